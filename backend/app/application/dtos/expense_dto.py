@@ -26,6 +26,7 @@ class CreateExpenseDTO:
     payment_method: str # Recibirá como string, luego se convierte a Enum
     description: Optional[str] = None
     date: Optional[datetime] = None
+    currency: Optional[str] = None  # Código ISO (por defecto USD)
     
     def to_payment_method_enum(self) -> PaymentMethod:
         """Convierte el string a enum PaymentMethod"""
@@ -39,6 +40,7 @@ class UpdateExpenseDTO:
     category: Optional[str] = None
     payment_method: Optional[str] = None
     description: Optional[str] = None
+    currency: Optional[str] = None
 
     def to_payment_method_enum(self) -> Optional[PaymentMethod]:
         """Convierte el String a enum si existe"""
@@ -56,6 +58,10 @@ class ExpenseFilterDTO:
     payment_method: Optional[str] = None
     min_amount: Optional[float] = None
     max_amount: Optional[float] = None
+    sort: Optional[str] = None  # date, amount o category
+    descending: bool = True
+    limit: Optional[int] = None
+    offset: int = 0
 
 @dataclass
 class ExpenseResponseDTO:
@@ -68,6 +74,7 @@ class ExpenseResponseDTO:
     category: str
     payment_method: str
     date: str #ISO format
+    currency: str
     description: Optional[str]
     formatted_amount: str
     is_recent: bool
\ No newline at end of file
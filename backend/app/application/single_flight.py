@@ -0,0 +1,120 @@
+# app/application/single_flight.py
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class _Flight:
+    """Un cálculo en curso y los que esperan su resultado"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Coalescencia de llamadas idénticas concurrentes ("single flight")
+
+    La primera llamada con una clave calcula; las que llegan con la misma
+    clave mientras tanto esperan y reciben el mismo resultado (o la misma
+    excepción). No es una caché: al terminar, la clave se libera.
+
+    supersede() (suscrito a las escrituras) desengancha los cálculos en
+    curso: quienes ya esperaban reciben su resultado, pero las llamadas
+    posteriores a la escritura arrancan un cálculo nuevo.
+
+    El resultado se comparte entre todos los que esperan: no modificarlo.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._stats = {"executions": 0, "coalesced": 0, "superseded": 0}
+
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        """
+        Ejecuta function una sola vez por clave entre las llamadas concurrentes
+        Args: key: Identifica el cálculo (caso de uso + argumentos)
+              function: Cálculo sin argumentos
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                flight.waiters += 1
+                self._stats["coalesced"] += 1
+                leader = False
+            else:
+                flight = self._flights[key] = _Flight()
+                self._stats["executions"] += 1
+                leader = True
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = function()
+            return flight.result
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                # Si una escritura lo desenganchó, la clave ya puede ser de otro cálculo
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            flight.done.set()
+
+    def supersede(self, *args) -> None:
+        """
+        Las llamadas que lleguen desde ahora no se suman a los cálculos en curso
+        (acepta y descarta el ExpenseChange para suscribirse al bus de eventos)
+        """
+        with self._lock:
+            self._stats["superseded"] += len(self._flights)
+            self._flights.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {**self._stats, "in_flight": len(self._flights)}
+
+    def scoped(self, scope: Hashable) -> "ScopedSingleFlight":
+        """
+        Vista que solo coalesce con llamadas del mismo scope
+        Args: scope: Origen de los datos (p. ej. primario o una réplica)
+        """
+        return ScopedSingleFlight(self, scope)
+
+
+class ScopedSingleFlight:
+    """
+    SingleFlight restringido a un scope: la clave se prefija con él
+
+    Dos lecturas iguales de orígenes distintos (primario y una réplica con
+    lag) no se comparten: quien lee del primario por read-your-writes no
+    debe recibir lo que leyó una réplica.
+    """
+
+    def __init__(self, single_flight: SingleFlight, scope: Hashable):
+        self._single_flight = single_flight
+        self._scope = scope
+
+    def do(self, key: Hashable, function: Callable[[], Any]) -> Any:
+        return self._single_flight.do((self._scope, key), function)
+
+
+_single_flight: Optional[SingleFlight] = None
+
+
+def get_single_flight() -> SingleFlight:
+    """Instancia global, suscrita a las escrituras de gastos"""
+    global _single_flight
+    if _single_flight is None:
+        from ..domain.events.expense_events import expense_events
+        _single_flight = SingleFlight()
+        expense_events.subscribe(_single_flight.supersede)
+    return _single_flight
@@ -1,8 +1,14 @@
 # tests/test_application/test_use_cases.py
+import json
+import threading
+import time
 import pytest
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime, timedelta
 
 from app.domain.entities.expense import Expense, PaymentMethod
+from app.domain.services.currency import ExchangeRate, ExchangeRates, MissingRateError
 from app.application.dtos.expense_dto import (
     CreateExpenseDTO, 
     UpdateExpenseDTO,
@@ -15,18 +21,40 @@ from app.application.use_cases.get_filtered_expenses import GetFilteredExpensesU
 from app.application.use_cases.update_expense import UpdateExpenseUseCase
 from app.application.use_cases.delete_expense import DeleteExpenseUseCase
 from app.application.use_cases.get_dashboard_data import GetDashboardDataUseCase
+from app.application.use_cases.get_time_series import GetTimeSeriesUseCase
+from app.application.use_cases.get_largest_expenses import GetLargestExpensesUseCase
+from app.application.use_cases.get_categories import GetCategoriesUseCase
+from app.infrastructure.repositories.category_cache import CategoryCache
+from app.application.use_cases.get_dashboard_snapshot import GetDashboardSnapshotUseCase
+from app.infrastructure.analytics.dashboard_snapshots import DashboardSnapshotStore
+from app.application.use_cases.get_amount_distribution import GetAmountDistributionUseCase
+from app.domain.events.expense_events import ExpenseEventBus
+from app.infrastructure.analytics.distribution_store import DistributionStore
+from app.infrastructure.repositories.observed_expense_repository import ObservedExpenseRepository
 from app.infrastructure.repositories.json_expense_repository import JsonExpenseRepository
+from app.infrastructure.repositories.in_memory_expense_repository import InMemoryExpenseRepository
+from app.infrastructure.repositories.json_budget_repository import JsonBudgetRepository
+from app.application.use_cases.set_budget import SetBudgetUseCase
+from app.application.use_cases.get_budget_status import GetBudgetStatusUseCase
+from app.application.use_cases.rebuild_budget_totals import RebuildBudgetTotalsUseCase
 from app.domain.repositories.exceptions import ExpenseNotFoundError
+from app.application.single_flight import SingleFlight
+from app.application.use_cases.request_report import RequestReportUseCase
+from app.application.use_cases.get_report import GetReportUseCase, ReportNotReadyError
+from app.infrastructure.reports.report_jobs import ReportJobManager
+from app.infrastructure.repositories.repository_decorator import ExpenseRepositoryDecorator
+from app.domain.repositories.expense_repository import ExpenseRepository
+from app.domain.repositories.expense_query import ExpenseQuery
+from app.domain.services.expense_service import ExpenseService
 
 
 class TestCreateExpenseUseCase:
     """Tests para CreateExpenseUseCase"""
     
     @pytest.fixture
-    def repository(self, tmp_path):
-        """Fixture con repositorio temporal"""
-        test_file = tmp_path / "test_expenses.json"
-        return JsonExpenseRepository(str(test_file))
+    def repository(self):
+        """Fixture con repositorio en memoria"""
+        return InMemoryExpenseRepository()
     
     @pytest.fixture
     def use_case(self, repository):
@@ -87,9 +115,8 @@ class TestGetExpenseByIdUseCase:
     """Tests para GetExpenseByIdUseCase"""
     
     @pytest.fixture
-    def repository(self, tmp_path):
-        test_file = tmp_path / "test_expenses.json"
-        return JsonExpenseRepository(str(test_file))
+    def repository(self):
+        return InMemoryExpenseRepository()
     
     @pytest.fixture
     def use_case(self, repository):
@@ -119,9 +146,8 @@ class TestUpdateExpenseUseCase:
     """Tests para UpdateExpenseUseCase"""
     
     @pytest.fixture
-    def repository(self, tmp_path):
-        test_file = tmp_path / "test_expenses.json"
-        return JsonExpenseRepository(str(test_file))
+    def repository(self):
+        return InMemoryExpenseRepository()
     
     @pytest.fixture
     def use_case(self, repository):
@@ -180,9 +206,8 @@ class TestDeleteExpenseUseCase:
     """Tests para DeleteExpenseUseCase"""
     
     @pytest.fixture
-    def repository(self, tmp_path):
-        test_file = tmp_path / "test_expenses.json"
-        return JsonExpenseRepository(str(test_file))
+    def repository(self):
+        return InMemoryExpenseRepository()
     
     @pytest.fixture
     def use_case(self, repository):
@@ -210,6 +235,16 @@ class TestDeleteExpenseUseCase:
         assert result is False
 
 
+class EntityRowsRepository(ExpenseRepositoryDecorator):
+    """Usa las consultas por defecto de la interfaz (a partir de entidades)"""
+
+    def find(self, query):
+        return ExpenseRepository.find(self, query)
+
+    def find_rows(self, query, fields):
+        return ExpenseRepository.find_rows(self, query, fields)
+
+
 class TestGetFilteredExpensesUseCase:
     """Tests para GetFilteredExpensesUseCase"""
     
@@ -283,6 +318,85 @@ class TestGetFilteredExpensesUseCase:
         assert result[0].payment_method == PaymentMethod.CASH
 
 
+    def test_projected_rows_match_entities(self, use_case, repository):
+        """Test: La proyección devuelve solo los campos pedidos, igual en el repositorio JSON y en el genérico"""
+        # Arrange
+        filters = ExpenseFilterDTO(payment_method="cash", max_amount=100)
+        fields = ("formatted_amount", "category")
+        generic_use_case = GetFilteredExpensesUseCase(EntityRowsRepository(repository))
+        
+        # Act
+        rows = use_case.execute_projected(filters, fields)
+        
+        # Assert
+        assert rows == [
+            {"formatted_amount": "$10.00", "category": "Comida"},
+            {"formatted_amount": "$30.00", "category": "Transporte"}
+        ]
+        assert generic_use_case.execute_projected(filters, fields) == rows
+
+    def test_sort_and_limit(self, use_case, repository):
+        """Test: Orden y límite, igual en el repositorio JSON (heap) y en el genérico"""
+        # Arrange
+        generic_use_case = GetFilteredExpensesUseCase(EntityRowsRepository(repository))
+        cheapest = ExpenseFilterDTO(sort="amount", descending=False, limit=3)
+        by_category = ExpenseFilterDTO(payment_method="cash", sort="category")
+        
+        # Act
+        result = use_case.execute(cheapest)
+        rows = use_case.execute_projected(by_category, ("category", "amount"))
+        
+        # Assert
+        assert [e.amount for e in result] == [10, 20, 30]
+        assert rows == [{"category": "Transporte", "amount": 30.0}, {"category": "Comida", "amount": 10.0}]
+        assert [e.id for e in generic_use_case.execute(cheapest)] == [e.id for e in result]
+        assert generic_use_case.execute_projected(by_category, ("category", "amount")) == rows
+
+    def test_page_and_total_count(self, use_case, repository):
+        """Test: offset pagina y count da el total de los filtros, igual en el repositorio genérico"""
+        # Arrange
+        generic_use_case = GetFilteredExpensesUseCase(EntityRowsRepository(repository))
+        second_page = ExpenseFilterDTO(max_amount=100, sort="amount", limit=2, offset=2)
+
+        # Act
+        page = use_case.execute(second_page)
+        total = use_case.count(second_page)
+
+        # Assert
+        assert [e.amount for e in page] == [10]
+        assert (total.value, total.exact) == (3, True)
+        assert generic_use_case.count(second_page) == total
+        assert [e.id for e in generic_use_case.execute(second_page)] == [e.id for e in page]
+
+
+class TestGetLargestExpensesUseCase:
+    """Tests para GetLargestExpensesUseCase"""
+    
+    @pytest.fixture
+    def repository(self, tmp_path):
+        repo = JsonExpenseRepository(str(tmp_path / "test_expenses.json"))
+        now = datetime.now()
+        repo.save(Expense(500, "Viajes", PaymentMethod.CREDIT_CARD, now - timedelta(days=60)))
+        for i, amount in enumerate([40, 90, 15, 90, 60]):
+            repo.save(Expense(amount, "Comida" if i % 2 else "Hogar", PaymentMethod.CASH, now - timedelta(days=i)))
+        return repo
+    
+    def test_largest_in_default_period(self, repository):
+        """Test: Los mayores de los últimos 30 días, de mayor a menor (empates por id)"""
+        # Act
+        result = GetLargestExpensesUseCase(repository).execute(limit=3)
+        
+        # Assert
+        assert [e.amount for e in result["expenses"]] == [90, 90, 60]
+        assert result["expenses"][0].id > result["expenses"][1].id
+        assert GetLargestExpensesUseCase(repository).execute(category="comida")["expenses"][0].amount == 90
+    
+    def test_invalid_limit_raises_error(self, repository):
+        """Test: Límite fuera de rango"""
+        with pytest.raises(ValueError):
+            GetLargestExpensesUseCase(repository).execute(limit=0)
+
+
 class TestGetDashboardDataUseCase:
     """Tests para GetDashboardDataUseCase"""
     
@@ -338,6 +452,618 @@ class TestGetDashboardDataUseCase:
         assert by_category["totals"]["Transporte"] == 50.0
         assert by_category["counts"]["Comida"] == 2
 
+    
+    def test_dashboard_in_base_currency(self, tmp_path):
+        """Test: Los gastos en otra moneda se convierten con la tasa vigente en su fecha"""
+        # Arrange
+        repo = JsonExpenseRepository(str(tmp_path / "multi.json"))
+        today = datetime.now()
+        repo.save(Expense(10, "Comida", PaymentMethod.CASH, date=today))
+        repo.save(Expense(100, "Comida", PaymentMethod.CASH, date=today, currency="EUR"))
+        repo.save(Expense(100, "Viajes", PaymentMethod.CASH, date=today - timedelta(days=400), currency="EUR"))
+        rates = ExchangeRates([
+            ExchangeRate((today - timedelta(days=500)).date(), "EUR", 1.0),
+            ExchangeRate((today - timedelta(days=10)).date(), "EUR", 1.1),
+        ], "USD")
+        use_case = GetDashboardDataUseCase(repo, lambda: rates)
+        
+        # Act
+        result = use_case.execute(days=30)
+        in_eur = use_case.execute(days=30, currency="EUR")
+        
+        # Assert
+        assert result["currency"] == "USD"
+        assert result["summary"]["total_amount"] == pytest.approx(120.0)  # 10 + 100 * 1.1
+        assert result["by_category"]["totals"]["Viajes"] == pytest.approx(100.0)  # tasa de hace 500 días
+        assert in_eur["summary"]["total_amount"] == pytest.approx(10 / 1.1 + 100)
+        assert repo.get_total_by_category(rates) == pytest.approx({"Comida": 120.0, "Viajes": 100.0})
+        with pytest.raises(MissingRateError):
+            use_case.execute(days=30, currency="GBP")
+        with pytest.raises(MissingRateError):
+            GetDashboardDataUseCase(repo).execute(days=30)
+
+
+class TestStreamingSummaries:
+    """Tests de los iteradores del repositorio y los resúmenes en una pasada"""
+
+    @pytest.fixture
+    def repository(self, tmp_path):
+        repo = JsonExpenseRepository(str(tmp_path / "stream.json"))
+        today = datetime.now()
+        for days_ago, amount, category, currency in [
+            (1, 25, "Comida", None), (3, 30, "Comida", "EUR"), (45, 50, "Transporte", None),
+            (60, 12.5, "Ocio", "EUR"), (2, 8, "Ocio", None),
+        ]:
+            repo.save(Expense(amount, category, PaymentMethod.CASH, date=today - timedelta(days=days_ago), currency=currency))
+        return repo
+
+    def test_iterators_match_lists(self, repository):
+        """Test: Los iteradores dan los mismos gastos que los métodos que devuelven listas"""
+        query = ExpenseQuery(category="ocio", sort="amount", limit=1)
+        start, end = datetime.now() - timedelta(days=10), datetime.now()
+
+        assert list(repository.iter_all()) == repository.get_all()
+        assert list(repository.iter_by_date_range(start, end)) == repository.get_by_date_range(start, end)
+        assert list(repository.iter_find(query)) == repository.find(query)
+
+    def test_single_pass_matches_columns(self, repository):
+        """Test: El resumen y la tendencia en una pasada coinciden con el cálculo por columnas"""
+        rates = ExchangeRates([ExchangeRate(datetime(2000, 1, 1).date(), "EUR", 1.1)], "USD")
+        columns = repository.get_columns()
+
+        summary, trend = ExpenseService.calculate_summary_and_trend(repository.iter_all(), 30, rates)
+
+        expected = ExpenseService.calculate_monthly_summary(columns, rates)
+        for key in expected:  # approx no compara diccionarios anidados
+            assert summary[key] == pytest.approx(expected[key])
+        assert trend == pytest.approx(ExpenseService.get_spending_trend(columns, 30, rates))
+        assert summary["by_category"]["Ocio"] == pytest.approx(8 + 12.5 * 1.1)
+        assert trend["expense_count"] == 3
+
+
+class TestGetDashboardSnapshotUseCase:
+    """Tests para el dashboard servido desde snapshots"""
+    
+    @pytest.fixture
+    def events(self):
+        return ExpenseEventBus()
+    
+    @pytest.fixture
+    def repository(self, tmp_path, events):
+        repo = ObservedExpenseRepository(JsonExpenseRepository(str(tmp_path / "test_expenses.json")), events)
+        repo.save(Expense(20.00, "Comida", PaymentMethod.CASH))
+        return repo
+    
+    @pytest.fixture
+    def store(self, repository, events):
+        store = DashboardSnapshotStore([7, 30], repository_scope=None)
+        store.refresh(repository=repository)
+        events.subscribe(store.on_change)
+        return store
+    
+    def test_serves_snapshot_until_refreshed(self, repository, store):
+        """Test: Tras una escritura se sirve el snapshot marcado como viejo"""
+        # Arrange
+        use_case = GetDashboardSnapshotUseCase(repository, store)
+        repository.save(Expense(30.00, "Comida", PaymentMethod.CASH))
+        
+        # Act
+        cached = use_case.execute(days=30)
+        refreshed = use_case.execute(days=30, refresh=True)
+        
+        # Assert
+        assert cached["summary"]["expense_count"] == 1
+        assert cached["snapshot"]["stale"] is True
+        assert refreshed["summary"]["expense_count"] == 2
+        assert refreshed["snapshot"]["stale"] is False
+    
+    def test_writes_from_other_processes_mark_snapshot_stale(self, tmp_path, repository, store):
+        """Test: Una escritura que no pasa por el bus (otro proceso) se detecta por la marca del archivo"""
+        # Arrange
+        use_case = GetDashboardSnapshotUseCase(repository, store)
+        other_process = JsonExpenseRepository(str(tmp_path / "test_expenses.json"))
+        other_process.save(Expense(30.00, "Comida", PaymentMethod.CASH))
+        assert use_case.execute(days=30)["snapshot"]["stale"] is False
+        
+        # Act
+        detected = store.check_external_writes(repository)
+        cached = use_case.execute(days=30)
+        store.refresh(repository=repository)
+        
+        # Assert
+        assert detected is True
+        assert cached["snapshot"]["stale"] is True
+        assert use_case.execute(days=30)["snapshot"]["stale"] is False
+        assert store.check_external_writes(repository) is False
+    
+    def test_refresh_reads_from_store_scope(self, tmp_path, repository):
+        """Test: El refresh lee del primario del store, no de la réplica de la petición"""
+        # Arrange
+        replica = JsonExpenseRepository(str(tmp_path / "replica.json"))
+        store = DashboardSnapshotStore([30], repository_scope=lambda: nullcontext(repository))
+        use_case = GetDashboardSnapshotUseCase(replica, store)
+        
+        # Act
+        result = use_case.execute(days=30, refresh=True)
+        
+        # Assert
+        assert result["summary"]["expense_count"] == 1
+        assert store.get(30).data["summary"]["expense_count"] == 1
+    
+    def test_other_windows_are_computed_live(self, repository, store):
+        """Test: Una ventana no precalculada se calcula en el momento"""
+        # Act
+        result = GetDashboardSnapshotUseCase(repository, store).execute(days=12)
+        
+        # Assert
+        assert result["snapshot"]["source"] == "live"
+        assert result["period_info"]["days"] == 12
+        assert store.get(12) is None
+
+
+class TestGetTimeSeriesUseCase:
+    """Tests para GetTimeSeriesUseCase"""
+    
+    @pytest.fixture
+    def repository(self, tmp_path):
+        test_file = tmp_path / "test_expenses.json"
+        repo = JsonExpenseRepository(str(test_file))
+        
+        repo.save(Expense(10, "Comida", PaymentMethod.CASH, date=datetime(2024, 1, 1, 9)))
+        repo.save(Expense(20, "Comida", PaymentMethod.CASH, date=datetime(2024, 1, 1, 20)))
+        repo.save(Expense(30, "Transporte", PaymentMethod.CASH, date=datetime(2024, 1, 3, 12)))
+        repo.save(Expense(40, "Comida", PaymentMethod.CASH, date=datetime(2024, 2, 10, 12)))
+        
+        return repo
+    
+    @pytest.fixture
+    def use_case(self, repository):
+        return GetTimeSeriesUseCase(repository)
+    
+    def test_daily_series_fills_gaps(self, use_case):
+        """Test: Los días sin gastos aparecen con total 0"""
+        # Act
+        result = use_case.execute("day", datetime(2024, 1, 1), datetime(2024, 1, 4, 23, 59))
+        
+        # Assert
+        points = result["points"]
+        assert [p["bucket"].day for p in points] == [1, 2, 3, 4]
+        assert [p["total"] for p in points] == [30.0, 0.0, 30.0, 0.0]
+        assert [p["count"] for p in points] == [2, 0, 1, 0]
+        assert points[2]["moving_avg_7"] == 20.0  # (30 + 0 + 30) / 3
+    
+    def test_monthly_series_with_category(self, use_case):
+        """Test: Serie mensual filtrada por categoría"""
+        # Act
+        result = use_case.execute("month", datetime(2024, 1, 1), datetime(2024, 3, 31), category="comida")
+        
+        # Assert
+        assert [p["total"] for p in result["points"]] == [30.0, 40.0, 0.0]
+        assert result["points"][1]["moving_avg_30"] == 35.0
+    
+    def test_invalid_granularity_raises_error(self, use_case):
+        """Test: Granularidad inválida lanza error"""
+        with pytest.raises(ValueError, match="Granularidad"):
+            use_case.execute("hour")
+
+
+class TestGetCategoriesUseCase:
+    """Tests para GetCategoriesUseCase"""
+    
+    def test_counts_follow_writes_without_reloading(self, tmp_path):
+        """Test: Se carga una vez del repositorio y después se mantiene con los eventos"""
+        # Arrange
+        events = ExpenseEventBus()
+        cache = CategoryCache()
+        events.subscribe(cache.on_change)
+        repository = ObservedExpenseRepository(JsonExpenseRepository(str(tmp_path / "test_expenses.json")), events)
+        repository.save(Expense(10, "Comida", PaymentMethod.CASH))
+        viaje = repository.save(Expense(500, "Viajes", PaymentMethod.CREDIT_CARD))
+        use_case = GetCategoriesUseCase(repository, cache)
+        assert use_case.execute() == [
+            {"id": None, "name": "Comida", "count": 1},
+            {"id": None, "name": "Viajes", "count": 1}
+        ]
+        
+        # Act
+        repository.save(Expense(20, "comida", PaymentMethod.CASH))
+        viaje.update_category("Hogar")
+        repository.update(viaje)
+        
+        # Assert
+        expected = [
+            {"id": None, "name": "Comida", "count": 2},
+            {"id": None, "name": "Hogar", "count": 1}
+        ]
+        assert use_case.execute() == expected
+        assert use_case.execute(refresh=True) == expected
+
+
+class TestGetAmountDistributionUseCase:
+    """Tests para GetAmountDistributionUseCase"""
+    
+    @pytest.fixture
+    def events(self):
+        return ExpenseEventBus()
+    
+    @pytest.fixture
+    def repository(self, tmp_path, events):
+        test_file = tmp_path / "test_expenses.json"
+        repo = ObservedExpenseRepository(JsonExpenseRepository(str(test_file)), events)
+        for amount in (10, 20, 30, 40, 100):
+            repo.save(Expense(amount, "Comida", PaymentMethod.CASH))
+        repo.save(Expense(500, "Viajes", PaymentMethod.CREDIT_CARD))
+        return repo
+    
+    @pytest.fixture
+    def store(self, tmp_path, events):
+        store = DistributionStore(str(tmp_path / "distribution.json"))
+        events.subscribe(store.on_change)
+        return store
+    
+    def test_distribution_is_built_from_repository(self, repository, store):
+        """Test: La primera lectura reconstruye los sketches"""
+        # Act
+        result = GetAmountDistributionUseCase(repository, store).execute()
+        
+        # Assert
+        comida = result["by_category"]["Comida"]
+        assert comida["count"] == 5
+        assert comida["p50"] == pytest.approx(30, rel=0.02)
+        assert result["overall"]["p99"] == pytest.approx(500, rel=0.02)
+        assert result["by_payment_method"]["credit_card"]["count"] == 1
+    
+    def test_distribution_updates_incrementally(self, repository, store):
+        """Test: save, update y delete actualizan los sketches sin reconstruir"""
+        # Arrange
+        use_case = GetAmountDistributionUseCase(repository, store)
+        use_case.execute()
+        viaje = repository.get_by_category("Viajes")[0]
+        
+        # Act
+        repository.delete(viaje.id)
+        comida = repository.get_by_category("Comida")[0]
+        comida.update_amount(1000)
+        repository.update(comida)
+        result = use_case.execute()
+        
+        # Assert
+        assert "Viajes" not in result["by_category"]
+        assert result["overall"]["count"] == 5
+        assert result["by_category"]["Comida"]["p99"] == pytest.approx(1000, rel=0.02)
+        assert result["overall"]["histogram"][0]["count"] == 0  # el gasto de 10 pasó a 1000
+    
+    def test_distribution_is_persisted(self, repository, store, tmp_path):
+        """Test: Un store nuevo carga el estado guardado sin reconstruir"""
+        # Arrange
+        GetAmountDistributionUseCase(repository, store).execute()
+        store.save()
+        
+        # Act
+        restored = DistributionStore(str(tmp_path / "distribution.json"))
+        
+        # Assert
+        assert restored.load() is True
+        assert restored.snapshot() == store.snapshot()
+
+    def test_distribution_is_rebuilt_when_count_disagrees(self, repository, store, tmp_path):
+        """Test: Escrituras que el store no vio (otro proceso, cambios sin guardar) fuerzan reconstruir"""
+        # Arrange
+        use_case = GetAmountDistributionUseCase(repository, store)
+        use_case.execute()
+        other_process = JsonExpenseRepository(str(tmp_path / "test_expenses.json"))
+
+        # Act: otro proceso escribe sin pasar por este bus de eventos
+        other_process.save(Expense(70, "Hogar", PaymentMethod.CASH))
+        result = use_case.execute()
+        restored = DistributionStore(str(tmp_path / "distribution.json"))
+        restored.ensure_ready(repository)
+
+        # Assert
+        assert result["overall"]["count"] == 7
+        assert result["by_category"]["Hogar"]["count"] == 1
+        assert restored.snapshot() == result
+
+    def test_same_count_update_from_other_process_is_detected(self, repository, store, tmp_path):
+        """Test: Un cambio de monto ajeno (misma cantidad de gastos) cambia la marca y fuerza reconstruir"""
+        # Arrange
+        use_case = GetAmountDistributionUseCase(repository, store)
+        use_case.execute()
+        other_process = JsonExpenseRepository(str(tmp_path / "test_expenses.json"))
+        viaje = other_process.get_by_category("Viajes")[0]
+
+        # Act
+        viaje.update_amount(5000)
+        other_process.update(viaje)
+        result = use_case.execute()
+
+        # Assert
+        assert result["overall"]["count"] == 6
+        assert result["by_category"]["Viajes"]["p50"] == pytest.approx(5000, rel=0.02)
+
+
+class TestBudgetTracking:
+    """Tests de presupuestos con totales del mes incrementales"""
+    
+    @pytest.fixture
+    def repository(self, tmp_path):
+        return JsonExpenseRepository(str(tmp_path / "test_expenses.json"))
+    
+    @pytest.fixture
+    def budgets(self, tmp_path):
+        budgets = JsonBudgetRepository(str(tmp_path / "test_budgets.json"))
+        SetBudgetUseCase(budgets).execute("comida", 100)
+        return budgets
+    
+    def test_create_returns_budget_status(self, repository, budgets):
+        """Test: Crear un gasto devuelve el % usado y si se superó"""
+        # Arrange
+        use_case = CreateExpenseUseCase(repository, budgets)
+        
+        # Act
+        _, first = use_case.execute_with_budget(CreateExpenseDTO(60, "Comida", "cash"))
+        _, second = use_case.execute_with_budget(CreateExpenseDTO(50, "Comida", "cash"))
+        _, other = use_case.execute_with_budget(CreateExpenseDTO(10, "Viajes", "cash"))
+        
+        # Assert
+        assert first.percent_used == 60.0 and first.exceeded is False
+        assert second.spent == 110.0 and second.exceeded is True
+        assert other is None
+    
+    def test_update_and_delete_move_month_totals(self, repository, budgets):
+        """Test: Actualizar y eliminar ajustan los totales sin reagrupar"""
+        # Arrange
+        create = CreateExpenseUseCase(repository, budgets)
+        kept = create.execute(CreateExpenseDTO(40, "Comida", "cash"))
+        removed = create.execute(CreateExpenseDTO(30, "Comida", "cash"))
+        
+        # Act
+        _, status = UpdateExpenseUseCase(repository, budgets).execute_with_budget(
+            UpdateExpenseDTO(expense_id=kept.id, amount=25, category="Viajes")
+        )
+        DeleteExpenseUseCase(repository, budgets).execute(removed.id)
+        result = GetBudgetStatusUseCase(budgets).execute()
+        
+        # Assert
+        assert status is None
+        assert result["budgets"][0]["spent"] == 0
+        assert result["total_spent"] == 25
+    
+    def test_rebuild_matches_incremental_totals(self, repository, budgets):
+        """Test: Reconstruir desde los gastos da los mismos totales"""
+        # Arrange
+        create = CreateExpenseUseCase(repository, budgets)
+        create.execute(CreateExpenseDTO(12.5, "Comida", "cash"))
+        create.execute(CreateExpenseDTO(7.25, "Comida", "debit_card"))
+        create.execute(CreateExpenseDTO(20, "Comida", "cash", date=datetime(2024, 1, 15)))
+        month = datetime.now().strftime("%Y-%m")
+        incremental = budgets.get_month_totals(month)
+        
+        # Act
+        result = RebuildBudgetTotalsUseCase(repository, budgets).execute()
+        
+        # Assert
+        assert result == {"counters": 2, "expenses": 3}
+        assert budgets.get_month_totals(month) == incremental == {"Comida": 19.75}
+        assert budgets.get_month_totals("2024-01") == {"Comida": 20.0}
+
+    def test_foreign_currency_is_converted_to_base(self, repository, budgets):
+        """Test: Los totales del mes suman en la moneda base; sin tasa el gasto se rechaza"""
+        # Arrange
+        rates = ExchangeRates([ExchangeRate(datetime(2000, 1, 1).date(), "EUR", 1.5)], "USD")
+        create = CreateExpenseUseCase(repository, budgets, lambda: rates)
+
+        # Act
+        _, status = create.execute_with_budget(CreateExpenseDTO(40, "Comida", "cash", currency="EUR"))
+        kept = create.execute(CreateExpenseDTO(10, "Comida", "cash"))
+        UpdateExpenseUseCase(repository, budgets, lambda: rates).execute(
+            UpdateExpenseDTO(expense_id=kept.id, currency="EUR")
+        )
+        month = datetime.now().strftime("%Y-%m")
+        incremental = budgets.get_month_totals(month)
+        RebuildBudgetTotalsUseCase(repository, budgets, lambda: rates).execute()
+
+        # Assert
+        assert status.spent == 60.0
+        assert incremental == budgets.get_month_totals(month) == {"Comida": 75.0}
+        with pytest.raises(MissingRateError):
+            CreateExpenseUseCase(repository, budgets).execute(CreateExpenseDTO(5, "Comida", "cash", currency="EUR"))
+        with pytest.raises(MissingRateError):
+            DeleteExpenseUseCase(repository, budgets).execute(kept.id)
+        assert budgets.get_month_totals(month) == {"Comida": 75.0}
+        assert len(repository.get_all()) == 2
+
+    def test_sub_cent_converted_expense_returns_status(self, repository, budgets):
+        """Test: Un gasto que convertido redondea a 0.00 no toca el total y devuelve el estado"""
+        # Arrange
+        rates = ExchangeRates([ExchangeRate(datetime(2000, 1, 1).date(), "JPY", 0.007)], "USD")
+        create = CreateExpenseUseCase(repository, budgets, lambda: rates)
+        create.execute(CreateExpenseDTO(30, "Comida", "cash"))
+
+        # Act
+        _, status = create.execute_with_budget(CreateExpenseDTO(0.01, "Comida", "cash", currency="JPY"))
+
+        # Assert
+        assert status.spent == 30.0
+
+
+class GatedRepository(ExpenseRepositoryDecorator):
+    """Repository cuyas lecturas (get_all, find) quedan bloqueadas hasta abrir la compuerta"""
+
+    def __init__(self, inner):
+        super().__init__(inner)
+        self.calls = 0
+        self.started = threading.Event()
+        self.gate = threading.Event()
+
+    def _wait(self):
+        self.calls += 1
+        self.started.set()
+        self.gate.wait(5)
+
+    def get_all(self):
+        self._wait()
+        return self._inner.get_all()
+
+    def find(self, query):
+        self._wait()
+        return self._inner.find(query)
+
+
+class TestSingleFlight:
+    """Tests de coalescencia de lecturas iguales concurrentes"""
+    
+    @pytest.fixture
+    def repository(self, tmp_path):
+        repository = JsonExpenseRepository(str(tmp_path / "test_expenses.json"))
+        repository.save(Expense(10, "Comida", PaymentMethod.CASH))
+        return repository
+    
+    @staticmethod
+    def _wait_for(condition):
+        deadline = time.monotonic() + 5
+        while not condition() and time.monotonic() < deadline:
+            time.sleep(0.01)
+    
+    def test_concurrent_calls_share_one_read(self, repository):
+        """Test: Las llamadas concurrentes esperan la lectura en curso"""
+        # Arrange
+        gated = GatedRepository(repository)
+        single_flight = SingleFlight()
+        use_case = GetAllExpensesUseCase(gated, single_flight)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(use_case.execute())) for _ in range(4)]
+        
+        # Act
+        threads[0].start()
+        gated.started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        self._wait_for(lambda: single_flight.stats()["coalesced"] == 3)
+        gated.gate.set()
+        for thread in threads:
+            thread.join(5)
+        
+        # Assert
+        assert gated.calls == 1
+        assert len(results) == 4 and all(r is results[0] for r in results)
+        assert single_flight.stats() == {"executions": 1, "coalesced": 3, "superseded": 0, "in_flight": 0}
+    
+    def test_write_supersedes_in_flight_read(self, repository):
+        """Test: Tras una escritura, las llamadas nuevas no reciben el resultado viejo"""
+        # Arrange
+        bus = ExpenseEventBus()
+        single_flight = SingleFlight()
+        bus.subscribe(single_flight.supersede)
+        gated = GatedRepository(repository)
+        use_case = GetFilteredExpensesUseCase(gated, single_flight)
+        filters = ExpenseFilterDTO(category="comida")
+        stale = []
+        first = threading.Thread(target=lambda: stale.append(use_case.execute(filters)))
+        first.start()
+        gated.started.wait(5)
+        
+        # Act
+        ObservedExpenseRepository(repository, bus).save(Expense(5, "Comida", PaymentMethod.CASH))
+        gated.gate.set()
+        fresh = use_case.execute(filters)
+        first.join(5)
+        
+        # Assert
+        assert gated.calls == 2
+        assert len(fresh) == 2
+        assert single_flight.stats()["superseded"] == 1
+
+    def test_reads_from_different_sources_are_not_shared(self, repository):
+        """Test: Una lectura del primario no se suma a la que está haciendo una réplica"""
+        # Arrange
+        single_flight = SingleFlight()
+        gated = GatedRepository(repository)
+        replica_read = GetAllExpensesUseCase(gated, single_flight.scoped("replica"))
+        primary_read = GetAllExpensesUseCase(repository, single_flight.scoped("primary"))
+        thread = threading.Thread(target=replica_read.execute)
+        thread.start()
+        gated.started.wait(5)
+        
+        # Act
+        result = primary_read.execute()
+        gated.gate.set()
+        thread.join(5)
+        
+        # Assert
+        assert len(result) == 1
+        assert single_flight.stats()["coalesced"] == 0
+        assert single_flight.stats()["executions"] == 2
+
+
+class TestReportJobs:
+    """Tests de reportes en segundo plano (el cálculo corre en un hilo en vez de un proceso)"""
+    
+    @pytest.fixture
+    def repository(self, tmp_path):
+        repository = JsonExpenseRepository(str(tmp_path / "test_expenses.json"))
+        repository.save(Expense(30, "Comida", PaymentMethod.CASH, date=datetime(2025, 3, 2), description="Super"))
+        repository.save(Expense(10, "Comida", PaymentMethod.CASH, date=datetime(2025, 3, 9), description=" super "))
+        repository.save(Expense(60, "Viajes", PaymentMethod.CREDIT_CARD, date=datetime(2025, 3, 20)))
+        repository.save(Expense(99, "Viajes", PaymentMethod.CASH, date=datetime(2025, 4, 1)))
+        return repository
+    
+    @pytest.fixture
+    def manager(self, repository, tmp_path):
+        manager = ReportJobManager(
+            str(tmp_path / "reports"), lambda: nullcontext(repository), executor=ThreadPoolExecutor(1)
+        )
+        yield manager
+        manager.shutdown()
+    
+    @staticmethod
+    def _wait(use_case, job_id):
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            job = use_case.execute(job_id)
+            if job["status"] in ("done", "failed"):
+                return job
+            time.sleep(0.01)
+        raise AssertionError("El reporte no terminó")
+    
+    def test_monthly_statement(self, manager):
+        """Test: El resumen mensual agrupa por categoría, método y comercio"""
+        # Arrange
+        get_report = GetReportUseCase(manager)
+        
+        # Act
+        job = RequestReportUseCase(manager).execute("monthly", "2025-03")
+        job = self._wait(get_report, job["id"])
+        statement = json.loads(get_report.artifact(job["id"]).read_text(encoding="utf-8"))
+        
+        # Assert
+        assert job["status"] == "done" and job["progress"] == 1.0
+        assert statement["total"] == 100 and statement["expense_count"] == 3
+        assert statement["by_category"][0] == {"name": "Viajes", "total": 60, "count": 1, "percent": 60.0}
+        assert statement["top_merchants"] == [{"name": "Super", "total": 40, "count": 2}]
+    
+    def test_artifact_is_reused_until_data_changes(self, manager, repository):
+        """Test: Con los mismos datos se reutiliza el archivo; una escritura genera otra versión"""
+        # Arrange
+        request, get_report = RequestReportUseCase(manager), GetReportUseCase(manager)
+        first = self._wait(get_report, request.execute("yearly", "2025", "csv")["id"])
+        
+        # Act
+        second = self._wait(get_report, request.execute("yearly", "2025", "csv")["id"])
+        repository.save(Expense(1, "Comida", PaymentMethod.CASH, date=datetime(2025, 5, 5)))
+        third = self._wait(get_report, request.execute("yearly", "2025", "csv")["id"])
+        
+        # Assert
+        assert second["cached"] is True and second["data_version"] == first["data_version"]
+        assert third["cached"] is False and third["data_version"] != first["data_version"]
+        with pytest.raises(ReportNotReadyError):
+            get_report.artifact(first["id"])
+    
+    def test_invalid_period_raises_error(self, manager):
+        """Test: Un período con formato inválido se rechaza"""
+        with pytest.raises(ValueError):
+            RequestReportUseCase(manager).execute("monthly", "2025")
+
 
 # =============================================================================
 # TEST MANUAL SIMPLE
@@ -1,9 +1,13 @@
 # app/application/use_cases/create_expense.py
 
-from typing import Optional
+from typing import Callable, Optional, Tuple
 from ..dtos.expense_dto import CreateExpenseDTO
+from ...domain.entities.budget import BudgetStatus, month_key
 from ...domain.entities.expense import Expense
+from ...domain.repositories.budget_repository import BudgetRepository
 from ...domain.repositories.expense_repository import ExpenseRepository
+from ...domain.services.budget_service import BudgetService
+from ...domain.services.currency import ExchangeRates
 
 class CreateExpenseUseCase:
     """
@@ -14,14 +18,25 @@ class CreateExpenseUseCase:
     2. Crear la entidad Expsense (con sus validaciones)
     3. Guardar usando el repository
     4. Retornar el gasti creado
+    5. Si hay presupuestos, actualizar el total del mes y devolver su estado
     """
 
-    def __init__ (self, expense_repository: ExpenseRepository):
+    def __init__ (
+        self,
+        expense_repository: ExpenseRepository,
+        budget_repository: Optional[BudgetRepository] = None,
+        exchange_rates: Optional[Callable[[], ExchangeRates]] = None
+    ):
         """
         Inicializar el caso de uso con sus dependencias
         Args: expense_repository: Repository para persistir gastos
+              budget_repository: Presupuestos y totales del mes (opcional)
+              exchange_rates: Tasas vigentes, para sumar a los totales del mes
+                              en la moneda base (None = solo DEFAULT_CURRENCY)
         """
         self._expense_repository = expense_repository
+        self._budget_repository = budget_repository
+        self._exchange_rates = exchange_rates
 
     def execute(self, create_expense_dto: CreateExpenseDTO) -> Expense:
         """
@@ -30,18 +45,41 @@ class CreateExpenseUseCase:
         Returns: Expense: El gasto creado con ID asignado
         Raises: ValueError: Si los datos son invalidos
         """
+        return self.execute_with_budget(create_expense_dto)[0]
+
+    def execute_with_budget(self, create_expense_dto: CreateExpenseDTO) -> Tuple[Expense, Optional[BudgetStatus]]:
+        """
+        Igual que execute, pero devuelve también el estado del presupuesto
+        de la categoría en el mes del gasto
+        Returns: Tuple[Expense, Optional[BudgetStatus]]: None si la categoría no tiene presupuesto
+        Raises: ValueError: Si los datos son inválidos o no hay tasa para la moneda
+        """
         # 1. Convertir DTO a entidad (aquí se ejecutan las validaciones)
         expense = Expense(
             amount=create_expense_dto.amount,
             category=create_expense_dto.category,
             payment_method=create_expense_dto.to_payment_method_enum(),
             description=create_expense_dto.description,
-            date=create_expense_dto.date
+            date=create_expense_dto.date,
+            currency=create_expense_dto.currency
         )
 
         #Guardar usando el repositorio
-        saved_expense = self._expense_repository.save(expense)
-        return saved_expense
-    
+        if self._budget_repository is None:
+            return self._expense_repository.save(expense), None
+
+        # El total del mes se actualiza en la misma transacción que el gasto
+        rates = self._exchange_rates() if self._exchange_rates else None
+        deltas = BudgetService.month_deltas(None, expense, rates)
+        with self._budget_repository.month_totals_transaction():
+            totals = self._budget_repository.apply_month_deltas(deltas)
+            saved_expense = self._expense_repository.save(expense)
 
-    
\ No newline at end of file
+        month = month_key(saved_expense.date)
+        budget = self._budget_repository.get_by_category(saved_expense.category)
+        if budget is None:
+            return saved_expense, None
+        # Un delta que redondea a 0 (p. ej. centavos convertidos) no toca el contador
+        key = (saved_expense.category, month)
+        spent = totals[key] if key in totals else self._budget_repository.get_month_totals(month).get(saved_expense.category, 0.0)
+        return saved_expense, budget.status(spent, month)
@@ -0,0 +1,18 @@
+# app/application/use_cases/delete_budget.py
+from ...domain.repositories.budget_repository import BudgetRepository
+
+
+class DeleteBudgetUseCase:
+    """
+    Caso de uso: Eliminar el presupuesto de una categoría
+    Los totales del mes se conservan (no dependen de que haya presupuesto)
+    """
+
+    def __init__(self, budget_repository: BudgetRepository):
+        self._budget_repository = budget_repository
+
+    def execute(self, category: str) -> bool:
+        """
+        Returns: bool: True si se eliminó, False si no existía
+        """
+        return self._budget_repository.delete(category)
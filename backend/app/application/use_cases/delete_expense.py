@@ -1,19 +1,54 @@
 #app/application/use_cases/delete_expense.py
+from typing import Callable, Optional
+from ...domain.repositories.budget_repository import BudgetRepository
 from ...domain.repositories.expense_repository import ExpenseRepository
+from ...domain.services.budget_service import BudgetService
+from ...domain.services.currency import ExchangeRates
+
+
+class _NotFound(Exception):
+    """El gasto no existe: se aborta la transacción de los totales"""
+
 
 class DeleteExpenseUseCase:
     """
     Caso de uso: Eliminar un gasto
+    Si hay presupuestos, resta el monto del total del mes
     """
 
-    def __init__(self, expense_repository: ExpenseRepository):
+    def __init__(
+        self,
+        expense_repository: ExpenseRepository,
+        budget_repository: Optional[BudgetRepository] = None,
+        exchange_rates: Optional[Callable[[], ExchangeRates]] = None
+    ):
+        """
+        Args: exchange_rates: Tasas vigentes, para restar el monto en la moneda
+                              base (None = solo DEFAULT_CURRENCY)
+        """
         self._expense_repository = expense_repository
+        self._budget_repository = budget_repository
+        self._exchange_rates = exchange_rates
 
     def execute(self, expense_id: int) -> bool:
         """
         Elimina un gasto por ID
         Args: expense_id: ID del gasto a eliminar
         Returns: bool: True si se elimono, False si no existia
+        Raises: ValueError: Si no hay tasa para la moneda del gasto
         """
-        return self._expense_repository.delete(expense_id)
-        
\ No newline at end of file
+        if self._budget_repository is None:
+            return self._expense_repository.delete(expense_id)
+
+        # El gasto se lee bloqueado y se resta en la misma transacción que el delete
+        rates = self._exchange_rates() if self._exchange_rates else None
+        try:
+            with self._budget_repository.month_totals_transaction():
+                existing_expense = self._expense_repository.get_by_id_for_update(expense_id)
+                if existing_expense is None:
+                    raise _NotFound()
+                self._budget_repository.apply_month_deltas(BudgetService.month_deltas(existing_expense, None, rates))
+                self._expense_repository.delete(expense_id)
+        except _NotFound:
+            return False
+        return True
@@ -1,20 +1,38 @@
 # app/application/use_cases/get_all_expenses.py
-from typing import List
+from typing import Any, Dict, List, Optional, Sequence
+from ..single_flight import SingleFlight
 from ...domain.entities.expense import Expense
 from ...domain.repositories.expense_repository import ExpenseRepository
+from ...domain.repositories.expense_query import ExpenseQuery
 
 class GetAllExpensesUseCase:
     """
     Caso de uso: Obtener todos los gastos
+    Con single_flight, las peticiones concurrentes comparten una lectura
     """
 
-    def __init__(self, expense_repository: ExpenseRepository):
+    def __init__(self, expense_repository: ExpenseRepository, single_flight: Optional[SingleFlight] = None):
         self._expense_repository = expense_repository
+        self._single_flight = single_flight
     
     def execute(self) -> List[Expense]:
         """
         Obtiene todos los gastos
-        Returns: List[Expense]: Lista de todos los gastos
+        Returns: List[Expense]: Lista de todos los gastos (compartida si hubo coalescencia: no modificar)
         """
-        return self._expense_repository.get_all()
-    
\ No newline at end of file
+        if self._single_flight is None:
+            return self._expense_repository.get_all()
+        return self._single_flight.do(("all_expenses",), self._expense_repository.get_all)
+
+    def execute_projected(self, fields: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Todos los gastos con solo los campos pedidos (el repositorio lee solo esas columnas)
+        Returns: List[Dict]: Una fila por gasto (compartida si hubo coalescencia: no modificar)
+        """
+        fields = tuple(fields)
+        if self._single_flight is None:
+            return self._expense_repository.find_rows(ExpenseQuery(), fields)
+        return self._single_flight.do(
+            ("all_rows", fields),
+            lambda: self._expense_repository.find_rows(ExpenseQuery(), fields)
+        )
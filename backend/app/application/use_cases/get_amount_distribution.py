@@ -0,0 +1,34 @@
+# app/application/use_cases/get_amount_distribution.py
+from typing import Dict
+from ...domain.repositories.expense_repository import ExpenseRepository
+
+
+class GetAmountDistributionUseCase:
+    """
+    Caso de uso: Distribución de montos (p50, p90, p99 e histograma)
+    general, por categoría y por método de pago
+
+    Lee sketches que se mantienen incrementalmente en cada escritura,
+    sin ordenar el historial completo en cada petición.
+    """
+
+    def __init__(self, expense_repository: ExpenseRepository, distribution_store):
+        """
+        Args: expense_repository: Repository (solo para reconstruir)
+              distribution_store: Store con los sketches (DistributionStore)
+        """
+        self._expense_repository = expense_repository
+        self._distribution_store = distribution_store
+
+    def execute(self, rebuild: bool = False) -> Dict:
+        """
+        Obtiene la distribución de montos
+        Args: rebuild: Recalcular los sketches desde el repositorio
+        Returns: Dict: overall, by_category y by_payment_method
+        """
+        if rebuild:
+            data_version = self._expense_repository.get_data_version()
+            self._distribution_store.rebuild(self._expense_repository.get_columns(), data_version)
+        else:
+            self._distribution_store.ensure_ready(self._expense_repository)
+        return self._distribution_store.snapshot()
@@ -0,0 +1,40 @@
+# app/application/use_cases/get_budget_status.py
+from dataclasses import asdict
+from datetime import datetime
+from typing import Dict, Optional
+from ...domain.entities.budget import month_key
+from ...domain.repositories.budget_repository import BudgetRepository
+from ...domain.services.budget_service import BudgetService
+
+
+class GetBudgetStatusUseCase:
+    """
+    Caso de uso: Estado de los presupuestos en un mes
+
+    Lee los contadores (categoria, mes): no agrega la tabla de gastos.
+    """
+
+    def __init__(self, budget_repository: BudgetRepository):
+        self._budget_repository = budget_repository
+
+    def execute(self, month: Optional[str] = None) -> Dict:
+        """
+        Obtiene el estado de cada presupuesto
+        Args: month: Mes YYYY-MM (por defecto: el actual)
+        Returns: Dict: Mes, estado por presupuesto y categorías excedidas
+        Raises: ValueError: Si el mes no tiene formato YYYY-MM
+        """
+        if month is None:
+            month = month_key(datetime.now())
+        else:
+            month = month_key(datetime.strptime(month, "%Y-%m"))
+
+        month_totals = self._budget_repository.get_month_totals(month)
+        statuses = BudgetService.build_statuses(self._budget_repository.get_all(), month_totals, month)
+
+        return {
+            "month": month,
+            "budgets": [{**asdict(status), "message": status.message()} for status in statuses],
+            "exceeded": [status.category for status in statuses if status.exceeded],
+            "total_spent": round(sum(month_totals.values()), 2)
+        }
@@ -0,0 +1,29 @@
+# app/application/use_cases/get_categories.py
+from typing import Dict, List
+from ...domain.repositories.expense_repository import ExpenseRepository
+
+
+class GetCategoriesUseCase:
+    """
+    Caso de uso: Categorías con su cantidad de gastos
+
+    Lee la caché de categorías, que se carga una vez desde el repositorio
+    y se mantiene con cada escritura (no recorre los gastos por petición).
+    """
+
+    def __init__(self, expense_repository: ExpenseRepository, category_cache):
+        """
+        Args: expense_repository: Repository (solo para cargar o recargar)
+              category_cache: Caché de categorías (CategoryCache)
+        """
+        self._expense_repository = expense_repository
+        self._category_cache = category_cache
+
+    def execute(self, refresh: bool = False) -> List[Dict]:
+        """
+        Obtiene las categorías ordenadas por nombre
+        Args: refresh: Recargar los conteos desde el repositorio
+        Returns: List[Dict]: id, name y count de cada categoría
+        """
+        self._category_cache.ensure_ready(self._expense_repository, refresh)
+        return self._category_cache.snapshot()
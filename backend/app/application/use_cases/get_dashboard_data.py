@@ -1,8 +1,20 @@
 # app/application/use_cases/get_dashboard_data.py
-from typing import Dict, List
+from typing import Callable, Dict, List, Optional
 from datetime import datetime, timedelta
+from ...domain.entities.expense import DEFAULT_CURRENCY, normalize_currency
 from ...domain.repositories.expense_repository import ExpenseRepository
+from ...domain.repositories.expense_query import ExpenseQuery
+from ...domain.services.currency import ExchangeRates
 from ...domain.services.expense_service import ExpenseService
+from ...domain.services.expense_analytics import ExpenseAnalytics, ExpenseColumns
+
+RECENT_LIMIT = 10
+
+_NO_RATES = ExchangeRates([], DEFAULT_CURRENCY)
+
+
+def _no_rates() -> ExchangeRates:
+    return _NO_RATES
 
 
 class GetDashboardDataUseCase:
@@ -14,42 +26,70 @@ class GetDashboardDataUseCase:
     - Totales por categoría
     - Totales por método de pago
     - Resumen y estadísticas
+
+    Con tipos de cambio, los montos agregados se informan en una sola moneda
+    (la pedida o la base): las columnas se convierten una vez, vectorizado.
     """
     
-    def __init__(self, expense_repository: ExpenseRepository):
+    def __init__(
+        self,
+        expense_repository: ExpenseRepository,
+        exchange_rates: Optional[Callable[[], ExchangeRates]] = None
+    ):
+        """
+        Args: expense_repository: Repositorio de gastos
+              exchange_rates: Devuelve las tasas vigentes (ExchangeRateCache.get);
+                              None = sin tasas (solo gastos en DEFAULT_CURRENCY)
+        """
         self._expense_repository = expense_repository
         self._expense_service = ExpenseService()
+        self._exchange_rates = exchange_rates or _no_rates
+        # Última conversión: varias ventanas sobre las mismas columnas la reutilizan
+        self._converted = None
     
-    def execute(self, days: int = 30) -> Dict:
+    def execute(self, days: int = 30, currency: Optional[str] = None) -> Dict:
         """
         Obtiene todos los datos del dashboard
         
         Args:
             days: Número de días a considerar
+            currency: Moneda de los agregados (por defecto la base de las tasas)
             
         Returns:
             Dict: Datos completos del dashboard
+            
+        Raises:
+            ValueError: Si la moneda es inválida
+            MissingRateError: Si falta la tasa de alguna moneda presente
         """
-        # 1. Obtener gastos recientes
-        recent_expenses = self._expense_repository.get_recent_expenses(days)
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=days)
+        
+        # 1. Obtener todos los gastos en formato columnar (una sola lectura)
+        columns, currency = self._in_currency(self._expense_repository.get_columns(), currency)
+        recent_columns = columns.select(
+            ExpenseAnalytics.period_mask(columns, start_date, end_date)
+        )
         
-        # 2. Obtener todos los gastos para comparación
-        all_expenses = self._expense_repository.get_all()
+        # 2. Calcular métricas vectorizadas usando el service
+        monthly_summary = self._expense_service.calculate_monthly_summary(recent_columns)
+        spending_trend = self._expense_service.get_spending_trend(columns, days)
         
-        # 3. Calcular métricas usando el service
-        monthly_summary = self._expense_service.calculate_monthly_summary(recent_expenses)
-        spending_trend = self._expense_service.get_spending_trend(all_expenses, days)
+        # 3. Totales agregados de todo el historial
+        category_totals = ExpenseAnalytics.totals_by_category(columns)
+        payment_totals = ExpenseAnalytics.totals_by_payment_method(columns)
+        category_counts = ExpenseAnalytics.counts_by_category(columns)
         
-        # 4. Obtener totales agregados
-        category_totals = self._expense_repository.get_total_by_category()
-        payment_totals = self._expense_repository.get_total_by_payment_method()
-        category_counts = self._expense_repository.get_count_by_category()
+        # 4. Los 10 gastos más recientes para la lista: ORDER BY ... LIMIT en
+        # el repositorio, sin traer ni ordenar todo el período
+        recent_expenses = self._expense_repository.find(
+            ExpenseQuery(start_date=start_date, end_date=end_date, sort="date", limit=RECENT_LIMIT)
+        )
         
         # 5. Preparar respuesta completa
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
         
         dashboard_data = {
+            "currency": currency,
             "period_info": {
                 "days": days,
                 "start_date": start_date.isoformat(),
@@ -73,6 +113,7 @@ class GetDashboardDataUseCase:
                 {
                     "id": expense.id,
                     "amount": expense.amount,
+                    "currency": expense.currency,
                     "formatted_amount": expense.get_formatted_amount(),
                     "category": expense.category,
                     "payment_method": expense.payment_method.value,
@@ -80,8 +121,19 @@ class GetDashboardDataUseCase:
                     "description": expense.description,
                     "is_recent": expense.is_recent(7)
                 }
-                for expense in sorted(recent_expenses, key=lambda x: x.date, reverse=True)[:10]
+                for expense in recent_expenses
             ]
         }
         
         return dashboard_data
+
+    def _in_currency(self, columns: ExpenseColumns, currency: Optional[str]):
+        """Columnas en la moneda pedida y la moneda efectiva"""
+        rates = self._exchange_rates()
+        currency = normalize_currency(currency) if currency else rates.pivot
+        key = (id(columns), rates.version, currency)
+        if self._converted is not None and self._converted[0] == key and self._converted[1] is columns:
+            return self._converted[2], currency
+        converted = columns.in_currency(rates, currency)
+        self._converted = (key, columns, converted)
+        return converted, currency
@@ -0,0 +1,74 @@
+# app/application/use_cases/get_dashboard_snapshot.py
+from datetime import datetime
+from typing import Callable, Dict, Optional
+from ..single_flight import SingleFlight
+from ...domain.entities.expense import normalize_currency
+from ...domain.repositories.expense_repository import ExpenseRepository
+from ...domain.services.currency import ExchangeRates
+from .get_dashboard_data import GetDashboardDataUseCase
+
+
+class GetDashboardSnapshotUseCase:
+    """
+    Caso de uso: Dashboard servido desde snapshots precalculados
+
+    Para las ventanas precalculadas devuelve el snapshot sin tocar el
+    repositorio; el resto de las ventanas (y las monedas distintas de la
+    de los snapshots) se calcula en el momento.
+    Con single_flight, los cálculos iguales concurrentes (ventana en vivo o
+    refresh) se hacen una sola vez.
+    """
+
+    def __init__(
+        self,
+        expense_repository: ExpenseRepository,
+        snapshot_store=None,
+        single_flight: Optional[SingleFlight] = None,
+        exchange_rates: Optional[Callable[[], ExchangeRates]] = None
+    ):
+        """
+        Args: expense_repository: Repository (para ventanas no precalculadas; el refresh
+                  lee del repository_scope del store si lo tiene)
+              snapshot_store: Store de snapshots (DashboardSnapshotStore), None = desactivado
+              single_flight: Coalescencia de cálculos concurrentes, None = desactivada
+              exchange_rates: Tasas vigentes para los cálculos en vivo (ver GetDashboardDataUseCase)
+        """
+        self._expense_repository = expense_repository
+        self._snapshot_store = snapshot_store
+        self._single_flight = single_flight
+        self._exchange_rates = exchange_rates
+
+    def execute(self, days: int = 30, refresh: bool = False, currency: Optional[str] = None) -> Dict:
+        """
+        Obtiene los datos del dashboard
+        Args: days: Número de días a considerar
+              refresh: Recalcular el snapshot antes de responder
+              currency: Moneda de los agregados (por defecto la base)
+        Returns: Dict: Datos del dashboard más "snapshot" con la frescura
+        Raises: ValueError: Si la moneda es inválida o falta una tasa
+        """
+        currency = normalize_currency(currency) if currency else None
+        store = self._snapshot_store
+        if store is None or days not in store.windows or (currency is not None and currency != store.currency):
+            return self._coalesced(("dashboard_live", days, currency), lambda: self._live(days, currency))
+
+        snapshot = None if refresh else store.get(days)
+        if snapshot is None:
+            self._coalesced(("dashboard_refresh", days), lambda: store.refresh([days], self._expense_repository))
+            snapshot = store.get(days)
+        return {**snapshot.data, "snapshot": store.describe(snapshot)}
+
+    def _coalesced(self, key, compute):
+        if self._single_flight is None:
+            return compute()
+        return self._single_flight.do(key, compute)
+
+    def _live(self, days: int, currency: Optional[str]) -> Dict:
+        data = GetDashboardDataUseCase(self._expense_repository, self._exchange_rates).execute(days=days, currency=currency)
+        data["snapshot"] = {
+            "source": "live",
+            "computed_at": datetime.now().isoformat(),
+            "age_seconds": 0.0,
+            "stale": False
+        }
+        return data
@@ -0,0 +1,30 @@
+# app/application/use_cases/get_exchange_rates.py
+from typing import Dict, List, Optional
+from ...domain.entities.expense import normalize_currency
+from ...domain.repositories.exchange_rate_repository import ExchangeRateRepository
+
+
+class GetExchangeRatesUseCase:
+    """Caso de uso: Listar los tipos de cambio cargados"""
+
+    def __init__(self, rate_repository: ExchangeRateRepository, rate_cache):
+        """
+        Args: rate_repository: Repository de tipos de cambio
+              rate_cache: Caché de tasas (ExchangeRateCache), para informar la moneda base
+        """
+        self._rate_repository = rate_repository
+        self._rate_cache = rate_cache
+
+    def execute(self, currency: Optional[str] = None) -> Dict:
+        """
+        Obtiene las tasas, opcionalmente de una sola moneda
+        Returns: Dict: Moneda base y lista de tasas (date, currency, rate)
+        Raises: ValueError: Si la moneda es inválida
+        """
+        currency = normalize_currency(currency) if currency else None
+        rates: List[Dict] = [
+            {"date": rate.date, "currency": rate.currency, "rate": rate.rate}
+            for rate in self._rate_repository.get_all()
+            if currency is None or rate.currency == currency
+        ]
+        return {"base_currency": self._rate_cache.pivot, "rates": rates}
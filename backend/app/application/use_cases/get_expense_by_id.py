@@ -1,6 +1,6 @@
 # app/application/use_cases/get_expense_by_id.py
 
-from typing import Optional
+from typing import Any, Dict, Optional, Sequence
 from ...domain.entities.expense import Expense
 from ...domain.repositories.expense_repository import ExpenseRepository
 from ...domain.repositories.exceptions import ExpenseNotFoundError
@@ -25,4 +25,13 @@ class GetExpenseByIdUseCase:
         if expense is None:
             raise ExpenseNotFoundError(expense_id)
         return expense
-        
\ No newline at end of file
+
+    def execute_projected(self, expense_id: int, fields: Sequence[str]) -> Dict[str, Any]:
+        """
+        Obtiene un gasto con solo los campos pedidos
+        Raises: ExpenseNotFoundError: Si no se encuentra el gasto
+        """
+        row = self._expense_repository.get_row_by_id(expense_id, fields)
+        if row is None:
+            raise ExpenseNotFoundError(expense_id)
+        return row
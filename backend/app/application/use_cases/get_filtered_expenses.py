@@ -1,18 +1,23 @@
 # app/application/use_cases/get_filtered_expenses.py
-from typing import List
+from dataclasses import astuple
+from typing import Any, Dict, List, Optional, Sequence
 from datetime import datetime
 from ..dtos.expense_dto import ExpenseFilterDTO
+from ..single_flight import SingleFlight
 from ...domain.entities.expense import Expense, PaymentMethod
 from ...domain.repositories.expense_repository import ExpenseRepository
+from ...domain.repositories.expense_query import ExpenseCount, ExpenseQuery
 
 class GetFilteredExpensesUseCase:
     """
     Caso de uso: Obtener gastos con filtros
     Permite combinar multiples filtros
+    Con single_flight, las peticiones iguales concurrentes comparten una lectura
     """
 
-    def __init__(self, expense_repository: ExpenseRepository):
-        self._expense_respository = expense_repository
+    def __init__(self, expense_repository: ExpenseRepository, single_flight: Optional[SingleFlight] = None):
+        self._expense_repository = expense_repository
+        self._single_flight = single_flight
 
 
     #def execute(self, filters: ExpenseFilterDTO) -> List[Expense]:
@@ -21,39 +26,58 @@ class GetFilteredExpensesUseCase:
          
          #Obtiene gastos apliando filtros
          #Args: Filtros a aplicar
-         #Returns: List[Expense]: Lista de gastos filtrados
+         #Returns: List[Expense]: Lista de gastos filtrados (compartida si hubo coalescencia: no modificar)
              
-        
-        #1. Filtrar por rango de fechas si existe
-        if filters.start_date and filters.end.date:
-            expenses = self._expense_repository.get_by_date_range(
-                 filters.start_date,
-                 filters.end_date
-                 
-            )
-        else:
-            expenses=self._expense_repository.get_all()
-
-        # 2. Aplicar filtros adicionales en memoria
-        if filters.category:
-            expenses = [ e for e in expenses
-                        if e.category.lower() == filters.category.lower()]
-                    
-        
-        if filters.payment_method:
-            payment_enum = PaymentMethod(filters.payment_method)
-            expenses = [e for e in expenses
-                        if e.payment_method == payment_enum]
-            
-
-        if filters.min_amount is not None:
-            expenses = [e for e in expenses
-                        if e.amount>=filters.min_amount]
-            
-
-        if filters.max_amount is not None:
-            expenses = [e for e in expenses
-                        if e.amount <= filters.max_amount]
-            
-
-        return expenses
\ No newline at end of file
+        if self._single_flight is None:
+            return self._execute(filters)
+        return self._single_flight.do(("filtered_expenses", astuple(filters)), lambda: self._execute(filters))
+
+    def execute_projected(self, filters: ExpenseFilterDTO, fields: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Igual que execute, pero solo con los campos pedidos: los filtros y la
+        proyección llegan al repositorio (en PostgreSQL, al WHERE y al SELECT)
+        Returns: List[Dict]: Una fila por gasto (compartida si hubo coalescencia: no modificar)
+        """
+        query = self.to_query(filters)
+        fields = tuple(fields)
+        if self._single_flight is None:
+            return self._expense_repository.find_rows(query, fields)
+        return self._single_flight.do(
+            ("filtered_rows", query, fields),
+            lambda: self._expense_repository.find_rows(query, fields)
+        )
+
+    def count(self, filters: ExpenseFilterDTO, estimate: bool = False) -> ExpenseCount:
+        """
+        Cantidad total de gastos que cumplen los filtros (sin orden ni
+        paginación), para acompañar una página de execute
+        Args: estimate: Aceptar la estimación del backend en resultados grandes
+        """
+        query = self.to_query(filters).unpaged()
+        if self._single_flight is None:
+            return self._expense_repository.count(query, estimate)
+        return self._single_flight.do(
+            ("filtered_count", query, estimate),
+            lambda: self._expense_repository.count(query, estimate)
+        )
+
+    @staticmethod
+    def to_query(filters: ExpenseFilterDTO) -> ExpenseQuery:
+        return ExpenseQuery(
+            start_date=filters.start_date,
+            end_date=filters.end_date,
+            category=filters.category,
+            # PaymentMethod(...) valida el método (ValueError si no existe)
+            payment_method=PaymentMethod(filters.payment_method).value if filters.payment_method else None,
+            min_amount=filters.min_amount,
+            max_amount=filters.max_amount,
+            sort=filters.sort,
+            descending=filters.descending,
+            limit=filters.limit,
+            offset=filters.offset
+        )
+
+    def _execute(self, filters: ExpenseFilterDTO) -> List[Expense]:
+        # Filtros, orden y límite se resuelven en el repositorio
+        # (PostgreSQL: WHERE + ORDER BY ... LIMIT; JSON: heap sobre los datos crudos)
+        return self._expense_repository.find(self.to_query(filters))
@@ -0,0 +1,67 @@
+# app/application/use_cases/get_largest_expenses.py
+from typing import Dict, Optional
+from datetime import datetime, timedelta
+from ...domain.repositories.expense_repository import ExpenseRepository
+from ...domain.repositories.expense_query import ExpenseQuery
+
+DEFAULT_LARGEST_DAYS = 30
+MAX_LARGEST_LIMIT = 100
+
+
+class GetLargestExpensesUseCase:
+    """
+    Caso de uso: Los gastos de mayor monto de un período
+    El repositorio devuelve solo los N pedidos (ORDER BY amount DESC LIMIT N
+    en PostgreSQL, heapq.nlargest en JSON)
+    """
+
+    def __init__(self, expense_repository: ExpenseRepository):
+        self._expense_repository = expense_repository
+
+    def execute(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        limit: int = 10,
+        category: Optional[str] = None
+    ) -> Dict:
+        """
+        Obtiene los mayores gastos
+        Args: start_date: Fecha inicial (por defecto: 30 días antes de end_date)
+              end_date: Fecha final (por defecto: ahora)
+              limit: Cantidad de gastos (1 a 100)
+              category: Filtrar por categoría
+        Returns: Dict: Parámetros efectivos y lista de gastos, de mayor a menor
+        Raises: ValueError: Si el límite o el rango son inválidos
+        """
+        if not 1 <= limit <= MAX_LARGEST_LIMIT:
+            raise ValueError(f"El límite debe estar entre 1 y {MAX_LARGEST_LIMIT}")
+
+        # Las fechas se guardan sin zona horaria
+        end_date = self._naive(end_date) if end_date else datetime.now()
+        start_date = self._naive(start_date) if start_date else end_date - timedelta(days=DEFAULT_LARGEST_DAYS)
+        if start_date > end_date:
+            raise ValueError("La fecha inicial debe ser anterior a la final")
+
+        category = category.strip() if category and category.strip() else None
+        expenses = self._expense_repository.find(ExpenseQuery(
+            start_date=start_date,
+            end_date=end_date,
+            category=category,
+            sort="amount",
+            descending=True,
+            limit=limit
+        ))
+
+        return {
+            "start_date": start_date,
+            "end_date": end_date,
+            "category": category,
+            "expenses": expenses
+        }
+
+    @staticmethod
+    def _naive(date: datetime) -> datetime:
+        if date.tzinfo is None:
+            return date
+        return date.astimezone().replace(tzinfo=None)
@@ -0,0 +1,52 @@
+# app/application/use_cases/get_report.py
+from pathlib import Path
+from typing import Dict
+
+
+class ReportNotFoundError(Exception):
+    """Se lanza cuando no existe el pedido de reporte"""
+
+    def __init__(self, job_id: str):
+        super().__init__(f"Reporte {job_id} no encontrado")
+        self.job_id = job_id
+
+
+class ReportNotReadyError(Exception):
+    """Se lanza al pedir el archivo de un reporte que no terminó (o ya no está)"""
+    pass
+
+
+class GetReportUseCase:
+    """
+    Caso de uso: Consultar el estado de un reporte y obtener su archivo
+    """
+
+    def __init__(self, report_jobs):
+        """Args: report_jobs: Manager de reportes (ReportJobManager)"""
+        self._report_jobs = report_jobs
+
+    def execute(self, job_id: str) -> Dict:
+        """
+        Estado y avance del pedido
+        Raises: ReportNotFoundError: Si no existe
+        """
+        return self._get_job(job_id).to_dict()
+
+    def artifact(self, job_id: str) -> Path:
+        """
+        Archivo generado
+        Raises: ReportNotFoundError: Si no existe
+                ReportNotReadyError: Si no terminó, falló o lo reemplazó una versión más nueva
+        """
+        job = self._get_job(job_id)
+        if job.status != "done":
+            raise ReportNotReadyError(f"El reporte está en estado '{job.status}'")
+        if not job.artifact.exists():
+            raise ReportNotReadyError("El archivo fue reemplazado por una versión más nueva, pedir el reporte otra vez")
+        return job.artifact
+
+    def _get_job(self, job_id: str):
+        job = self._report_jobs.get(job_id)
+        if job is None:
+            raise ReportNotFoundError(job_id)
+        return job
@@ -0,0 +1,88 @@
+# app/application/use_cases/get_time_series.py
+from typing import Dict, Optional
+from datetime import datetime, timedelta
+from ...domain.repositories.expense_repository import ExpenseRepository
+from ...domain.services.expense_service import ExpenseService, TIME_SERIES_GRANULARITIES
+
+# Límite de buckets por consulta (10 años diarios)
+MAX_TIME_SERIES_BUCKETS = 3660
+
+# Buckets que se muestran si no se indica fecha inicial
+DEFAULT_BUCKETS = {"day": 30, "week": 12, "month": 12}
+
+
+class GetTimeSeriesUseCase:
+    """
+    Caso de uso: Serie temporal de gastos por día, semana o mes
+    Incluye buckets vacíos y promedios móviles de 7 y 30 buckets
+    """
+
+    def __init__(self, expense_repository: ExpenseRepository):
+        self._expense_repository = expense_repository
+
+    def execute(
+        self,
+        granularity: str = "day",
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None,
+        category: Optional[str] = None
+    ) -> Dict:
+        """
+        Obtiene la serie temporal
+        Args: granularity: day, week o month
+              start_date: Fecha inicial (por defecto: 30 días / 12 semanas / 12 meses atrás)
+              end_date: Fecha final (por defecto: ahora)
+              category: Filtrar por categoría
+        Returns: Dict: Parámetros efectivos y lista de puntos
+        Raises: ValueError: Si la granularidad o el rango son inválidos
+        """
+        if granularity not in TIME_SERIES_GRANULARITIES:
+            raise ValueError(
+                f"Granularidad debe ser una de: {', '.join(TIME_SERIES_GRANULARITIES)}"
+            )
+
+        # Las fechas se guardan sin zona horaria
+        end_date = self._naive(end_date) if end_date else datetime.now()
+        start_date = self._naive(start_date) if start_date else self._default_start(end_date, granularity)
+
+        if start_date > end_date:
+            raise ValueError("La fecha inicial debe ser anterior a la final")
+        if self._bucket_count(start_date, end_date, granularity) > MAX_TIME_SERIES_BUCKETS:
+            raise ValueError(
+                f"El rango supera el máximo de {MAX_TIME_SERIES_BUCKETS} buckets, usar una granularidad mayor"
+            )
+
+        category = category.strip() if category and category.strip() else None
+        points = self._expense_repository.get_time_series(granularity, start_date, end_date, category)
+
+        return {
+            "granularity": granularity,
+            "start_date": start_date,
+            "end_date": end_date,
+            "category": category,
+            "points": points
+        }
+
+    @staticmethod
+    def _naive(date: datetime) -> datetime:
+        if date.tzinfo is None:
+            return date
+        return date.astimezone().replace(tzinfo=None)
+
+    @staticmethod
+    def _default_start(end_date: datetime, granularity: str) -> datetime:
+        buckets = DEFAULT_BUCKETS[granularity]
+        if granularity == "day":
+            return ExpenseService.truncate_date(end_date - timedelta(days=buckets - 1), "day")
+        if granularity == "week":
+            return ExpenseService.truncate_date(end_date - timedelta(weeks=buckets - 1), "week")
+        month_index = end_date.year * 12 + end_date.month - 1 - (buckets - 1)
+        return datetime(month_index // 12, month_index % 12 + 1, 1)
+
+    @staticmethod
+    def _bucket_count(start_date: datetime, end_date: datetime, granularity: str) -> int:
+        if granularity == "day":
+            return (end_date - start_date).days + 1
+        if granularity == "week":
+            return (end_date - start_date).days // 7 + 2
+        return (end_date.year - start_date.year) * 12 + end_date.month - start_date.month + 1
@@ -0,0 +1,43 @@
+# app/application/use_cases/rebuild_budget_totals.py
+from typing import Callable, Dict, Optional
+from ...domain.entities.expense import DEFAULT_CURRENCY
+from ...domain.repositories.budget_repository import BudgetRepository
+from ...domain.repositories.expense_repository import ExpenseRepository
+from ...domain.services.currency import ExchangeRates
+from ...domain.services.expense_analytics import ExpenseAnalytics
+
+
+class RebuildBudgetTotalsUseCase:
+    """
+    Caso de uso: Recalcular los totales (categoria, mes) desde la tabla de gastos
+
+    Corre en una transacción exclusiva: las escrituras de gastos esperan a que
+    termine, así ningún gasto queda contado dos veces ni sin contar.
+    Los montos se suman convertidos a la moneda base, igual que al escribir.
+    """
+
+    def __init__(
+        self,
+        expense_repository: ExpenseRepository,
+        budget_repository: BudgetRepository,
+        exchange_rates: Optional[Callable[[], ExchangeRates]] = None
+    ):
+        """
+        Args: exchange_rates: Tasas vigentes (None = solo gastos en DEFAULT_CURRENCY)
+        """
+        self._expense_repository = expense_repository
+        self._budget_repository = budget_repository
+        self._exchange_rates = exchange_rates
+
+    def execute(self) -> Dict:
+        """
+        Returns: Dict: Cantidad de contadores y de gastos procesados
+        Raises: MissingRateError: Si falta la tasa de alguna moneda presente
+        """
+        rates = self._exchange_rates() if self._exchange_rates else ExchangeRates([], DEFAULT_CURRENCY)
+        with self._budget_repository.month_totals_transaction(exclusive=True):
+            columns = self._expense_repository.get_columns().in_currency(rates, rates.pivot)
+            totals = ExpenseAnalytics.totals_by_category_month(columns)
+            self._budget_repository.replace_month_totals(totals)
+
+        return {"counters": len(totals), "expenses": len(columns)}
@@ -0,0 +1,26 @@
+# app/application/use_cases/request_report.py
+from typing import Dict
+from ...domain.services.expense_report import ReportSpec
+
+
+class RequestReportUseCase:
+    """
+    Caso de uso: Pedir un resumen mensual o anual en segundo plano
+    El cálculo lo hace el manager de reportes (ReportJobManager)
+    """
+
+    def __init__(self, report_jobs):
+        """Args: report_jobs: Manager de reportes (ReportJobManager)"""
+        self._report_jobs = report_jobs
+
+    def execute(self, kind: str, period: str, format: str = "json") -> Dict:
+        """
+        Encola el reporte
+        Args: kind: monthly o yearly
+              period: YYYY-MM (mensual) o YYYY (anual)
+              format: json o csv
+        Returns: Dict: Estado inicial del pedido (id para consultarlo)
+        Raises: ValueError: Si los parámetros son inválidos
+        """
+        spec = ReportSpec.create(kind, period, format)
+        return self._report_jobs.submit(spec).to_dict()
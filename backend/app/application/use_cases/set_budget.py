@@ -0,0 +1,22 @@
+# app/application/use_cases/set_budget.py
+from ...domain.entities.budget import Budget
+from ...domain.repositories.budget_repository import BudgetRepository
+
+
+class SetBudgetUseCase:
+    """
+    Caso de uso: Crear o reemplazar el presupuesto mensual de una categoría
+    """
+
+    def __init__(self, budget_repository: BudgetRepository):
+        self._budget_repository = budget_repository
+
+    def execute(self, category: str, monthly_limit: float) -> Budget:
+        """
+        Guarda el presupuesto
+        Args: category: Categoría (se formatea igual que en los gastos)
+              monthly_limit: Límite mensual
+        Returns: Budget: El presupuesto guardado
+        Raises: ValueError: Si los datos son inválidos
+        """
+        return self._budget_repository.save(Budget(category, monthly_limit))
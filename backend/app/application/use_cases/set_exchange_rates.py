@@ -0,0 +1,45 @@
+# app/application/use_cases/set_exchange_rates.py
+from datetime import date
+from typing import List, Tuple
+from ...domain.repositories.exchange_rate_repository import ExchangeRateRepository
+from ...domain.services.currency import ExchangeRate
+
+
+class SetExchangeRatesUseCase:
+    """
+    Caso de uso: Cargar tipos de cambio (crea o reemplaza por moneda y fecha)
+    Después de guardar invalida la caché de tasas: los agregados en otra
+    moneda y los snapshots del dashboard se recalculan con las nuevas.
+    Los totales del mes de los presupuestos se sumaron convertidos con las
+    tasas anteriores, así que se reconstruyen.
+    """
+
+    def __init__(self, rate_repository: ExchangeRateRepository, rate_cache, budget_totals=None):
+        """
+        Args: rate_repository: Repository de tipos de cambio
+              rate_cache: Caché de tasas en memoria (ExchangeRateCache)
+              budget_totals: Reconstrucción de los totales del mes
+                             (RebuildBudgetTotalsUseCase, opcional)
+        """
+        self._rate_repository = rate_repository
+        self._rate_cache = rate_cache
+        self._budget_totals = budget_totals
+
+    def execute(self, rates: List[Tuple[date, str, float]]) -> int:
+        """
+        Guarda las tasas
+        Args: rates: (fecha, moneda, valor de 1 unidad en la moneda base)
+        Returns: int: Cantidad de tasas guardadas
+        Raises: ValueError: Si alguna tasa es inválida o es de la moneda base
+                MissingRateError: Si al reconstruir los totales falta la tasa de
+                                  alguna moneda (las tasas ya quedaron guardadas)
+        """
+        validated = [ExchangeRate.create(day, currency, rate) for day, currency, rate in rates]
+        for rate in validated:
+            if rate.currency == self._rate_cache.pivot:
+                raise ValueError(f"{rate.currency} es la moneda base: su tasa es siempre 1")
+        saved = self._rate_repository.save_many(validated)
+        self._rate_cache.invalidate()
+        if self._budget_totals is not None:
+            self._budget_totals.execute()
+        return saved
@@ -1,17 +1,35 @@
 # app/application/use_cases/update_expense.py
+import copy
+from typing import Callable, Optional, Tuple
 from ..dtos.expense_dto import UpdateExpenseDTO
-from ...domain.entities.expense import Expense
+from ...domain.entities.budget import BudgetStatus, month_key
+from ...domain.entities.expense import Expense, normalize_currency
+from ...domain.repositories.budget_repository import BudgetRepository
 from ...domain.repositories.expense_repository import ExpenseRepository
 from ...domain.repositories.exceptions import ExpenseNotFoundError
+from ...domain.services.budget_service import BudgetService
+from ...domain.services.currency import ExchangeRates
 
 class UpdateExpenseUseCase:
     """
     Caso de uso: ACtualizar un gasto existente
+    Si hay presupuestos, mueve el monto entre los totales del mes
     """
 
-    def __init__ (self, expense_respository: ExpenseRepository ):
+    def __init__ (
+        self,
+        expense_respository: ExpenseRepository,
+        budget_repository: Optional[BudgetRepository] = None,
+        exchange_rates: Optional[Callable[[], ExchangeRates]] = None
+    ):
+        """
+        Args: exchange_rates: Tasas vigentes, para mover los montos entre los
+                              totales del mes en la moneda base (None = solo DEFAULT_CURRENCY)
+        """
         self._expense_repository=expense_respository
-    
+        self._budget_repository = budget_repository
+        self._exchange_rates = exchange_rates
+
     def execute(self, update_dto: UpdateExpenseDTO) -> Expense:
         """
         Actauliza un gasto existente
@@ -19,11 +37,55 @@ class UpdateExpenseUseCase:
         Returns: Expense: El gasto actualizado
         Raises: ExpenseNotFoundError: Si el gasto no existe
         """
+        return self.execute_with_budget(update_dto)[0]
+
+    def execute_with_budget(self, update_dto: UpdateExpenseDTO) -> Tuple[Expense, Optional[BudgetStatus]]:
+        """
+        Igual que execute, pero devuelve también el estado del presupuesto
+        de la categoría (nueva) en el mes del gasto
+        Returns: Tuple[Expense, Optional[BudgetStatus]]: None si la categoría no tiene presupuesto
+        Raises: ExpenseNotFoundError: Si el gasto no existe
+                ValueError: Si no hay tasa para la moneda del gasto
+        """
+        if self._budget_repository is None:
+            # 1. Obtener el gasto existente
+            existing_expense = self._get_existing(update_dto.expense_id, for_update=False)
+            # 2. Aplicar cambios usando métodos de la entidad
+            self._apply_changes(existing_expense, update_dto)
+            # 3. Guardar cambios
+            return self._expense_repository.update(existing_expense), None
+
+        # Los totales del mes se mueven en la misma transacción que el gasto;
+        # el gasto se lee bloqueado para que el estado anterior sea el real
+        rates = self._exchange_rates() if self._exchange_rates else None
+        with self._budget_repository.month_totals_transaction():
+            existing_expense = self._get_existing(update_dto.expense_id, for_update=True)
+            before = copy.copy(existing_expense)
+            self._apply_changes(existing_expense, update_dto)
+            totals = self._budget_repository.apply_month_deltas(
+                BudgetService.month_deltas(before, existing_expense, rates)
+            )
+            updated_expense =  self._expense_repository.update(existing_expense)
 
-        # 1. Obtener el gasto existente
-        existing_expense = self._expense_repository.get_by_id(update_dto.expense_id)
+        budget = self._budget_repository.get_by_category(updated_expense.category)
+        if budget is None:
+            return updated_expense, None
+        month = month_key(updated_expense.date)
+        key = (updated_expense.category, month)
+        spent = totals[key] if key in totals else self._budget_repository.get_month_totals(month).get(updated_expense.category, 0.0)
+        return updated_expense, budget.status(spent, month)
 
-        # 2. Aplicar cambios usando métodos de la entidad
+    def _get_existing(self, expense_id: int, for_update: bool) -> Expense:
+        if for_update:
+            existing_expense = self._expense_repository.get_by_id_for_update(expense_id)
+        else:
+            existing_expense = self._expense_repository.get_by_id(expense_id)
+        if existing_expense is None:
+            raise ExpenseNotFoundError(expense_id)
+        return existing_expense
+
+    @staticmethod
+    def _apply_changes(existing_expense: Expense, update_dto: UpdateExpenseDTO) -> None:
         if update_dto.amount is not None:
             existing_expense.update_amount(update_dto.amount)
 
@@ -33,12 +95,16 @@ class UpdateExpenseUseCase:
         if update_dto.payment_method is not None:
             existing_expense.payment_method= update_dto.to_payment_method_enum()
 
+        if update_dto.currency is not None:
+            existing_expense.currency = normalize_currency(update_dto.currency)
+
         if update_dto.description is not None:
             existing_expense.description = update_dto.description.strip() if update_dto.description else None
-        
-        # 3. Guardar cambios
-        updated_expense =  self._expense_repository.update(existing_expense)
 
-        return updated_expense
 
-    
+"""
+2. ¿Estoy ejecutando una acción del sistema? → Estás en application/
+•   ¿Estoy creando un caso de uso como CrearUsuario, ProcesarPago, ActualizarPerfil?
+• 	¿Estoy orquestando entidades para cumplir una tarea?
+• 	¿Estoy definiendo qué pasa cuando alguien hace una solicitud?
+"""
@@ -0,0 +1,60 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+
+def month_key(date: datetime) -> str:
+    """Mes de una fecha en formato YYYY-MM (clave de los contadores mensuales)"""
+    return f"{date.year:04d}-{date.month:02d}"
+
+
+class Budget:
+    """
+    Entidad Budget - Límite mensual de gasto para una categoría
+    La categoría se formatea igual que en Expense para que coincidan.
+    El límite y los totales del mes están en la moneda base: los gastos en
+    otra moneda se suman convertidos (ver BudgetService.month_deltas)
+    """
+
+    def __init__(self, category: str, monthly_limit: float):
+        if not category or category.strip() == "":
+            raise ValueError("La categoria es requerida")
+        if monthly_limit <= 0:
+            raise ValueError("El límite mensual debe ser mayor que cero.")
+
+        self.category = category.strip().title()
+        self.monthly_limit = round(monthly_limit, 2)
+
+    def status(self, spent: float, month: str) -> "BudgetStatus":
+        """Estado del presupuesto dado lo gastado en el mes"""
+        spent = round(spent, 2)
+        return BudgetStatus(
+            category=self.category,
+            month=month,
+            monthly_limit=self.monthly_limit,
+            spent=spent,
+            remaining=round(self.monthly_limit - spent, 2),
+            percent_used=round(spent / self.monthly_limit * 100, 1),
+            exceeded=spent > self.monthly_limit
+        )
+
+    def __repr__(self):
+        return f"<Budget(category={self.category}, monthly_limit={self.monthly_limit})>"
+
+
+@dataclass(frozen=True)
+class BudgetStatus:
+    """Cuánto se usó del presupuesto de una categoría en un mes"""
+    category: str
+    month: str
+    monthly_limit: float
+    spent: float
+    remaining: float
+    percent_used: float
+    exceeded: bool
+
+    def message(self) -> Optional[str]:
+        """Aviso para el usuario cuando el presupuesto se superó"""
+        if self.exceeded:
+            return f"Presupuesto de {self.category} superado ({self.percent_used}% usado)"
+        return None
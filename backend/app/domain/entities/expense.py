@@ -1,7 +1,25 @@
+import re
 from datetime import datetime
 from typing import Optional
 from enum import Enum
 
+# Moneda de los gastos que no indican otra (y de los datos anteriores a multi-moneda)
+DEFAULT_CURRENCY = "USD"
+_CURRENCY_PATTERN = re.compile(r"^[A-Z]{3}$")
+
+
+def normalize_currency(currency: Optional[str]) -> str:
+    """
+    Código ISO 4217 en mayúsculas (None = DEFAULT_CURRENCY)
+    Raises: ValueError: Si no son tres letras
+    """
+    if currency is None:
+        return DEFAULT_CURRENCY
+    code = currency.strip().upper()
+    if not _CURRENCY_PATTERN.match(code):
+        raise ValueError("La moneda debe ser un código ISO de tres letras (ej: USD, EUR)")
+    return code
+
 class PaymentMethod(Enum):
     #Formas de pago disponibles
     CASH = "cash"
@@ -23,7 +41,8 @@ No sabe nada sobre base de datos , API's o framework
         payment_method: PaymentMethod,
         date: Optional[datetime] = None,
         description: Optional[str] = None,
-        id: Optional[int] = None
+        id: Optional[int] = None,
+        currency: Optional[str] = None
     ):
 
 # Validaciones de negocio - Reglas de la aplicacion
@@ -43,6 +62,7 @@ No sabe nada sobre base de datos , API's o framework
         self.payment_method = payment_method        
         self.date = date or datetime.now()  # Alternativa usando 'or' CLAUDE
         self.description = description.strip() if description else None  # Limpiar descripcion
+        self.currency = normalize_currency(currency)
 
 
     def update_amount(self, new_amount: float) -> None:
@@ -83,9 +103,16 @@ No sabe nada sobre base de datos , API's o framework
         """
         Retorna el monto formateado para mostrar
         """
-        return f"${self.amount:,.2f}"
+        return Expense.format_amount(self.amount, self.currency)
         #return f"${self.amount:,.2f}"
         
+    @staticmethod
+    def format_amount(amount: float, currency: str = DEFAULT_CURRENCY) -> str:
+        """Formato de un monto para mostrar (también para filas proyectadas sin entidad)"""
+        if currency == DEFAULT_CURRENCY:
+            return f"${amount:,.2f}"
+        return f"{amount:,.2f} {currency}"
+
     def to_dict(self) -> dict:
         """
         Convierte la entidad a diccionario
@@ -97,7 +124,8 @@ No sabe nada sobre base de datos , API's o framework
             "category": self.category,
             "payment_method": self.payment_method.value,
             "date": self.date.isoformat() if self.date else None,
-            "description": self.description
+            "description": self.description,
+            "currency": self.currency
         }   
 
     def __str__(self) -> str:
@@ -115,6 +143,7 @@ No sabe nada sobre base de datos , API's o framework
             return False
         return (
             self.amount == other.amount and
+            self.currency == other.currency and
             self.category == other.category and
             self.payment_method == other.payment_method and
             self.date == other.date
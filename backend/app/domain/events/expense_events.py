@@ -0,0 +1,62 @@
+# app/domain/events/expense_events.py
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from ..entities.expense import Expense
+
+logger = logging.getLogger(__name__)
+
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+
+
+@dataclass(frozen=True)
+class ExpenseChange:
+    """
+    Evento de escritura sobre un gasto
+
+    before: estado anterior (None al crear)
+    after: estado nuevo (None al eliminar)
+    """
+    kind: str
+    before: Optional[Expense] = None
+    after: Optional[Expense] = None
+
+
+class ExpenseEventBus:
+    """
+    Publica los cambios de gastos a los suscriptores (estadísticas, cachés, etc.)
+
+    Los suscriptores se ejecutan en el mismo hilo de la escritura; un error en
+    un suscriptor se registra pero no hace fallar la escritura.
+    """
+
+    def __init__(self):
+        self._subscribers: List[Callable[[ExpenseChange], None]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[ExpenseChange], None]) -> None:
+        with self._lock:
+            if callback not in self._subscribers:
+                self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[ExpenseChange], None]) -> None:
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    def publish(self, change: ExpenseChange) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(change)
+            except Exception:
+                logger.exception("Error en suscriptor de eventos de gastos")
+
+
+# Bus global de la aplicación
+expense_events = ExpenseEventBus()
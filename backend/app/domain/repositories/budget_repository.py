@@ -0,0 +1,87 @@
+from abc import ABC, abstractmethod
+from contextlib import AbstractContextManager
+from typing import Dict, List, Optional, Tuple
+
+from ..entities.budget import Budget
+
+# Clave de los contadores: (categoria, mes YYYY-MM)
+MonthKey = Tuple[str, str]
+
+
+class BudgetRepository(ABC):
+    """
+    Interface para presupuestos por categoría y los totales del mes
+
+    Los totales (categoria, mes) son contadores que se actualizan de forma
+    incremental en cada escritura de gastos, así consultar cuánto se gastó
+    en el mes es una lectura y no una agregación sobre la tabla de gastos.
+    """
+
+    @abstractmethod
+    def get_all(self) -> List[Budget]:
+        """
+        Obtiene todos los presupuestos
+        Returns: List[Budget]: Presupuestos ordenados por categoria
+        """
+        pass
+
+    @abstractmethod
+    def get_by_category(self, category: str) -> Optional[Budget]:
+        """
+        Obtiene el presupuesto de una categoria
+        Returns: Optional[Budget]: El presupuesto, None si no tiene
+        """
+        pass
+
+    @abstractmethod
+    def save(self, budget: Budget) -> Budget:
+        """
+        Crea o reemplaza el presupuesto de la categoria
+        Returns: Budget: El presupuesto guardado
+        """
+        pass
+
+    @abstractmethod
+    def delete(self, category: str) -> bool:
+        """
+        Elimina el presupuesto de una categoria
+        Returns: bool: True si se eliminó, False si no existía
+        """
+        pass
+
+    @abstractmethod
+    def get_month_totals(self, month: str) -> Dict[str, float]:
+        """
+        Obtiene los totales del mes leyendo los contadores
+        Args: month: Mes en formato YYYY-MM
+        Returns: Dict[str, float]: categoria -> total gastado en el mes
+        """
+        pass
+
+    @abstractmethod
+    def month_totals_transaction(self, exclusive: bool = False) -> AbstractContextManager:
+        """
+        Transacción sobre los contadores
+
+        La escritura del gasto debe hacerse dentro del bloque: los contadores
+        se confirman con ella o se descartan si falla. Con exclusive=True
+        bloquea a los demás escritores (para reconstruir desde la tabla base).
+        """
+        pass
+
+    @abstractmethod
+    def apply_month_deltas(self, deltas: Dict[MonthKey, float]) -> Dict[MonthKey, float]:
+        """
+        Suma los deltas a los contadores de forma atómica
+        Args: deltas: (categoria, mes) -> monto a sumar (negativo para restar)
+        Returns: Dict[MonthKey, float]: Total resultante de cada contador
+        """
+        pass
+
+    @abstractmethod
+    def replace_month_totals(self, totals: Dict[MonthKey, float]) -> None:
+        """
+        Reemplaza todos los contadores (reconstrucción)
+        Args: totals: (categoria, mes) -> total
+        """
+        pass
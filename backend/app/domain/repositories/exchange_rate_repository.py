@@ -0,0 +1,29 @@
+from abc import ABC, abstractmethod
+from typing import Iterable, List
+
+from ..services.currency import ExchangeRate
+
+
+class ExchangeRateRepository(ABC):
+    """
+    Interface para la tabla local de tipos de cambio por (moneda, fecha)
+
+    La tabla es chica (una fila por moneda y día con cotización) y se lee
+    entera para armar ExchangeRates; nunca se consulta por gasto.
+    """
+
+    @abstractmethod
+    def get_all(self) -> List[ExchangeRate]:
+        """
+        Obtiene todos los tipos de cambio
+        Returns: List[ExchangeRate]: Ordenados por moneda y fecha
+        """
+        pass
+
+    @abstractmethod
+    def save_many(self, rates: Iterable[ExchangeRate]) -> int:
+        """
+        Crea o reemplaza las tasas (clave: moneda y fecha)
+        Returns: int: Cantidad de tasas guardadas
+        """
+        pass
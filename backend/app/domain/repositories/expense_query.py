@@ -0,0 +1,176 @@
+# app/domain/repositories/expense_query.py
+import heapq
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TypeVar
+
+from ..entities.expense import DEFAULT_CURRENCY, Expense
+
+# Campos que se pueden pedir (formatted_amount se calcula a partir de amount y currency)
+EXPENSE_FIELDS: Tuple[str, ...] = (
+    "id", "amount", "currency", "category", "payment_method", "date", "description", "formatted_amount"
+)
+
+# Campos por los que se puede ordenar
+SORT_FIELDS: Tuple[str, ...] = ("date", "amount", "category")
+
+T = TypeVar("T")
+
+
+def parse_fields(value: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Convierte "amount,category,date" en la tupla de campos pedidos
+    Returns: None si no se pidió proyección (todos los campos)
+    Raises: ValueError: Si algún campo no existe
+    """
+    if value is None or not value.strip():
+        return None
+    fields = []
+    for name in value.split(","):
+        name = name.strip().lower()
+        if not name:
+            continue
+        if name not in EXPENSE_FIELDS:
+            raise ValueError(f"Campo desconocido '{name}', los válidos son: {', '.join(EXPENSE_FIELDS)}")
+        if name not in fields:
+            fields.append(name)
+    return tuple(fields) or None
+
+
+def stored_fields(fields: Sequence[str]) -> Tuple[str, ...]:
+    """Columnas a leer para armar los campos pedidos"""
+    stored = [name for name in fields if name != "formatted_amount"]
+    if "formatted_amount" in fields:
+        stored.extend(name for name in ("amount", "currency") if name not in stored)
+    return tuple(stored)
+
+
+def project(row: Dict[str, Any], fields: Sequence[str]) -> Dict[str, Any]:
+    """Arma el resultado con los campos pedidos, en ese orden, desde las columnas leídas"""
+    return {
+        name: Expense.format_amount(row["amount"], row["currency"]) if name == "formatted_amount" else row[name]
+        for name in fields
+    }
+
+
+def expense_to_row(expense: Expense) -> Dict[str, Any]:
+    """Columnas de una entidad con los tipos de una fila proyectada (fecha ISO, método como string)"""
+    return {
+        "id": expense.id,
+        "amount": expense.amount,
+        "currency": expense.currency,
+        "category": expense.category,
+        "payment_method": expense.payment_method.value,
+        "date": expense.date.isoformat() if expense.date else None,
+        "description": expense.description,
+    }
+
+
+@dataclass(frozen=True)
+class ExpenseQuery:
+    """
+    Filtros de una consulta de gastos (todos opcionales, se combinan con AND)
+    El rango de fechas solo se aplica si vienen las dos fechas.
+
+    sort=None deja el orden propio del repositorio (PostgreSQL: fecha
+    descendente, JSON: orden del archivo); offset y limit cortan después de
+    ordenar (paginación).
+    """
+    start_date: Optional[datetime] = None
+    end_date: Optional[datetime] = None
+    category: Optional[str] = None
+    payment_method: Optional[str] = None
+    min_amount: Optional[float] = None
+    max_amount: Optional[float] = None
+    sort: Optional[str] = None
+    descending: bool = True
+    limit: Optional[int] = None
+    offset: int = 0
+
+    def __post_init__(self):
+        if self.sort is not None and self.sort not in SORT_FIELDS:
+            raise ValueError(f"Orden inválido '{self.sort}', los válidos son: {', '.join(SORT_FIELDS)}")
+        if self.limit is not None and self.limit < 1:
+            raise ValueError("El límite debe ser mayor a 0")
+        if self.offset < 0:
+            raise ValueError("El offset no puede ser negativo")
+
+    @property
+    def has_date_range(self) -> bool:
+        return self.start_date is not None and self.end_date is not None
+
+    @property
+    def has_filters(self) -> bool:
+        """Si algún filtro restringe los gastos (orden y paginación no cuentan)"""
+        return bool(
+            self.has_date_range or self.category or self.payment_method
+            or self.min_amount is not None or self.max_amount is not None
+        )
+
+    def unpaged(self) -> "ExpenseQuery":
+        """Los mismos filtros sin orden ni paginación (para contar)"""
+        return replace(self, sort=None, limit=None, offset=0)
+
+    def matches(self, expense: Expense) -> bool:
+        return self.matches_row({
+            "amount": expense.amount,
+            "category": expense.category,
+            "payment_method": expense.payment_method.value,
+            "date": expense.date,
+        })
+
+    def matches_row(self, row: Dict[str, Any]) -> bool:
+        """
+        Igual que matches sobre una fila cruda (la fecha puede ser string ISO:
+        solo se parsea si hay rango de fechas)
+        """
+        if self.category and row["category"].lower() != self.category.lower():
+            return False
+        if self.payment_method and row["payment_method"] != self.payment_method:
+            return False
+        if self.min_amount is not None and row["amount"] < self.min_amount:
+            return False
+        if self.max_amount is not None and row["amount"] > self.max_amount:
+            return False
+        if self.has_date_range:
+            date = row["date"]
+            if date is None:
+                return False
+            if isinstance(date, str):
+                date = datetime.fromisoformat(date)
+            if not self.start_date <= date <= self.end_date:
+                return False
+        return True
+
+    def order_and_limit(self, items: List[T], value_of: Callable[[T, str], Any]) -> List[T]:
+        """
+        Ordena y corta en memoria. Con limit usa un heap (heapq.nlargest /
+        nsmallest, O(n log k)) en lugar de ordenar todo. Empates por id.
+        Con sort, items puede ser un iterador (con limit solo se retienen
+        offset + limit items)
+        Args: value_of: Devuelve el valor de un campo ("id", "date", ...) de un item
+        """
+        end = self.offset + self.limit if self.limit is not None else None
+        if self.sort is None:
+            return items[self.offset:end] if end is not None or self.offset else items
+
+        sort = self.sort
+
+        def key(item: T):
+            value = value_of(item, sort)
+            if sort == "category":
+                value = value.lower()
+            # Los gastos sin fecha quedan al final al ordenar de mayor a menor
+            return (value is not None, value if value is not None else 0, value_of(item, "id") or 0)
+
+        if end is None:
+            return sorted(items, key=key, reverse=self.descending)[self.offset:]
+        select = heapq.nlargest if self.descending else heapq.nsmallest
+        return select(end, items, key=key)[self.offset:]
+
+
+@dataclass(frozen=True)
+class ExpenseCount:
+    """Cantidad de gastos de una consulta; exact=False si es una estimación del planner"""
+    value: int
+    exact: bool = True
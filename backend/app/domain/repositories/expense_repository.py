@@ -1,7 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict
+from typing import Any, Hashable, Iterator, List, Optional, Dict, Sequence
 from datetime import datetime
 from ..entities.expense import Expense
+from .expense_query import ExpenseCount, ExpenseQuery, expense_to_row, project
+from ..services.expense_analytics import ExpenseColumns
+from ..services.currency import ExchangeRates
+
+# Gastos por bloque en los iteradores (iter_all, iter_by_date_range, iter_find)
+ITER_BATCH_SIZE = 1000
 
 class ExpenseRepository(ABC):
     """
@@ -39,6 +45,14 @@ class ExpenseRepository(ABC):
         Returns: Optional[Expense]: El gasto si existe, None si no existe
         """
         pass
+
+    def get_by_id_for_update(self, expense_id: int) -> Optional[Expense]:
+        """
+        Obtiene un gasto por ID bloqueándolo hasta el fin de la transacción
+        Evita que dos escrituras concurrentes partan del mismo estado anterior
+        Implementación por defecto: get_by_id (backends sin transacciones)
+        """
+        return self.get_by_id(expense_id)
     @abstractmethod
     def get_all(self) -> List[Expense]:
         """
@@ -96,9 +110,16 @@ class ExpenseRepository(ABC):
         """
         pass
     @abstractmethod
-    def get_total_by_category(self) -> Dict[str, float]:
+    def get_total_by_category(
+        self,
+        rates: Optional[ExchangeRates] = None,
+        base: Optional[str] = None
+    ) -> Dict[str, float]:
         """
         Obtiene totales agrupados por categoria
+        Args: rates: Tipos de cambio; sin ellos se suman los montos tal cual
+              base: Moneda del resultado (por defecto la pivote de rates)
+        Raises: MissingRateError: Si falta la tasa de alguna moneda presente
         Returns: 
             Dict[str,float]: Diccionario con categoria -> total gastado
             Ejemplo: {"Comida": 150.50, "Transporte": 45.00}
@@ -106,9 +127,14 @@ class ExpenseRepository(ABC):
         pass
 
     @abstractmethod
-    def get_total_by_payment_method(self) -> Dict[str,float:]:
+    def get_total_by_payment_method(
+        self,
+        rates: Optional[ExchangeRates] = None,
+        base: Optional[str] = None
+    ) -> Dict[str,float:]:
         """
         Obtiene totales agrupados por metodo de pago 
+        Args: rates, base: Como en get_total_by_category
         Returns:
             Dict[str,float]: DIccionario con metodo->total gastado
             Ejemplo_. {"cash": 95.50, "debit_card": 200.00}
@@ -143,3 +169,134 @@ class ExpenseRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_time_series(
+        self,
+        granularity: str,
+        start_date: datetime,
+        end_date: datetime,
+        category: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Obtiene totales y cantidades agrupados por día, semana o mes
+        Args: granularity: day, week o month
+              start_date: Fecha inicial (inclusive)
+              end_date: Fecha final (inclusive)
+              category: Filtrar por categoria (opcional)
+        Returns: List[Dict]: Un punto por bucket (incluye los vacíos) con
+                 bucket, total, count, moving_avg_7 y moving_avg_30
+        """
+        pass
+
+    def get_columns(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> ExpenseColumns:
+        """
+        Obtiene los gastos en formato columnar para el motor de analítica
+        Args: start_date, end_date: Rango opcional (inclusive)
+        Returns: ExpenseColumns: Arrays de id, monto, fecha, categoria y metodo
+        
+        Implementación por defecto a partir de entidades; los repositorios
+        concretos la reemplazan para construir los arrays sin crear entidades.
+        """
+        if start_date is not None and end_date is not None:
+            return ExpenseColumns.from_expenses(self.iter_by_date_range(start_date, end_date))
+        return ExpenseColumns.from_expenses(self.iter_all())
+
+    def find(self, query: ExpenseQuery) -> List[Expense]:
+        """
+        Gastos que cumplen la consulta, ordenados y limitados según query.sort/limit
+        Args: query: Filtros, orden y límite
+        Returns: List[Expense]: Los gastos encontrados
+
+        Implementación por defecto: filtra y ordena en memoria (con heap si hay
+        límite); los repositorios concretos la reemplazan para que lo haga el backend.
+        """
+        if query.has_date_range:
+            expenses = self.get_by_date_range(query.start_date, query.end_date)
+        else:
+            expenses = self.get_all()
+        return query.order_and_limit([e for e in expenses if query.matches(e)], _expense_value)
+
+    def iter_all(self) -> Iterator[Expense]:
+        """
+        Recorre todos los gastos sin armar la lista completa
+        Yields: Expense: Los mismos gastos (y en el mismo orden) que get_all
+
+        Implementación por defecto sobre get_all; los repositorios concretos
+        la reemplazan para leer por bloques con memoria acotada. El iterador
+        debe consumirse mientras el repositorio (y su sesión) siga abierto.
+        """
+        yield from self.get_all()
+
+    def iter_by_date_range(self, start_date: datetime, end_date: datetime) -> Iterator[Expense]:
+        """
+        Como get_by_date_range, de a un gasto
+        Implementación por defecto sobre get_by_date_range
+        """
+        yield from self.get_by_date_range(start_date, end_date)
+
+    def iter_find(self, query: ExpenseQuery) -> Iterator[Expense]:
+        """
+        Como find, de a un gasto
+        Implementación por defecto sobre find
+        """
+        yield from self.find(query)
+
+    def find_rows(self, query: ExpenseQuery, fields: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Gastos que cumplen la consulta, solo con los campos pedidos (proyección)
+        Args: query: Filtros, orden y límite
+              fields: Campos de EXPENSE_FIELDS, en el orden de salida
+        Returns: List[Dict]: Una fila por gasto (fecha como string ISO)
+
+        Implementación por defecto a partir de entidades; los repositorios
+        concretos la reemplazan para leer solo las columnas necesarias.
+        """
+        return [project(expense_to_row(e), fields) for e in self.find(query)]
+
+    def count(self, query: ExpenseQuery, estimate: bool = False) -> ExpenseCount:
+        """
+        Cantidad de gastos que cumplen los filtros de la consulta (ignora orden y paginación)
+        Args: query: Filtros
+              estimate: Aceptar una estimación barata si el backend la tiene
+                        (solo se usa para resultados grandes; si no, se cuenta exacto)
+        Returns: ExpenseCount: La cantidad y si es exacta
+
+        Implementación por defecto: recorre iter_find; los repositorios concretos
+        la reemplazan para contar desde índices, contadores o con COUNT en la base.
+        """
+        return ExpenseCount(sum(1 for _ in self.iter_find(query.unpaged())))
+
+    def get_data_version(self) -> Optional[Hashable]:
+        """
+        Marca barata de los datos guardados: cambia con cualquier escritura,
+        también las de otros procesos (otros workers, el importador, la CLI)
+        Returns: Optional[Hashable]: None si el backend no puede detectarlas
+                 (los datos viven en este proceso o no hay una marca barata)
+        """
+        return None
+
+    def get_categories(self) -> List[Dict[str, Any]]:
+        """
+        Categorías con su cantidad de gastos
+        Returns: List[Dict]: id (None si el backend no tiene tabla de categorías), name, count
+        """
+        return [
+            {"id": None, "name": name, "count": count}
+            for name, count in self.get_count_by_category().items()
+        ]
+
+    def get_row_by_id(self, expense_id: int, fields: Sequence[str]) -> Optional[Dict[str, Any]]:
+        """
+        Un gasto con solo los campos pedidos
+        Returns: Optional[Dict]: None si no existe
+        """
+        expense = self.get_by_id(expense_id)
+        return project(expense_to_row(expense), fields) if expense is not None else None
+
+
+def _expense_value(expense: Expense, name: str):
+    return getattr(expense, name)
@@ -0,0 +1,57 @@
+# app/domain/services/budget_service.py
+from typing import Dict, List, Optional
+
+from ..entities.budget import Budget, BudgetStatus, month_key
+from ..entities.expense import DEFAULT_CURRENCY, Expense
+from ..repositories.budget_repository import MonthKey
+from .currency import ExchangeRates
+
+_NO_RATES = ExchangeRates([], DEFAULT_CURRENCY)
+
+
+class BudgetService:
+    """
+    Servicios del dominio para presupuestos
+    """
+
+    @staticmethod
+    def amount_in_budget_currency(expense: Expense, rates: Optional[ExchangeRates] = None) -> float:
+        """
+        Monto del gasto en la moneda de los presupuestos (la moneda base de
+        las tasas), con la tasa vigente en la fecha del gasto
+        Raises: MissingRateError: Si no hay tasa para la moneda del gasto
+        """
+        rates = rates or _NO_RATES
+        if expense.currency == rates.pivot:
+            return expense.amount
+        return rates.convert_one(expense.amount, expense.currency, expense.date, rates.pivot)
+
+    @staticmethod
+    def month_deltas(
+        before: Optional[Expense],
+        after: Optional[Expense],
+        rates: Optional[ExchangeRates] = None
+    ) -> Dict[MonthKey, float]:
+        """
+        Cambios que una escritura produce en los totales (categoria, mes)
+
+        Crear: solo after; eliminar: solo before; actualizar: resta el
+        estado anterior y suma el nuevo (puede cambiar categoría o mes).
+        Se omiten los deltas nulos, por ejemplo al cambiar solo la descripción.
+        Los montos se suman convertidos a la moneda base: sin `rates`, solo
+        se aceptan gastos en DEFAULT_CURRENCY.
+        Raises: MissingRateError: Si no hay tasa para la moneda de algún gasto
+        """
+        deltas: Dict[MonthKey, float] = {}
+        if before is not None:
+            key = (before.category, month_key(before.date))
+            deltas[key] = deltas.get(key, 0.0) - BudgetService.amount_in_budget_currency(before, rates)
+        if after is not None:
+            key = (after.category, month_key(after.date))
+            deltas[key] = deltas.get(key, 0.0) + BudgetService.amount_in_budget_currency(after, rates)
+        return {key: round(delta, 2) for key, delta in deltas.items() if round(delta, 2) != 0}
+
+    @staticmethod
+    def build_statuses(budgets: List[Budget], month_totals: Dict[str, float], month: str) -> List[BudgetStatus]:
+        """Estado de cada presupuesto a partir de los totales del mes"""
+        return [budget.status(month_totals.get(budget.category, 0.0), month) for budget in budgets]
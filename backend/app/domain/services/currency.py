@@ -0,0 +1,181 @@
+# app/domain/services/currency.py
+import hashlib
+from dataclasses import dataclass
+from datetime import date as date_type, datetime
+from typing import Dict, Iterable, List, Sequence, Union
+
+import numpy as np
+
+from ..entities.expense import normalize_currency
+
+_EPOCH_DATE = date_type(1970, 1, 1)
+# Días máximos del rango para la tabla densa de factores (~180 años)
+_MAX_DENSE_DAYS = 1 << 16
+
+
+def epoch_day(value: Union[date_type, datetime]) -> int:
+    """Día (desde 1970) de una fecha, igual que ExpenseColumns.epoch_days"""
+    if isinstance(value, datetime):
+        value = value.date()
+    return (value - _EPOCH_DATE).days
+
+
+@dataclass(frozen=True)
+class ExchangeRate:
+    """Valor de 1 unidad de `currency` en la moneda pivote, vigente desde `date`"""
+    date: date_type
+    currency: str
+    rate: float
+
+    @classmethod
+    def create(cls, date: date_type, currency: str, rate: float) -> "ExchangeRate":
+        """
+        Valida y normaliza
+        Raises: ValueError: Si la moneda es inválida o la tasa no es positiva
+        """
+        if rate is None or rate <= 0:
+            raise ValueError("El tipo de cambio debe ser mayor a 0")
+        return cls(date, normalize_currency(currency), float(rate))
+
+
+class MissingRateError(ValueError):
+    """No hay ningún tipo de cambio cargado para la moneda"""
+
+    def __init__(self, currency: str):
+        self.currency = currency
+        super().__init__(f"No hay tipo de cambio cargado para {currency}")
+
+
+class ExchangeRates:
+    """
+    Tabla de tipos de cambio en memoria (inmutable)
+
+    Cada tasa dice cuánto vale 1 unidad de la moneda en la moneda pivote
+    (la moneda base configurada, que vale 1). Se usa la tasa vigente en la
+    fecha del gasto: la última con fecha <= a la del gasto, o la primera si
+    el gasto es anterior a todas.
+
+    La conversión es vectorizada: un np.searchsorted por moneda presente
+    sobre los días del rango y un indexado sobre todas las filas, nunca
+    una búsqueda por fila.
+    """
+
+    def __init__(self, rates: Iterable[ExchangeRate], pivot: str):
+        self.pivot = normalize_currency(pivot)
+        by_currency: Dict[str, Dict[int, float]] = {}
+        for rate in rates:
+            if rate.currency != self.pivot:
+                by_currency.setdefault(rate.currency, {})[epoch_day(rate.date)] = rate.rate
+
+        self._days: Dict[str, np.ndarray] = {}
+        self._rates: Dict[str, np.ndarray] = {}
+        digest = hashlib.sha256(self.pivot.encode())
+        for currency in sorted(by_currency):
+            days = sorted(by_currency[currency])
+            self._days[currency] = np.asarray(days, dtype=np.int64)
+            self._rates[currency] = np.asarray([by_currency[currency][d] for d in days], dtype=np.float64)
+            digest.update(currency.encode())
+            digest.update(self._days[currency].tobytes())
+            digest.update(self._rates[currency].tobytes())
+        # Cambia con cualquier tasa: sirve de clave de caché de los resultados convertidos
+        self.version = digest.hexdigest()[:16]
+
+    @property
+    def currencies(self) -> List[str]:
+        """Monedas convertibles (la pivote siempre)"""
+        return sorted({self.pivot, *self._days})
+
+    def _to_pivot(self, currency: str, days: np.ndarray) -> np.ndarray:
+        """Tasa vigente de `currency` en cada día"""
+        if currency == self.pivot:
+            return np.ones(len(days), dtype=np.float64)
+        if currency not in self._days:
+            raise MissingRateError(currency)
+        index = np.searchsorted(self._days[currency], days, side="right") - 1
+        return self._rates[currency][np.maximum(index, 0)]
+
+    def convert(
+        self,
+        amounts: np.ndarray,
+        currency_codes: np.ndarray,
+        currencies: Sequence[str],
+        days: np.ndarray,
+        base: str
+    ) -> np.ndarray:
+        """
+        Convierte montos a `base`
+
+        Arma una tabla densa de factores (moneda x día del rango presente) y
+        la aplica con un solo indexado: O(filas + monedas x días), sin ordenar.
+        Args: amounts: Monto de cada fila, en su moneda
+              currency_codes: Índice en `currencies` de la moneda de cada fila
+              days: Día (desde 1970) de cada fila
+              base: Moneda del resultado
+        Raises: MissingRateError: Si alguna moneda presente (o la base) no tiene tasas
+        """
+        base = normalize_currency(base)
+        amounts = np.asarray(amounts, dtype=np.float64)
+        if len(amounts) == 0:
+            return amounts.copy()
+        present = np.flatnonzero(np.bincount(currency_codes, minlength=len(currencies))).tolist()
+        first = int(days.min())
+        span = int(days.max()) - first + 1
+        if span > _MAX_DENSE_DAYS:
+            return self._convert_by_currency(amounts, currency_codes, currencies, days, base, present)
+
+        grid = np.arange(first, first + span, dtype=np.int64)
+        base_rates = self._to_pivot(base, grid)
+        factors = np.ones((len(currencies), span), dtype=np.float64)
+        for code in present:
+            if currencies[code] != base:
+                factors[code] = self._to_pivot(currencies[code], grid) / base_rates
+        return amounts * factors[currency_codes, days - first]
+
+    def _convert_by_currency(self, amounts, currency_codes, currencies, days, base, present) -> np.ndarray:
+        """Rangos de fechas enormes: un searchsorted por moneda sobre sus filas"""
+        converted = amounts.copy()
+        for code in present:
+            currency = currencies[code]
+            if currency != base:
+                mask = currency_codes == code
+                converted[mask] *= self._to_pivot(currency, days[mask]) / self._to_pivot(base, days[mask])
+        return converted
+
+    def convert_one(self, amount: float, currency: str, when: datetime, base: str) -> float:
+        """Un monto suelto (para una entidad, no para agregados)"""
+        return float(self.convert(
+            np.asarray([amount], dtype=np.float64),
+            np.zeros(1, dtype=np.int16),
+            [currency],
+            np.asarray([epoch_day(when)], dtype=np.int64),
+            base
+        )[0])
+
+
+def sum_by_key_in_currency(
+    keys: Sequence,
+    amounts: Sequence[float],
+    currencies: Sequence[str],
+    days: Sequence[int],
+    rates: ExchangeRates,
+    base: str
+) -> Dict:
+    """
+    Suma por clave montos en distintas monedas, convertidos a `base`
+
+    Pensado para grupos ya reducidos por el backend (clave, moneda, día):
+    una sola conversión vectorizada y un np.bincount por clave.
+    """
+    if len(keys) == 0:
+        return {}
+    key_names, key_codes = np.unique(np.asarray(keys, dtype=object).astype(str), return_inverse=True)
+    currency_names, currency_codes = np.unique(np.asarray(currencies, dtype=object).astype(str), return_inverse=True)
+    converted = rates.convert(
+        np.asarray(amounts, dtype=np.float64),
+        currency_codes.reshape(-1),
+        [str(name) for name in currency_names],
+        np.asarray(days, dtype=np.int64),
+        base
+    )
+    totals = np.bincount(key_codes.reshape(-1), weights=converted, minlength=len(key_names))
+    return {str(name): float(total) for name, total in zip(key_names, totals)}
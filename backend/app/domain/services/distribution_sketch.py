@@ -0,0 +1,218 @@
+# app/domain/services/distribution_sketch.py
+import math
+from bisect import bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Límites de los buckets fijos del histograma de montos (el último es abierto)
+AMOUNT_HISTOGRAM_EDGES: Tuple[float, ...] = (0, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+# Cuantiles que se reportan
+REPORTED_QUANTILES = (0.5, 0.9, 0.99)
+
+
+class QuantileSketch:
+    """
+    Sketch de cuantiles con error relativo acotado (estilo DDSketch)
+
+    Cada monto cae en el bucket ceil(log_gamma(x)); cualquier cuantil se
+    estima con error relativo <= relative_accuracy. A diferencia de t-digest
+    o KLL, los buckets son contadores: permiten restar (update/delete) de
+    forma exacta y dos sketches se combinan sumando contadores.
+
+    La memoria está acotada por max_buckets: si se supera, los buckets más
+    bajos se colapsan en uno (se pierde precisión solo en los montos chicos).
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01, max_buckets: int = 1024):
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._counts: Dict[int, int] = {}
+        self._collapse_below: Optional[int] = None
+        self.count = 0
+
+    def _key(self, value: float) -> int:
+        key = math.ceil(math.log(value) / self._log_gamma)
+        if self._collapse_below is not None and key < self._collapse_below:
+            return self._collapse_below
+        return key
+
+    def _value(self, key: int) -> float:
+        return 2 * self._gamma ** key / (self._gamma + 1)
+
+    def add(self, value: float, count: int = 1) -> None:
+        key = self._key(value)
+        self._counts[key] = self._counts.get(key, 0) + count
+        self.count += count
+        if len(self._counts) > self.max_buckets:
+            self._collapse()
+
+    def remove(self, value: float, count: int = 1) -> None:
+        """Resta un valor agregado antes (update/delete)"""
+        key = self._key(value)
+        current = self._counts.get(key, 0)
+        removed = min(current, count)
+        if removed == 0:
+            return
+        if current == removed:
+            del self._counts[key]
+        else:
+            self._counts[key] = current - removed
+        self.count -= removed
+
+    def add_many(self, values: np.ndarray) -> None:
+        """Agrega un array de montos de forma vectorizada (reconstrucción)"""
+        if len(values) == 0:
+            return
+        keys = np.ceil(np.log(values) / self._log_gamma).astype(np.int64)
+        if self._collapse_below is not None:
+            keys = np.maximum(keys, self._collapse_below)
+        unique_keys, counts = np.unique(keys, return_counts=True)
+        for key, count in zip(unique_keys.tolist(), counts.tolist()):
+            self._counts[key] = self._counts.get(key, 0) + count
+        self.count += int(len(values))
+        while len(self._counts) > self.max_buckets:
+            self._collapse()
+
+    def _collapse(self) -> None:
+        keys = sorted(self._counts)
+        excess = len(keys) - self.max_buckets
+        target = keys[excess]
+        merged = sum(self._counts.pop(key) for key in keys[:excess])
+        self._counts[target] = self._counts.get(target, 0) + merged
+        self._collapse_below = target
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Combina otro sketch con la misma precisión"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Solo se pueden combinar sketches con la misma precisión")
+        for key, count in other._counts.items():
+            if self._collapse_below is not None and key < self._collapse_below:
+                key = self._collapse_below
+            self._counts[key] = self._counts.get(key, 0) + count
+        self.count += other.count
+        while len(self._counts) > self.max_buckets:
+            self._collapse()
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimación del cuantil q (0..1) por rango más cercano; None si está vacío"""
+        if self.count == 0:
+            return None
+        rank = max(0, math.ceil(q * self.count) - 1)
+        cumulative = 0
+        for key in sorted(self._counts):
+            cumulative += self._counts[key]
+            if cumulative > rank:
+                return round(self._value(key), 2)
+        return round(self._value(max(self._counts)), 2)
+
+    def to_dict(self) -> Dict:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "max_buckets": self.max_buckets,
+            "collapse_below": self._collapse_below,
+            "counts": {str(key): count for key, count in self._counts.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "QuantileSketch":
+        sketch = cls(data["relative_accuracy"], data["max_buckets"])
+        sketch._collapse_below = data.get("collapse_below")
+        sketch._counts = {int(key): count for key, count in data["counts"].items()}
+        sketch.count = sum(sketch._counts.values())
+        return sketch
+
+
+class AmountHistogram:
+    """Histograma de montos con buckets fijos (AMOUNT_HISTOGRAM_EDGES)"""
+
+    def __init__(self, edges: Iterable[float] = AMOUNT_HISTOGRAM_EDGES):
+        self.edges = list(edges)
+        self.counts = [0] * len(self.edges)
+
+    def _index(self, value: float) -> int:
+        return max(0, bisect_right(self.edges, value) - 1)
+
+    def add(self, value: float) -> None:
+        self.counts[self._index(value)] += 1
+
+    def remove(self, value: float) -> None:
+        index = self._index(value)
+        if self.counts[index] > 0:
+            self.counts[index] -= 1
+
+    def add_many(self, values: np.ndarray) -> None:
+        if len(values) == 0:
+            return
+        indexes = np.maximum(np.searchsorted(self.edges, values, side="right") - 1, 0)
+        for index, count in enumerate(np.bincount(indexes, minlength=len(self.edges)).tolist()):
+            self.counts[index] += count
+
+    def merge(self, other: "AmountHistogram") -> None:
+        if other.edges != self.edges:
+            raise ValueError("Solo se pueden combinar histogramas con los mismos buckets")
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+
+    def buckets(self) -> List[Dict]:
+        return [
+            {
+                "lower": self.edges[i],
+                "upper": self.edges[i + 1] if i + 1 < len(self.edges) else None,
+                "count": count,
+            }
+            for i, count in enumerate(self.counts)
+        ]
+
+    def to_dict(self) -> Dict:
+        return {"edges": self.edges, "counts": self.counts}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "AmountHistogram":
+        histogram = cls(data["edges"])
+        histogram.counts = list(data["counts"])
+        return histogram
+
+
+class AmountDistribution:
+    """Sketch de cuantiles + histograma de un grupo de gastos"""
+
+    def __init__(self, sketch: Optional[QuantileSketch] = None, histogram: Optional[AmountHistogram] = None):
+        self.sketch = sketch or QuantileSketch()
+        self.histogram = histogram or AmountHistogram()
+
+    @property
+    def count(self) -> int:
+        return self.sketch.count
+
+    def add(self, amount: float) -> None:
+        self.sketch.add(amount)
+        self.histogram.add(amount)
+
+    def remove(self, amount: float) -> None:
+        self.sketch.remove(amount)
+        self.histogram.remove(amount)
+
+    def add_many(self, amounts: np.ndarray) -> None:
+        self.sketch.add_many(amounts)
+        self.histogram.add_many(amounts)
+
+    def merge(self, other: "AmountDistribution") -> None:
+        self.sketch.merge(other.sketch)
+        self.histogram.merge(other.histogram)
+
+    def summary(self) -> Dict:
+        result = {"count": self.count}
+        for q in REPORTED_QUANTILES:
+            result[f"p{int(q * 100)}"] = self.sketch.quantile(q)
+        result["histogram"] = self.histogram.buckets()
+        return result
+
+    def to_dict(self) -> Dict:
+        return {"sketch": self.sketch.to_dict(), "histogram": self.histogram.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "AmountDistribution":
+        return cls(QuantileSketch.from_dict(data["sketch"]), AmountHistogram.from_dict(data["histogram"]))
@@ -0,0 +1,318 @@
+# app/domain/services/expense_analytics.py
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..entities.expense import DEFAULT_CURRENCY, Expense, PaymentMethod
+
+# Orden fijo de los métodos de pago: el código es el índice en esta lista
+METHOD_NAMES: List[str] = [method.value for method in PaymentMethod]
+_METHOD_CODES: Dict[str, int] = {name: code for code, name in enumerate(METHOD_NAMES)}
+
+_EPOCH = datetime(1970, 1, 1)
+SECONDS_PER_DAY = 86400
+
+
+def to_epoch_seconds(date: datetime) -> int:
+    """
+    Segundos desde 1970 tomando la fecha como hora local sin zona
+    (igual que las fechas que guardan los repositorios y datetime.now())
+    """
+    if date.tzinfo is not None:
+        date = date.astimezone().replace(tzinfo=None)
+    return int((date - _EPOCH).total_seconds())
+
+
+@dataclass
+class ExpenseColumns:
+    """
+    Gastos en formato columnar (un array por campo)
+
+    Las categorías y métodos de pago se codifican como enteros para que los
+    group-by sean np.bincount en lugar de diccionarios de strings. Los
+    montos están en la moneda de cada gasto (currency_codes) hasta que se
+    convierten con in_currency; los agregados suponen una sola moneda.
+    """
+    ids: np.ndarray  # int64
+    amounts: np.ndarray  # float64
+    timestamps: np.ndarray  # int64, segundos desde 1970 (hora local)
+    category_codes: np.ndarray  # int32, índice en `categories`
+    method_codes: np.ndarray  # int8, índice en METHOD_NAMES
+    categories: List[str]
+    currency_codes: Optional[np.ndarray] = None  # int16, índice en `currencies`
+    currencies: List[str] = field(default_factory=lambda: [DEFAULT_CURRENCY])
+
+    def __post_init__(self):
+        if self.currency_codes is None:
+            self.currency_codes = np.zeros(len(self.amounts), dtype=np.int16)
+
+    def __len__(self) -> int:
+        return len(self.amounts)
+
+    def in_currency(self, rates, base: str) -> "ExpenseColumns":
+        """
+        Las mismas filas con los montos convertidos a `base` (vectorizado)
+        Args: rates: Tipos de cambio (ExchangeRates)
+        Raises: MissingRateError: Si falta la tasa de alguna moneda presente
+        """
+        counts = np.bincount(self.currency_codes, minlength=len(self.currencies))
+        present = [self.currencies[code] for code in np.flatnonzero(counts).tolist()]
+        if all(currency == base for currency in present):
+            if self.currencies == [base]:
+                return self
+            return replace(self, currency_codes=np.zeros(len(self), dtype=np.int16), currencies=[base])
+        return replace(
+            self,
+            amounts=rates.convert(self.amounts, self.currency_codes, self.currencies, self.epoch_days, base),
+            currency_codes=np.zeros(len(self), dtype=np.int16),
+            currencies=[base],
+        )
+
+    @property
+    def epoch_days(self) -> np.ndarray:
+        """Día (desde 1970) de cada gasto"""
+        return self.timestamps // SECONDS_PER_DAY
+
+    def select(self, mask: np.ndarray) -> "ExpenseColumns":
+        """Subconjunto de filas (mask booleana o índices); conserva el diccionario de categorías"""
+        return ExpenseColumns(
+            ids=self.ids[mask],
+            amounts=self.amounts[mask],
+            timestamps=self.timestamps[mask],
+            category_codes=self.category_codes[mask],
+            method_codes=self.method_codes[mask],
+            categories=self.categories,
+            currency_codes=self.currency_codes[mask],
+            currencies=self.currencies,
+        )
+
+    @classmethod
+    def empty(cls) -> "ExpenseColumns":
+        return cls.from_rows([], [], [], [], [])
+
+    @classmethod
+    def from_rows(
+        cls,
+        ids: Sequence[Optional[int]],
+        amounts: Sequence[float],
+        dates: Sequence[Union[datetime, str]],
+        categories: Sequence[str],
+        methods: Sequence[str],
+        currencies: Optional[Sequence[str]] = None,
+    ) -> "ExpenseColumns":
+        """
+        Construye las columnas desde listas paralelas
+        Las fechas pueden ser datetime o strings ISO (se parsean vectorizado)
+        Sin currencies, todos los montos están en DEFAULT_CURRENCY
+        """
+        category_names, category_codes = np.unique(
+            np.asarray(categories, dtype=object).astype(str), return_inverse=True
+        )
+        return cls(
+            ids=np.asarray([-1 if i is None else i for i in ids], dtype=np.int64),
+            amounts=np.asarray(amounts, dtype=np.float64),
+            timestamps=_dates_to_epoch_seconds(dates),
+            category_codes=category_codes.astype(np.int32).reshape(-1),
+            method_codes=np.asarray([_METHOD_CODES[m] for m in methods], dtype=np.int8),
+            categories=[str(name) for name in category_names],
+            **_encode_currencies(currencies, len(amounts)),
+        )
+
+    @classmethod
+    def from_category_ids(
+        cls,
+        ids: Sequence[Optional[int]],
+        amounts: Sequence[float],
+        dates: Sequence[Union[datetime, str]],
+        category_ids: Sequence[int],
+        category_names: Dict[int, str],
+        methods: Sequence[str],
+        currencies: Optional[Sequence[str]] = None,
+    ) -> "ExpenseColumns":
+        """
+        Igual que from_rows pero con la categoría como id entero (tabla
+        categories): se codifica con np.unique sobre enteros y los nombres
+        salen del diccionario. Los códigos quedan en orden alfabético, como en from_rows.
+        """
+        keys, inverse = np.unique(np.asarray(category_ids, dtype=np.int64), return_inverse=True)
+        names = [category_names[key] for key in keys.tolist()]
+        order = sorted(range(len(names)), key=names.__getitem__)
+        rank = np.empty(len(names), dtype=np.int32)
+        rank[order] = np.arange(len(names), dtype=np.int32)
+        return cls(
+            ids=np.asarray([-1 if i is None else i for i in ids], dtype=np.int64),
+            amounts=np.asarray(amounts, dtype=np.float64),
+            timestamps=_dates_to_epoch_seconds(dates),
+            category_codes=rank[inverse.reshape(-1)],
+            method_codes=np.asarray([_METHOD_CODES[m] for m in methods], dtype=np.int8),
+            categories=[names[i] for i in order],
+            **_encode_currencies(currencies, len(amounts)),
+        )
+
+    @classmethod
+    def from_expenses(cls, expenses: Iterable[Expense]) -> "ExpenseColumns":
+        """
+        Convierte entidades (camino lento, para compatibilidad) en una pasada:
+        acepta un iterador del repositorio sin retener las entidades
+        """
+        ids, amounts, dates, categories, methods, currencies = [], [], [], [], [], []
+        for e in expenses:
+            ids.append(e.id)
+            amounts.append(e.amount)
+            dates.append(e.date)
+            categories.append(e.category)
+            methods.append(e.payment_method.value)
+            currencies.append(e.currency)
+        return cls.from_rows(ids, amounts, dates, categories, methods, currencies)
+
+
+def _encode_currencies(currencies: Optional[Sequence[str]], count: int) -> Dict:
+    """Códigos de moneda (en general una o pocas monedas distintas)"""
+    if currencies is None or count == 0:
+        return {"currency_codes": np.zeros(count, dtype=np.int16), "currencies": [DEFAULT_CURRENCY]}
+    names, codes = np.unique(np.asarray(currencies, dtype=object).astype(str), return_inverse=True)
+    return {"currency_codes": codes.astype(np.int16).reshape(-1), "currencies": [str(name) for name in names]}
+
+
+def _dates_to_epoch_seconds(dates: Sequence[Union[datetime, str]]) -> np.ndarray:
+    if len(dates) == 0:
+        return np.zeros(0, dtype=np.int64)
+    if isinstance(dates[0], str):
+        try:
+            # numpy parsea ISO 8601 sin zona en C, mucho más rápido que fromisoformat
+            return np.asarray(dates, dtype="datetime64[s]").astype(np.int64)
+        except ValueError:
+            dates = [datetime.fromisoformat(d) for d in dates]
+    return np.fromiter((to_epoch_seconds(d) for d in dates), dtype=np.int64, count=len(dates))
+
+
+class ExpenseAnalytics:
+    """
+    Motor de analítica vectorizado sobre ExpenseColumns
+    Todas las operaciones son pasadas de numpy, sin bucles de Python por fila
+    """
+
+    @staticmethod
+    def period_mask(columns: ExpenseColumns, start_date: datetime, end_date: datetime) -> np.ndarray:
+        """Máscara de los gastos con fecha entre start_date y end_date (inclusive)"""
+        start, end = to_epoch_seconds(start_date), to_epoch_seconds(end_date)
+        return (columns.timestamps >= start) & (columns.timestamps <= end)
+
+    @staticmethod
+    def totals_by_category(columns: ExpenseColumns) -> Dict[str, float]:
+        totals = np.bincount(columns.category_codes, weights=columns.amounts, minlength=len(columns.categories))
+        counts = np.bincount(columns.category_codes, minlength=len(columns.categories))
+        return {
+            columns.categories[code]: float(totals[code])
+            for code in np.flatnonzero(counts)
+        }
+
+    @staticmethod
+    def counts_by_category(columns: ExpenseColumns) -> Dict[str, int]:
+        counts = np.bincount(columns.category_codes, minlength=len(columns.categories))
+        return {columns.categories[code]: int(counts[code]) for code in np.flatnonzero(counts)}
+
+    @staticmethod
+    def totals_by_payment_method(columns: ExpenseColumns) -> Dict[str, float]:
+        totals = np.bincount(columns.method_codes, weights=columns.amounts, minlength=len(METHOD_NAMES))
+        counts = np.bincount(columns.method_codes, minlength=len(METHOD_NAMES))
+        return {METHOD_NAMES[code]: float(totals[code]) for code in np.flatnonzero(counts)}
+
+    @staticmethod
+    def daily_totals(columns: ExpenseColumns) -> Dict[int, float]:
+        """
+        Total por día (desde 1970): ordena por día y suma cada tramo con np.add.reduceat
+        """
+        if len(columns) == 0:
+            return {}
+        days = columns.epoch_days
+        order = np.argsort(days, kind="stable")
+        sorted_days = days[order]
+        starts = np.flatnonzero(np.r_[True, sorted_days[1:] != sorted_days[:-1]])
+        sums = np.add.reduceat(columns.amounts[order], starts)
+        return {int(day): float(total) for day, total in zip(sorted_days[starts], sums)}
+
+    @staticmethod
+    def time_series_buckets(columns: ExpenseColumns, granularity: str) -> Dict[datetime, Tuple[float, int]]:
+        """
+        Total y cantidad por bucket (día, semana desde el lunes o mes), igual
+        que ExpenseService.truncate_date pero con códigos enteros y np.bincount
+        Returns: Dict: inicio de bucket -> (total, cantidad), para build_time_series
+        """
+        if len(columns) == 0:
+            return {}
+        days = columns.epoch_days
+        if granularity == "day":
+            codes, unit = days, "D"
+        elif granularity == "week":
+            # El 1/1/1970 fue jueves: (días + 3) % 7 es el día de la semana desde el lunes
+            codes, unit = days - (days + 3) % 7, "D"
+        elif granularity == "month":
+            codes, unit = columns.timestamps.astype("datetime64[s]").astype("datetime64[M]").astype(np.int64), "M"
+        else:
+            raise ValueError(f"Granularidad inválida: {granularity}")
+        unique_codes, inverse = np.unique(codes, return_inverse=True)
+        inverse = inverse.reshape(-1)
+        totals = np.bincount(inverse, weights=columns.amounts)
+        counts = np.bincount(inverse)
+        starts = unique_codes.astype(f"datetime64[{unit}]").astype("datetime64[s]").tolist()
+        return {start: (total, count) for start, total, count in zip(starts, totals.tolist(), counts.tolist())}
+
+    @staticmethod
+    def totals_by_category_month(columns: ExpenseColumns) -> Dict[Tuple[str, str], float]:
+        """
+        Total por (categoria, mes YYYY-MM): un solo bincount sobre la clave
+        combinada mes * n_categorias + categoria
+        """
+        if len(columns) == 0:
+            return {}
+        months = columns.timestamps.astype("datetime64[s]").astype("datetime64[M]").astype(np.int64)
+        first_month = int(months.min())
+        n_categories = len(columns.categories)
+        keys = (months - first_month) * n_categories + columns.category_codes
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+        totals = np.bincount(inverse.reshape(-1), weights=columns.amounts)
+        result = {}
+        for key, total in zip(unique_keys.tolist(), totals.tolist()):
+            month_index, code = divmod(key, n_categories)
+            year, month = divmod(first_month + month_index, 12)
+            result[(columns.categories[code], f"{1970 + year:04d}-{month + 1:02d}")] = total
+        return result
+
+    @staticmethod
+    def summary(columns: ExpenseColumns) -> Dict:
+        """Resumen con total, totales por categoría/método y cantidad"""
+        if len(columns) == 0:
+            return {
+                "total": 0,
+                "by_category": {},
+                "by_payment_method": {},
+                "expense_count": 0
+            }
+        return {
+            "total": float(columns.amounts.sum()),
+            "by_category": ExpenseAnalytics.totals_by_category(columns),
+            "by_payment_method": ExpenseAnalytics.totals_by_payment_method(columns),
+            "expense_count": len(columns)
+        }
+
+    @staticmethod
+    def spending_trend(columns: ExpenseColumns, days: int = 30, now: Optional[datetime] = None) -> Dict:
+        """Total y promedio diario de los últimos `days` días"""
+        cutoff = to_epoch_seconds((now or datetime.now()) - timedelta(days=days))
+        mask = columns.timestamps >= cutoff
+        count = int(np.count_nonzero(mask))
+        if count == 0:
+            return {
+                "total_period": 0,
+                "average_daily": 0,
+                "expense_count": 0
+            }
+        total = float(columns.amounts[mask].sum())
+        return {
+            "total_period": total,
+            "average_daily": total / days,
+            "expense_count": count
+        }
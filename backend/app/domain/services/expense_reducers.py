@@ -0,0 +1,150 @@
+# app/domain/services/expense_reducers.py
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ..entities.expense import Expense
+from .currency import ExchangeRates, epoch_day
+from .expense_analytics import METHOD_NAMES, to_epoch_seconds
+
+
+class ExpenseReducer(ABC):
+    """
+    Agregado que se calcula en una pasada, consumiendo los gastos de a uno
+
+    Pensado para los iteradores del repositorio (iter_all, iter_find...):
+    la memoria depende de la cantidad de grupos, no de la de gastos.
+    """
+
+    @abstractmethod
+    def add(self, expense: Expense) -> None:
+        """Suma un gasto al agregado"""
+        pass
+
+    @abstractmethod
+    def result(self) -> Dict:
+        """
+        Resultado con todos los gastos sumados hasta ahora
+        Returns: Dict: El agregado
+        """
+        pass
+
+
+def reduce_expenses(expenses: Iterable[Expense], *reducers: ExpenseReducer) -> List[Dict]:
+    """Alimenta varios reductores con un solo recorrido y devuelve sus resultados"""
+    for expense in expenses:
+        for reducer in reducers:
+            reducer.add(expense)
+    return [reducer.result() for reducer in reducers]
+
+
+class _GroupedAmounts:
+    """
+    Suma de montos por (grupo, moneda, día)
+
+    Sin tipos de cambio el día no hace falta y los montos se suman tal cual;
+    con ellos, cada grupo se convierte al final en una sola pasada vectorizada
+    (mismo criterio de tasa vigente que ExpenseColumns.in_currency).
+    """
+
+    def __init__(self, rates: Optional[ExchangeRates] = None, base: Optional[str] = None):
+        self._rates = rates
+        self._base = base or (rates.pivot if rates is not None else None)
+        self._sums: Dict[Tuple[Hashable, str, int], float] = defaultdict(float)
+
+    def add(self, group: Hashable, expense: Expense) -> None:
+        if self._rates is None:
+            self._sums[(group, "", 0)] += expense.amount
+        else:
+            self._sums[(group, expense.currency, epoch_day(expense.date))] += expense.amount
+
+    def totals(self) -> Dict[Hashable, float]:
+        """Total de cada grupo (en la moneda base si hay tipos de cambio)"""
+        if not self._sums:
+            return {}
+        keys = list(self._sums)
+        amounts = np.fromiter(self._sums.values(), dtype=np.float64, count=len(keys))
+        if self._rates is not None:
+            currency_names = sorted({currency for _, currency, _ in keys})
+            codes = {name: code for code, name in enumerate(currency_names)}
+            amounts = self._rates.convert(
+                amounts,
+                np.fromiter((codes[currency] for _, currency, _ in keys), dtype=np.int16, count=len(keys)),
+                currency_names,
+                np.fromiter((day for _, _, day in keys), dtype=np.int64, count=len(keys)),
+                self._base
+            )
+        totals: Dict[Hashable, float] = defaultdict(float)
+        for (group, _, _), amount in zip(keys, amounts.tolist()):
+            totals[group] += amount
+        return totals
+
+
+class SummaryReducer(ExpenseReducer):
+    """Igual que ExpenseAnalytics.summary: total, por categoría y método, y cantidad"""
+
+    def __init__(self, rates: Optional[ExchangeRates] = None, base: Optional[str] = None):
+        self._amounts = _GroupedAmounts(rates, base)
+        self._count = 0
+
+    def add(self, expense: Expense) -> None:
+        self._amounts.add((expense.category, expense.payment_method.value), expense)
+        self._count += 1
+
+    def result(self) -> Dict:
+        if self._count == 0:
+            return {
+                "total": 0,
+                "by_category": {},
+                "by_payment_method": {},
+                "expense_count": 0
+            }
+        by_category: Dict[str, float] = defaultdict(float)
+        by_method: Dict[str, float] = defaultdict(float)
+        for (category, method), amount in self._amounts.totals().items():
+            by_category[category] += amount
+            by_method[method] += amount
+        return {
+            "total": float(sum(by_category.values())),
+            "by_category": {name: by_category[name] for name in sorted(by_category)},
+            "by_payment_method": {name: by_method[name] for name in METHOD_NAMES if name in by_method},
+            "expense_count": self._count
+        }
+
+
+class SpendingTrendReducer(ExpenseReducer):
+    """Igual que ExpenseAnalytics.spending_trend: total y promedio diario de los últimos `days` días"""
+
+    def __init__(
+        self,
+        days: int = 30,
+        rates: Optional[ExchangeRates] = None,
+        base: Optional[str] = None,
+        now: Optional[datetime] = None
+    ):
+        self._days = days
+        self._cutoff = to_epoch_seconds((now or datetime.now()) - timedelta(days=days))
+        self._amounts = _GroupedAmounts(rates, base)
+        self._count = 0
+
+    def add(self, expense: Expense) -> None:
+        if to_epoch_seconds(expense.date) >= self._cutoff:
+            self._amounts.add(None, expense)
+            self._count += 1
+
+    def result(self) -> Dict:
+        if self._count == 0:
+            return {
+                "total_period": 0,
+                "average_daily": 0,
+                "expense_count": 0
+            }
+        total = float(sum(self._amounts.totals().values()))
+        return {
+            "total_period": total,
+            "average_daily": total / self._days,
+            "expense_count": self._count
+        }
@@ -0,0 +1,189 @@
+# app/domain/services/expense_report.py
+import csv
+import hashlib
+import io
+import re
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ..entities.expense import Expense
+from .expense_analytics import METHOD_NAMES, ExpenseAnalytics, ExpenseColumns
+
+REPORT_KINDS = ("monthly", "yearly")
+REPORT_FORMATS = ("json", "csv")
+TOP_MERCHANTS = 10
+
+_PERIOD_PATTERNS = {"monthly": re.compile(r"^\d{4}-(0[1-9]|1[0-2])$"), "yearly": re.compile(r"^\d{4}$")}
+
+
+@dataclass(frozen=True)
+class ReportSpec:
+    """Qué resumen se pide: mensual (period=YYYY-MM) o anual (period=YYYY), en JSON o CSV"""
+    kind: str
+    period: str
+    format: str = "json"
+
+    @classmethod
+    def create(cls, kind: str, period: str, format: str = "json") -> "ReportSpec":
+        """
+        Valida y normaliza
+        Raises: ValueError: Si el tipo, el período o el formato son inválidos
+        """
+        kind, period, format = kind.strip().lower(), period.strip(), format.strip().lower()
+        if kind not in REPORT_KINDS:
+            raise ValueError(f"El tipo de reporte debe ser uno de: {', '.join(REPORT_KINDS)}")
+        if not _PERIOD_PATTERNS[kind].match(period):
+            expected = "YYYY-MM" if kind == "monthly" else "YYYY"
+            raise ValueError(f"El período de un reporte {kind} debe tener el formato {expected}")
+        if format not in REPORT_FORMATS:
+            raise ValueError(f"El formato debe ser uno de: {', '.join(REPORT_FORMATS)}")
+        return cls(kind, period, format)
+
+    def date_range(self) -> Tuple[datetime, datetime]:
+        """Primer y último instante del período (inclusive)"""
+        if self.kind == "monthly":
+            year, month = (int(part) for part in self.period.split("-"))
+            start = datetime(year, month, 1)
+            end = datetime(year + month // 12, month % 12 + 1, 1)
+        else:
+            start = datetime(int(self.period), 1, 1)
+            end = datetime(int(self.period) + 1, 1, 1)
+        return start, end - timedelta(microseconds=1)
+
+
+@dataclass
+class ReportData:
+    """
+    Snapshot de los gastos del período que se manda al proceso de trabajo
+    (columnas numpy + descripciones: se serializa barato con pickle)
+    """
+    columns: ExpenseColumns
+    descriptions: List[Optional[str]]
+
+    @classmethod
+    def from_expenses(cls, expenses: Iterable[Expense]) -> "ReportData":
+        """Una sola pasada (sirve con un iterador del repositorio)"""
+        descriptions: List[Optional[str]] = []
+
+        def collect() -> Iterable[Expense]:
+            for expense in expenses:
+                descriptions.append(expense.description)
+                yield expense
+
+        return cls(ExpenseColumns.from_expenses(collect()), descriptions)
+
+    def fingerprint(self) -> str:
+        """Versión de los datos: hash del contenido (cambia con cualquier escritura del período)"""
+        columns = self.columns
+        digest = hashlib.sha256()
+        order = np.argsort(columns.ids, kind="stable")
+        for array in (columns.ids, columns.amounts, columns.timestamps, columns.method_codes, columns.currency_codes):
+            digest.update(np.ascontiguousarray(array[order]).tobytes())
+        digest.update("\x1f".join(columns.currencies).encode())
+        codes = columns.category_codes[order]
+        digest.update("\x1f".join(columns.categories[code] for code in codes.tolist()).encode())
+        digest.update("\x1f".join(self.descriptions[i] or "" for i in order.tolist()).encode())
+        return digest.hexdigest()[:16]
+
+
+class ExpenseReportBuilder:
+    """
+    Arma el resumen de un período: totales por categoría y método de pago,
+    principales comercios (por descripción) y, en los anuales, totales por mes
+    """
+
+    @staticmethod
+    def build(spec: ReportSpec, data: ReportData) -> Dict:
+        columns = data.columns
+        start, end = spec.date_range()
+        total = float(columns.amounts.sum()) if len(columns) else 0.0
+        statement = {
+            "kind": spec.kind,
+            "period": spec.period,
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+            # Moneda de los montos (None si las columnas no se convirtieron a una sola)
+            "currency": columns.currencies[0] if len(columns.currencies) == 1 else None,
+            "total": round(total, 2),
+            "expense_count": len(columns),
+            "average": round(total / len(columns), 2) if len(columns) else 0.0,
+            "by_category": ExpenseReportBuilder._breakdown(
+                ExpenseAnalytics.totals_by_category(columns),
+                ExpenseAnalytics.counts_by_category(columns),
+                total
+            ),
+            "by_payment_method": ExpenseReportBuilder._breakdown(
+                ExpenseAnalytics.totals_by_payment_method(columns),
+                ExpenseReportBuilder._counts_by_payment_method(columns),
+                total
+            ),
+            "top_merchants": ExpenseReportBuilder.top_merchants(data),
+        }
+        if spec.kind == "yearly":
+            statement["by_month"] = ExpenseReportBuilder._by_month(columns, spec.period)
+        return statement
+
+    @staticmethod
+    def _breakdown(totals: Dict[str, float], counts: Dict[str, int], total: float) -> List[Dict]:
+        rows = [
+            {
+                "name": name,
+                "total": round(amount, 2),
+                "count": counts.get(name, 0),
+                "percent": round(amount / total * 100, 2) if total else 0.0
+            }
+            for name, amount in totals.items()
+        ]
+        return sorted(rows, key=lambda row: row["total"], reverse=True)
+
+    @staticmethod
+    def _counts_by_payment_method(columns: ExpenseColumns) -> Dict[str, int]:
+        counts = np.bincount(columns.method_codes, minlength=len(METHOD_NAMES))
+        return {METHOD_NAMES[code]: int(counts[code]) for code in np.flatnonzero(counts)}
+
+    @staticmethod
+    def top_merchants(data: ReportData, limit: int = TOP_MERCHANTS) -> List[Dict]:
+        """
+        Descripciones con mayor total (sin distinguir mayúsculas ni espacios
+        alrededor); los gastos sin descripción no cuentan
+        """
+        keys = np.array([(d or "").strip().lower() for d in data.descriptions], dtype=object)
+        present = keys != ""
+        if not present.any():
+            return []
+        _, first, inverse = np.unique(keys[present].astype(str), return_index=True, return_inverse=True)
+        totals = np.bincount(inverse, weights=data.columns.amounts[present])
+        counts = np.bincount(inverse)
+        top = np.argsort(-totals, kind="stable")[:limit]
+        originals = [d for d, p in zip(data.descriptions, present.tolist()) if p]
+        return [
+            {"name": originals[first[i]].strip(), "total": round(float(totals[i]), 2), "count": int(counts[i])}
+            for i in top.tolist()
+        ]
+
+    @staticmethod
+    def _by_month(columns: ExpenseColumns, year: str) -> List[Dict]:
+        months = columns.timestamps.astype("datetime64[s]").astype("datetime64[M]").astype(np.int64) % 12
+        totals = np.bincount(months, weights=columns.amounts, minlength=12)
+        counts = np.bincount(months, minlength=12)
+        return [
+            {"month": f"{year}-{m + 1:02d}", "total": round(float(totals[m]), 2), "count": int(counts[m])}
+            for m in range(12)
+        ]
+
+    @staticmethod
+    def to_csv(statement: Dict) -> str:
+        """Una fila por dato: section, name, total, count, percent"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(["section", "name", "total", "count", "percent"])
+        writer.writerow(["summary", statement["period"], statement["total"], statement["expense_count"], 100.0])
+        for section in ("by_category", "by_payment_method", "top_merchants"):
+            for row in statement[section]:
+                writer.writerow([section, row["name"], row["total"], row["count"], row.get("percent", "")])
+        for row in statement.get("by_month", []):
+            writer.writerow(["by_month", row["month"], row["total"], row["count"], ""])
+        return buffer.getvalue()
@@ -4,9 +4,17 @@
 # =============================================================================
 
 # app/domain/services/expense_service.py
-from typing import List, Dict
+from typing import Iterable, List, Dict, Optional, Tuple, Union
 from datetime import datetime, timedelta
 from ..entities.expense import Expense
+from .currency import ExchangeRates
+from .expense_analytics import ExpenseAnalytics, ExpenseColumns
+from .expense_reducers import SpendingTrendReducer, SummaryReducer, reduce_expenses
+
+# Granularidades soportadas por la serie temporal
+TIME_SERIES_GRANULARITIES = ("day", "week", "month")
+# Ventanas (en buckets) de los promedios móviles
+MOVING_AVERAGE_WINDOWS = (7, 30)
 
 
 class ExpenseService:
@@ -15,74 +23,134 @@ class ExpenseService:
     """
     
     @staticmethod
-    def calculate_monthly_summary(expenses: List[Expense]) -> Dict:
+    def calculate_monthly_summary(
+        expenses: Union[Iterable[Expense], ExpenseColumns],
+        rates: Optional[ExchangeRates] = None,
+        base: Optional[str] = None
+    ) -> Dict:
         """
         Calcula resumen de gastos
         
         Args:
-            expenses: Lista de gastos
+            expenses: Gastos (lista o iterador del repositorio) o columnas (ExpenseColumns)
+            rates: Tipos de cambio; sin ellos se suman los montos tal cual
+            base: Moneda del resumen (por defecto la pivote de rates)
             
         Returns:
             Dict: Resumen con totales y conteos
         """
-        if not expenses:
-            return {
-                "total": 0,
-                "by_category": {},
-                "by_payment_method": {},
-                "expense_count": 0
-            }
-        
-        total = sum(expense.amount for expense in expenses)
-        
-        by_category = {}
-        by_payment_method = {}
-        
-        for expense in expenses:
-            # Por categoría
-            if expense.category not in by_category:
-                by_category[expense.category] = 0
-            by_category[expense.category] += expense.amount
-            
-            # Por método de pago
-            method = expense.payment_method.value
-            if method not in by_payment_method:
-                by_payment_method[method] = 0
-            by_payment_method[method] += expense.amount
-        
-        return {
-            "total": total,
-            "by_category": by_category,
-            "by_payment_method": by_payment_method,
-            "expense_count": len(expenses)
-        }
+        if isinstance(expenses, ExpenseColumns):
+            return ExpenseAnalytics.summary(ExpenseService._in_currency(expenses, rates, base))
+        return reduce_expenses(expenses, SummaryReducer(rates, base))[0]
     
     @staticmethod
-    def get_spending_trend(expenses: List[Expense], days: int = 30) -> Dict:
+    def get_spending_trend(
+        expenses: Union[Iterable[Expense], ExpenseColumns],
+        days: int = 30,
+        rates: Optional[ExchangeRates] = None,
+        base: Optional[str] = None
+    ) -> Dict:
         """
         Analiza tendencia de gastos
         
         Args:
-            expenses: Lista de gastos
+            expenses: Gastos (lista o iterador del repositorio) o columnas (ExpenseColumns)
             days: Número de días a analizar
+            rates, base: Como en calculate_monthly_summary
             
         Returns:
             Dict: Análisis de tendencia
         """
-        cutoff_date = datetime.now() - timedelta(days=days)
-        recent_expenses = [e for e in expenses if e.date >= cutoff_date]
+        if isinstance(expenses, ExpenseColumns):
+            return ExpenseAnalytics.spending_trend(ExpenseService._in_currency(expenses, rates, base), days)
+        return reduce_expenses(expenses, SpendingTrendReducer(days, rates, base))[0]
+    
+    @staticmethod
+    def calculate_summary_and_trend(
+        expenses: Iterable[Expense],
+        days: int = 30,
+        rates: Optional[ExchangeRates] = None,
+        base: Optional[str] = None
+    ) -> Tuple[Dict, Dict]:
+        """
+        Resumen y tendencia en un solo recorrido de los gastos
+        (para un iterador del repositorio, que no se puede recorrer dos veces)
+        """
+        summary, trend = reduce_expenses(
+            expenses, SummaryReducer(rates, base), SpendingTrendReducer(days, rates, base)
+        )
+        return summary, trend
+    
+    @staticmethod
+    def _in_currency(
+        columns: ExpenseColumns,
+        rates: Optional[ExchangeRates] = None,
+        base: Optional[str] = None
+    ) -> ExpenseColumns:
+        """Las columnas en la moneda pedida (tal cual si no hay tipos de cambio)"""
+        if rates is None:
+            return columns
+        return columns.in_currency(rates, base or rates.pivot)
+    
+    @staticmethod
+    def truncate_date(date: datetime, granularity: str) -> datetime:
+        """
+        Inicio del bucket que contiene la fecha (igual que date_trunc de PostgreSQL)
+        Las semanas empiezan el lunes
+        """
+        day = datetime(date.year, date.month, date.day)
+        if granularity == "day":
+            return day
+        if granularity == "week":
+            return day - timedelta(days=day.weekday())
+        if granularity == "month":
+            return datetime(date.year, date.month, 1)
+        raise ValueError(f"Granularidad inválida: {granularity}")
+    
+    @staticmethod
+    def next_bucket(bucket: datetime, granularity: str) -> datetime:
+        """Inicio del bucket siguiente"""
+        if granularity == "day":
+            return bucket + timedelta(days=1)
+        if granularity == "week":
+            return bucket + timedelta(weeks=1)
+        if bucket.month == 12:
+            return bucket.replace(year=bucket.year + 1, month=1)
+        return bucket.replace(month=bucket.month + 1)
+    
+    @staticmethod
+    def build_time_series(
+        bucket_totals: Dict[datetime, Tuple[float, int]],
+        start_date: datetime,
+        end_date: datetime,
+        granularity: str
+    ) -> List[Dict]:
+        """
+        Arma la serie completa: rellena buckets vacíos con 0 y agrega
+        promedios móviles de 7 y 30 buckets (sumas acumuladas, una pasada)
         
-        if not recent_expenses:
-            return {
-                "total_period": 0,
-                "average_daily": 0,
-                "expense_count": 0
-            }
+        Args:
+            bucket_totals: inicio de bucket -> (total, cantidad)
+            start_date, end_date: Rango a cubrir
+            granularity: day, week o month
+            
+        Returns:
+            List[Dict]: Puntos con bucket, total, count, moving_avg_7, moving_avg_30
+        """
+        points = []
+        prefix = [0.0]
+        bucket = ExpenseService.truncate_date(start_date, granularity)
+        last = ExpenseService.truncate_date(end_date, granularity)
         
-        total = sum(e.amount for e in recent_expenses)
+        while bucket <= last:
+            total, count = bucket_totals.get(bucket, (0.0, 0))
+            prefix.append(prefix[-1] + total)
+            index = len(points) + 1
+            point = {"bucket": bucket, "total": round(total, 2), "count": count}
+            for window in MOVING_AVERAGE_WINDOWS:
+                size = min(window, index)
+                point[f"moving_avg_{window}"] = round((prefix[index] - prefix[index - size]) / size, 2)
+            points.append(point)
+            bucket = ExpenseService.next_bucket(bucket, granularity)
         
-        return {
-            "total_period": total,
-            "average_daily": total / days,
-            "expense_count": len(recent_expenses)
-        }
\ No newline at end of file
+        return points
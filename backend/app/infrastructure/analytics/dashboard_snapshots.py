@@ -0,0 +1,318 @@
+# app/infrastructure/analytics/dashboard_snapshots.py
+import asyncio
+import logging
+import threading
+import time
+from contextlib import AbstractContextManager
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, Hashable, Iterable, Optional
+
+from ...application.use_cases.get_dashboard_data import GetDashboardDataUseCase
+from ...domain.entities.expense import DEFAULT_CURRENCY
+from ...domain.events.expense_events import ExpenseChange
+from ...domain.repositories.expense_repository import ExpenseRepository
+from ...domain.services.currency import ExchangeRates
+from ...domain.services.expense_analytics import ExpenseColumns
+from ..repositories.repository_decorator import ExpenseRepositoryDecorator
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    """Resultado precalculado de GetDashboardDataUseCase para una ventana"""
+    days: int
+    data: Dict
+    computed_at: datetime
+    version: int  # Versión de los datos (cantidad de escrituras) al calcular
+    day: date  # Día en que se calculó: al cambiar de día queda viejo
+    data_version: Optional[Hashable] = None  # repository.get_data_version() al calcular
+
+
+class _SharedColumnsRepository(ExpenseRepositoryDecorator):
+    """Lee las columnas una sola vez para calcular todas las ventanas"""
+
+    def __init__(self, inner: ExpenseRepository):
+        super().__init__(inner)
+        self._columns: Optional[ExpenseColumns] = None
+
+    def get_columns(self, start_date=None, end_date=None) -> ExpenseColumns:
+        if start_date is not None or end_date is not None:
+            return self._inner.get_columns(start_date, end_date)
+        if self._columns is None:
+            self._columns = self._inner.get_columns()
+        return self._columns
+
+
+class DashboardSnapshotStore:
+    """
+    Dashboards precalculados para las ventanas más usadas (7, 30, 90, 365 días)
+
+    Cada escritura (bus de eventos) marca los snapshots como viejos; la tarea
+    en segundo plano (run) los recalcula cuando pasan `debounce_seconds` sin
+    escrituras, o como mucho `max_delay_seconds` después de la primera
+    escritura pendiente, y también al cambiar de día. Leer un snapshot es O(1).
+
+    El bus solo ve las escrituras de este proceso. Las de otros workers, el
+    importador u otros clientes se detectan comparando la marca de los datos
+    compartidos (repository.get_data_version(): mtime del archivo, contadores
+    de la tabla) cada `check_seconds`: en ese lapso un snapshot puede
+    figurar como fresco sin serlo. Con el backend en memoria no hay marca y
+    solo cuenta el bus (los datos son del proceso).
+
+    Los montos van en la moneda base de las tasas (`currency`); un cambio
+    de tasas (on_rates_change) los deja viejos igual que una escritura.
+    """
+
+    def __init__(
+        self,
+        windows: Iterable[int],
+        repository_scope: Callable[[], AbstractContextManager],
+        debounce_seconds: float = 2.0,
+        max_delay_seconds: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+        exchange_rates: Optional[Callable[[], ExchangeRates]] = None,
+        currency: Optional[str] = None,
+        check_seconds: float = 5.0
+    ):
+        """
+        Args: windows: Ventanas en días que se precalculan
+              repository_scope: Abre un repositorio fuera de una petición
+              exchange_rates: Tasas vigentes (None = sin conversión)
+              currency: Moneda de los snapshots (la base de las tasas, por defecto DEFAULT_CURRENCY)
+              debounce_seconds: Silencio de escrituras antes de recalcular
+              max_delay_seconds: Espera máxima con escrituras continuas
+              check_seconds: Cada cuánto se busca escrituras de otros procesos (0 = nunca)
+        """
+        self.windows = tuple(sorted(set(windows)))
+        self._repository_scope = repository_scope
+        self._debounce = debounce_seconds
+        self._max_delay = max_delay_seconds
+        self._check_seconds = check_seconds
+        self._clock = clock
+        self._exchange_rates = exchange_rates
+        self.currency = currency or DEFAULT_CURRENCY
+        self._lock = threading.Lock()
+        self._snapshots: Dict[int, DashboardSnapshot] = {}
+        self._version = 0
+        self._data_version: Optional[Hashable] = None  # Última marca vista de los datos compartidos
+        self._last_write: Optional[float] = None
+        self._first_pending: Optional[float] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+
+    # ------------------------------------------------------------------
+    # Escrituras
+    # ------------------------------------------------------------------
+
+    def on_change(self, change: Optional[ExpenseChange] = None) -> None:
+        """Suscriptor del bus de eventos: marca los snapshots como viejos"""
+        with self._lock:
+            now = self._clock()
+            self._version += 1
+            self._last_write = now
+            if self._first_pending is None:
+                self._first_pending = now
+        if self._loop is not None and self._wake is not None:
+            self._loop.call_soon_threadsafe(self._wake.set)
+
+    def on_rates_change(self) -> None:
+        """Suscriptor de ExchangeRateCache: los montos convertidos quedan viejos"""
+        self.on_change()
+
+    def check_external_writes(self, repository: Optional[ExpenseRepository] = None) -> bool:
+        """
+        Compara la marca de los datos compartidos con la de los snapshots y,
+        si cambió (escribió otro proceso), los marca como viejos
+        Returns: bool: Si se detectó un cambio
+        """
+        data_version = self._read_data_version(repository)
+        if data_version is None:
+            return False
+        with self._lock:
+            self._data_version = data_version
+            changed = any(s.data_version != data_version for s in self._snapshots.values())
+        if changed:
+            self.on_change()
+        return changed
+
+    def _read_data_version(self, repository: Optional[ExpenseRepository]) -> Optional[Hashable]:
+        """
+        Marca de los datos leída con repository_scope (el primario) si lo hay:
+        el repositorio de una petición puede leer de una réplica, con otros contadores
+        """
+        if self._repository_scope is None:
+            return repository.get_data_version()
+        with self._repository_scope() as primary:
+            return primary.get_data_version()
+
+    # ------------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------------
+
+    def get(self, days: int) -> Optional[DashboardSnapshot]:
+        with self._lock:
+            return self._snapshots.get(days)
+
+    def is_stale(self, snapshot: DashboardSnapshot) -> bool:
+        """Hay escrituras posteriores al cálculo (de este u otro proceso) o cambió el día"""
+        with self._lock:
+            return (
+                snapshot.version < self._version
+                or snapshot.day != date.today()
+                or (self._data_version is not None and snapshot.data_version != self._data_version)
+            )
+
+    def describe(self, snapshot: DashboardSnapshot) -> Dict:
+        """Metadatos de frescura que acompañan a la respuesta"""
+        return {
+            "source": "snapshot",
+            "computed_at": snapshot.computed_at.isoformat(),
+            "age_seconds": round((datetime.now() - snapshot.computed_at).total_seconds(), 3),
+            "stale": self.is_stale(snapshot)
+        }
+
+    # ------------------------------------------------------------------
+    # Cálculo
+    # ------------------------------------------------------------------
+
+    def refresh(self, windows: Optional[Iterable[int]] = None, repository: Optional[ExpenseRepository] = None) -> None:
+        """
+        Recalcula las ventanas (por defecto todas) leyendo las columnas una vez
+        Con repository_scope se lee siempre de ahí (el primario): el repositorio
+        de una petición puede ser una réplica con lag y el snapshot lo ven todos
+        Args: repository: Repositorio a usar solo si no hay repository_scope
+        """
+        windows = tuple(windows) if windows is not None else self.windows
+        if self._repository_scope is None:
+            self._compute(windows, repository)
+        else:
+            with self._repository_scope() as primary:
+                self._compute(windows, primary)
+
+    def _compute(self, windows: Iterable[int], repository: ExpenseRepository) -> None:
+        with self._lock:
+            version = self._version
+        # La marca se lee antes que los datos: una escritura durante el
+        # cálculo deja al snapshot con la marca vieja y se detecta después
+        data_version = self._read_data_version(repository)
+        use_case = GetDashboardDataUseCase(_SharedColumnsRepository(repository), self._exchange_rates)
+        computed = {}
+        for days in windows:
+            computed[days] = DashboardSnapshot(
+                days=days,
+                data=use_case.execute(days=days, currency=self.currency),
+                computed_at=datetime.now(),
+                version=version,
+                day=date.today(),
+                data_version=data_version
+            )
+        with self._lock:
+            if data_version is not None:
+                self._data_version = data_version
+            for days, snapshot in computed.items():
+                current = self._snapshots.get(days)
+                if current is None or current.version <= snapshot.version:
+                    self._snapshots[days] = snapshot
+            if self._version == version and set(self.windows) <= set(computed):
+                self._first_pending = None
+
+    # ------------------------------------------------------------------
+    # Tarea en segundo plano
+    # ------------------------------------------------------------------
+
+    def _debounce_delay(self) -> float:
+        """Segundos que faltan para recalcular (<= 0: ya)"""
+        with self._lock:
+            if self._first_pending is None:
+                return 0.0
+            now = self._clock()
+            quiet = self._debounce - (now - self._last_write)
+            overdue = self._max_delay - (now - self._first_pending)
+        return min(quiet, overdue)
+
+    @staticmethod
+    def _seconds_until_midnight() -> float:
+        now = datetime.now()
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        return max((midnight - now).total_seconds(), 0.0) + 0.5
+
+    def _idle_timeout(self) -> float:
+        midnight = self._seconds_until_midnight()
+        return min(midnight, self._check_seconds) if self._check_seconds > 0 else midnight
+
+    def _day_changed(self) -> bool:
+        with self._lock:
+            return any(snapshot.day != date.today() for snapshot in self._snapshots.values())
+
+    async def run(self) -> None:
+        """
+        Bucle de la tarea en segundo plano (se cancela al cerrar la app)
+        El cálculo corre en un hilo para no bloquear el event loop
+        """
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        await self._refresh_in_thread()
+
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self._idle_timeout())
+            except asyncio.TimeoutError:
+                if self._day_changed():
+                    # Cambio de día: las ventanas se corren aunque no haya escrituras
+                    await self._refresh_in_thread()
+                else:
+                    # Escrituras de otros procesos: si las hubo, on_change despierta al bucle
+                    await self._check_in_thread()
+                continue
+
+            while True:
+                self._wake.clear()
+                delay = self._debounce_delay()
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
+            await self._refresh_in_thread()
+
+    async def _check_in_thread(self) -> None:
+        try:
+            await asyncio.to_thread(self.check_external_writes)
+        except Exception:
+            logger.exception("Error al verificar escrituras externas para el dashboard")
+
+    async def _refresh_in_thread(self) -> None:
+        try:
+            await asyncio.to_thread(self.refresh)
+        except Exception:
+            logger.exception("Error al recalcular los snapshots del dashboard")
+            await asyncio.sleep(self._max_delay)
+            # Reintentar en la próxima vuelta
+            self._wake.set()
+
+
+_store: Optional[DashboardSnapshotStore] = None
+
+
+def get_dashboard_snapshot_store() -> DashboardSnapshotStore:
+    """Store global, suscrito al bus de eventos la primera vez que se pide"""
+    global _store
+    if _store is None:
+        from ...core.config import settings
+        from ...domain.events.expense_events import expense_events
+        from ..repositories.exchange_rate_cache import get_exchange_rate_cache
+        from ..repositories.registry import open_repository
+
+        rates = get_exchange_rate_cache()
+        _store = DashboardSnapshotStore(
+            settings.get_dashboard_snapshot_windows(),
+            open_repository,
+            settings.dashboard_refresh_debounce_seconds,
+            settings.dashboard_refresh_max_delay_seconds,
+            exchange_rates=rates.get,
+            currency=rates.pivot,
+            check_seconds=settings.dashboard_external_check_seconds
+        )
+        expense_events.subscribe(_store.on_change)
+        rates.subscribe(_store.on_rates_change)
+    return _store
@@ -0,0 +1,252 @@
+# app/infrastructure/analytics/distribution_store.py
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Hashable, Optional
+
+import numpy as np
+
+from ...domain.entities.expense import Expense
+from ...domain.events.expense_events import ExpenseChange
+from ...domain.repositories.expense_repository import ExpenseRepository
+from ...domain.services.distribution_sketch import AmountDistribution
+from ...domain.services.expense_analytics import ExpenseColumns, METHOD_NAMES
+
+logger = logging.getLogger(__name__)
+
+STATE_FORMAT_VERSION = 1
+
+
+class DistributionStore:
+    """
+    Distribuciones de montos (general, por categoría y por método de pago)
+
+    Se actualiza con cada ExpenseChange (suscrita al bus de eventos), se
+    guarda en disco cada `persist_every` cambios para que reiniciar no
+    obligue a recorrer todo el historial, y se reconstruye desde el
+    repositorio si no hay estado guardado.
+
+    Cada proceso tiene su propio sketch y solo ve los eventos propios: otros
+    workers escriben en el mismo almacenamiento y un corte pierde los cambios
+    sin guardar. Por eso, como DashboardSnapshotStore, se guarda la marca de
+    los datos (repository.get_data_version()) con la que se calculó y antes
+    de usar el sketch (ensure_ready) se compara con la actual: si cambió sin
+    que pasaran eventos de este proceso, se recarga el estado guardado o se
+    reconstruye. Si además hubo eventos propios no hay forma de separarlos y
+    se adopta la marca nueva: una escritura ajena en ese lapso se nota recién
+    con la siguiente. Sin marca (backend en memoria) solo cuenta el bus.
+    """
+
+    def __init__(self, state_path: Optional[str] = None, persist_every: int = 50, source: str = ""):
+        """
+        Args: state_path: Archivo donde se guarda el estado (None = solo memoria)
+              persist_every: Guardar cada N cambios
+              source: Identifica el almacenamiento de origen; un estado guardado
+                      para otro backend/BD se ignora al cargar
+        """
+        self._path = Path(state_path) if state_path else None
+        self._source = source
+        self._persist_every = persist_every
+        self._lock = threading.RLock()
+        self._pending_changes = 0
+        self._ready = False
+        self._data_version: Optional[Hashable] = None  # Marca de los datos del sketch
+        self._own_changes = False  # Eventos propios desde que se leyó la marca
+        self._reset()
+
+    def _reset(self) -> None:
+        self._overall = AmountDistribution()
+        self._by_category: Dict[str, AmountDistribution] = {}
+        self._by_method: Dict[str, AmountDistribution] = {}
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready
+
+    # ------------------------------------------------------------------
+    # Actualización incremental
+    # ------------------------------------------------------------------
+
+    def _apply(self, expense: Expense, sign: int) -> None:
+        groups = (
+            self._overall,
+            self._by_category.setdefault(expense.category, AmountDistribution()),
+            self._by_method.setdefault(expense.payment_method.value, AmountDistribution()),
+        )
+        for distribution in groups:
+            if sign > 0:
+                distribution.add(expense.amount)
+            else:
+                distribution.remove(expense.amount)
+        if sign < 0:
+            self._drop_if_empty(self._by_category, expense.category)
+            self._drop_if_empty(self._by_method, expense.payment_method.value)
+
+    @staticmethod
+    def _drop_if_empty(groups: Dict[str, AmountDistribution], key: str) -> None:
+        if key in groups and groups[key].count == 0:
+            del groups[key]
+
+    def on_change(self, change: ExpenseChange) -> None:
+        """Suscriptor del bus de eventos: resta el estado anterior y suma el nuevo"""
+        with self._lock:
+            if not self._ready:
+                # Sin estado base no tiene sentido acumular; se reconstruirá
+                return
+            if change.before is not None:
+                self._apply(change.before, -1)
+            if change.after is not None:
+                self._apply(change.after, +1)
+            self._own_changes = True
+            self._pending_changes += 1
+            if self._pending_changes >= self._persist_every:
+                self.save()
+
+    # ------------------------------------------------------------------
+    # Reconstrucción y persistencia
+    # ------------------------------------------------------------------
+
+    def rebuild(self, columns: ExpenseColumns, data_version: Optional[Hashable] = None) -> None:
+        """
+        Recalcula todo desde las columnas del repositorio (vectorizado por grupo)
+        Args: data_version: Marca de los datos leída antes que las columnas
+                            (una escritura durante la lectura se detecta después)
+        """
+        with self._lock:
+            self._reset()
+            self._data_version = _version_key(data_version)
+            self._own_changes = False
+            self._overall.add_many(columns.amounts)
+            for code in np.unique(columns.category_codes).tolist():
+                distribution = AmountDistribution()
+                distribution.add_many(columns.amounts[columns.category_codes == code])
+                self._by_category[columns.categories[code]] = distribution
+            for code in np.unique(columns.method_codes).tolist():
+                distribution = AmountDistribution()
+                distribution.add_many(columns.amounts[columns.method_codes == code])
+                self._by_method[METHOD_NAMES[code]] = distribution
+            self._ready = True
+            self.save()
+
+    def ensure_ready(self, repository: ExpenseRepository) -> None:
+        """
+        Deja los sketches listos y coherentes con el repositorio
+
+        Si la marca de los datos difiere de la del sketch (escrituras de otros
+        procesos o cambios perdidos sin guardar) se intenta el estado en
+        disco, que puede haberlo guardado otro proceso con la marca actual,
+        y si tampoco coincide se reconstruye.
+        """
+        current = repository.get_data_version()
+        data_version = _version_key(current)
+        with self._lock:
+            if self._ready and (data_version is None or data_version == self._data_version):
+                return
+            if self._ready and self._own_changes:
+                # Los eventos propios ya están aplicados: la marca nueva es la del sketch
+                self._data_version = data_version
+                self._own_changes = False
+                return
+            if self.load(expected_version=data_version):
+                return
+            if self._ready:
+                logger.info("Sketch de distribución desactualizado (cambió la marca de los datos): se reconstruye")
+            self.rebuild(repository.get_columns(), current)
+
+    def load(self, expected_version: Optional[Hashable] = None) -> bool:
+        """
+        Carga el estado desde disco
+        Args: expected_version: Marca actual de los datos; un estado guardado
+                                con otra marca se descarta
+        Returns: bool: False si no existe, es inválido o no coincide
+        """
+        if self._path is None or not self._path.exists():
+            return False
+        try:
+            with open(self._path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("format_version") != STATE_FORMAT_VERSION or data.get("source") != self._source:
+                return False
+            if expected_version is not None and data.get("data_version") != expected_version:
+                return False
+            with self._lock:
+                self._overall = AmountDistribution.from_dict(data["overall"])
+                self._by_category = {k: AmountDistribution.from_dict(v) for k, v in data["by_category"].items()}
+                self._by_method = {k: AmountDistribution.from_dict(v) for k, v in data["by_payment_method"].items()}
+                self._data_version = data.get("data_version")
+                self._own_changes = False
+                self._ready = True
+                self._pending_changes = 0
+            return True
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("No se pudo cargar %s, se reconstruirá: %s", self._path, e)
+            return False
+
+    def save(self) -> None:
+        """
+        Guarda el estado con escritura atómica (archivo temporal + rename)
+
+        El temporal lleva el pid: varios workers pueden guardar a la vez sin
+        pisarse el archivo a medio escribir. Gana el último reemplazo, y quien
+        cargue después lo valida contra el repositorio.
+        """
+        if self._path is None:
+            return
+        with self._lock:
+            data = {
+                "format_version": STATE_FORMAT_VERSION,
+                "source": self._source,
+                # Con eventos propios sin verificar la marca no es la de estos datos
+                "data_version": None if self._own_changes else self._data_version,
+                "overall": self._overall.to_dict(),
+                "by_category": {k: v.to_dict() for k, v in self._by_category.items()},
+                "by_payment_method": {k: v.to_dict() for k, v in self._by_method.items()},
+            }
+            self._pending_changes = 0
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self._path.with_suffix(self._path.suffix + f".{os.getpid()}.tmp")
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(temp_path, self._path)
+        except OSError as e:
+            logger.warning("No se pudo guardar %s: %s", self._path, e)
+
+    # ------------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> Dict:
+        """Cuantiles e histogramas actuales"""
+        with self._lock:
+            return {
+                "overall": self._overall.summary(),
+                "by_category": {k: v.summary() for k, v in sorted(self._by_category.items())},
+                "by_payment_method": {k: v.summary() for k, v in sorted(self._by_method.items())},
+            }
+
+
+def _version_key(data_version: Optional[Hashable]) -> Optional[str]:
+    """Marca en texto, para compararla con la guardada en el JSON (fechas, tuplas)"""
+    return None if data_version is None else repr(data_version)
+
+
+_store: Optional[DistributionStore] = None
+
+
+def get_distribution_store() -> DistributionStore:
+    """Store global, suscrito al bus de eventos la primera vez que se pide"""
+    global _store
+    if _store is None:
+        from ...core.config import settings
+        from ...domain.events.expense_events import expense_events
+
+        _store = DistributionStore(
+            settings.distribution_state_path,
+            settings.distribution_persist_every,
+            source=settings.get_storage_fingerprint()
+        )
+        expense_events.subscribe(_store.on_change)
+    return _store
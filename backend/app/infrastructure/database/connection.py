@@ -1,32 +1,108 @@
 # app/infrastructure/database/connection.py
 
-from sqlalchemy import create_engine
+import logging
+import time
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
 from sqlalchemy.orm import sessionmaker, Session
-from typing import Generator
+from typing import Dict, Generator, Optional
 from ...core.config import settings
+from ...domain.repositories.exceptions import RepositoryError
+from .pool_metrics import InstrumentedQueuePool, instrument_engine, get_pool_status
+from .slow_queries import QueryStats, get_query_stats, instrument_queries, postgresql_explainer
+
+logger = logging.getLogger(__name__)
+
+
+def _engine_options(database_url: str) -> Dict:
+    """
+    Opciones del engine a partir de Settings
+    SQLite en memoria no usa pool de colas (cada conexión seria otra BD)
+    """
+    options = {
+        "echo": settings.get_db_echo(),  # SQL queries en consola
+        "pool_pre_ping": settings.db_pool_pre_ping,  # Verificar la conexión antes de usar
+        "pool_recycle": settings.db_pool_recycle,
+    }
+    if database_url.startswith("sqlite"):
+        options["connect_args"] = {"check_same_thread": False}
+        if ":memory:" in database_url or database_url.rstrip("/") == "sqlite:":
+            return options
+
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.db_pool_size,  # Tamaño de pool de conexiones
+        max_overflow=settings.db_max_overflow,  # Conexiones extra permitidas
+        pool_timeout=settings.db_pool_timeout,
+        pool_use_lifo=settings.db_pool_use_lifo,
+    )
+    return options
+
+
+def build_engine(database_url: str) -> Engine:
+    """Crea un engine con el pool configurado e instrumentado"""
+    new_engine = create_engine(database_url, **_engine_options(database_url))
+    instrument_engine(new_engine)
+    if settings.slow_query_log_enabled:
+        _instrument_slow_queries(new_engine)
+    return new_engine
+
+
+def _instrument_slow_queries(new_engine: Engine) -> None:
+    """Estadísticas por sentencia; EXPLAIN de las lentas solo en PostgreSQL y si está activado"""
+    explain = None
+    if settings.slow_query_explain and new_engine.dialect.name == "postgresql":
+        explain = postgresql_explainer(new_engine)
+    instrument_queries(new_engine, QueryStats(
+        settings.slow_query_threshold_ms / 1000,
+        explain=explain,
+        explain_interval=settings.slow_query_explain_interval_seconds,
+        plans_path=settings.slow_query_plans_path,
+    ))
+
+
+# El engine y la fábrica de sesiones se crean al primer uso, no al importar:
+# así el arranque con el backend JSON no abre nada de SQLAlchemy/psycopg2
+_engine = None
+_session_factory = None
+
+
+def get_engine() -> Engine:
+    """Devuelve el engine principal, creándolo la primera vez"""
+    global _engine
+    if _engine is None:
+        _engine = build_engine(settings.database_url)
+    return _engine
+
+
+def get_session_factory() -> sessionmaker:
+    """Devuelve la fábrica de sesiones (SessionLocal) ligada al engine principal"""
+    global _session_factory
+    if _session_factory is None:
+        _session_factory = sessionmaker(
+            autocommit=False,
+            autoflush=False,
+            bind=get_engine()
+        )
+    return _session_factory
+
+
+def __getattr__(name: str):
+    # Compatibilidad: `from .connection import engine, SessionLocal` sigue funcionando
+    if name == "engine":
+        return get_engine()
+    if name == "SessionLocal":
+        return get_session_factory()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Crear Engine(motor) de SQLAlchemy
-engine = create_engine(
-    settings.database_url,
-    echo=settings.debug, #SQL queries en consolo si debug=True
-    pool_pre_ping=True, #Verificar la conexión antes de usar
-    pool_size=5, #Tamaño de pool de conexiones
-    max_overflow=10 #Conexiones extra permitidas
-)
-
-#Crear sesión local
-SessionLocal= sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=engine
-)
 
 def get_db() -> Generator[Session, None, None]:
     """
     Dependency para obtener la sesion de la BD
     Yields: Session: Sesion de SQLAlchamy
     """
-    db = SessionLocal()
+    db = get_session_factory()()
     try:
         yield db
     finally:
@@ -38,4 +114,102 @@ def init_db():
     Solo para desarrollo - en produccion usa Alembic
     """
     from .models import Base
-    Base.metadata.create_all(bind=engine)
\ No newline at end of file
+    Base.metadata.create_all(bind=get_engine())
+
+
+def ensure_schema(engine: Optional[Engine] = None) -> int:
+    """
+    Verifica la versión del esquema con una sola consulta
+
+    Solo crea las tablas si la BD está vacía. Una BD con expenses pero sin
+    schema_version es anterior al versionado (v1, la del create_all de cada
+    arranque): se migra acá mismo con run_migrations, que incluye el backfill
+    de los contadores de presupuestos. Reemplaza al create_all en cada arranque.
+
+    Returns: int: Versión del esquema en la BD
+    Raises: RepositoryError: Si el esquema es más viejo que el del código
+    """
+    from .models import Base, SchemaVersionModel, SCHEMA_VERSION
+
+    current_engine = engine or get_engine()
+    try:
+        with current_engine.connect() as connection:
+            current = connection.execute(
+                text("SELECT MAX(version) FROM schema_version")
+            ).scalar()
+    except DBAPIError:
+        tables = inspect(current_engine)
+        if tables.has_table("schema_version"):
+            raise
+        if tables.has_table("expenses"):
+            from .migrations import run_migrations
+            logger.warning("BD anterior al versionado del esquema: aplicando migraciones desde v1")
+            run_migrations(current_engine)
+            return SCHEMA_VERSION
+        current = None
+
+    if current is None:
+        with current_engine.begin() as connection:
+            Base.metadata.create_all(bind=connection)
+            connection.execute(SchemaVersionModel.__table__.insert().values(version=SCHEMA_VERSION))
+        return SCHEMA_VERSION
+
+    if current < SCHEMA_VERSION:
+        raise RepositoryError(
+            f"Esquema de BD v{current} desactualizado, se requiere v{SCHEMA_VERSION}. "
+            "Ejecutar las migraciones antes de arrancar: python -m app.infrastructure.database.migrations"
+        )
+    return current
+
+
+def warm_up_pool(connections: int = None) -> int:
+    """
+    Abre N conexiones a la vez y las devuelve al pool
+    Evita que las primeras peticiones paguen el costo de conectar
+    Returns: int: Conexiones abiertas
+    """
+    count = settings.db_pool_warmup if connections is None else connections
+    opened = []
+    try:
+        for _ in range(count):
+            opened.append(get_engine().connect())
+    finally:
+        for connection in opened:
+            connection.close()
+    return len(opened)
+
+
+def check_database() -> Dict:
+    """
+    Readiness: ejecuta SELECT 1 y reporta el estado del pool
+    Returns: Dict: ready, latencia de la consulta y estado del pool
+    """
+    start = time.perf_counter()
+    try:
+        with get_engine().connect() as connection:
+            connection.execute(text("SELECT 1"))
+        ready, error = True, None
+    except Exception as e:
+        ready, error = False, str(e)
+
+    return {
+        "ready": ready,
+        "error": error,
+        "latency_ms": (time.perf_counter() - start) * 1000,
+        "pool": get_pool_status(get_engine()),
+        "queries": _query_status(),
+        "replicas": _replica_status(),
+    }
+
+
+def _query_status() -> list:
+    """Las sentencias que más tiempo suman (ver slow_queries.py)"""
+    stats = get_query_stats(get_engine())
+    return stats.snapshot(limit=10) if stats is not None else []
+
+
+def _replica_status() -> list:
+    if not settings.get_replica_urls():
+        return []
+    from .replicas import get_replica_router
+    return get_replica_router().status()
@@ -0,0 +1,430 @@
+# app/infrastructure/database/import_json.py
+"""
+Importa a la BD los gastos del archivo del backend JSON
+
+    python -m app.infrastructure.database.import_json data/expenses.json
+
+El archivo (JSON o msgpack, ver json_codecs.py) se recorre de a un gasto,
+sin cargarlo entero, y se inserta por lotes: COPY en PostgreSQL, INSERT de
+varias filas en otros motores. Se conservan los ids y al terminar se ajusta la secuencia.
+
+Después de cada lote confirmado se guarda un checkpoint (<archivo>.import.json)
+con el byte por el que va: si la importación se corta, volver a ejecutar el
+mismo comando sigue desde ahí. Cada lote es idempotente (ON CONFLICT (id)
+DO NOTHING), así que repetir el último tras un corte no duplica gastos.
+
+Al final se comparan cantidades y totales por categoría y moneda entre el
+archivo y la BD, y se recalculan los contadores mensuales de presupuestos.
+"""
+import argparse
+import io
+import json
+import logging
+import math
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import inspect, select, text
+from sqlalchemy.engine import Connection, Engine
+
+from ...domain.entities.expense import DEFAULT_CURRENCY, Expense
+from ...domain.repositories.exceptions import RepositoryError
+from ...domain.services.currency import ExchangeRate, ExchangeRates, MissingRateError, sum_by_key_in_currency
+from ..repositories.json_expense_repository import expense_from_dict
+from ..repositories.json_codecs import codec_for_file
+from .migrations import day_key_sql
+from .models import (
+    Base, CategoryModel, CategoryMonthTotalModel, ExchangeRateModel, ExpenseModel, PaymentMethodEnum,
+    SchemaVersionModel, SCHEMA_VERSION
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 5000
+
+# Totales esperados: (categoría, moneda) -> [cantidad, suma de montos]
+Totals = Dict[Tuple[str, str], List[float]]
+
+_COPY_COLUMNS = ("id", "amount", "currency", "category", "category_id", "payment_method", "date", "description")
+
+
+@dataclass
+class ImportCheckpoint:
+    """Progreso de una importación, ligado a una versión del archivo (tamaño y mtime)"""
+    source: str
+    size: int
+    mtime_ns: int
+    offset: int = 0
+    imported: int = 0
+    max_id: int = 0
+    totals: Totals = field(default_factory=dict)
+    completed: bool = False
+
+    @classmethod
+    def for_source(cls, source: Path) -> "ImportCheckpoint":
+        stat = source.stat()
+        return cls(str(source.resolve()), stat.st_size, stat.st_mtime_ns)
+
+    def matches(self, other: "ImportCheckpoint") -> bool:
+        return (self.source, self.size, self.mtime_ns) == (other.source, other.size, other.mtime_ns)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["ImportCheckpoint"]:
+        if not path.exists():
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        data["totals"] = {(category, currency): [count, total] for category, currency, count, total in data["totals"]}
+        return cls(**data)
+
+    def save(self, path: Path) -> None:
+        """Escribe a un temporal y reemplaza: un corte a mitad no deja el checkpoint roto"""
+        data = dict(self.__dict__)
+        data["totals"] = [[category, currency, count, total] for (category, currency), (count, total) in self.totals.items()]
+        temp_path = path.with_suffix(path.suffix + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+
+@dataclass
+class ImportReport:
+    """Resultado de una importación"""
+    imported: int
+    resumed_from: int
+    seconds: float
+    mismatches: List[str]
+
+    @property
+    def verified(self) -> bool:
+        return not self.mismatches
+
+
+class JsonToDatabaseImport:
+    """Importación por lotes con checkpoint y verificación final"""
+
+    def __init__(
+        self,
+        source: Path,
+        engine: Engine,
+        checkpoint_path: Optional[Path] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        base_currency: str = DEFAULT_CURRENCY
+    ):
+        self.source = Path(source)
+        self.base_currency = base_currency
+        self.engine = engine
+        self.checkpoint_path = checkpoint_path or self.source.with_suffix(self.source.suffix + ".import.json")
+        self.batch_size = batch_size
+        self._category_ids: Dict[str, int] = {}
+
+    def run(self) -> ImportReport:
+        """
+        Importa (o retoma) y verifica
+        Raises: RepositoryError: Si el esquema no está al día, la tabla ya tiene
+                gastos ajenos a esta importación o un registro es inválido
+        """
+        start = time.perf_counter()
+        self._check_schema()
+        checkpoint = self._open_checkpoint()
+        resumed_from = checkpoint.imported
+
+        if not checkpoint.completed:
+            with self.engine.connect() as connection:
+                self._category_ids = dict(
+                    connection.execute(select(CategoryModel.name, CategoryModel.id)).all()
+                )
+            batch: List[Expense] = []
+            end_offset = checkpoint.offset
+            records = codec_for_file(self.source).iter_records(self.source, checkpoint.offset)
+            for index, (item, end_offset) in enumerate(records):
+                batch.append(self._to_expense(item, checkpoint.imported + index + 1))
+                if len(batch) >= self.batch_size:
+                    self._commit_batch(batch, end_offset, checkpoint)
+                    batch = []
+            if batch:
+                self._commit_batch(batch, end_offset, checkpoint)
+            self._finish(checkpoint)
+
+        return ImportReport(
+            imported=checkpoint.imported,
+            resumed_from=resumed_from,
+            seconds=time.perf_counter() - start,
+            mismatches=self.verify(checkpoint.totals)
+        )
+
+    def _check_schema(self) -> None:
+        if not inspect(self.engine).has_table("schema_version"):
+            Base.metadata.create_all(bind=self.engine)
+            with self.engine.begin() as connection:
+                connection.execute(SchemaVersionModel.__table__.insert().values(version=SCHEMA_VERSION))
+            return
+        with self.engine.connect() as connection:
+            current = connection.execute(text("SELECT MAX(version) FROM schema_version")).scalar()
+        if current < SCHEMA_VERSION:
+            raise RepositoryError(
+                f"Esquema de BD v{current} desactualizado, se requiere v{SCHEMA_VERSION}. "
+                "Ejecutar antes las migraciones: python -m app.infrastructure.database.migrations"
+            )
+
+    def _open_checkpoint(self) -> ImportCheckpoint:
+        current = ImportCheckpoint.for_source(self.source)
+        saved = ImportCheckpoint.load(self.checkpoint_path)
+        if saved is not None:
+            if not saved.matches(current):
+                raise RepositoryError(
+                    f"El archivo cambió desde el checkpoint {self.checkpoint_path}; "
+                    "borrarlo para importar desde el principio"
+                )
+            logger.info("Retomando la importación en el gasto %s (byte %s)", saved.imported, saved.offset)
+            return saved
+
+        with self.engine.connect() as connection:
+            existing = connection.execute(text("SELECT COUNT(*) FROM expenses")).scalar()
+        if existing:
+            raise RepositoryError(
+                f"La tabla expenses ya tiene {existing} gastos: la importación conserva los ids "
+                "y necesita una tabla vacía (o el checkpoint de una importación anterior)"
+            )
+        current.save(self.checkpoint_path)
+        return current
+
+    @staticmethod
+    def _to_expense(item: dict, position: int) -> Expense:
+        try:
+            expense = expense_from_dict(item)
+        except (KeyError, TypeError, ValueError) as e:
+            raise RepositoryError(f"Gasto #{position} del archivo inválido: {e}")
+        if expense.id is None:
+            raise RepositoryError(f"Gasto #{position} del archivo sin id")
+        return expense
+
+    def _commit_batch(self, batch: List[Expense], end_offset: int, checkpoint: ImportCheckpoint) -> None:
+        """Inserta el lote en una transacción y, ya confirmado, avanza el checkpoint"""
+        with self.engine.begin() as connection:
+            category_ids = self._ensure_categories(connection, {e.category for e in batch})
+            if connection.dialect.name == "postgresql":
+                self._copy(connection, batch, category_ids)
+            else:
+                self._insert(connection, batch, category_ids)
+
+        for expense in batch:
+            entry = checkpoint.totals.setdefault((expense.category, expense.currency), [0, 0.0])
+            entry[0] += 1
+            entry[1] += expense.amount
+        checkpoint.offset = end_offset
+        checkpoint.imported += len(batch)
+        checkpoint.max_id = max(checkpoint.max_id, max(e.id for e in batch))
+        checkpoint.save(self.checkpoint_path)
+        logger.info("%s gastos importados", checkpoint.imported)
+
+    def _ensure_categories(self, connection: Connection, names: Iterable[str]) -> Dict[str, int]:
+        """Ids de las categorías del lote, dando de alta las que falten"""
+        missing = sorted(name for name in names if name not in self._category_ids)
+        if missing:
+            insert = _dialect_insert(connection)(CategoryModel.__table__)
+            connection.execute(
+                insert.on_conflict_do_nothing(index_elements=["name"]),
+                [{"name": name} for name in missing]
+            )
+            rows = connection.execute(
+                select(CategoryModel.name, CategoryModel.id).where(CategoryModel.name.in_(missing))
+            )
+            self._category_ids.update(dict(rows.all()))
+        return self._category_ids
+
+    @staticmethod
+    def _copy(connection: Connection, batch: List[Expense], category_ids: Dict[str, int]) -> None:
+        """COPY a una tabla temporal y de ahí a expenses, salteando ids ya importados"""
+        buffer = io.StringIO()
+        for e in batch:
+            values = (
+                e.id, repr(e.amount), e.currency, e.category, category_ids[e.category],
+                PaymentMethodEnum(e.payment_method.value).name,
+                e.date.isoformat() if e.date else None, e.description
+            )
+            buffer.write("\t".join(_copy_field(value) for value in values))
+            buffer.write("\n")
+        buffer.seek(0)
+
+        enum_type = ExpenseModel.__table__.c.payment_method.type.name
+        columns = ", ".join(_COPY_COLUMNS)
+        connection.execute(text("""
+            CREATE TEMP TABLE IF NOT EXISTS expenses_import (
+                id INTEGER, amount DOUBLE PRECISION, currency VARCHAR(3), category VARCHAR(100),
+                category_id INTEGER, payment_method TEXT, date TIMESTAMP, description VARCHAR(500)
+            ) ON COMMIT DELETE ROWS
+        """))
+        cursor = connection.connection.cursor()
+        try:
+            cursor.copy_expert(f"COPY expenses_import ({columns}) FROM STDIN", buffer)
+        finally:
+            cursor.close()
+        connection.execute(text(f"""
+            INSERT INTO expenses ({columns}, created_at, update_at)
+            SELECT id, amount, currency, category, category_id, payment_method::{enum_type}, date, description,
+                   now() AT TIME ZONE 'utc', now() AT TIME ZONE 'utc'
+            FROM expenses_import
+            ON CONFLICT (id) DO NOTHING
+        """))
+
+    @staticmethod
+    def _insert(connection: Connection, batch: List[Expense], category_ids: Dict[str, int]) -> None:
+        """INSERT de varias filas (motores sin COPY)"""
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "id": e.id, "amount": e.amount, "currency": e.currency, "category": e.category,
+                "category_id": category_ids[e.category],
+                "payment_method": PaymentMethodEnum(e.payment_method.value),
+                "date": e.date, "description": e.description, "created_at": now, "update_at": now,
+            }
+            for e in batch
+        ]
+        insert = _dialect_insert(connection)(ExpenseModel.__table__)
+        connection.execute(insert.on_conflict_do_nothing(index_elements=["id"]), rows)
+
+    def _finish(self, checkpoint: ImportCheckpoint) -> None:
+        """Ajusta la secuencia de ids y recalcula los contadores mensuales de presupuestos"""
+        with self.engine.begin() as connection:
+            if connection.dialect.name == "postgresql":
+                connection.execute(text(
+                    "SELECT setval(pg_get_serial_sequence('expenses', 'id'), MAX(id)) FROM expenses"
+                ))
+            self._rebuild_month_totals(connection)
+        checkpoint.completed = True
+        checkpoint.save(self.checkpoint_path)
+
+    def _rebuild_month_totals(self, connection: Connection) -> None:
+        """
+        Contadores (categoría, mes) en la moneda base, como al escribir gastos
+
+        SQL reduce a una fila por (categoría, moneda, día) y la conversión con
+        las tasas de exchange_rates es vectorizada. Si falta la tasa de alguna
+        moneda los contadores quedan como estaban (con un aviso): se recalculan
+        con POST /budgets/rebuild después de cargar las tasas.
+        """
+        day = day_key_sql(connection.dialect.name)
+        rows = connection.execute(text(f"""
+            SELECT category, currency, {day}, SUM(amount)
+            FROM expenses
+            WHERE date IS NOT NULL
+            GROUP BY category, currency, {day}
+        """)).all()
+        rates = ExchangeRates(
+            [ExchangeRate(d, c, r) for c, d, r in connection.execute(
+                select(ExchangeRateModel.currency, ExchangeRateModel.date, ExchangeRateModel.rate)
+            )],
+            self.base_currency
+        )
+        totals = {}
+        if rows:
+            categories, currencies, days, sums = zip(*rows)
+            try:
+                # Clave mes + categoría: el mes tiene ancho fijo y se separa sin ambigüedad
+                totals = sum_by_key_in_currency(
+                    [f"{d[:7]}{category}" for category, d in zip(categories, days)],
+                    sums,
+                    currencies,
+                    np.asarray(days, dtype="datetime64[D]").astype(np.int64),
+                    rates,
+                    rates.pivot
+                )
+            except MissingRateError as e:
+                logger.warning("Contadores de presupuestos sin recalcular: %s", e)
+                return
+        connection.execute(text("DELETE FROM category_month_totals"))
+        if totals:
+            connection.execute(CategoryMonthTotalModel.__table__.insert(), [
+                {"category": key[7:], "month": key[:7], "total": round(total, 2)}
+                for key, total in totals.items()
+            ])
+
+    def verify(self, expected: Totals) -> List[str]:
+        """
+        Compara cantidad y suma por (categoría, moneda) del archivo contra la BD
+        Returns: List[str]: Diferencias encontradas (vacía si coincide todo)
+        """
+        with self.engine.connect() as connection:
+            rows = connection.execute(text(
+                "SELECT category, currency, COUNT(*), SUM(amount) FROM expenses GROUP BY category, currency"
+            )).all()
+        actual = {(category, currency): [count, total] for category, currency, count, total in rows}
+
+        mismatches = []
+        for key in sorted(set(expected) | set(actual)):
+            expected_count, expected_total = expected.get(key, [0, 0.0])
+            count, total = actual.get(key, [0, 0.0])
+            if count != expected_count or not math.isclose(total, expected_total, rel_tol=1e-9, abs_tol=0.01):
+                mismatches.append(
+                    f"{key[0]} ({key[1]}): archivo {expected_count} gastos / {expected_total:.2f}, "
+                    f"BD {count} gastos / {total:.2f}"
+                )
+        return mismatches
+
+
+def _dialect_insert(connection: Connection):
+    """insert() del dialecto, con soporte de ON CONFLICT DO NOTHING"""
+    if connection.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
+
+
+def _copy_field(value) -> str:
+    """Valor en el formato de texto de COPY (\\N = NULL)"""
+    if value is None:
+        return "\\N"
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from ...core.config import settings
+    from .connection import build_engine
+
+    parser = argparse.ArgumentParser(description="Importa a la BD los gastos de un archivo JSON")
+    parser.add_argument("source", nargs="?", default=settings.data_file_path, help="Archivo JSON de gastos")
+    parser.add_argument("--database-url", default=settings.database_url)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--checkpoint", type=Path, help="Archivo de checkpoint (por defecto <source>.import.json)")
+    args = parser.parse_args(argv)
+
+    engine = build_engine(args.database_url)
+    try:
+        report = JsonToDatabaseImport(
+            Path(args.source), engine, args.checkpoint, args.batch_size, settings.base_currency
+        ).run()
+    except RepositoryError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+    finally:
+        engine.dispose()
+
+    if report.resumed_from:
+        print(f"Retomada en el gasto {report.resumed_from}")
+    print(f"{report.imported} gastos importados en {report.seconds:.1f}s")
+    if not report.verified:
+        print("La verificación encontró diferencias:", file=sys.stderr)
+        for mismatch in report.mismatches:
+            print(f"  {mismatch}", file=sys.stderr)
+        return 1
+    print("Verificación OK: cantidades y totales por categoría coinciden")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    sys.exit(main())
@@ -0,0 +1,152 @@
+# app/infrastructure/database/migrations.py
+"""
+Migraciones del esquema
+
+Cada migración lleva la BD de la versión N-1 a N y se registra con
+@migration(N). ensure_schema() no las aplica al arrancar: se ejecutan con
+
+    python -m app.infrastructure.database.migrations
+
+Una BD con la tabla expenses pero sin schema_version es anterior al
+versionado: es la v1 y se le aplican todas las migraciones (ensure_schema
+lo hace al arrancar, ya que esas BD se creaban con create_all).
+"""
+import logging
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+from .models import (
+    Base, BudgetModel, CategoryModel, CategoryMonthTotalModel, ExchangeRateModel, ExpenseModel,
+    SchemaVersionModel, SCHEMA_VERSION
+)
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS: Dict[int, Callable[[Connection], None]] = {}
+
+
+def migration(version: int):
+    """Registra la función que migra a `version`"""
+    def register(function: Callable[[Connection], None]) -> Callable[[Connection], None]:
+        MIGRATIONS[version] = function
+        return function
+    return register
+
+
+def schema_version(connection: Connection) -> Optional[int]:
+    """
+    Versión del esquema de la BD
+    Returns: Optional[int]: None si la BD está vacía; 1 si tiene expenses
+             pero no schema_version (creada antes del versionado)
+    """
+    tables = inspect(connection)
+    if tables.has_table(SchemaVersionModel.__tablename__):
+        return connection.execute(text("SELECT MAX(version) FROM schema_version")).scalar() or 1
+    return 1 if tables.has_table(ExpenseModel.__tablename__) else None
+
+
+def month_key_sql(dialect_name: str, column: str = "date") -> str:
+    """Expresión SQL que formatea una fecha como YYYY-MM"""
+    if dialect_name == "sqlite":
+        return f"strftime('%Y-%m', {column})"
+    return f"to_char({column}, 'YYYY-MM')"
+
+
+def day_key_sql(dialect_name: str, column: str = "date") -> str:
+    """Expresión SQL que formatea una fecha como YYYY-MM-DD"""
+    if dialect_name == "sqlite":
+        return f"strftime('%Y-%m-%d', {column})"
+    return f"to_char({column}, 'YYYY-MM-DD')"
+
+
+@migration(2)
+def _add_budgets(connection: Connection) -> None:
+    """Tablas de presupuestos y contadores mensuales, con backfill desde expenses"""
+    Base.metadata.create_all(
+        bind=connection,
+        tables=[BudgetModel.__table__, CategoryMonthTotalModel.__table__]
+    )
+    month = month_key_sql(connection.dialect.name)
+    connection.execute(text(f"""
+        INSERT INTO category_month_totals (category, month, total)
+        SELECT category, {month}, SUM(amount)
+        FROM expenses
+        GROUP BY category, {month}
+    """))
+
+
+@migration(3)
+def _add_expense_date_index(connection: Connection) -> None:
+    """Índice (date, id) para los listados ordenados por fecha con límite"""
+    for index in ExpenseModel.__table__.indexes:
+        if index.name == "ix_expenses_date_id":
+            index.create(bind=connection, checkfirst=True)
+
+
+@migration(4)
+def _add_categories(connection: Connection) -> None:
+    """Tabla categories y expenses.category_id, con backfill desde los nombres"""
+    Base.metadata.create_all(bind=connection, tables=[CategoryModel.__table__])
+    connection.execute(text("INSERT INTO categories (name) SELECT DISTINCT category FROM expenses"))
+    connection.execute(text("ALTER TABLE expenses ADD COLUMN category_id INTEGER REFERENCES categories (id)"))
+    connection.execute(text("""
+        UPDATE expenses
+        SET category_id = (SELECT c.id FROM categories c WHERE c.name = expenses.category)
+    """))
+    if connection.dialect.name == "postgresql":
+        # SQLite no permite agregar NOT NULL a una columna existente
+        connection.execute(text("ALTER TABLE expenses ALTER COLUMN category_id SET NOT NULL"))
+    for index in ExpenseModel.__table__.indexes:
+        if index.name == "ix_expenses_category_id":
+            index.create(bind=connection, checkfirst=True)
+
+
+@migration(5)
+def _add_currencies(connection: Connection) -> None:
+    """expenses.currency (los gastos existentes quedan en USD) y la tabla exchange_rates"""
+    connection.execute(text("ALTER TABLE expenses ADD COLUMN currency VARCHAR(3) NOT NULL DEFAULT 'USD'"))
+    Base.metadata.create_all(bind=connection, tables=[ExchangeRateModel.__table__])
+
+
+def run_migrations(engine: Optional[Engine] = None) -> List[int]:
+    """
+    Aplica en orden las migraciones pendientes, cada una en su transacción
+    Una BD vacía se crea directamente en la versión actual
+    Returns: List[int]: Versiones aplicadas
+    """
+    from .connection import get_engine
+
+    engine = engine or get_engine()
+    with engine.connect() as connection:
+        current = schema_version(connection)
+
+    if current is None:
+        with engine.begin() as connection:
+            Base.metadata.create_all(bind=connection)
+            connection.execute(SchemaVersionModel.__table__.insert().values(version=SCHEMA_VERSION))
+        return []
+
+    # Anterior al versionado: se registra como v1 antes de migrar
+    with engine.begin() as connection:
+        if not inspect(connection).has_table(SchemaVersionModel.__tablename__):
+            SchemaVersionModel.__table__.create(bind=connection)
+            connection.execute(SchemaVersionModel.__table__.insert().values(version=1))
+
+    applied = []
+    for version in range(current + 1, SCHEMA_VERSION + 1):
+        with engine.begin() as connection:
+            MIGRATIONS[version](connection)
+            connection.execute(
+                SchemaVersionModel.__table__.insert().values(version=version)
+            )
+        logger.info("Migración a v%s aplicada", version)
+        applied.append(version)
+    return applied
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    versions = run_migrations()
+    print(f"Migraciones aplicadas: {versions}" if versions else f"Esquema al día (v{SCHEMA_VERSION})")
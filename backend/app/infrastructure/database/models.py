@@ -1,5 +1,5 @@
 # app/infrastructure/database/models.py
-from sqlalchemy import Column, Integer, Float, String, DateTime, Enum
+from sqlalchemy import Column, Date, Integer, Float, String, DateTime, Enum, ForeignKey, Index, PrimaryKeyConstraint
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 from datetime import timezone
@@ -7,6 +7,9 @@ import enum
 
 Base=declarative_base()
 
+# Versión del esquema que espera el código (ver connection.ensure_schema)
+SCHEMA_VERSION = 5
+
 class PaymentMethodEnum(str, enum.Enum):
     """
     Enum para metodos de pago en la base de datos
@@ -15,6 +18,20 @@ class PaymentMethodEnum(str, enum.Enum):
     DEBIT_CARD = "debit_card"
     CREDIT_CARD = "credit_card"
 
+class CategoryModel(Base):
+    """
+    Dimensión de categorías: cada nombre (ya normalizado por Expense) una vez,
+    con una clave entera que referencian los gastos
+    """
+    __tablename__ = "categories"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(100), nullable=False, unique=True)
+
+    def __repr__(self):
+        return f"<Category(id={self.id}, name={self.name})>"
+
+
 class ExpenseModel(Base):
     """
     Modelo SQLAlchemy para la tabla de gastos
@@ -24,7 +41,10 @@ class ExpenseModel(Base):
     
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     amount = Column(Float, nullable=False, index=True)
+    currency = Column(String(3), nullable=False, default="USD", server_default="USD")  # ISO 4217
     category =Column(String(100), nullable=False, index=True)
+    # Filtros y group-by van por category_id; category queda como nombre para leer
+    category_id = Column(Integer, ForeignKey("categories.id"), nullable=False, index=True)
     payment_method = Column(Enum(PaymentMethodEnum), nullable=False, index=True)
     #date = Column(DateTime, default=datetime.utcnow)
     date = Column(DateTime, default=lambda: datetime.now(timezone.utc))
@@ -33,8 +53,65 @@ class ExpenseModel(Base):
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc)) 
     #update_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     update_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        # ORDER BY date DESC, id DESC LIMIT n (listados recientes) se resuelve
+        # leyendo el índice, sin ordenar la tabla
+        Index("ix_expenses_date_id", "date", "id"),
+    )
     
     def __repr__(self):
         return f"<Expense(id={self.id}, amount={self.amount}, category={self.category})>"
-    
-    
\ No newline at end of file
+
+
+class SchemaVersionModel(Base):
+    """
+    Tabla con la versión del esquema aplicada
+    Permite verificar el esquema al arrancar con una sola consulta
+    """
+    __tablename__ = "schema_version"
+
+    version = Column(Integer, primary_key=True)
+    applied_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+
+class BudgetModel(Base):
+    """
+    Presupuesto mensual por categoría
+    """
+    __tablename__ = "budgets"
+
+    category = Column(String(100), primary_key=True)
+    monthly_limit = Column(Float, nullable=False)
+    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+
+class CategoryMonthTotalModel(Base):
+    """
+    Total gastado por (categoria, mes)
+
+    Contador que se actualiza en la misma transacción que cada escritura de
+    gastos (ver PostgreSQLBudgetRepository); se puede reconstruir desde expenses.
+    """
+    __tablename__ = "category_month_totals"
+
+    category = Column(String(100), nullable=False)
+    month = Column(String(7), nullable=False)  # YYYY-MM
+    total = Column(Float, nullable=False, default=0.0)
+
+    __table_args__ = (PrimaryKeyConstraint("category", "month"),)
+
+
+class ExchangeRateModel(Base):
+    """
+    Tipo de cambio de una moneda vigente desde una fecha: cuánto vale una
+    unidad en la moneda base configurada. Se carga entera en memoria
+    (ver ExchangeRateCache), no se consulta por gasto.
+    """
+    __tablename__ = "exchange_rates"
+
+    currency = Column(String(3), nullable=False)
+    date = Column(Date, nullable=False)
+    rate = Column(Float, nullable=False)
+
+    __table_args__ = (PrimaryKeyConstraint("currency", "date"),)
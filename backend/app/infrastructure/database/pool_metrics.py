@@ -0,0 +1,173 @@
+# app/infrastructure/database/pool_metrics.py
+import math
+import threading
+import time
+from collections import deque
+from typing import Dict
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+
+def percentile(ordered: list, p: float) -> float:
+    """Percentil p (0-100) de una lista ya ordenada (nearest-rank; 0.0 si está vacía)"""
+    if not ordered:
+        return 0.0
+    index = min(max(math.ceil(p / 100 * len(ordered)) - 1, 0), len(ordered) - 1)
+    return ordered[index]
+
+
+class PoolMetrics:
+    """
+    Contadores del pool de conexiones
+
+    Permite distinguir si la latencia viene de esperar una conexión libre
+    (pool saturado) o de las consultas en sí.
+    """
+
+    def __init__(self, max_samples: int = 1000):
+        self._lock = threading.Lock()
+        self._waits = deque(maxlen=max_samples)
+        self.checkouts = 0
+        self.checkins = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.timeouts = 0
+        self.peak_checked_out = 0
+        self.peak_overflow = 0
+        self.waits = 0  # Esperas registradas desde el arranque (_waits guarda solo las últimas)
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        """Registra el tiempo que se esperó por una conexión del pool"""
+        with self._lock:
+            self._waits.append(seconds)
+            self.waits += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def record_checkout(self, checked_out: int, overflow: int) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+            self.peak_overflow = max(self.peak_overflow, overflow)
+
+    def record_checkin(self) -> None:
+        with self._lock:
+            self.checkins += 1
+
+    def record_connect(self) -> None:
+        with self._lock:
+            self.connects += 1
+
+    def record_invalidation(self) -> None:
+        with self._lock:
+            self.invalidations += 1
+
+    def _wait_percentile(self, ordered: list, p: float) -> float:
+        return percentile(ordered, p)
+
+    def snapshot(self) -> Dict:
+        """Devuelve una copia de los contadores con las esperas en milisegundos"""
+        with self._lock:
+            waits = sorted(self._waits)
+            return {
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "connects": self.connects,
+                "invalidations": self.invalidations,
+                "timeouts": self.timeouts,
+                "peak_checked_out": self.peak_checked_out,
+                "peak_overflow": self.peak_overflow,
+                "wait_ms": {
+                    "avg": (self.total_wait / self.waits * 1000) if self.waits else 0.0,
+                    "p50": self._wait_percentile(waits, 50) * 1000,
+                    "p95": self._wait_percentile(waits, 95) * 1000,
+                    "p99": self._wait_percentile(waits, 99) * 1000,
+                    "max": self.max_wait * 1000,
+                },
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool que mide el tiempo de espera de cada checkout
+
+    SQLAlchemy no emite un evento antes de esperar una conexión, así que
+    la espera (y los timeouts) se miden envolviendo _do_get.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        # dispose() recrea el pool; conservar los contadores acumulados
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Registra los eventos del pool (checkout, checkin, connect, invalidate)
+    Los listeners leen engine.pool en cada evento porque dispose() lo reemplaza.
+    """
+    if not isinstance(engine.pool, InstrumentedQueuePool):
+        return
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        pool = engine.pool
+        pool.metrics.record_checkout(pool.checkedout(), max(0, pool.overflow()))
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        engine.pool.metrics.record_checkin()
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        engine.pool.metrics.record_connect()
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        engine.pool.metrics.record_invalidation()
+
+
+def get_pool_status(engine: Engine) -> Dict:
+    """
+    Estado actual del pool más los contadores acumulados
+    Returns: Dict: Tamaño, conexiones en uso, overflow y métricas de espera
+    """
+    pool = engine.pool
+    if not isinstance(pool, InstrumentedQueuePool):
+        return {"pool_class": type(pool).__name__, "instrumented": False}
+
+    checked_out = pool.checkedout()
+    capacity = pool.size() + pool._max_overflow
+    return {
+        "pool_class": type(pool).__name__,
+        "instrumented": True,
+        "pool_size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "timeout_seconds": pool.timeout(),
+        "checked_out": checked_out,
+        "checked_in": pool.checkedin(),
+        "overflow": max(0, pool.overflow()),
+        "saturated": checked_out >= capacity,
+        **pool.metrics.snapshot(),
+    }
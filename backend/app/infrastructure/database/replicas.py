@@ -0,0 +1,182 @@
+# app/infrastructure/database/replicas.py
+import itertools
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError, DisconnectionError, OperationalError
+from sqlalchemy.orm import Session, sessionmaker
+
+from ...core.config import settings
+from .connection import build_engine, get_session_factory
+from .pool_metrics import get_pool_status
+
+
+class ReplicaState:
+    """Una réplica de lectura con su pool y su estado de salud"""
+
+    def __init__(self, url: str, engine: Engine):
+        self.url = url
+        self.engine = engine
+        self.session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        self.failures = 0
+        self.ejected_until = 0.0
+
+    def status(self, now: float) -> Dict:
+        return {
+            "url": self.engine.url.render_as_string(hide_password=True),
+            "healthy": now >= self.ejected_until,
+            "failures": self.failures,
+            "ejected_for_seconds": max(0.0, self.ejected_until - now),
+            "pool": get_pool_status(self.engine),
+        }
+
+
+class ReplicaRouter:
+    """
+    Decide si una lectura va a una réplica o al primario
+
+    - Round robin entre réplicas sanas
+    - Read-your-writes: un cliente que escribió hace menos de N segundos
+      lee del primario para ver su propio cambio aunque la réplica tenga lag
+    - Expulsión por salud: tras `max_failures` errores seguidos la réplica
+      queda fuera `ejection_seconds`; al volver, un solo error la expulsa de nuevo
+    """
+
+    def __init__(
+        self,
+        replica_urls: List[str],
+        read_your_writes_seconds: float = 5.0,
+        max_failures: int = 3,
+        ejection_seconds: float = 30.0,
+        engine_builder: Callable[[str], Engine] = build_engine,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._replicas = [ReplicaState(url, engine_builder(url)) for url in replica_urls]
+        self._cycle = itertools.cycle(range(len(self._replicas))) if self._replicas else None
+        self._read_your_writes_seconds = read_your_writes_seconds
+        self._max_failures = max_failures
+        self._ejection_seconds = ejection_seconds
+        self._clock = clock
+        self._last_write: Dict[str, float] = {}
+        self._last_any_write: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def replicas(self) -> List[ReplicaState]:
+        return list(self._replicas)
+
+    def record_write(self, client_key: str) -> None:
+        """Marca que el cliente acaba de escribir (abre la ventana read-your-writes)"""
+        now = self._clock()
+        with self._lock:
+            self._last_write[client_key] = now
+            self._last_any_write = now
+            # Limpieza oportunista para que el diccionario no crezca sin límite
+            if len(self._last_write) > 10_000:
+                cutoff = now - self._read_your_writes_seconds
+                self._last_write = {k: t for k, t in self._last_write.items() if t >= cutoff}
+
+    def has_recent_write(self, client_key: str) -> bool:
+        with self._lock:
+            last = self._last_write.get(client_key)
+        return last is not None and self._clock() - last < self._read_your_writes_seconds
+
+    def has_any_recent_write(self) -> bool:
+        """
+        True si algún cliente escribió dentro de la ventana read-your-writes
+
+        Mientras tanto una réplica puede no tener la escritura todavía: lo que
+        se lea de ella no debe quedar en cachés compartidas entre clientes.
+        """
+        with self._lock:
+            last = self._last_any_write
+        return last is not None and self._clock() - last < self._read_your_writes_seconds
+
+    def choose(self, client_key: str) -> Optional[ReplicaState]:
+        """
+        Elige una réplica para leer
+        Returns: Optional[ReplicaState]: None si hay que leer del primario
+        """
+        if not self._replicas or self.has_recent_write(client_key):
+            return None
+
+        now = self._clock()
+        with self._lock:
+            for _ in range(len(self._replicas)):
+                replica = self._replicas[next(self._cycle)]
+                if now >= replica.ejected_until:
+                    return replica
+        return None
+
+    def mark_failure(self, replica: ReplicaState) -> None:
+        with self._lock:
+            replica.failures += 1
+            if replica.failures >= self._max_failures:
+                replica.ejected_until = self._clock() + self._ejection_seconds
+                # Al readmitirla basta un error para volver a expulsarla
+                replica.failures = self._max_failures - 1
+
+    def mark_success(self, replica: ReplicaState) -> None:
+        with self._lock:
+            replica.failures = 0
+
+    def status(self) -> List[Dict]:
+        now = self._clock()
+        return [replica.status(now) for replica in self._replicas]
+
+
+_router: Optional[ReplicaRouter] = None
+
+
+def get_replica_router() -> ReplicaRouter:
+    """Router global construido desde Settings la primera vez que se usa"""
+    global _router
+    if _router is None:
+        _router = ReplicaRouter(
+            settings.get_replica_urls(),
+            read_your_writes_seconds=settings.replica_read_your_writes_seconds,
+            max_failures=settings.replica_max_failures,
+            ejection_seconds=settings.replica_ejection_seconds,
+        )
+    return _router
+
+
+def is_connection_error(error: BaseException) -> bool:
+    """True si el error indica que la BD no está disponible (no un error de la consulta)"""
+    if isinstance(error, DisconnectionError):
+        return True
+    if isinstance(error, DBAPIError):
+        return error.connection_invalidated or isinstance(error, OperationalError)
+    return False
+
+
+def open_read_session(
+    client_key: str,
+    router: Optional[ReplicaRouter] = None,
+    primary_factory: Optional[sessionmaker] = None,
+) -> Tuple[Session, Optional[ReplicaState]]:
+    """
+    Abre una sesión para lecturas: réplica si corresponde, primario si no
+
+    La conexión de la réplica se obtiene en el momento (con pre-ping) para
+    detectar réplicas caídas y volver al primario sin fallar la petición.
+
+    Returns:
+        Tuple: (sesión, réplica usada o None si es el primario)
+    """
+    router = router or get_replica_router()
+    replica = router.choose(client_key)
+    if replica is not None:
+        db = replica.session_factory()
+        try:
+            db.connection()
+            router.mark_success(replica)
+            return db, replica
+        except (DBAPIError, DisconnectionError):
+            db.close()
+            router.mark_failure(replica)
+
+    factory = primary_factory or get_session_factory()
+    return factory(), None
@@ -0,0 +1,293 @@
+# app/infrastructure/database/slow_queries.py
+import hashlib
+import json
+import logging
+import re
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .pool_metrics import percentile
+
+logger = logging.getLogger(__name__)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+# Parámetros de los drivers: %(name)s (psycopg2), %s, ? y :name (SQLite)
+_PARAMETER = re.compile(r"%\(\w+\)s|%s|\?|(?<!:):\w+")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+# Solo se explican lecturas: ANALYZE ejecuta la sentencia
+_EXPLAINABLE = ("select", "with")
+
+
+def normalize_sql(statement: str) -> str:
+    """
+    Forma canónica de una sentencia: literales y parámetros como ?, listas
+    IN (?, ?, ?) como (?...) y espacios colapsados. Dos consultas que solo
+    difieren en valores quedan iguales
+    """
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _PARAMETER.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _IN_LIST.sub("(?...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def fingerprint_of(normalized: str) -> str:
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:12]
+
+
+def parameters_shape(parameters: Any, executemany: bool = False) -> Any:
+    """Tipos de los parámetros, sin los valores (pueden ser datos personales)"""
+    if executemany:
+        return {"rows": len(parameters), "row": parameters_shape(parameters[0]) if parameters else None}
+    if isinstance(parameters, dict):
+        return {name: type(value).__name__ for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def _calling_repository_method() -> Optional[str]:
+    """
+    Método del repositorio que emitió la sentencia (ej: PostgreSQLExpenseRepository.find)
+    El más externo del mismo objeto: get_total_by_category y no su auxiliar _category_names
+    """
+    frame = sys._getframe(2)
+    owner, method = None, None
+    while frame is not None:
+        if frame.f_code.co_filename.endswith("_repository.py"):
+            current = frame.f_locals.get("self")
+            if owner is None or current is owner:
+                owner, method = current, frame.f_code.co_name
+        frame = frame.f_back
+    if method is None:
+        return None
+    return f"{type(owner).__name__}.{method}" if owner is not None else method
+
+
+class StatementStats:
+    """Duraciones de una sentencia (por fingerprint) y su último plan"""
+
+    def __init__(self, fingerprint: str, sql: str, source: Optional[str], max_samples: int):
+        self.fingerprint = fingerprint
+        self.sql = sql
+        self.source = source
+        self.count = 0
+        self.slow_count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._durations: Deque[float] = deque(maxlen=max_samples)
+        self.plan: Optional[Any] = None
+        self.plan_captured_at: Optional[str] = None
+        self.last_explain = 0.0  # perf_counter del último EXPLAIN pedido
+        self.explaining = False  # Hay un EXPLAIN en curso (no pedir otro)
+
+    def record(self, seconds: float, slow: bool) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self._durations.append(seconds)
+        if slow:
+            self.slow_count += 1
+
+    def snapshot(self) -> Dict:
+        durations = sorted(self._durations)
+        return {
+            "fingerprint": self.fingerprint,
+            "sql": self.sql,
+            "source": self.source,
+            "count": self.count,
+            "slow_count": self.slow_count,
+            "total_ms": self.total * 1000,
+            "duration_ms": {
+                "avg": self.total / self.count * 1000 if self.count else 0.0,
+                "p50": percentile(durations, 50) * 1000,
+                "p95": percentile(durations, 95) * 1000,
+                "p99": percentile(durations, 99) * 1000,
+                "max": self.max * 1000,
+            },
+            "plan_captured_at": self.plan_captured_at,
+        }
+
+
+class QueryStats:
+    """
+    Estadísticas por fingerprint de todas las sentencias de un engine y
+    registro de las lentas (log + EXPLAIN (ANALYZE, BUFFERS) opcional)
+
+    Normalizar cuesta una regex por sentencia distinta: el texto SQL de
+    SQLAlchemy se repite (los valores van como parámetros), así que se
+    cachea por texto. Los EXPLAIN corren en un hilo aparte, con a lo sumo
+    uno por fingerprint cada explain_interval segundos.
+    """
+
+    def __init__(
+        self,
+        threshold: float,
+        explain: Optional[Callable[[str, Any], Any]] = None,
+        explain_interval: float = 300.0,
+        plans_path: Optional[str] = None,
+        max_statements: int = 500,
+        max_samples: int = 500,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        """
+        Args: threshold: Segundos a partir de los cuales una sentencia es lenta
+              explain: Función (sql, parámetros) -> plan; None = no explicar
+              plans_path: Archivo JSONL donde se agregan los planes capturados
+        """
+        self.threshold = threshold
+        self.explain_interval = explain_interval
+        self.plans_path = Path(plans_path) if plans_path else None
+        self.max_statements = max_statements
+        self.max_samples = max_samples
+        self._explain = explain
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._normalized: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()
+        self._statements: Dict[str, StatementStats] = {}
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="explain") if explain else None
+        self._pending_explains = 0
+
+    def _normalize(self, statement: str) -> Tuple[str, str]:
+        cached = self._normalized.get(statement)
+        if cached is None:
+            normalized = normalize_sql(statement)
+            cached = (normalized, fingerprint_of(normalized))
+            self._normalized[statement] = cached
+            if len(self._normalized) > self.max_statements:
+                self._normalized.popitem(last=False)
+        return cached
+
+    def record(self, statement: str, parameters: Any, seconds: float, executemany: bool = False) -> None:
+        slow = seconds >= self.threshold
+        with self._lock:
+            normalized, fingerprint = self._normalize(statement)
+            stats = self._statements.get(fingerprint)
+            if stats is None:
+                if len(self._statements) >= self.max_statements:
+                    return  # Cota de memoria: sentencias nuevas más allá del límite no se agregan
+                stats = StatementStats(fingerprint, normalized, _calling_repository_method(), self.max_samples)
+                self._statements[fingerprint] = stats
+            stats.record(seconds, slow)
+            explain = slow and not executemany and self._should_explain(stats, statement)
+        if not slow:
+            return
+        logger.warning(
+            "Consulta lenta (%.1f ms) [%s] %s: %s params=%s",
+            seconds * 1000, fingerprint, stats.source or "-", normalized,
+            parameters_shape(parameters, executemany)
+        )
+        if explain:
+            self._executor.submit(self._capture_plan, stats, statement, parameters)
+
+    def _should_explain(self, stats: StatementStats, statement: str) -> bool:
+        if self._executor is None or not statement.lstrip()[:6].lower().startswith(_EXPLAINABLE):
+            return False
+        now = self._clock()
+        if stats.explaining:
+            return False
+        if stats.plan is not None and now - stats.last_explain < self.explain_interval:
+            return False
+        if self._pending_explains >= 4:
+            return False
+        stats.last_explain = now
+        stats.explaining = True
+        self._pending_explains += 1
+        return True
+
+    def _capture_plan(self, stats: StatementStats, statement: str, parameters: Any) -> None:
+        try:
+            plan = self._explain(statement, parameters)
+        except Exception as e:
+            logger.warning("No se pudo explicar la consulta [%s]: %s", stats.fingerprint, e)
+            return
+        finally:
+            with self._lock:
+                self._pending_explains -= 1
+                stats.explaining = False
+        captured_at = datetime.now().isoformat(timespec="seconds")
+        with self._lock:
+            stats.plan, stats.plan_captured_at = plan, captured_at
+        if self.plans_path is not None:
+            record = {"fingerprint": stats.fingerprint, "source": stats.source, "sql": stats.sql,
+                      "captured_at": captured_at, "plan": plan}
+            try:
+                self.plans_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.plans_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record, default=str) + "\n")
+            except OSError as e:
+                logger.warning("No se pudo guardar el plan [%s]: %s", stats.fingerprint, e)
+
+    def snapshot(self, limit: Optional[int] = None) -> List[Dict]:
+        """Sentencias ordenadas por tiempo total (las que más pesan primero)"""
+        with self._lock:
+            rows = [stats.snapshot() for stats in self._statements.values()]
+        rows.sort(key=lambda row: row["total_ms"], reverse=True)
+        return rows[:limit] if limit is not None else rows
+
+    def plan(self, fingerprint: str) -> Optional[Any]:
+        with self._lock:
+            stats = self._statements.get(fingerprint)
+            return stats.plan if stats is not None else None
+
+    def wait_for_explains(self) -> None:
+        """Espera los EXPLAIN encolados (tests y cierre ordenado)"""
+        if self._executor is not None:
+            self._executor.submit(lambda: None).result()
+
+
+_ENGINE_STATS: "weakref.WeakKeyDictionary[Engine, QueryStats]" = weakref.WeakKeyDictionary()
+
+
+def postgresql_explainer(engine: Engine) -> Callable[[str, Any], Any]:
+    """EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) con una conexión propia (se descarta con rollback)"""
+    def explain(statement: str, parameters: Any) -> Any:
+        with engine.connect() as connection:
+            result = connection.exec_driver_sql(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}", parameters)
+            plan = result.scalar()
+            connection.rollback()
+        return json.loads(plan) if isinstance(plan, str) else plan
+    return explain
+
+
+def instrument_queries(engine: Engine, stats: QueryStats) -> None:
+    """
+    Mide cada sentencia del engine (tiempo en el cursor, sin el fetch) y la
+    registra en stats. Los EXPLAIN propios no se registran
+    """
+    _ENGINE_STATS[engine] = stats
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(connection, cursor, statement, parameters, context, executemany):
+        connection.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(connection, cursor, statement, parameters, context, executemany):
+        started = connection.info["query_started"].pop()
+        if statement.startswith("EXPLAIN (ANALYZE"):
+            return
+        stats.record(statement, parameters, time.perf_counter() - started, executemany)
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(exception_context):
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_started"):
+            connection.info["query_started"].pop()
+
+
+def get_query_stats(engine: Engine) -> Optional[QueryStats]:
+    """Estadísticas del engine (None si no está instrumentado)"""
+    return _ENGINE_STATS.get(engine)
@@ -0,0 +1,117 @@
+# app/infrastructure/database/test_import_json.py
+import json
+
+import pytest
+from sqlalchemy import text
+
+from app.infrastructure.database.connection import build_engine
+from app.infrastructure.database.import_json import JsonToDatabaseImport
+from app.infrastructure.repositories.json_stream import iter_json_array
+
+
+def _write_expenses(path, count):
+    items = [
+        {
+            "id": i * 2,  # ids con huecos: deben conservarse
+            "amount": 10.5 + i,
+            "category": ["comida", "Transporte", "Café y té"][i % 3],
+            "payment_method": "cash",
+            "date": f"2024-0{1 + i % 3}-15T10:00:00",
+            "description": "línea\tcon\\escapes" if i % 4 == 0 else None,
+            "currency": "EUR" if i % 5 == 0 else "USD",
+        }
+        for i in range(1, count + 1)
+    ]
+    path.write_text(json.dumps(items, indent=2, ensure_ascii=False), encoding="utf-8")
+    return items
+
+
+class TestIterJsonArray:
+    """Tests del recorrido incremental de un arreglo JSON"""
+
+    def test_streams_items_and_resumes_from_offset(self, tmp_path):
+        """Test: Bloques chicos dan los mismos elementos y el offset permite retomar"""
+        path = tmp_path / "expenses.json"
+        items = _write_expenses(path, 7)
+
+        streamed = list(iter_json_array(path, chunk_size=16))
+        assert [item for item, _ in streamed] == items
+
+        offset = streamed[2][1]
+        assert [item for item, _ in iter_json_array(path, offset, chunk_size=16)] == items[3:]
+
+    def test_rejects_non_array(self, tmp_path):
+        """Test: Un archivo que no es un arreglo falla"""
+        path = tmp_path / "expenses.json"
+        path.write_text('{"id": 1}')
+        with pytest.raises(json.JSONDecodeError):
+            list(iter_json_array(path))
+
+
+class TestJsonToDatabaseImport:
+    """Tests de la importación JSON -> BD sobre SQLite"""
+
+    @pytest.fixture
+    def engine(self, tmp_path):
+        engine = build_engine(f"sqlite:///{tmp_path / 'import.db'}")
+        yield engine
+        engine.dispose()
+
+    def test_imports_preserving_ids_and_verifies(self, tmp_path, engine):
+        """Test: Se conservan los ids y la verificación coincide"""
+        source = tmp_path / "expenses.json"
+        items = _write_expenses(source, 23)
+
+        report = JsonToDatabaseImport(source, engine, batch_size=5).run()
+
+        assert report.imported == 23
+        assert report.verified
+        with engine.connect() as connection:
+            ids = [row[0] for row in connection.execute(text("SELECT id FROM expenses ORDER BY id"))]
+            names = {row[0] for row in connection.execute(text("SELECT name FROM categories"))}
+        assert ids == [item["id"] for item in items]
+        assert names == {"Comida", "Transporte", "Café Y Té"}
+
+    def test_resumes_after_interruption(self, tmp_path, engine, monkeypatch):
+        """Test: Tras un corte, volver a ejecutar sigue desde el checkpoint sin duplicar"""
+        source = tmp_path / "expenses.json"
+        _write_expenses(source, 23)
+        original = JsonToDatabaseImport._commit_batch
+        calls = {"count": 0}
+
+        def failing_commit(self, *args):
+            calls["count"] += 1
+            if calls["count"] == 3:
+                raise KeyboardInterrupt
+            return original(self, *args)
+
+        monkeypatch.setattr(JsonToDatabaseImport, "_commit_batch", failing_commit)
+        with pytest.raises(KeyboardInterrupt):
+            JsonToDatabaseImport(source, engine, batch_size=5).run()
+        monkeypatch.setattr(JsonToDatabaseImport, "_commit_batch", original)
+
+        report = JsonToDatabaseImport(source, engine, batch_size=5).run()
+
+        assert report.resumed_from == 10
+        assert report.imported == 23
+        assert report.verified
+
+    def test_month_totals_are_in_base_currency(self, tmp_path, engine):
+        """Test: Los contadores de presupuestos suman los gastos convertidos con las tasas de la BD"""
+        from app.infrastructure.database.models import Base, SCHEMA_VERSION
+        source = tmp_path / "expenses.json"
+        items = _write_expenses(source, 12)
+        Base.metadata.create_all(bind=engine)
+        with engine.begin() as connection:
+            connection.execute(text("INSERT INTO schema_version (version) VALUES (:v)"), {"v": SCHEMA_VERSION})
+            connection.execute(text("INSERT INTO exchange_rates (currency, date, rate) VALUES ('EUR', '2024-01-01', 2.0)"))
+
+        JsonToDatabaseImport(source, engine).run()
+
+        expected = {}
+        for item in items:
+            key = (item["category"].title(), item["date"][:7])
+            expected[key] = expected.get(key, 0) + item["amount"] * (2.0 if item["currency"] == "EUR" else 1.0)
+        with engine.connect() as connection:
+            totals = {(c, m): t for c, m, t in connection.execute(text("SELECT category, month, total FROM category_month_totals"))}
+        assert totals == pytest.approx(expected)
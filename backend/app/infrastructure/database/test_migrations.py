@@ -0,0 +1,83 @@
+# app/infrastructure/database/test_migrations.py
+import pytest
+from sqlalchemy import create_engine, inspect, text
+
+from app.domain.repositories.exceptions import RepositoryError
+from app.infrastructure.database.connection import ensure_schema
+from app.infrastructure.database.migrations import run_migrations, schema_version
+from app.infrastructure.database.models import SCHEMA_VERSION
+
+# Tabla expenses como la creaba el código anterior al versionado del esquema
+BASELINE_EXPENSES = """
+    CREATE TABLE expenses (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        amount FLOAT NOT NULL,
+        category VARCHAR(100) NOT NULL,
+        payment_method VARCHAR(11) NOT NULL,
+        date DATETIME,
+        description VARCHAR(500),
+        created_at DATETIME,
+        update_at DATETIME
+    )
+"""
+
+
+@pytest.fixture
+def baseline_engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'baseline.db'}")
+    with engine.begin() as connection:
+        connection.execute(text(BASELINE_EXPENSES))
+        connection.execute(text("""
+            INSERT INTO expenses (amount, category, payment_method, date) VALUES
+            (25.5, 'Comida', 'CASH', '2026-09-03 12:00:00'),
+            (14.5, 'Comida', 'DEBIT_CARD', '2026-09-20 09:00:00'),
+            (10, 'Transporte', 'CASH', '2026-10-01 08:00:00')
+        """))
+    yield engine
+    engine.dispose()
+
+
+class TestSchemaVersioning:
+    """Tests de la detección de versión y las migraciones"""
+
+    def test_unversioned_database_is_migrated_at_startup(self, baseline_engine):
+        """Test: Una BD anterior al versionado (v1) se migra al arrancar, con el backfill de presupuestos"""
+        with baseline_engine.connect() as connection:
+            assert schema_version(connection) == 1
+
+        assert ensure_schema(baseline_engine) == SCHEMA_VERSION
+
+        with baseline_engine.connect() as connection:
+            versions = connection.execute(text("SELECT version FROM schema_version ORDER BY version")).scalars().all()
+            totals = connection.execute(text("SELECT category, month, total FROM category_month_totals")).all()
+        assert versions == list(range(1, SCHEMA_VERSION + 1))
+        assert sorted(totals) == [("Comida", "2026-09", 40.0), ("Transporte", "2026-10", 10.0)]
+
+    def test_outdated_versioned_database_is_refused(self, baseline_engine):
+        """Test: Una BD versionada pero vieja no arranca hasta correr las migraciones"""
+        with baseline_engine.begin() as connection:
+            connection.execute(text("CREATE TABLE schema_version (version INTEGER PRIMARY KEY, applied_at DATETIME)"))
+            connection.execute(text("INSERT INTO schema_version (version) VALUES (1)"))
+
+        with pytest.raises(RepositoryError, match="v1 desactualizado"):
+            ensure_schema(baseline_engine)
+        assert not inspect(baseline_engine).has_table("category_month_totals")
+
+    def test_run_migrations_upgrades_unversioned_database(self, baseline_engine):
+        """Test: run_migrations aplica 2..N sobre una BD anterior al versionado"""
+        assert run_migrations(baseline_engine) == list(range(2, SCHEMA_VERSION + 1))
+
+        assert ensure_schema(baseline_engine) == SCHEMA_VERSION
+        with baseline_engine.connect() as connection:
+            rows = connection.execute(text("SELECT currency, category_id FROM expenses")).all()
+        assert all(currency == "USD" and category_id is not None for currency, category_id in rows)
+        assert run_migrations(baseline_engine) == []
+
+    def test_empty_database_is_created_current(self, tmp_path):
+        """Test: Una BD vacía se crea directamente en la versión actual"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'empty.db'}")
+
+        assert run_migrations(engine) == []
+        assert ensure_schema(engine) == SCHEMA_VERSION
+        with engine.connect() as connection:
+            assert schema_version(connection) == SCHEMA_VERSION
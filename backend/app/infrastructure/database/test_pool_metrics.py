@@ -0,0 +1,28 @@
+# app/infrastructure/database/test_pool_metrics.py
+import pytest
+
+from app.infrastructure.database.pool_metrics import PoolMetrics, percentile
+
+
+class TestPoolMetrics:
+    """Tests de los contadores del pool"""
+
+    def test_average_wait_covers_all_samples(self):
+        """Test: El promedio usa todas las esperas, no solo las que guarda la ventana de percentiles"""
+        metrics = PoolMetrics(max_samples=10)
+
+        for _ in range(100):
+            metrics.record_wait(0.002)
+
+        wait = metrics.snapshot()["wait_ms"]
+        assert wait["avg"] == pytest.approx(2.0)
+        assert wait["p99"] == pytest.approx(2.0)
+
+    def test_percentile_is_nearest_rank(self):
+        """Test: El percentil es el menor valor que cubre al menos p% de las muestras"""
+        samples = list(range(1, 11))
+
+        assert percentile(samples, 50) == 5
+        assert percentile(samples, 95) == 10
+        assert percentile(samples, 0) == 1
+        assert percentile(samples, 25) == 3  # rango 2.5: se redondea hacia arriba
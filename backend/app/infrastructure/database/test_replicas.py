@@ -0,0 +1,99 @@
+# app/infrastructure/database/test_replicas.py
+import pytest
+
+from app.domain.entities.expense import Expense, PaymentMethod
+from app.infrastructure.database.connection import build_engine
+from app.infrastructure.database.models import Base
+from app.infrastructure.database.replicas import ReplicaRouter, open_read_session
+from app.infrastructure.repositories.postgresql_expense_repository import PostgreSQLExpenseRepository
+from sqlalchemy.orm import sessionmaker
+
+
+class FakeClock:
+    """Reloj controlable para probar las ventanas de tiempo"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestReplicaRouting:
+    """Tests de ruteo a réplicas con dos bases SQLite locales"""
+
+    @pytest.fixture
+    def primary_factory(self, tmp_path):
+        engine = build_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+        Base.metadata.create_all(bind=engine)
+        factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        with factory() as db:
+            PostgreSQLExpenseRepository(db).save(Expense(10, "Primario", PaymentMethod.CASH))
+        return factory
+
+    @pytest.fixture
+    def replica_url(self, tmp_path):
+        url = f"sqlite:///{tmp_path / 'replica.db'}"
+        engine = build_engine(url)
+        Base.metadata.create_all(bind=engine)
+        with sessionmaker(bind=engine)() as db:
+            PostgreSQLExpenseRepository(db).save(Expense(20, "Replica", PaymentMethod.CASH))
+        engine.dispose()
+        return url
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    def _read_categories(self, router, primary_factory, client_key="cliente"):
+        db, replica = open_read_session(client_key, router, primary_factory)
+        try:
+            return [e.category for e in PostgreSQLExpenseRepository(db).get_all()], replica
+        finally:
+            db.close()
+
+    def test_reads_go_to_replica(self, replica_url, primary_factory, clock):
+        """Test: Sin escrituras recientes se lee de la réplica"""
+        router = ReplicaRouter([replica_url], clock=clock)
+
+        categories, replica = self._read_categories(router, primary_factory)
+
+        assert categories == ["Replica"]
+        assert replica is not None
+
+    def test_read_your_writes_uses_primary(self, replica_url, primary_factory, clock):
+        """Test: Tras escribir, el mismo cliente lee del primario durante la ventana"""
+        router = ReplicaRouter([replica_url], read_your_writes_seconds=5, clock=clock)
+        router.record_write("cliente")
+
+        assert self._read_categories(router, primary_factory)[0] == ["Primario"]
+        assert self._read_categories(router, primary_factory, "otro")[0] == ["Replica"]
+
+        clock.now += 6
+        assert self._read_categories(router, primary_factory)[0] == ["Replica"]
+
+    def test_any_recent_write_spans_all_clients(self, replica_url, clock):
+        """Test: La ventana de cualquier cliente cuenta para no cachear lecturas de réplica"""
+        router = ReplicaRouter([replica_url], read_your_writes_seconds=5, clock=clock)
+        assert router.has_any_recent_write() is False
+
+        router.record_write("cliente")
+        assert router.has_any_recent_write() is True
+        assert router.has_recent_write("otro") is False
+
+        clock.now += 6
+        assert router.has_any_recent_write() is False
+
+    def test_unhealthy_replica_is_ejected(self, tmp_path, primary_factory, clock):
+        """Test: Una réplica caída se expulsa y las lecturas van al primario"""
+        broken_url = f"sqlite:///{tmp_path / 'no_existe' / 'replica.db'}"
+        router = ReplicaRouter([broken_url], max_failures=2, ejection_seconds=30, clock=clock)
+
+        for _ in range(2):
+            assert self._read_categories(router, primary_factory)[0] == ["Primario"]
+
+        assert router.status()[0]["healthy"] is False
+        assert router.choose("cliente") is None
+
+        clock.now += 31
+        assert router.choose("cliente") is not None
@@ -0,0 +1,81 @@
+# app/infrastructure/database/test_slow_queries.py
+import json
+import logging
+from datetime import datetime
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.domain.entities.expense import Expense, PaymentMethod
+from app.domain.repositories.expense_query import ExpenseQuery
+from app.infrastructure.database.models import Base
+from app.infrastructure.database.slow_queries import QueryStats, instrument_queries, normalize_sql, parameters_shape
+from app.infrastructure.repositories.category_cache import CategoryCache
+from app.infrastructure.repositories.postgresql_expense_repository import PostgreSQLExpenseRepository
+
+
+class TestNormalizeSql:
+    """Tests de la forma canónica de las sentencias"""
+
+    def test_values_and_in_lists_collapse(self):
+        """Test: Literales, parámetros y listas IN de cualquier largo dan la misma forma"""
+        first = normalize_sql("SELECT * FROM expenses WHERE id IN (%(id_1)s, %(id_2)s)\n  AND amount > 10.5 LIMIT 5")
+        second = normalize_sql("SELECT * FROM expenses WHERE id IN (?, ?, ?) AND amount > 3 LIMIT 20")
+
+        assert first == second == "SELECT * FROM expenses WHERE id IN (?...) AND amount > ? LIMIT ?"
+        assert normalize_sql("SELECT date::date, 'a''b' FROM expenses_1") == "SELECT date::date, ? FROM expenses_1"
+
+    def test_parameters_shape_hides_values(self):
+        """Test: Del parámetro solo queda el tipo"""
+        assert parameters_shape({"amount": 10.5, "date": datetime(2026, 1, 1)}) == {"amount": "float", "date": "datetime"}
+        assert parameters_shape([(1, "x"), (2, "y")], executemany=True) == {"rows": 2, "row": ["int", "str"]}
+
+
+class TestQueryStats:
+    """Tests del registro de consultas lentas sobre un engine SQLite"""
+
+    def _repository(self, tmp_path, stats):
+        engine = create_engine(f"sqlite:///{tmp_path / 'slow.db'}")
+        instrument_queries(engine, stats)
+        Base.metadata.create_all(bind=engine)
+        return PostgreSQLExpenseRepository(sessionmaker(bind=engine)(), categories=CategoryCache())
+
+    def test_aggregates_by_fingerprint_and_source(self, tmp_path):
+        """Test: Las consultas iguales con otros valores se agrupan, con el método del repositorio"""
+        stats = QueryStats(threshold=60)
+        repository = self._repository(tmp_path, stats)
+        repository.save(Expense(10, "Comida", PaymentMethod.CASH, date=datetime(2026, 1, 1)))
+
+        for min_amount in (1, 2, 3):
+            repository.find(ExpenseQuery(min_amount=min_amount, sort="amount", limit=min_amount))
+
+        [find] = [row for row in stats.snapshot() if row["source"] == "PostgreSQLExpenseRepository.find"]
+        assert (find["count"], find["slow_count"]) == (3, 0)
+        assert find["duration_ms"]["p50"] <= find["duration_ms"]["max"]
+        assert any(row["source"] == "PostgreSQLExpenseRepository.save" for row in stats.snapshot())
+
+    def test_slow_queries_are_logged_and_explained_in_background(self, tmp_path, caplog):
+        """Test: Las lentas se registran sin valores y su plan se guarda (una vez por intervalo)"""
+        explained = []
+
+        def explain(statement, parameters):
+            explained.append(statement)
+            return [{"Plan": {"Node Type": "Seq Scan"}}]
+
+        plans_path = tmp_path / "plans.jsonl"
+        stats = QueryStats(threshold=0, explain=explain, plans_path=str(plans_path))
+        repository = self._repository(tmp_path, stats)
+        repository.save(Expense(10, "Comida", PaymentMethod.CASH, date=datetime(2026, 1, 1), description="privado"))
+
+        with caplog.at_level(logging.WARNING, logger="app.infrastructure.database.slow_queries"):
+            repository.search_by_description("privado")
+            repository.search_by_description("otro")
+        stats.wait_for_explains()
+
+        assert "Consulta lenta" in caplog.text and "privado" not in caplog.text
+        assert len([s for s in explained if "description" in s.lower() and "like" in s.lower()]) == 1
+        assert not any(s.lstrip().upper().startswith("INSERT") for s in explained)
+        [search] = [row for row in stats.snapshot() if row["source"] == "PostgreSQLExpenseRepository.search_by_description"]
+        assert stats.plan(search["fingerprint"]) == [{"Plan": {"Node Type": "Seq Scan"}}]
+        records = [json.loads(line) for line in plans_path.read_text().splitlines()]
+        assert search["fingerprint"] in {record["fingerprint"] for record in records}
@@ -0,0 +1,215 @@
+# app/infrastructure/profiling/request_profiles.py
+import cProfile
+import json
+import logging
+import os
+import sys
+import threading
+import uuid
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SAMPLING = "sampling"
+CPROFILE = "cprofile"
+PROFILING_MODES = (SAMPLING, CPROFILE)
+
+# Extensión del artefacto de cada modo (el .json de metadatos va aparte)
+_ARTIFACT_SUFFIX = {SAMPLING: ".collapsed", CPROFILE: ".prof"}
+
+# Marco más interno de un hilo sin trabajo: esperando en una cola/condición
+# (threadpool) o en el select del event loop
+_IDLE_FRAMES = {("threading.py", "wait"), ("selectors.py", "select"), ("queue.py", "get")}
+
+
+class SamplingProfiler:
+    """
+    Perfil estadístico: cada interval segundos toma la pila de los hilos
+    ocupados (sys._current_frames) y cuenta pilas iguales
+
+    A diferencia de cProfile ve también el hilo del threadpool donde corren
+    las rutas y dependencias sync, pero no separa peticiones concurrentes:
+    lo que corra en paralelo aparece en la misma captura.
+    El resultado es el formato "collapsed" de flamegraph.pl / speedscope.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples = 0
+        self._stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """No espera al hilo (se llama desde el event loop): dumps espera la última muestra"""
+        self._stop.set()
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            self.samples += 1
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own and not _is_idle(frame):
+                    self._stacks[_collapse(frame)] += 1
+
+    def dumps(self) -> str:
+        if self._thread is not None:
+            self._thread.join()
+        return "".join(f"{stack} {count}\n" for stack, count in self._stacks.most_common())
+
+
+class CProfileProfiler:
+    """
+    Perfil determinístico con cProfile (.prof para pstats, snakeviz o flameprof)
+    Solo mide el hilo que lo activa: el del event loop (rutas async), no el threadpool
+    """
+
+    def __init__(self):
+        self._profile = cProfile.Profile()
+        self.samples = None
+
+    def start(self) -> None:
+        self._profile.enable()
+
+    def stop(self) -> None:
+        self._profile.disable()
+
+    def dump(self, path: Path) -> None:
+        self._profile.dump_stats(str(path))
+
+
+def _is_idle(frame) -> bool:
+    return (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in _IDLE_FRAMES
+
+
+def _collapse(frame) -> str:
+    """Pila de la raíz al marco actual: 'modulo:funcion;modulo:funcion;...'"""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class ProfileStore:
+    """
+    Directorio anillo de capturas: al superar max_files se borran las más viejas
+
+    Cada captura es <id>.json (ruta, parámetros, estado, duración, modo) más
+    el artefacto (<id>.collapsed o <id>.prof). Los ids empiezan con la hora,
+    así el orden de los nombres es el cronológico.
+    """
+
+    def __init__(self, directory: str, max_files: int = 50):
+        self.directory = Path(directory)
+        self.max_files = max_files
+        self._lock = threading.Lock()
+
+    def save(self, profiler, metadata: Dict) -> Dict:
+        """
+        Guarda el artefacto y los metadatos y recorta el anillo
+        Returns: Dict: Los metadatos guardados (con id y artifact)
+        """
+        profile_id = f"{datetime.now():%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:6]}"
+        artifact = self.directory / f"{profile_id}{_ARTIFACT_SUFFIX[metadata['mode']]}"
+        metadata = {**metadata, "id": profile_id, "artifact": artifact.name, "samples": profiler.samples}
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            if isinstance(profiler, CProfileProfiler):
+                profiler.dump(artifact)
+            else:
+                artifact.write_text(profiler.dumps(), encoding="utf-8")
+            (self.directory / f"{profile_id}.json").write_text(json.dumps(metadata, indent=2), encoding="utf-8")
+            self._trim()
+        return metadata
+
+    def _trim(self) -> None:
+        for old in sorted(self.directory.glob("*.json"))[:-self.max_files or None]:
+            for path in self.directory.glob(f"{old.stem}.*"):
+                path.unlink(missing_ok=True)
+
+    def list(self) -> List[Dict]:
+        """Metadatos de las capturas, de la más nueva a la más vieja"""
+        captures = []
+        for path in sorted(self.directory.glob("*.json"), reverse=True):
+            try:
+                captures.append(json.loads(path.read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                continue  # Borrada por el recorte mientras se listaba
+        return captures
+
+    def artifact_path(self, profile_id: str) -> Optional[Path]:
+        """Archivo de la captura (None si no existe o el id no es válido)"""
+        if not profile_id.replace("-", "").isalnum():
+            return None
+        for suffix in _ARTIFACT_SUFFIX.values():
+            path = self.directory / f"{profile_id}{suffix}"
+            if path.exists():
+                return path
+        return None
+
+
+class RequestProfiler:
+    """
+    Decide qué peticiones se perfilan y crea el perfilador de cada una
+
+    Una captura a la vez: si otra petición ya se está perfilando, la nueva
+    sigue sin perfilar (cProfile no admite dos activos y las muestras se mezclarían).
+    """
+
+    def __init__(self, store: ProfileStore, mode: str = SAMPLING, interval: float = 0.005):
+        if mode not in PROFILING_MODES:
+            raise ValueError(f"Modo de profiling desconocido: '{mode}' (disponibles: {', '.join(PROFILING_MODES)})")
+        self.store = store
+        self.mode = mode
+        self.interval = interval
+        self._busy = threading.Lock()
+
+    def begin(self):
+        """Returns: El perfilador ya iniciado, o None si hay otra captura en curso"""
+        if not self._busy.acquire(blocking=False):
+            return None
+        profiler = SamplingProfiler(self.interval) if self.mode == SAMPLING else CProfileProfiler()
+        profiler.start()
+        return profiler
+
+    def end(self, profiler) -> None:
+        """Detiene el perfilador (en el mismo hilo que begin: cProfile es por hilo) y libera el turno"""
+        try:
+            profiler.stop()
+        finally:
+            self._busy.release()
+
+    def save(self, profiler, metadata: Dict) -> Optional[Dict]:
+        """Guarda la captura (fuera del event loop); un error de disco no afecta la petición"""
+        try:
+            return self.store.save(profiler, {**metadata, "mode": self.mode})
+        except OSError as e:
+            logger.warning("No se pudo guardar el perfil de %s: %s", metadata.get("path"), e)
+            return None
+
+
+_profiler: Optional[RequestProfiler] = None
+_profiler_lock = threading.Lock()
+
+
+def get_request_profiler() -> RequestProfiler:
+    """Perfilador global con el directorio y el modo de settings"""
+    global _profiler
+    with _profiler_lock:
+        if _profiler is None:
+            from ...core.config import settings
+            _profiler = RequestProfiler(
+                ProfileStore(settings.profiles_dir, settings.profiles_max_files),
+                settings.profiling_mode,
+                settings.profiling_interval_ms / 1000
+            )
+        return _profiler
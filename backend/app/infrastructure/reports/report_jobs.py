@@ -0,0 +1,221 @@
+# app/infrastructure/reports/report_jobs.py
+import logging
+import multiprocessing
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import AbstractContextManager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from ...application.single_flight import SingleFlight
+from ...domain.services.currency import ExchangeRates
+from ...domain.services.expense_report import ReportData, ReportSpec
+from .report_worker import build_report_artifact
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Avance aproximado por etapa (el cálculo en el proceso no reporta avance parcial)
+_STAGE_PROGRESS = {"queued": 0.0, "reading": 0.1, "computing": 0.4, "done": 1.0}
+
+
+@dataclass
+class ReportJob:
+    """Estado de un pedido de reporte"""
+    id: str
+    spec: ReportSpec
+    status: str = QUEUED
+    stage: str = "queued"
+    progress: float = 0.0
+    created_at: datetime = field(default_factory=datetime.now)
+    finished_at: Optional[datetime] = None
+    data_version: Optional[str] = None
+    artifact: Optional[Path] = None
+    cached: bool = False
+    size_bytes: Optional[int] = None
+    expense_count: Optional[int] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            "id": self.id,
+            "kind": self.spec.kind,
+            "period": self.spec.period,
+            "format": self.spec.format,
+            "status": self.status,
+            "stage": self.stage,
+            "progress": self.progress,
+            "created_at": self.created_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "data_version": self.data_version,
+            "cached": self.cached,
+            "size_bytes": self.size_bytes,
+            "expense_count": self.expense_count,
+            "error": self.error,
+        }
+
+
+class ReportJobManager:
+    """
+    Cola de reportes: cada pedido lee un snapshot de los gastos del período
+    en un hilo coordinador y manda la agregación a un ProcessPoolExecutor,
+    así el cálculo no ocupa los workers de la API ni el GIL.
+
+    Los archivos quedan en disco con la versión de los datos (hash del
+    snapshot) en el nombre: si nada cambió, un pedido igual se sirve del
+    archivo existente sin recalcular. Al generar una versión nueva se
+    borran las anteriores del mismo reporte.
+    """
+
+    def __init__(
+        self,
+        reports_dir: str,
+        repository_scope: Callable[[], AbstractContextManager],
+        workers: int = 2,
+        max_jobs: int = 200,
+        executor: Optional[Executor] = None,
+        exchange_rates: Optional[Callable[[], ExchangeRates]] = None
+    ):
+        """
+        Args: reports_dir: Directorio de los archivos generados
+              repository_scope: Abre un repositorio fuera de una petición
+              workers: Procesos de cálculo (y hilos coordinadores)
+              max_jobs: Pedidos que se recuerdan (se olvidan los terminados más viejos)
+              executor: Executor del cálculo (por defecto un ProcessPoolExecutor con spawn)
+              exchange_rates: Tasas vigentes; los montos se convierten a la moneda
+                              base antes de mandarlos al proceso (None = tal cual)
+        """
+        self.reports_dir = Path(reports_dir)
+        self._repository_scope = repository_scope
+        self._workers = workers
+        self._max_jobs = max_jobs
+        self._executor = executor
+        self._exchange_rates = exchange_rates
+        self._coordinator = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="report-job")
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, ReportJob]" = OrderedDict()
+        # Dos pedidos iguales sobre los mismos datos comparten el cálculo
+        self._single_flight = SingleFlight()
+
+    def _get_executor(self) -> Executor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: no heredar del padre conexiones de BD ni hilos a medio usar
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self._workers,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def submit(self, spec: ReportSpec) -> ReportJob:
+        """Encola un pedido y devuelve su estado inicial"""
+        job = ReportJob(id=uuid.uuid4().hex, spec=spec)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._forget_old_jobs()
+        self._coordinator.submit(self._run, job)
+        return job
+
+    def get(self, job_id: str) -> Optional[ReportJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def shutdown(self) -> None:
+        self._coordinator.shutdown(wait=False, cancel_futures=True)
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _forget_old_jobs(self) -> None:
+        while len(self._jobs) > self._max_jobs:
+            oldest = next((j for j in self._jobs.values() if j.status in (DONE, FAILED)), None)
+            if oldest is None:
+                return
+            del self._jobs[oldest.id]
+
+    def _set_stage(self, job: ReportJob, stage: str) -> None:
+        job.stage = stage
+        job.progress = _STAGE_PROGRESS[stage]
+
+    def _run(self, job: ReportJob) -> None:
+        spec = job.spec
+        try:
+            job.status = RUNNING
+            self._set_stage(job, "reading")
+            start, end = spec.date_range()
+            with self._repository_scope() as repository:
+                data = ReportData.from_expenses(repository.iter_by_date_range(start, end))
+            if self._exchange_rates is not None:
+                # La versión sale de los montos convertidos: cambia si cambian las tasas
+                rates = self._exchange_rates()
+                data = ReportData(data.columns.in_currency(rates, rates.pivot), data.descriptions)
+            job.data_version = data.fingerprint()
+            job.artifact = self.reports_dir / f"{spec.kind}-{spec.period}-{job.data_version}.{spec.format}"
+
+            if job.artifact.exists():
+                job.cached = True
+                result = {"size_bytes": job.artifact.stat().st_size, "expense_count": len(data.columns)}
+            else:
+                self._set_stage(job, "computing")
+                result = self._single_flight.do(
+                    (spec, job.data_version),
+                    lambda: self._compute(spec, data, job.artifact)
+                )
+
+            job.size_bytes = result["size_bytes"]
+            job.expense_count = result["expense_count"]
+            self._set_stage(job, "done")
+            job.status = DONE
+        except Exception as e:
+            logger.exception("Error al generar el reporte %s", job.id)
+            job.error = str(e)
+            job.status = FAILED
+        finally:
+            job.finished_at = datetime.now()
+
+    def _compute(self, spec: ReportSpec, data: ReportData, artifact: Path) -> Dict:
+        self.reports_dir.mkdir(parents=True, exist_ok=True)
+        result = self._get_executor().submit(build_report_artifact, spec, data, str(artifact)).result()
+        # Versiones anteriores del mismo reporte
+        for old in self.reports_dir.glob(f"{spec.kind}-{spec.period}-*.{spec.format}"):
+            if old != artifact:
+                old.unlink(missing_ok=True)
+        return result
+
+
+_manager: Optional[ReportJobManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_report_job_manager() -> ReportJobManager:
+    """Manager global (los procesos se crean con el primer reporte)"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            from ...core.config import settings
+            from ..repositories.exchange_rate_cache import get_exchange_rate_cache
+            from ..repositories.registry import open_repository
+            _manager = ReportJobManager(
+                settings.reports_dir,
+                open_repository,
+                settings.report_workers,
+                settings.report_max_jobs,
+                exchange_rates=get_exchange_rate_cache().get
+            )
+        return _manager
+
+
+def shutdown_report_job_manager() -> None:
+    """Al cerrar la app: cancelar los pedidos pendientes y cerrar los procesos"""
+    global _manager
+    with _manager_lock:
+        if _manager is not None:
+            _manager.shutdown()
+            _manager = None
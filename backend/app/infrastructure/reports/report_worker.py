@@ -0,0 +1,32 @@
+# app/infrastructure/reports/report_worker.py
+"""
+Código que corre en los procesos de trabajo de los reportes
+
+Se mantiene liviano a propósito: con el método "spawn" cada proceso nuevo
+importa este módulo, y no debe arrastrar FastAPI ni SQLAlchemy.
+"""
+import json
+import os
+from pathlib import Path
+from typing import Dict
+
+from ...domain.services.expense_report import ExpenseReportBuilder, ReportData, ReportSpec
+
+
+def build_report_artifact(spec: ReportSpec, data: ReportData, path: str) -> Dict:
+    """
+    Calcula el resumen y lo escribe en `path` (temporal + reemplazo atómico)
+    Returns: Dict: Tamaño del archivo y cantidad de gastos incluidos
+    """
+    statement = ExpenseReportBuilder.build(spec, data)
+    if spec.format == "csv":
+        content = ExpenseReportBuilder.to_csv(statement)
+    else:
+        content = json.dumps(statement, indent=2, ensure_ascii=False)
+
+    target = Path(path)
+    temp_path = target.with_suffix(target.suffix + f".{os.getpid()}.tmp")
+    with open(temp_path, "w", encoding="utf-8", newline="") as f:
+        f.write(content)
+    os.replace(temp_path, target)
+    return {"size_bytes": target.stat().st_size, "expense_count": statement["expense_count"]}
@@ -0,0 +1,348 @@
+# app/infrastructure/repositories/cached_expense_repository.py
+import copy
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from ...domain.entities.expense import Expense
+from ...domain.repositories.expense_repository import ExpenseRepository
+from ...domain.repositories.expense_query import ExpenseCount, ExpenseQuery
+from ...domain.services.currency import ExchangeRates
+from .repository_decorator import ExpenseRepositoryDecorator
+
+# Tags de invalidación
+LISTS = ("lists",)
+AGGREGATES = ("aggregates",)
+
+
+def _id_tag(expense_id: int) -> Tuple:
+    return ("id", expense_id)
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float
+    tags: FrozenSet[Tuple]
+    # Si está, la entrada solo se invalida si algún gasto escrito la afecta
+    depends_on: Optional[Callable[[Expense], bool]] = None
+
+
+class ExpenseCache:
+    """
+    Caché LRU con TTL compartida por los CachedExpenseRepository del proceso
+
+    Cada entrada lleva tags (id del gasto, listas, agregados) y opcionalmente
+    un predicado; invalidate() solo recorre las entradas de los tags tocados
+    y, entre ellas, descarta las que el gasto escrito realmente afecta.
+    El TTL acota lo viejo que puede quedar un dato escrito por otro proceso.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 30.0, clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._by_tag: Dict[Tuple, set] = {}
+        self._generation = 0  # Aumenta con cada invalidación
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Returns: (encontrado, valor)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return False, None
+            if entry.expires_at <= self._clock():
+                self._remove(key)
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return True, entry.value
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def put(
+        self,
+        key: Hashable,
+        value: Any,
+        tags: Iterable[Tuple],
+        depends_on: Optional[Callable[[Expense], bool]] = None,
+        generation: Optional[int] = None
+    ) -> None:
+        """
+        Guarda un valor
+        Args: generation: generation leída antes de cargar el valor; si hubo una
+                          invalidación mientras tanto, el valor puede ser viejo y no se guarda
+        """
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            if key in self._entries:
+                self._remove(key)
+            entry = _Entry(value, self._clock() + self.ttl_seconds, frozenset(tags), depends_on)
+            self._entries[key] = entry
+            for tag in entry.tags:
+                self._by_tag.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._stats["evictions"] += 1
+
+    def invalidate(self, tags: Iterable[Tuple], expenses: Sequence[Expense] = ()) -> int:
+        """
+        Descarta las entradas de los tags afectadas por los gastos escritos
+        Returns: int: Entradas descartadas
+        """
+        removed = 0
+        with self._lock:
+            self._generation += 1
+            for tag in tags:
+                for key in list(self._by_tag.get(tag, ())):
+                    entry = self._entries.get(key)
+                    if entry is None:
+                        continue
+                    if entry.depends_on is None or any(entry.depends_on(e) for e in expenses):
+                        self._remove(key)
+                        removed += 1
+            self._stats["invalidations"] += removed
+        return removed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._by_tag.clear()
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        for tag in entry.tags:
+            keys = self._by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_tag[tag]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hit_rate": round(self._stats["hits"] / lookups, 4) if lookups else 0.0,
+            }
+
+
+def _copy_value(value: Any) -> Any:
+    """Los casos de uso modifican las entidades: nunca se entrega la instancia cacheada"""
+    if isinstance(value, Expense):
+        return copy.copy(value)
+    if isinstance(value, list):
+        return [copy.copy(item) for item in value]
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+
+class CachedExpenseRepository(ExpenseRepositoryDecorator):
+    """
+    Repositorio con caché de lecturas: get_by_id, listas filtradas y agregados
+
+    save, update y delete invalidan solo lo que cambia: el id escrito, las
+    listas cuyo filtro coincide con el estado anterior o el nuevo, y los
+    agregados si cambió monto, categoría o método (no al editar la descripción).
+    Los iteradores (iter_all, iter_find...) no pasan por la caché: existen para
+    no tener el resultado completo en memoria.
+
+    Con fill=False las lecturas aprovechan la caché pero lo leído no se
+    guarda: es para lecturas de una réplica que puede no tener aún la última
+    escritura (dejarla en la caché la serviría vieja a todos durante el TTL).
+    """
+
+    def __init__(self, inner: ExpenseRepository, cache: ExpenseCache, fill: bool = True):
+        super().__init__(inner)
+        self._cache = cache
+        self._fill = fill
+
+    def _cached(
+        self,
+        key: Tuple,
+        load: Callable[[], Any],
+        tags: Iterable[Tuple],
+        depends_on: Optional[Callable[[Expense], bool]] = None
+    ) -> Any:
+        generation = self._cache.generation
+        found, value = self._cache.get(key)
+        if not found:
+            value = load()
+            if not self._fill:
+                return value
+            self._cache.put(key, value, tags, depends_on, generation)
+        return _copy_value(value)
+
+    # ------------------------------------------------------------------
+    # Lecturas
+    # ------------------------------------------------------------------
+
+    def get_by_id(self, expense_id: int) -> Optional[Expense]:
+        return self._cached(
+            ("get_by_id", expense_id),
+            lambda: self._inner.get_by_id(expense_id),
+            [_id_tag(expense_id)]
+        )
+
+    def get_all(self) -> List[Expense]:
+        return self._cached(("get_all",), self._inner.get_all, [LISTS])
+
+    def get_by_date_range(self, start_date: datetime, end_date: datetime) -> List[Expense]:
+        return self._cached(
+            ("get_by_date_range", start_date, end_date),
+            lambda: self._inner.get_by_date_range(start_date, end_date),
+            [LISTS],
+            lambda e: start_date <= e.date <= end_date
+        )
+
+    def get_by_category(self, category: str) -> List[Expense]:
+        category_lower = category.lower()
+        return self._cached(
+            ("get_by_category", category_lower),
+            lambda: self._inner.get_by_category(category),
+            [LISTS],
+            lambda e: e.category.lower() == category_lower
+        )
+
+    def get_by_payment_method(self, payment_method: str) -> List[Expense]:
+        return self._cached(
+            ("get_by_payment_method", payment_method),
+            lambda: self._inner.get_by_payment_method(payment_method),
+            [LISTS],
+            lambda e: e.payment_method.value == payment_method
+        )
+
+    def search_by_description(self, search_term: str) -> List[Expense]:
+        term = search_term.lower()
+        return self._cached(
+            ("search_by_description", term),
+            lambda: self._inner.search_by_description(search_term),
+            [LISTS],
+            lambda e: term in (e.description or "").lower()
+        )
+
+    def get_recent_expenses(self, days: int = 30) -> List[Expense]:
+        cutoff = datetime.now() - timedelta(days=days)
+        return self._cached(
+            ("get_recent_expenses", days),
+            lambda: self._inner.get_recent_expenses(days),
+            [LISTS],
+            lambda e: e.date >= cutoff
+        )
+
+    def find(self, query: ExpenseQuery) -> List[Expense]:
+        # Con orden/límite basta el mismo predicado: una escritura que no cumple
+        # el filtro no puede entrar ni salir del top
+        return self._cached(("find", query), lambda: self._inner.find(query), [LISTS], query.matches)
+
+    def find_rows(self, query: ExpenseQuery, fields: Sequence[str]) -> List[Dict[str, Any]]:
+        fields = tuple(fields)
+        return self._cached(
+            ("find_rows", query, fields),
+            lambda: self._inner.find_rows(query, fields),
+            [LISTS],
+            query.matches
+        )
+
+    def count(self, query: ExpenseQuery, estimate: bool = False) -> ExpenseCount:
+        query = query.unpaged()
+        return self._cached(
+            ("count", query, estimate),
+            lambda: self._inner.count(query, estimate),
+            [LISTS],
+            query.matches
+        )
+
+    def get_row_by_id(self, expense_id: int, fields: Sequence[str]) -> Optional[Dict[str, Any]]:
+        fields = tuple(fields)
+        return self._cached(
+            ("get_row_by_id", expense_id, fields),
+            lambda: self._inner.get_row_by_id(expense_id, fields),
+            [_id_tag(expense_id)]
+        )
+
+    def get_total_by_category(self, rates: Optional[ExchangeRates] = None, base: Optional[str] = None) -> Dict[str, float]:
+        # La versión de las tasas va en la clave: al cambiarlas, las entradas viejas no se usan más
+        return self._cached(
+            ("get_total_by_category", _rates_key(rates, base)),
+            lambda: self._inner.get_total_by_category(rates, base),
+            [AGGREGATES]
+        )
+
+    def get_total_by_payment_method(self, rates: Optional[ExchangeRates] = None, base: Optional[str] = None) -> Dict[str, float]:
+        return self._cached(
+            ("get_total_by_payment_method", _rates_key(rates, base)),
+            lambda: self._inner.get_total_by_payment_method(rates, base),
+            [AGGREGATES]
+        )
+
+    def get_count_by_category(self) -> Dict[str, int]:
+        return self._cached(("get_count_by_category",), self._inner.get_count_by_category, [AGGREGATES])
+
+    def get_categories(self) -> List[Dict[str, Any]]:
+        return self._cached(("get_categories",), self._inner.get_categories, [AGGREGATES])
+
+    # ------------------------------------------------------------------
+    # Escrituras
+    # ------------------------------------------------------------------
+
+    def save(self, expense: Expense) -> Expense:
+        saved = self._inner.save(expense)
+        self._invalidate(None, saved)
+        return saved
+
+    def update(self, expense: Expense) -> Expense:
+        before = self._inner.get_by_id(expense.id) if expense.id is not None else None
+        updated = self._inner.update(expense)
+        self._invalidate(before, updated)
+        return updated
+
+    def delete(self, expense_id: int) -> bool:
+        before = self._inner.get_by_id(expense_id)
+        deleted = self._inner.delete(expense_id)
+        if deleted:
+            self._invalidate(before, None)
+        return deleted
+
+    def _invalidate(self, before: Optional[Expense], after: Optional[Expense]) -> None:
+        written = [e for e in (before, after) if e is not None]
+        tags = {_id_tag(e.id) for e in written} | {LISTS}
+        if before is None or after is None or (
+            (before.amount, before.currency, before.category, before.payment_method, before.date)
+            != (after.amount, after.currency, after.category, after.payment_method, after.date)
+        ):
+            tags.add(AGGREGATES)
+        self._cache.invalidate(tags, written)
+
+
+def _rates_key(rates: Optional[ExchangeRates], base: Optional[str]) -> Optional[Tuple[str, Optional[str]]]:
+    return (rates.version, base) if rates is not None else None
+
+
+_cache: Optional[ExpenseCache] = None
+
+
+def get_expense_cache() -> ExpenseCache:
+    """Caché global del proceso (tamaño y TTL desde settings)"""
+    global _cache
+    if _cache is None:
+        from ...core.config import settings
+        _cache = ExpenseCache(settings.repository_cache_max_entries, settings.repository_cache_ttl_seconds)
+    return _cache
@@ -0,0 +1,128 @@
+# app/infrastructure/repositories/category_cache.py
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+from ...domain.events.expense_events import ExpenseChange
+from ...domain.repositories.expense_repository import ExpenseRepository
+
+
+@dataclass
+class CategoryEntry:
+    name: str
+    id: Optional[int] = None  # Clave de la tabla categories (None en backends sin tabla)
+    count: int = 0
+
+
+class CategoryCache:
+    """
+    Diccionario de categorías en memoria: nombre <-> id entero y cantidad
+    de gastos de cada una
+
+    PostgreSQL traduce el nombre a id una vez y filtra / agrupa por
+    category_id (enteros chicos); los ids se pasan a nombres solo al armar
+    la respuesta. Los ids no cambian nunca, así que no se invalidan.
+
+    Los conteos se cargan una vez desde el repositorio y después se
+    mantienen con los eventos de escritura (suscrita al bus), así
+    /categories no recorre los gastos. Las escrituras de otros procesos
+    no se ven hasta recargar (refresh).
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._by_name: Dict[str, CategoryEntry] = {}  # nombre en minúsculas
+        self._by_id: Dict[int, CategoryEntry] = {}
+        self._counts_ready = False
+
+    @property
+    def counts_ready(self) -> bool:
+        return self._counts_ready
+
+    # ------------------------------------------------------------------
+    # Ids
+    # ------------------------------------------------------------------
+
+    def id_of(self, name: str) -> Optional[int]:
+        with self._lock:
+            entry = self._by_name.get(name.strip().lower())
+            return entry.id if entry is not None else None
+
+    def name_of(self, category_id: int) -> Optional[str]:
+        with self._lock:
+            entry = self._by_id.get(category_id)
+            return entry.name if entry is not None else None
+
+    def remember(self, category_id: int, name: str) -> None:
+        """Registra el id de una categoría leída o creada en la tabla"""
+        with self._lock:
+            entry = self._entry(name)
+            entry.id = category_id
+            self._by_id[category_id] = entry
+
+    def _entry(self, name: str) -> CategoryEntry:
+        key = name.strip().lower()
+        entry = self._by_name.get(key)
+        if entry is None:
+            entry = self._by_name[key] = CategoryEntry(name)
+        return entry
+
+    # ------------------------------------------------------------------
+    # Conteos
+    # ------------------------------------------------------------------
+
+    def load(self, categories: Iterable[Dict[str, Any]]) -> None:
+        """Reemplaza los conteos con los del repositorio (id, name, count)"""
+        with self._lock:
+            for entry in self._by_name.values():
+                entry.count = 0
+            for category in categories:
+                entry = self._entry(category["name"])
+                entry.count = category["count"]
+                if category.get("id") is not None:
+                    entry.id = category["id"]
+                    self._by_id[entry.id] = entry
+            self._counts_ready = True
+
+    def ensure_ready(self, repository: ExpenseRepository, refresh: bool = False) -> None:
+        """Carga los conteos la primera vez (o siempre con refresh)"""
+        if self._counts_ready and not refresh:
+            return
+        with self._lock:
+            if not self._counts_ready or refresh:
+                self.load(repository.get_categories())
+
+    def on_change(self, change: ExpenseChange) -> None:
+        """Suscriptor del bus de eventos: resta la categoría anterior y suma la nueva"""
+        with self._lock:
+            if not self._counts_ready:
+                return
+            if change.before is not None:
+                self._entry(change.before.category).count -= 1
+            if change.after is not None:
+                self._entry(change.after.category).count += 1
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Categorías con gastos (o con fila en la tabla), por nombre"""
+        with self._lock:
+            return [
+                {"id": entry.id, "name": entry.name, "count": entry.count}
+                for entry in sorted(self._by_name.values(), key=lambda e: e.name)
+                if entry.count > 0 or entry.id is not None
+            ]
+
+
+_cache: Optional[CategoryCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_category_cache() -> CategoryCache:
+    """Caché global, suscrita al bus de eventos la primera vez que se pide"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            from ...domain.events.expense_events import expense_events
+
+            _cache = CategoryCache()
+            expense_events.subscribe(_cache.on_change)
+        return _cache
@@ -0,0 +1,64 @@
+# app/infrastructure/repositories/exchange_rate_cache.py
+import threading
+from typing import Callable, List, Optional
+
+from ...domain.repositories.exchange_rate_repository import ExchangeRateRepository
+from ...domain.services.currency import ExchangeRates
+
+
+class ExchangeRateCache:
+    """
+    Tipos de cambio en memoria (ExchangeRates) para todo el proceso
+
+    La tabla se lee entera la primera vez que se pide y se reutiliza en
+    cada conversión; al guardar tasas (invalidate) se descarta y se avisa a
+    los suscriptores (snapshots del dashboard). Las tasas cargadas por otros
+    procesos no se ven hasta invalidar o reiniciar.
+    """
+
+    def __init__(self, pivot: str, loader: Callable[[], ExchangeRateRepository]):
+        """
+        Args: pivot: Moneda base (la que vale 1)
+              loader: Context manager que abre el repositorio de tasas
+        """
+        self.pivot = pivot
+        self._loader = loader
+        self._lock = threading.Lock()
+        self._rates: Optional[ExchangeRates] = None
+        self._listeners: List[Callable[[], None]] = []
+
+    def get(self) -> ExchangeRates:
+        rates = self._rates
+        if rates is not None:
+            return rates
+        with self._lock:
+            if self._rates is None:
+                with self._loader() as repository:
+                    self._rates = ExchangeRates(repository.get_all(), self.pivot)
+            return self._rates
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._rates = None
+        for listener in list(self._listeners):
+            listener()
+
+    def subscribe(self, listener: Callable[[], None]) -> None:
+        """Registra una función que se llama cada vez que cambian las tasas"""
+        self._listeners.append(listener)
+
+
+_cache: Optional[ExchangeRateCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_exchange_rate_cache() -> ExchangeRateCache:
+    """Caché global, con la moneda base de settings y el backend activo"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            from ...core.config import settings
+            from .registry import open_rate_repository
+
+            _cache = ExchangeRateCache(settings.base_currency, open_rate_repository)
+        return _cache
@@ -0,0 +1,260 @@
+# app/infrastructure/repositories/in_memory_expense_repository.py
+import copy
+import threading
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from ...domain.entities.expense import Expense
+from ...domain.repositories.expense_repository import ExpenseRepository, _expense_value
+from ...domain.repositories.expense_query import ExpenseCount, ExpenseQuery
+from ...domain.repositories.exceptions import DuplicateExpenseError, ExpenseNotFoundError, RepositoryError
+from ...domain.services.currency import ExchangeRates
+from ...domain.services.expense_analytics import ExpenseAnalytics, ExpenseColumns
+from ...domain.services.expense_service import ExpenseService
+
+
+class InMemoryExpenseRepository(ExpenseRepository):
+    """
+    Implementación en memoria con índices secundarios (tests y despliegues efímeros)
+
+    - _by_id: id -> gasto
+    - _by_category / _by_method: categoría (en minúsculas) o método -> ids
+    - _by_date: (fecha, id) ordenado; los rangos son dos bisect, O(log n + k)
+
+    Las listas salen como en PostgreSQL: por fecha descendente. Se guardan y
+    se devuelven copias, así que modificar un gasto leído no toca los índices
+    hasta llamar a update. Nada se persiste: se pierde al terminar el proceso.
+    """
+
+    def __init__(self, expenses: Optional[Iterable[Expense]] = None):
+        """
+        Args: expenses: Gastos iniciales (opcional, se guardan con save)
+        """
+        self._lock = threading.RLock()
+        self._reset()
+        for expense in expenses or ():
+            self.save(expense)
+
+    # --- Índices ------------------------------------------------------------
+
+    def _reset(self) -> None:
+        self._by_id: Dict[int, Expense] = {}
+        self._by_category: Dict[str, Set[int]] = {}
+        self._by_method: Dict[str, Set[int]] = {}
+        self._by_date: List[Tuple[datetime, int]] = []
+        self._next_id = 1
+
+    def _index(self, expense: Expense) -> None:
+        self._by_id[expense.id] = expense
+        self._by_category.setdefault(expense.category.lower(), set()).add(expense.id)
+        self._by_method.setdefault(expense.payment_method.value, set()).add(expense.id)
+        insort(self._by_date, (expense.date, expense.id))
+
+    def _unindex(self, expense: Expense) -> None:
+        del self._by_id[expense.id]
+        for index, key in ((self._by_category, expense.category.lower()), (self._by_method, expense.payment_method.value)):
+            ids = index[key]
+            ids.discard(expense.id)
+            if not ids:
+                del index[key]
+        position = bisect_left(self._by_date, (expense.date, expense.id))
+        del self._by_date[position]
+
+    def _date_bounds(self, start_date: datetime, end_date: datetime) -> Tuple[int, int]:
+        """Posiciones en _by_date de las fechas en [start_date, end_date]"""
+        return (
+            bisect_left(self._by_date, (start_date,)),
+            bisect_right(self._by_date, (end_date, float("inf")))
+        )
+
+    def _ids_in_range(self, start_date: datetime, end_date: datetime) -> List[int]:
+        """Ids con fecha en [start_date, end_date], de la más reciente a la más antigua"""
+        low, high = self._date_bounds(start_date, end_date)
+        return [expense_id for _, expense_id in reversed(self._by_date[low:high])]
+
+    def _newest_first(self, ids: Iterable[int]) -> List[Expense]:
+        expenses = [self._by_id[expense_id] for expense_id in ids]
+        expenses.sort(key=lambda e: (e.date, e.id), reverse=True)
+        return expenses
+
+    @staticmethod
+    def _copies(expenses: Iterable[Expense]) -> List[Expense]:
+        return [copy.copy(expense) for expense in expenses]
+
+    # --- Escrituras ---------------------------------------------------------
+
+    def save(self, expense: Expense) -> Expense:
+        """Asigna el próximo id si no tiene (como el backend JSON, respeta uno dado)"""
+        with self._lock:
+            if expense.id is None:
+                expense.id = self._next_id
+            elif expense.id in self._by_id:
+                raise DuplicateExpenseError(f"Ya existe un gasto con ID {expense.id}")
+            self._next_id = max(self._next_id, expense.id + 1)
+            self._index(copy.copy(expense))
+        return expense
+
+    def update(self, expense: Expense) -> Expense:
+        if expense.id is None:
+            raise RepositoryError("No se puede actualizar un gasto sin ID")
+        with self._lock:
+            current = self._by_id.get(expense.id)
+            if current is None:
+                raise ExpenseNotFoundError(expense.id)
+            self._unindex(current)
+            self._index(copy.copy(expense))
+        return expense
+
+    def delete(self, expense_id: int) -> bool:
+        with self._lock:
+            current = self._by_id.get(expense_id)
+            if current is None:
+                return False
+            self._unindex(current)
+        return True
+
+    def clear_all(self) -> None:
+        """Elimina todos los gastos (útil para testing)"""
+        with self._lock:
+            self._reset()
+
+    # --- Lecturas -----------------------------------------------------------
+
+    def get_by_id(self, expense_id: int) -> Optional[Expense]:
+        with self._lock:
+            expense = self._by_id.get(expense_id)
+            return copy.copy(expense) if expense is not None else None
+
+    def get_all(self) -> List[Expense]:
+        with self._lock:
+            return self._copies(self._by_id[expense_id] for _, expense_id in reversed(self._by_date))
+
+    def get_by_date_range(self, start_date: datetime, end_date: datetime) -> List[Expense]:
+        with self._lock:
+            return self._copies(self._by_id[expense_id] for expense_id in self._ids_in_range(start_date, end_date))
+
+    def get_by_category(self, category: str) -> List[Expense]:
+        with self._lock:
+            return self._copies(self._newest_first(self._by_category.get(category.strip().lower(), ())))
+
+    def get_by_payment_method(self, payment_method: str) -> List[Expense]:
+        with self._lock:
+            return self._copies(self._newest_first(self._by_method.get(payment_method, ())))
+
+    def get_recent_expenses(self, days: int = 30) -> List[Expense]:
+        end_date = datetime.now()
+        return self.get_by_date_range(end_date - timedelta(days=days), end_date)
+
+    def search_by_description(self, search_term: str) -> List[Expense]:
+        search_lower = search_term.lower()
+        return [
+            expense for expense in self.get_all()
+            if expense.description and search_lower in expense.description.lower()
+        ]
+
+    def find(self, query: ExpenseQuery) -> List[Expense]:
+        """
+        Parte del índice más selectivo disponible (rango de fechas, categoría
+        o método) y filtra el resto; orden y límite como en ExpenseQuery
+        """
+        with self._lock:
+            if query.has_date_range:
+                candidates = [self._by_id[i] for i in self._ids_in_range(query.start_date, query.end_date)]
+            elif query.category:
+                candidates = self._newest_first(self._by_category.get(query.category.strip().lower(), ()))
+            elif query.payment_method:
+                candidates = self._newest_first(self._by_method.get(query.payment_method, ()))
+            else:
+                candidates = [self._by_id[expense_id] for _, expense_id in reversed(self._by_date)]
+            found = query.order_and_limit([e for e in candidates if query.matches(e)], _expense_value)
+            return self._copies(found)
+
+    def count(self, query: ExpenseQuery, estimate: bool = False) -> ExpenseCount:
+        """
+        Si el único filtro es el de un índice (rango, categoría o método) es
+        el tamaño del índice (el rango, con bisect); si no, filtra los
+        candidatos del índice más selectivo, como find
+        """
+        with self._lock:
+            if query.has_date_range:
+                low, high = self._date_bounds(query.start_date, query.end_date)
+                ids: Iterable[int] = (expense_id for _, expense_id in self._by_date[low:high])
+                size, rest = high - low, bool(query.category or query.payment_method)
+            elif query.category:
+                ids = self._by_category.get(query.category.strip().lower(), ())
+                size, rest = len(ids), bool(query.payment_method)
+            elif query.payment_method:
+                ids = self._by_method.get(query.payment_method, ())
+                size, rest = len(ids), False
+            else:
+                ids, size, rest = self._by_id, len(self._by_id), False
+            if not rest and query.min_amount is None and query.max_amount is None:
+                return ExpenseCount(size)
+            return ExpenseCount(sum(1 for expense_id in ids if query.matches(self._by_id[expense_id])))
+
+    # --- Agregados ----------------------------------------------------------
+
+    def get_total_by_category(self, rates: Optional[ExchangeRates] = None, base: Optional[str] = None) -> Dict[str, float]:
+        if rates is not None:
+            return ExpenseAnalytics.totals_by_category(self.get_columns().in_currency(rates, base or rates.pivot))
+        with self._lock:
+            return {
+                self._by_id[next(iter(ids))].category: sum(self._by_id[i].amount for i in ids)
+                for ids in self._by_category.values()
+            }
+
+    def get_total_by_payment_method(self, rates: Optional[ExchangeRates] = None, base: Optional[str] = None) -> Dict[str, float]:
+        if rates is not None:
+            return ExpenseAnalytics.totals_by_payment_method(self.get_columns().in_currency(rates, base or rates.pivot))
+        with self._lock:
+            return {method: sum(self._by_id[i].amount for i in ids) for method, ids in self._by_method.items()}
+
+    def get_count_by_category(self) -> Dict[str, int]:
+        with self._lock:
+            return {self._by_id[next(iter(ids))].category: len(ids) for ids in self._by_category.values()}
+
+    def get_time_series(
+        self,
+        granularity: str,
+        start_date: datetime,
+        end_date: datetime,
+        category: Optional[str] = None
+    ) -> List[Dict]:
+        category_lower = category.lower() if category else None
+        truncate = ExpenseService.truncate_date
+        buckets: Dict[datetime, list] = {}
+        with self._lock:
+            for expense_id in self._ids_in_range(start_date, end_date):
+                expense = self._by_id[expense_id]
+                if category_lower and expense.category.lower() != category_lower:
+                    continue
+                bucket = buckets.setdefault(truncate(expense.date, granularity), [0.0, 0])
+                bucket[0] += expense.amount
+                bucket[1] += 1
+        return ExpenseService.build_time_series(
+            {key: (total, count) for key, (total, count) in buckets.items()},
+            start_date,
+            end_date,
+            granularity
+        )
+
+    def get_columns(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> ExpenseColumns:
+        """Arrays desde los gastos indexados (el rango sale del índice por fecha)"""
+        with self._lock:
+            if start_date is not None and end_date is not None:
+                expenses = [self._by_id[i] for i in self._ids_in_range(start_date, end_date)]
+            else:
+                expenses = [self._by_id[expense_id] for _, expense_id in reversed(self._by_date)]
+        return ExpenseColumns.from_rows(
+            [e.id for e in expenses],
+            [e.amount for e in expenses],
+            [e.date for e in expenses],
+            [e.category for e in expenses],
+            [e.payment_method.value for e in expenses],
+            [e.currency for e in expenses]
+        )
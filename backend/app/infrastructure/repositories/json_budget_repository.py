@@ -0,0 +1,130 @@
+# app/infrastructure/repositories/json_budget_repository.py
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+from ...domain.entities.budget import Budget
+from ...domain.repositories.budget_repository import BudgetRepository, MonthKey
+from ...domain.repositories.exceptions import RepositoryError, RepositoryConnectionError
+
+# Un lock por archivo, compartido por todas las instancias del proceso
+_FILE_LOCKS: Dict[str, threading.RLock] = {}
+_FILE_LOCKS_GUARD = threading.Lock()
+
+
+def _lock_for(path: Path) -> threading.RLock:
+    key = str(path.resolve())
+    with _FILE_LOCKS_GUARD:
+        return _FILE_LOCKS.setdefault(key, threading.RLock())
+
+
+class JsonBudgetRepository(BudgetRepository):
+    """
+    Presupuestos y contadores mensuales en un archivo JSON
+
+    Formato: {"budgets": {categoria: limite},
+              "month_totals": {mes: {categoria: total}}}
+
+    La transacción toma un lock del proceso durante toda la escritura del
+    gasto y guarda el archivo solo si terminó bien (temporal + rename).
+    Como el backend JSON, sirve para un único proceso.
+    """
+
+    def __init__(self, file_path: str = "budgets.json"):
+        self.file_path = Path(file_path)
+        self._lock = _lock_for(self.file_path)
+        self._state: Optional[Dict] = None
+        self._dirty = False
+
+    def _load(self) -> Dict:
+        if not self.file_path.exists():
+            return {"budgets": {}, "month_totals": {}}
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            data.setdefault("budgets", {})
+            data.setdefault("month_totals", {})
+            return data
+        except json.JSONDecodeError as e:
+            raise RepositoryError(f"Error al leer el archivo JSON: {e}")
+        except OSError as e:
+            raise RepositoryConnectionError(f"Error al acceder al archivo: {e}")
+
+    def _write(self, data: Dict) -> None:
+        try:
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.file_path.with_suffix(self.file_path.suffix + ".tmp")
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, self.file_path)
+        except OSError as e:
+            raise RepositoryConnectionError(f"Error al guardar en el archivo: {e}")
+
+    @contextmanager
+    def month_totals_transaction(self, exclusive: bool = False) -> Iterator[None]:
+        # exclusive no cambia nada: todas las transacciones ya son exclusivas
+        with self._lock:
+            if self._state is not None:
+                # Transacción anidada: la externa decide
+                yield
+                return
+            self._state = self._load()
+            self._dirty = False
+            try:
+                yield
+                if self._dirty:
+                    self._write(self._state)
+            finally:
+                self._state = None
+
+    @contextmanager
+    def _transaction_state(self) -> Iterator[Dict]:
+        with self.month_totals_transaction():
+            yield self._state
+
+    def get_all(self) -> List[Budget]:
+        with self._transaction_state() as state:
+            return [Budget(category, limit) for category, limit in sorted(state["budgets"].items())]
+
+    def get_by_category(self, category: str) -> Optional[Budget]:
+        category = category.strip().title()
+        with self._transaction_state() as state:
+            limit = state["budgets"].get(category)
+        return Budget(category, limit) if limit is not None else None
+
+    def save(self, budget: Budget) -> Budget:
+        with self._transaction_state() as state:
+            state["budgets"][budget.category] = budget.monthly_limit
+            self._dirty = True
+        return budget
+
+    def delete(self, category: str) -> bool:
+        with self._transaction_state() as state:
+            deleted = state["budgets"].pop(category.strip().title(), None) is not None
+            self._dirty = self._dirty or deleted
+        return deleted
+
+    def get_month_totals(self, month: str) -> Dict[str, float]:
+        with self._transaction_state() as state:
+            return dict(state["month_totals"].get(month, {}))
+
+    def apply_month_deltas(self, deltas: Dict[MonthKey, float]) -> Dict[MonthKey, float]:
+        totals = {}
+        with self._transaction_state() as state:
+            for (category, month), delta in deltas.items():
+                month_totals = state["month_totals"].setdefault(month, {})
+                month_totals[category] = round(month_totals.get(category, 0.0) + delta, 2)
+                totals[(category, month)] = month_totals[category]
+            self._dirty = self._dirty or bool(deltas)
+        return totals
+
+    def replace_month_totals(self, totals: Dict[MonthKey, float]) -> None:
+        with self._transaction_state() as state:
+            month_totals: Dict[str, Dict[str, float]] = {}
+            for (category, month), total in sorted(totals.items()):
+                month_totals.setdefault(month, {})[category] = round(total, 2)
+            state["month_totals"] = month_totals
+            self._dirty = True
@@ -0,0 +1,218 @@
+# app/infrastructure/repositories/json_codecs.py
+"""
+Formatos del archivo de gastos del backend JSON (settings.json_codec)
+
+- json: stdlib, indentado (el formato histórico, legible a mano)
+- orjson: JSON compacto con orjson (mismo formato, codifica y parsea en C)
+- msgpack: binario, con las fechas como enteros (microsegundos desde 1970)
+
+El formato se detecta al leer mirando los primeros bytes, así que un archivo
+escrito con otro codec se sigue leyendo; el próximo guardado lo reescribe en
+el codec configurado. orjson y msgpack solo se importan si se usan.
+"""
+import json
+import warnings
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ...domain.repositories.exceptions import RepositoryError
+from .json_stream import iter_json_array
+
+FORMAT_JSON = "json"
+FORMAT_MSGPACK = "msgpack"
+
+_MICROS_PER_SECOND = 1_000_000
+_EPOCH = datetime(1970, 1, 1)
+
+
+class ExpenseFileCodec(ABC):
+    """Cómo se escribe y se lee la lista de gastos (diccionarios con la fecha como string ISO)"""
+    name = ""
+    format = ""
+
+    @abstractmethod
+    def dumps(self, records: List[dict]) -> bytes:
+        """Serializa la lista completa de gastos"""
+        pass
+
+    @abstractmethod
+    def loads(self, data: bytes) -> List[dict]:
+        """Raises: ValueError: Si el contenido no es válido para el formato"""
+        pass
+
+    @abstractmethod
+    def iter_records(self, path: Union[str, Path], offset: int = 0) -> Iterator[Tuple[dict, int]]:
+        """
+        Recorre el archivo de a un gasto (memoria acotada por el registro más grande)
+        Yields: Tuple[dict, int]: Registro y byte en el que termina (para retomar)
+        """
+        pass
+
+
+class JsonCodec(ExpenseFileCodec):
+    name = "json"
+    format = FORMAT_JSON
+
+    def dumps(self, records: List[dict]) -> bytes:
+        return json.dumps(records, indent=2, ensure_ascii=False).encode("utf-8")
+
+    def loads(self, data: bytes) -> List[dict]:
+        return json.loads(data) if data.strip() else []
+
+    def iter_records(self, path: Union[str, Path], offset: int = 0) -> Iterator[Tuple[dict, int]]:
+        return iter_json_array(path, offset)
+
+
+class OrjsonCodec(JsonCodec):
+    name = "orjson"
+
+    def __init__(self):
+        self._orjson = _import_optional("orjson")
+
+    def dumps(self, records: List[dict]) -> bytes:
+        return self._orjson.dumps(records)
+
+    def loads(self, data: bytes) -> List[dict]:
+        return self._orjson.loads(data) if data.strip() else []
+
+
+class MsgpackCodec(ExpenseFileCodec):
+    """
+    Arreglo msgpack de mapas; la fecha va como entero (microsegundos desde
+    1970, hora local sin zona). Las fechas se convierten de y a ISO
+    vectorizado con numpy, no con fromisoformat por fila
+    """
+    name = "msgpack"
+    format = FORMAT_MSGPACK
+
+    def __init__(self):
+        self._msgpack = _import_optional("msgpack")
+
+    def dumps(self, records: List[dict]) -> bytes:
+        dates = _iso_to_epoch_micros([record.get("date") for record in records])
+        if dates is not None:
+            records = [{**record, "date": date} for record, date in zip(records, dates)]
+        return self._msgpack.packb(records, use_bin_type=True)
+
+    def loads(self, data: bytes) -> List[dict]:
+        if not data:
+            return []
+        records = self._msgpack.unpackb(data, raw=False)
+        if not isinstance(records, list):
+            raise ValueError("El archivo msgpack no contiene un arreglo")
+        positions = [i for i, record in enumerate(records) if isinstance(record.get("date"), int)]
+        if positions:
+            dates = _epoch_micros_to_iso([records[i]["date"] for i in positions])
+            for i, date in zip(positions, dates):
+                records[i]["date"] = date
+        return records
+
+    def iter_records(self, path: Union[str, Path], offset: int = 0) -> Iterator[Tuple[dict, int]]:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            unpacker = self._msgpack.Unpacker(f, raw=False)
+            remaining = unpacker.read_array_header() if offset == 0 else None
+            start = offset
+            while remaining is None or remaining > 0:
+                try:
+                    record = unpacker.unpack()
+                except self._msgpack.OutOfData:
+                    return
+                if isinstance(record.get("date"), int):
+                    record["date"] = _epoch_micros_to_iso_one(record["date"])
+                if remaining is not None:
+                    remaining -= 1
+                yield record, start + unpacker.tell()
+
+
+_CODECS = {"json": JsonCodec, "orjson": OrjsonCodec, "msgpack": MsgpackCodec}
+_DEFAULT_FOR_FORMAT = {FORMAT_JSON: JsonCodec, FORMAT_MSGPACK: MsgpackCodec}
+
+
+def available_codecs() -> List[str]:
+    return sorted(_CODECS)
+
+
+def get_codec(name: str) -> ExpenseFileCodec:
+    """
+    Raises: RepositoryError: Si el codec no existe o su paquete no está instalado
+    """
+    try:
+        codec_class = _CODECS[name.strip().lower()]
+    except KeyError:
+        raise RepositoryError(f"Codec desconocido: '{name}' (disponibles: {', '.join(available_codecs())})")
+    return codec_class()
+
+
+def detect_format(path: Union[str, Path]) -> Optional[str]:
+    """
+    Formato del archivo según sus primeros bytes (None si está vacío o no existe)
+    Un arreglo JSON empieza con '['; uno msgpack con 0x90-0x9f, 0xdc o 0xdd
+    """
+    try:
+        with open(path, "rb") as f:
+            head = f.read(64).lstrip()
+    except FileNotFoundError:
+        return None
+    if not head:
+        return None
+    if head[:1] == b"[":
+        return FORMAT_JSON
+    if 0x90 <= head[0] <= 0x9F or head[0] in (0xDC, 0xDD):
+        return FORMAT_MSGPACK
+    raise RepositoryError(f"Formato de archivo de gastos no reconocido: {path}")
+
+
+def codec_for_file(path: Union[str, Path], preferred: Optional[ExpenseFileCodec] = None) -> ExpenseFileCodec:
+    """Codec para leer el archivo: el preferido si coincide con el formato detectado"""
+    detected = detect_format(path)
+    if preferred is not None and (detected is None or preferred.format == detected):
+        return preferred
+    return _DEFAULT_FOR_FORMAT[detected or FORMAT_JSON]()
+
+
+def _import_optional(package: str) -> Any:
+    try:
+        return __import__(package)
+    except ImportError:
+        raise RepositoryError(f"El codec '{package}' requiere el paquete {package} (pip install {package})")
+
+
+def _iso_to_epoch_micros(dates: List[Optional[str]]) -> Optional[List[Optional[int]]]:
+    """
+    Fechas ISO sin zona a enteros, parseadas por numpy en C
+    Returns: None si alguna no se puede convertir (con zona horaria): se guardan como texto
+    """
+    try:
+        with warnings.catch_warnings():
+            # numpy acepta (con aviso) un offset de zona y lo pasa a UTC: se trata como no convertible
+            warnings.simplefilter("error", DeprecationWarning)
+            values = np.asarray(dates, dtype="datetime64[us]")
+    except (ValueError, DeprecationWarning):
+        return None
+    missing = np.isnat(values)
+    micros = values.astype(np.int64).tolist()
+    if missing.any():
+        return [None if flag else value for flag, value in zip(missing.tolist(), micros)]
+    return micros
+
+
+def _epoch_micros_to_iso(micros: List[int]) -> List[str]:
+    """Inverso de _iso_to_epoch_micros, con el mismo texto que datetime.isoformat()"""
+    values = np.asarray(micros, dtype=np.int64).astype("datetime64[us]")
+    whole = values.astype(np.int64) % _MICROS_PER_SECOND == 0
+    # isoformat() omite los microsegundos cuando son 0 (el caso habitual)
+    if whole.all():
+        return values.astype("datetime64[s]").astype(str).tolist()
+    if not whole.any():
+        return values.astype(str).tolist()
+    return np.where(whole, values.astype("datetime64[s]").astype(str), values.astype(str)).tolist()
+
+
+def _epoch_micros_to_iso_one(micros: int) -> str:
+    """Una sola fecha (iter_records): sin el costo fijo de numpy por llamada"""
+    return (_EPOCH + timedelta(microseconds=micros)).isoformat()
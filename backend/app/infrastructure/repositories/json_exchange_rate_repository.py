@@ -0,0 +1,69 @@
+# app/infrastructure/repositories/json_exchange_rate_repository.py
+import json
+import os
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from ...domain.repositories.exceptions import RepositoryError, RepositoryConnectionError
+from ...domain.repositories.exchange_rate_repository import ExchangeRateRepository
+from ...domain.services.currency import ExchangeRate
+from .json_budget_repository import _lock_for
+
+
+class JsonExchangeRateRepository(ExchangeRateRepository):
+    """
+    Tipos de cambio en un archivo JSON
+
+    Formato: [{"currency": "EUR", "date": "2024-01-01", "rate": 1.09}, ...]
+    Como el resto del backend JSON, sirve para un único proceso.
+    """
+
+    def __init__(self, file_path: str = "exchange_rates.json"):
+        self.file_path = Path(file_path)
+        self._lock = _lock_for(self.file_path)
+
+    def _load(self) -> Dict[Tuple[str, date], float]:
+        if not self.file_path.exists():
+            return {}
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return {
+                (item["currency"], date.fromisoformat(item["date"])): float(item["rate"])
+                for item in data
+            }
+        except (json.JSONDecodeError, KeyError, ValueError) as e:
+            raise RepositoryError(f"Error al leer el archivo JSON: {e}")
+        except OSError as e:
+            raise RepositoryConnectionError(f"Error al acceder al archivo: {e}")
+
+    def _write(self, rates: Dict[Tuple[str, date], float]) -> None:
+        data = [
+            {"currency": currency, "date": day.isoformat(), "rate": rate}
+            for (currency, day), rate in sorted(rates.items())
+        ]
+        try:
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.file_path.with_suffix(self.file_path.suffix + ".tmp")
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(temp_path, self.file_path)
+        except OSError as e:
+            raise RepositoryConnectionError(f"Error al guardar en el archivo: {e}")
+
+    def get_all(self) -> List[ExchangeRate]:
+        with self._lock:
+            rates = self._load()
+        return [ExchangeRate(day, currency, rate) for (currency, day), rate in sorted(rates.items())]
+
+    def save_many(self, rates: Iterable[ExchangeRate]) -> int:
+        with self._lock:
+            stored = self._load()
+            count = 0
+            for rate in rates:
+                stored[(rate.currency, rate.date)] = rate.rate
+                count += 1
+            if count:
+                self._write(stored)
+        return count
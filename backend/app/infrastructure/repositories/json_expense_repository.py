@@ -1,12 +1,21 @@
 # app/infrastructure/repositories/json_expense_repository.py
-import json
+import itertools
 import os
-from typing import List, Optional, Dict
+import sys
+from collections import Counter
+from typing import Any, Hashable, Iterator, List, Optional, Dict, Sequence
 from datetime import datetime
 from pathlib import Path
 
-from ...domain.entities.expense import Expense, PaymentMethod
+import numpy as np
+
+from ...domain.entities.expense import DEFAULT_CURRENCY, Expense, PaymentMethod
 from ...domain.repositories.expense_repository import ExpenseRepository
+from ...domain.repositories.expense_query import ExpenseCount, ExpenseQuery, project, stored_fields
+from ...domain.services.currency import ExchangeRates
+from ...domain.services.expense_service import ExpenseService
+from ...domain.services.expense_analytics import ExpenseColumns, ExpenseAnalytics
+from .json_codecs import codec_for_file, get_codec
 from ...domain.repositories.exceptions import (
     ExpenseNotFoundError, 
     RepositoryError,
@@ -14,6 +23,22 @@ from ...domain.repositories.exceptions import (
 )
 
 
+def expense_from_dict(data: dict) -> Expense:
+    """
+    Gasto a partir de un registro del archivo JSON (valida con la entidad)
+    Raises: ValueError / KeyError: Si el registro está incompleto o es inválido
+    """
+    return Expense(
+        amount=float(data['amount']),
+        category=data['category'],
+        payment_method=PaymentMethod(data['payment_method']),
+        date=datetime.fromisoformat(data['date']) if data.get('date') else None,
+        description=data.get('description'),
+        id=data.get('id'),
+        currency=data.get('currency')
+    )
+
+
 class JsonExpenseRepository(ExpenseRepository):
     """
     Implementación del ExpenseRepository usando archivo JSON
@@ -24,16 +49,24 @@ class JsonExpenseRepository(ExpenseRepository):
     - Testing
     - Proyectos pequeños
     - No requiere base de datos instalada
+    
+    El formato del archivo lo da el codec (json, orjson o msgpack, ver
+    json_codecs.py); se lee cualquiera y se guarda en el configurado.
     """
     
-    def __init__(self, file_path: str = "expenses.json"):
+    def __init__(self, file_path: str = "expenses.json", codec: Optional[str] = None):
         """
         Inicializa el repositorio JSON
         
         Args:
             file_path: Ruta del archivo JSON donde se guardarán los gastos
+            codec: Codec con el que se escribe (por defecto settings.json_codec)
         """
+        if codec is None:
+            from ...core.config import settings
+            codec = settings.json_codec
         self.file_path = Path(file_path)
+        self.codec = get_codec(codec)
         self._ensure_file_exists()
     
     def _ensure_file_exists(self) -> None:
@@ -49,24 +82,43 @@ class JsonExpenseRepository(ExpenseRepository):
             List[dict]: Lista de gastos en formato diccionario
         """
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                return data if isinstance(data, list) else []
-        except json.JSONDecodeError as e:
+            data = codec_for_file(self.file_path, self.codec).loads(self.file_path.read_bytes())
+            if not isinstance(data, list):
+                return []
+            # Cada nombre de categoría queda una sola vez en memoria (los
+            # filtros y conteos comparan el mismo objeto en lugar de copias)
+            for item in data:
+                item['category'] = sys.intern(item['category'])
+            return data
+        except RepositoryError:
+            raise
+        except ValueError as e:
             raise RepositoryError(f"Error al leer el archivo JSON: {e}")
         except Exception as e:
             raise RepositoryConnectionError(f"Error al acceder al archivo: {e}")
     
+    def _load_records(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[dict]:
+        """
+        Registros que pueden caer en el rango (el que llama filtra por fecha)
+        Con un solo archivo son todos; el layout por meses abre solo los que se solapan
+        """
+        return self._load_from_file()
+    
     def _save_to_file(self, data: List[dict]) -> None:
         """
         Guarda los datos en el archivo JSON
         
+        Se escribe a un temporal y se reemplaza: las lecturas concurrentes
+        (rutas en el threadpool, snapshots) nunca ven el archivo a medias
+
         Args:
             data: Lista de gastos en formato diccionario
         """
         try:
-            with open(self.file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            temp_path = self.file_path.with_suffix(self.file_path.suffix + ".tmp")
+            with open(temp_path, 'wb') as f:
+                f.write(self.codec.dumps(data))
+            os.replace(temp_path, self.file_path)
         except Exception as e:
             raise RepositoryConnectionError(f"Error al guardar en el archivo: {e}")
     
@@ -80,14 +132,7 @@ class JsonExpenseRepository(ExpenseRepository):
         Returns:
             Expense: Entidad creada
         """
-        return Expense(
-            amount=float(data['amount']),
-            category=data['category'],
-            payment_method=PaymentMethod(data['payment_method']),
-            date=datetime.fromisoformat(data['date']) if data.get('date') else None,
-            description=data.get('description'),
-            id=data.get('id')
-        )
+        return expense_from_dict(data)
     
     def _expense_to_dict(self, expense: Expense) -> dict:
         """
@@ -105,7 +150,8 @@ class JsonExpenseRepository(ExpenseRepository):
             'category': expense.category,
             'payment_method': expense.payment_method.value,
             'date': expense.date.isoformat() if expense.date else None,
-            'description': expense.description
+            'description': expense.description,
+            'currency': expense.currency
         }
     
     def _get_next_id(self) -> int:
@@ -162,10 +208,10 @@ class JsonExpenseRepository(ExpenseRepository):
         """
         Obtiene gastos en un rango de fechas
         """
-        all_expenses = self.get_all()
+        candidates = (self._dict_to_expense(item) for item in self._load_records(start_date, end_date))
         
         return [
-            expense for expense in all_expenses
+            expense for expense in candidates
             if start_date <= expense.date <= end_date
         ]
     
@@ -233,10 +279,13 @@ class JsonExpenseRepository(ExpenseRepository):
         
         return False
     
-    def get_total_by_category(self) -> Dict[str, float]:
+    def get_total_by_category(self, rates: Optional[ExchangeRates] = None, base: Optional[str] = None) -> Dict[str, float]:
         """
         Obtiene totales agrupados por categoría
+        Con tipos de cambio convierte las columnas (vectorizado) y agrupa con bincount
         """
+        if rates is not None:
+            return ExpenseAnalytics.totals_by_category(self._columns_in(rates, base))
         all_expenses = self.get_all()
         totals: Dict[str, float] = {}
         
@@ -247,10 +296,12 @@ class JsonExpenseRepository(ExpenseRepository):
         
         return totals
     
-    def get_total_by_payment_method(self) -> Dict[str, float]:
+    def get_total_by_payment_method(self, rates: Optional[ExchangeRates] = None, base: Optional[str] = None) -> Dict[str, float]:
         """
         Obtiene totales agrupados por método de pago
         """
+        if rates is not None:
+            return ExpenseAnalytics.totals_by_payment_method(self._columns_in(rates, base))
         all_expenses = self.get_all()
         totals: Dict[str, float] = {}
         
@@ -262,19 +313,15 @@ class JsonExpenseRepository(ExpenseRepository):
         
         return totals
     
+    def _columns_in(self, rates: ExchangeRates, base: Optional[str]) -> ExpenseColumns:
+        return self.get_columns().in_currency(rates, base or rates.pivot)
+    
     def get_count_by_category(self) -> Dict[str, int]:
         """
-        Obtiene cantidad de gastos por categoría
+        Obtiene cantidad de gastos por categoría (sobre los nombres internados, sin entidades)
         """
-        all_expenses = self.get_all()
-        counts: Dict[str, int] = {}
-        
-        for expense in all_expenses:
-            if expense.category not in counts:
-                counts[expense.category] = 0
-            counts[expense.category] += 1
-        
-        return counts
+        return dict(Counter(item['category'] for item in self._load_from_file()))
+
     
     def search_by_description(self, search_term: str) -> List[Expense]:
         """
@@ -298,6 +345,155 @@ class JsonExpenseRepository(ExpenseRepository):
         
         return self.get_by_date_range(start_date, end_date)
     
+    def get_time_series(
+        self,
+        granularity: str,
+        start_date: datetime,
+        end_date: datetime,
+        category: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Serie temporal desde las columnas: truncar fechas a códigos enteros
+        y sumar con np.bincount (sin bucles de Python por fila)
+        """
+        columns = self.get_columns(start_date, end_date)
+        if category:
+            category_lower = category.lower()
+            codes = [code for code, name in enumerate(columns.categories) if name.lower() == category_lower]
+            columns = columns.select(np.isin(columns.category_codes, codes))
+        return ExpenseService.build_time_series(
+            ExpenseAnalytics.time_series_buckets(columns, granularity),
+            start_date,
+            end_date,
+            granularity
+        )
+    
+    def get_columns(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> ExpenseColumns:
+        """
+        Arrays directamente desde los diccionarios del archivo (sin entidades)
+        """
+        data = [item for item in self._load_records(start_date, end_date) if item.get('date')]
+        columns = ExpenseColumns.from_rows(
+            [item.get('id') for item in data],
+            [item['amount'] for item in data],
+            [item['date'] for item in data],
+            [item['category'] for item in data],
+            [item['payment_method'] for item in data],
+            # Los archivos anteriores a multi-moneda no tienen la clave
+            [item.get('currency', DEFAULT_CURRENCY) for item in data]
+        )
+        if start_date is not None and end_date is not None:
+            columns = columns.select(ExpenseAnalytics.period_mask(columns, start_date, end_date))
+        return columns
+    
+    def find(self, query: ExpenseQuery) -> List[Expense]:
+        """
+        Filtra, ordena y limita sobre los diccionarios crudos (las fechas ISO
+        ordenan bien como texto) y solo construye entidades para el resultado
+        """
+        return [self._dict_to_expense(item) for item in self._find_raw(query)]
+    
+    def find_rows(self, query: ExpenseQuery, fields: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Filtra y proyecta sobre los diccionarios crudos: sin entidades y sin
+        parsear fechas salvo que haya rango (la fecha sale como está en el archivo)
+        """
+        stored = stored_fields(fields)
+        return [project(self._raw_row(item, stored), fields) for item in self._find_raw(query)]
+    
+    def _find_raw(self, query: ExpenseQuery) -> List[dict]:
+        matching = [item for item in self._load_records(query.start_date, query.end_date) if query.matches_row(item)]
+        # Con límite: heapq.nlargest/nsmallest en lugar de ordenar todo
+        return query.order_and_limit(matching, self._raw_value)
+    
+    @staticmethod
+    def _raw_value(item: dict, name: str):
+        value = item.get(name)
+        return float(value) if name == 'amount' else value
+    
+    def _iter_raw(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> Iterator[dict]:
+        """
+        Recorre el archivo de a un diccionario (sin cargarlo entero): la
+        memoria no depende del tamaño del archivo. Lee el archivo abierto al
+        empezar; los guardados posteriores (os.replace) no lo alteran.
+        El rango, como en _load_records, solo acota qué se lee
+        """
+        try:
+            for item, _ in codec_for_file(self.file_path, self.codec).iter_records(self.file_path):
+                yield item
+        except ValueError as e:
+            raise RepositoryError(f"Error al leer el archivo JSON: {e}")
+        except OSError as e:
+            raise RepositoryConnectionError(f"Error al acceder al archivo: {e}")
+    
+    def iter_all(self) -> Iterator[Expense]:
+        """Gastos en el orden del archivo, decodificados de a uno"""
+        for item in self._iter_raw():
+            yield self._dict_to_expense(item)
+    
+    def iter_by_date_range(self, start_date: datetime, end_date: datetime) -> Iterator[Expense]:
+        for item in self._iter_raw(start_date, end_date):
+            expense = self._dict_to_expense(item)
+            if start_date <= expense.date <= end_date:
+                yield expense
+    
+    def iter_find(self, query: ExpenseQuery) -> Iterator[Expense]:
+        """
+        Filtra sobre los diccionarios crudos mientras lee. Sin sort sale en el
+        orden del archivo; con sort y limit retiene solo los offset + limit
+        primeros (heap); con sort sin limit tiene que juntar los que coinciden.
+        """
+        matching = (item for item in self._iter_raw(query.start_date, query.end_date) if query.matches_row(item))
+        if query.sort is None:
+            end = query.offset + query.limit if query.limit is not None else None
+            matching = itertools.islice(matching, query.offset, end)
+        else:
+            matching = query.order_and_limit(matching, self._raw_value)
+        for item in matching:
+            yield self._dict_to_expense(item)
+    
+    def count(self, query: ExpenseQuery, estimate: bool = False) -> ExpenseCount:
+        """Cuenta sobre los diccionarios crudos mientras lee, sin entidades (siempre exacto)"""
+        return ExpenseCount(sum(
+            1 for item in self._iter_raw(query.start_date, query.end_date) if query.matches_row(item)
+        ))
+    
+    def get_data_version(self) -> Optional[Hashable]:
+        """
+        Inodo, mtime y tamaño del archivo: cada guardado lo reemplaza
+        (os.replace), así que cambia aunque escriba otro proceso
+        """
+        return self._stat_version(self.file_path)
+    
+    @staticmethod
+    def _stat_version(path: Path) -> Optional[Hashable]:
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    
+    def get_row_by_id(self, expense_id: int, fields: Sequence[str]) -> Optional[Dict[str, Any]]:
+        """Un gasto proyectado desde el diccionario crudo"""
+        stored = stored_fields(fields)
+        for item in self._load_from_file():
+            if item.get('id') == expense_id:
+                return project(self._raw_row(item, stored), fields)
+        return None
+    
+    @staticmethod
+    def _raw_row(item: dict, stored: Sequence[str]) -> Dict[str, Any]:
+        row = {name: item.get(name) for name in stored}
+        if 'currency' in row and row['currency'] is None:
+            row['currency'] = DEFAULT_CURRENCY
+        if 'amount' in row:
+            row['amount'] = float(row['amount'])
+        return row
+    
     def clear_all(self) -> None:
         """
         Elimina todos los gastos (útil para testing)
@@ -316,5 +512,6 @@ class JsonExpenseRepository(ExpenseRepository):
             'file_path': str(self.file_path),
             'file_exists': self.file_path.exists(),
             'total_expenses': len(data),
+            'codec': self.codec.name,
             'file_size_bytes': self.file_path.stat().st_size if self.file_path.exists() else 0
         }
\ No newline at end of file
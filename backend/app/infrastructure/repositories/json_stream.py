@@ -0,0 +1,80 @@
+# app/infrastructure/repositories/json_stream.py
+import codecs
+import json
+from pathlib import Path
+from typing import Any, Iterator, Tuple, Union
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+_WHITESPACE = " \t\n\r"
+
+
+def iter_json_array(
+    path: Union[str, Path],
+    offset: int = 0,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Tuple[Any, int]]:
+    """
+    Recorre los elementos de un archivo con un arreglo JSON sin cargarlo entero
+
+    Lee de a `chunk_size` bytes y decodifica un elemento por vez: la memoria
+    queda acotada por el elemento más grande, no por el tamaño del archivo.
+
+    Args: path: Archivo cuyo contenido es un arreglo JSON
+          offset: Byte desde el que seguir (0 = inicio; si no, uno devuelto antes)
+          chunk_size: Bytes por lectura
+    Yields: Tuple[Any, int]: Elemento y byte en el que termina (para retomar desde ahí)
+    Raises: json.JSONDecodeError: Si el archivo no es un arreglo JSON válido
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder("utf-8")()
+    with open(path, "rb") as f:
+        f.seek(offset)
+        buffer, position, eof = "", 0, False
+        expecting_start = offset == 0
+
+        def fill() -> bool:
+            nonlocal buffer, position, eof
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[position:] + text_decoder.decode(chunk, final=eof)
+            position = 0
+            return not eof
+
+        while True:
+            # Separadores entre elementos: espacios, la apertura y las comas
+            while True:
+                while position < len(buffer) and buffer[position] in _WHITESPACE:
+                    offset += 1
+                    position += 1
+                if position == len(buffer):
+                    if not fill():
+                        raise json.JSONDecodeError("Fin de archivo dentro del arreglo", buffer, position)
+                    continue
+                char = buffer[position]
+                if expecting_start:
+                    if char != "[":
+                        raise json.JSONDecodeError("Se esperaba un arreglo JSON", buffer, position)
+                    expecting_start = False
+                elif char == ",":
+                    pass
+                elif char == "]":
+                    return
+                else:
+                    break
+                offset += 1
+                position += 1
+
+            while True:
+                # Un elemento que llega justo al fin del bloque puede estar
+                # cortado (o ser un número incompleto): leer más y reintentar
+                try:
+                    item, end = decoder.raw_decode(buffer, position)
+                    if end < len(buffer) or eof:
+                        break
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                fill()
+            offset += len(buffer[position:end].encode("utf-8"))
+            position = end
+            yield item, offset
@@ -0,0 +1,40 @@
+# app/infrastructure/repositories/observed_expense_repository.py
+from typing import Optional
+
+from ...domain.entities.expense import Expense
+from ...domain.events.expense_events import (
+    ExpenseChange, ExpenseEventBus, expense_events, CREATED, UPDATED, DELETED
+)
+from ...domain.repositories.expense_repository import ExpenseRepository
+from .repository_decorator import ExpenseRepositoryDecorator
+
+
+class ObservedExpenseRepository(ExpenseRepositoryDecorator):
+    """
+    Publica un ExpenseChange después de cada save, update y delete exitoso
+
+    Para update y delete lee antes el estado guardado, así los suscriptores
+    reciben el valor anterior real (el caso de uso modifica la entidad en memoria).
+    """
+
+    def __init__(self, inner: ExpenseRepository, event_bus: Optional[ExpenseEventBus] = None):
+        super().__init__(inner)
+        self._events = event_bus or expense_events
+
+    def save(self, expense: Expense) -> Expense:
+        saved = self._inner.save(expense)
+        self._events.publish(ExpenseChange(CREATED, after=saved))
+        return saved
+
+    def update(self, expense: Expense) -> Expense:
+        before = self._inner.get_by_id(expense.id) if expense.id is not None else None
+        updated = self._inner.update(expense)
+        self._events.publish(ExpenseChange(UPDATED, before=before, after=updated))
+        return updated
+
+    def delete(self, expense_id: int) -> bool:
+        before = self._inner.get_by_id(expense_id)
+        deleted = self._inner.delete(expense_id)
+        if deleted:
+            self._events.publish(ExpenseChange(DELETED, before=before))
+        return deleted
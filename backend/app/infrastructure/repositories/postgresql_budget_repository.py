@@ -0,0 +1,105 @@
+# app/infrastructure/repositories/postgresql_budget_repository.py
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from ...domain.entities.budget import Budget
+from ...domain.repositories.budget_repository import BudgetRepository, MonthKey
+from ...domain.repositories.exceptions import RepositoryError
+from ..database.models import BudgetModel, CategoryMonthTotalModel
+
+
+class PostgreSQLBudgetRepository(BudgetRepository):
+    """
+    Presupuestos y contadores mensuales en PostgreSQL
+
+    Comparte la sesión con PostgreSQLExpenseRepository: los deltas se escriben
+    antes que el gasto y el commit del gasto confirma ambos (o el rollback
+    deshace ambos). Cada contador se actualiza con un UPSERT atómico
+    (total = total + delta) que bloquea la fila hasta el commit, así los
+    escritores concurrentes se serializan por contador sin perder sumas.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_all(self) -> List[Budget]:
+        models = self.db.query(BudgetModel).order_by(BudgetModel.category).all()
+        return [Budget(model.category, model.monthly_limit) for model in models]
+
+    def get_by_category(self, category: str) -> Optional[Budget]:
+        model = self.db.get(BudgetModel, category.strip().title())
+        return Budget(model.category, model.monthly_limit) if model else None
+
+    def save(self, budget: Budget) -> Budget:
+        try:
+            self.db.merge(BudgetModel(
+                category=budget.category,
+                monthly_limit=budget.monthly_limit,
+                updated_at=datetime.now(timezone.utc)
+            ))
+            self.db.commit()
+            return budget
+        except Exception as e:
+            self.db.rollback()
+            raise RepositoryError(f"Error al guardar presupuesto: {str(e)}")
+
+    def delete(self, category: str) -> bool:
+        try:
+            deleted = self.db.query(BudgetModel).filter(
+                BudgetModel.category == category.strip().title()
+            ).delete()
+            self.db.commit()
+            return deleted > 0
+        except Exception as e:
+            self.db.rollback()
+            raise RepositoryError(f"Error al eliminar presupuesto: {str(e)}")
+
+    def get_month_totals(self, month: str) -> Dict[str, float]:
+        results = self.db.query(
+            CategoryMonthTotalModel.category,
+            CategoryMonthTotalModel.total
+        ).filter(CategoryMonthTotalModel.month == month).all()
+        return {category: float(total) for category, total in results}
+
+    @contextmanager
+    def month_totals_transaction(self, exclusive: bool = False) -> Iterator[None]:
+        try:
+            if exclusive and self.db.get_bind().dialect.name == "postgresql":
+                # Los escritores esperan (ROW EXCLUSIVE) hasta que termine la reconstrucción
+                self.db.execute(text("LOCK TABLE category_month_totals IN EXCLUSIVE MODE"))
+            yield
+            self.db.commit()
+        except Exception:
+            self.db.rollback()
+            raise
+
+    def apply_month_deltas(self, deltas: Dict[MonthKey, float]) -> Dict[MonthKey, float]:
+        upsert = text("""
+            INSERT INTO category_month_totals (category, month, total)
+            VALUES (:category, :month, :delta)
+            ON CONFLICT (category, month)
+            DO UPDATE SET total = category_month_totals.total + excluded.total
+            RETURNING total
+        """)
+        totals = {}
+        # Orden fijo de claves: dos escrituras que tocan los mismos contadores no se bloquean en cruz
+        for category, month in sorted(deltas):
+            totals[(category, month)] = float(self.db.execute(
+                upsert, {"category": category, "month": month, "delta": deltas[(category, month)]}
+            ).scalar())
+        return totals
+
+    def replace_month_totals(self, totals: Dict[MonthKey, float]) -> None:
+        self.db.query(CategoryMonthTotalModel).delete()
+        if totals:
+            self.db.execute(
+                CategoryMonthTotalModel.__table__.insert(),
+                [
+                    {"category": category, "month": month, "total": total}
+                    for (category, month), total in totals.items()
+                ]
+            )
@@ -0,0 +1,34 @@
+# app/infrastructure/repositories/postgresql_exchange_rate_repository.py
+from typing import Iterable, List
+
+from sqlalchemy.orm import Session
+
+from ...domain.repositories.exceptions import RepositoryError
+from ...domain.repositories.exchange_rate_repository import ExchangeRateRepository
+from ...domain.services.currency import ExchangeRate
+from ..database.models import ExchangeRateModel
+
+
+class PostgreSQLExchangeRateRepository(ExchangeRateRepository):
+    """Tipos de cambio en la tabla exchange_rates (clave: moneda y fecha)"""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_all(self) -> List[ExchangeRate]:
+        models = self.db.query(ExchangeRateModel).order_by(
+            ExchangeRateModel.currency, ExchangeRateModel.date
+        ).all()
+        return [ExchangeRate(model.date, model.currency, model.rate) for model in models]
+
+    def save_many(self, rates: Iterable[ExchangeRate]) -> int:
+        try:
+            count = 0
+            for rate in rates:
+                self.db.merge(ExchangeRateModel(currency=rate.currency, date=rate.date, rate=rate.rate))
+                count += 1
+            self.db.commit()
+            return count
+        except Exception as e:
+            self.db.rollback()
+            raise RepositoryError(f"Error al guardar tipos de cambio: {str(e)}")
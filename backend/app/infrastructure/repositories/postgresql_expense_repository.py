@@ -4,19 +4,40 @@
 
 # app/infrastructure/repositories/postgresql_expense_repository.py
 
-from typing import List,Optional, Dict
+from typing import Any, Hashable, Iterable, Iterator, List,Optional, Dict, Sequence
 from datetime import datetime
 from datetime import timezone
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract
+from sqlalchemy import Date, cast, false, func, extract, text
 
 from ...domain.entities.expense import Expense, PaymentMethod
-from ...domain.repositories.expense_repository import ExpenseRepository
+from ...domain.repositories.expense_repository import ITER_BATCH_SIZE, ExpenseRepository
+from ...domain.repositories.expense_query import ExpenseCount, ExpenseQuery, project, stored_fields
+from ...domain.services.currency import ExchangeRates, epoch_day, sum_by_key_in_currency
+from ...domain.services.expense_service import ExpenseService
+from ...domain.services.expense_analytics import ExpenseColumns
 from ...domain.repositories.exceptions import (
     ExpenseNotFoundError, RepositoryError
 )
 
-from ..database.models import ExpenseModel, PaymentMethodEnum
+from ..database.models import CategoryModel, ExpenseModel, PaymentMethodEnum
+from .category_cache import CategoryCache, get_category_cache
+
+# Columna de cada campo proyectable
+_COLUMNS = {
+    "id": ExpenseModel.id,
+    "amount": ExpenseModel.amount,
+    "currency": ExpenseModel.currency,
+    "category": ExpenseModel.category,
+    "payment_method": ExpenseModel.payment_method,
+    "date": ExpenseModel.date,
+    "description": ExpenseModel.description,
+}
+
+# Por debajo de estas filas estimadas se cuenta exacto aunque se pida
+# estimación: contar pocas filas es barato y ahí el planner más se equivoca
+ESTIMATE_MIN_ROWS = 10_000
 
 
 class PostgreSQLExpenseRepository(ExpenseRepository):
@@ -25,12 +46,55 @@ class PostgreSQLExpenseRepository(ExpenseRepository):
     Esta es la implementacion REAL para produccion
     USA SQLAlchemy para comunicarse con PostgreeSQL
     """
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, categories: Optional[CategoryCache] = None):
         """
         Inicializa el repositorio con una sesion de BD
-        Args: Sesion de SQLAlchemy
+        Args: db: Sesion de SQLAlchemy
+              categories: Diccionario nombre <-> id de categorías (por defecto el global)
         """
         self.db = db
+        self._categories = categories or get_category_cache()
+
+    def _category_id(self, name: str, create: bool = False) -> Optional[int]:
+        """
+        Id de una categoría: de la caché o, si no está, de la tabla (una vez)
+        Args: create: Insertarla si no existe (al guardar un gasto)
+        Returns: Optional[int]: None si no existe y no se pidió crearla
+        """
+        category_id = self._categories.id_of(name)
+        if category_id is not None:
+            return category_id
+
+        model = self.db.query(CategoryModel).filter(
+            func.lower(CategoryModel.name) == name.strip().lower()
+        ).first()
+        if model is None and create:
+            try:
+                with self.db.begin_nested():
+                    model = CategoryModel(name=name)
+                    self.db.add(model)
+                # Recién creada: no va a la caché hasta que se lea confirmada
+                # (si la transacción se revierte, el id no existe)
+                return model.id
+            except IntegrityError:
+                # Otra transacción la creó al mismo tiempo
+                model = self.db.query(CategoryModel).filter(CategoryModel.name == name).one()
+        if model is None:
+            return None
+        self._categories.remember(model.id, model.name)
+        return model.id
+
+    def _category_names(self, category_ids: Iterable[int]) -> Dict[int, str]:
+        """Nombres de los ids pedidos; los que no están en caché se leen en una consulta"""
+        names = {category_id: self._categories.name_of(category_id) for category_id in set(category_ids)}
+        missing = [category_id for category_id, name in names.items() if name is None]
+        if missing:
+            for category_id, name in self.db.query(CategoryModel.id, CategoryModel.name).filter(
+                CategoryModel.id.in_(missing)
+            ):
+                self._categories.remember(category_id, name)
+                names[category_id] = name
+        return names
         
     def _model_to_entity(self, model: ExpenseModel) -> Expense:
         """
@@ -44,7 +108,8 @@ class PostgreSQLExpenseRepository(ExpenseRepository):
             payment_method=PaymentMethod(model.payment_method.value),
             date=model.date,
             description=model.description,
-            id=model.id
+            id=model.id,
+            currency=model.currency
         )
     
     def _entity_to_model(self, entity: Expense) -> ExpenseModel:
@@ -60,7 +125,9 @@ class PostgreSQLExpenseRepository(ExpenseRepository):
         return ExpenseModel(
             id=entity.id,
             amount=entity.amount,
+            currency=entity.currency,
             category=entity.category,
+            category_id=self._category_id(entity.category, create=True),
             payment_method=PaymentMethodEnum(entity.payment_method.value),
             date=entity.date,
             description=entity.description
@@ -95,6 +162,16 @@ class PostgreSQLExpenseRepository(ExpenseRepository):
             return None
         return self._model_to_entity(model)
 
+    def get_by_id_for_update(self, expense_id: int) -> Optional[Expense]:
+        """Obtiene un gasto por ID con SELECT ... FOR UPDATE"""
+        model = self.db.query(ExpenseModel).filter(
+            ExpenseModel.id == expense_id
+        ).with_for_update().first()
+
+        if not model:
+            return None
+        return self._model_to_entity(model)
+
     def get_all(self)-> List[Expense]:
         """Obtiene todos los gastos"""
         models = self.db.query(ExpenseModel).order_by(
@@ -117,8 +194,11 @@ class PostgreSQLExpenseRepository(ExpenseRepository):
     
     def get_by_category(self, category:str)->List[Expense]:
         """Obtiene gastos de una categoria"""
+        category_id = self._category_id(category)
+        if category_id is None:
+            return []
         models = self.db.query(ExpenseModel).filter(
-            func.lower(ExpenseModel.category) == category.lower()
+            ExpenseModel.category_id == category_id
         ).order_by(ExpenseModel.date.desc()).all()
 
         return [self._model_to_entity(model) for model in models]
@@ -147,7 +227,9 @@ class PostgreSQLExpenseRepository(ExpenseRepository):
             
             #Actualizar campos
             model.amount = expense.amount
+            model.currency = expense.currency
             model.category = expense.category
+            model.category_id = self._category_id(expense.category, create=True)
             model.payment_method = PaymentMethodEnum(expense.payment_method.value)
             model.description = expense.description
             model.date = expense.date
@@ -183,17 +265,24 @@ class PostgreSQLExpenseRepository(ExpenseRepository):
             raise RepositoryError(f"Error al eliminar el gasto: {str(e)}")
         
 
-    def get_total_by_category(self) -> Dict[str,float]:
-        """Obtiene gastos totales agrupados por categoria"""
+    def get_total_by_category(self, rates: Optional[ExchangeRates] = None, base: Optional[str] = None) -> Dict[str,float]:
+        """Obtiene gastos totales agrupados por categoria (group-by sobre category_id)"""
+        if rates is not None:
+            totals = self._totals_in_currency(ExpenseModel.category_id, rates, base)
+            names = self._category_names(int(category_id) for category_id in totals)
+            return {names[int(category_id)]: total for category_id, total in totals.items()}
         results = self.db.query(
-            ExpenseModel.category,
+            ExpenseModel.category_id,
             func.sum(ExpenseModel.amount).label('total')
-        ).group_by(ExpenseModel.category).all()
+        ).group_by(ExpenseModel.category_id).all()
 
-        return {category: float(total) for category, total in results}
+        names = self._category_names(category_id for category_id, _ in results)
+        return {names[category_id]: float(total) for category_id, total in results}
     
-    def get_total_by_payment_method(self) -> Dict[str,float]:
+    def get_total_by_payment_method(self, rates: Optional[ExchangeRates] = None, base: Optional[str] = None) -> Dict[str,float]:
         """Obtiene los gastos agrupados por metodo de pago"""
+        if rates is not None:
+            return self._totals_in_currency(ExpenseModel.payment_method, rates, base)
         results = self.db.query(
             ExpenseModel.payment_method,
             func.sum(ExpenseModel.amount).label('total')
@@ -201,14 +290,57 @@ class PostgreSQLExpenseRepository(ExpenseRepository):
 
         return {method.value: float(total) for method, total in results}
     
+    def _totals_in_currency(self, key_column, rates: ExchangeRates, base: Optional[str]) -> Dict[str, float]:
+        """
+        Totales por key_column convertidos a base: SQL reduce a una fila por
+        (clave, moneda, día) y la conversión es un producto vectorizado por
+        la tasa vigente de cada día, nunca una búsqueda por gasto
+        """
+        day = cast(ExpenseModel.date, Date)
+        results = self.db.query(
+            key_column,
+            ExpenseModel.currency,
+            day,
+            func.sum(ExpenseModel.amount)
+        ).filter(ExpenseModel.date.isnot(None)).group_by(key_column, ExpenseModel.currency, day).all()
+        if not results:
+            return {}
+        keys, currencies, days, sums = zip(*results)
+        return sum_by_key_in_currency(
+            [getattr(key, "value", key) for key in keys],
+            sums,
+            currencies,
+            [epoch_day(value) for value in days],
+            rates,
+            base or rates.pivot
+        )
+
     def get_count_by_category(self) -> Dict[str,int]:
         """Obtiene la cantidad de gastos por categoria"""
         results = self.db.query(
-            ExpenseModel.category,
+            ExpenseModel.category_id,
             func.count(ExpenseModel.id).label('count')
-        ).group_by(ExpenseModel.category).all() #inserte este linea copilot
+        ).group_by(ExpenseModel.category_id).all()
 
-        return {category: count for category, count in results}
+        names = self._category_names(category_id for category_id, _ in results)
+        return {names[category_id]: count for category_id, count in results}
+
+    def get_categories(self) -> List[Dict[str, Any]]:
+        """Filas de la tabla categories con la cantidad de gastos de cada una"""
+        results = self.db.query(
+            CategoryModel.id,
+            CategoryModel.name,
+            func.count(ExpenseModel.id)
+        ).outerjoin(ExpenseModel, ExpenseModel.category_id == CategoryModel.id).group_by(
+            CategoryModel.id, CategoryModel.name
+        ).all()
+
+        for category_id, name, _ in results:
+            self._categories.remember(category_id, name)
+        return [
+            {"id": category_id, "name": name, "count": count}
+            for category_id, name, count in results
+        ]
     
     def search_by_description(self, search_term:str)-> List[Expense]:
         """Busca gastos por descripcion"""
@@ -248,6 +380,265 @@ class PostgreSQLExpenseRepository(ExpenseRepository):
             for year, month, total, count in results
         ]
 
-    
+    def get_time_series(
+        self,
+        granularity: str,
+        start_date: datetime,
+        end_date: datetime,
+        category: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Serie temporal calculada en SQL: date_trunc agrupa, generate_series
+        rellena los buckets vacíos y AVG() OVER calcula los promedios móviles.
+        En otros motores (SQLite en tests) se agrupa en Python.
+        """
+        if self.db.get_bind().dialect.name != "postgresql":
+            return self._get_time_series_python(granularity, start_date, end_date, category)
+
+        # Con una categoría desconocida category_id es NULL: la serie sale en cero
+        category_filter = "AND category_id = :category_id" if category else ""
+        sql = text(f"""
+            WITH series AS (
+                SELECT generate_series(
+                    date_trunc(:granularity, CAST(:start_date AS timestamp)),
+                    date_trunc(:granularity, CAST(:end_date AS timestamp)),
+                    CAST(:step AS interval)
+                ) AS bucket
+            ),
+            totals AS (
+                SELECT date_trunc(:granularity, date) AS bucket,
+                       SUM(amount) AS total,
+                       COUNT(id) AS count
+                FROM expenses
+                WHERE date >= :start_date AND date <= :end_date {category_filter}
+                GROUP BY 1
+            )
+            SELECT s.bucket,
+                   COALESCE(t.total, 0) AS total,
+                   COALESCE(t.count, 0) AS count,
+                   AVG(COALESCE(t.total, 0)) OVER (
+                       ORDER BY s.bucket ROWS BETWEEN 6 PRECEDING AND CURRENT ROW
+                   ) AS moving_avg_7,
+                   AVG(COALESCE(t.total, 0)) OVER (
+                       ORDER BY s.bucket ROWS BETWEEN 29 PRECEDING AND CURRENT ROW
+                   ) AS moving_avg_30
+            FROM series s
+            LEFT JOIN totals t ON t.bucket = s.bucket
+            ORDER BY s.bucket
+        """)
+        params = {
+            "granularity": granularity,
+            "start_date": start_date,
+            "end_date": end_date,
+            "step": f"1 {granularity}",
+        }
+        if category:
+            params["category_id"] = self._category_id(category)
+
+        results = self.db.execute(sql, params).all()
+        return [
+            {
+                "bucket": bucket,
+                "total": round(float(total), 2),
+                "count": int(count),
+                "moving_avg_7": round(float(avg_7), 2),
+                "moving_avg_30": round(float(avg_30), 2)
+            }
+            for bucket, total, count, avg_7, avg_30 in results
+        ]
+
+    def _get_time_series_python(
+        self,
+        granularity: str,
+        start_date: datetime,
+        end_date: datetime,
+        category: Optional[str] = None
+    ) -> List[Dict]:
+        """Fallback sin date_trunc: trae solo fecha y monto y agrupa en Python"""
+        query = self.db.query(ExpenseModel.date, ExpenseModel.amount).filter(
+            ExpenseModel.date >= start_date,
+            ExpenseModel.date <= end_date
+        )
+        if category:
+            query = query.filter(ExpenseModel.category_id == self._category_id(category))
+
+        buckets: Dict[datetime, list] = {}
+        for date, amount in query:
+            bucket = buckets.setdefault(ExpenseService.truncate_date(date, granularity), [0.0, 0])
+            bucket[0] += amount
+            bucket[1] += 1
+
+        return ExpenseService.build_time_series(
+            {key: (total, count) for key, (total, count) in buckets.items()},
+            start_date,
+            end_date,
+            granularity
+        )
+
+    def get_columns(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> ExpenseColumns:
+        """
+        Trae solo las 6 columnas necesarias (sin modelos ORM ni entidades)
+        y las entrega como arrays al motor de analítica. La categoría viaja
+        como category_id (entero) y se codifica sin comparar strings.
+        """
+        query = self.db.query(
+            ExpenseModel.id,
+            ExpenseModel.amount,
+            ExpenseModel.date,
+            ExpenseModel.category_id,
+            ExpenseModel.payment_method,
+            ExpenseModel.currency
+        ).filter(ExpenseModel.date.isnot(None))
+        if start_date is not None and end_date is not None:
+            query = query.filter(
+                ExpenseModel.date >= start_date,
+                ExpenseModel.date <= end_date
+            )
+
+        rows = query.all()
+        if not rows:
+            return ExpenseColumns.empty()
+        ids, amounts, dates, category_ids, methods, currencies = zip(*rows)
+        return ExpenseColumns.from_category_ids(
+            ids, amounts, dates, category_ids, self._category_names(category_ids),
+            [method.value for method in methods], currencies
+        )
+
+    def _filter(self, sql_query, query: ExpenseQuery):
+        """Aplica los filtros de ExpenseQuery como WHERE"""
+        if query.category:
+            category_id = self._category_id(query.category)
+            if category_id is None:
+                return sql_query.filter(false())
+            sql_query = sql_query.filter(ExpenseModel.category_id == category_id)
+        if query.payment_method:
+            sql_query = sql_query.filter(ExpenseModel.payment_method == PaymentMethodEnum(query.payment_method))
+        if query.min_amount is not None:
+            sql_query = sql_query.filter(ExpenseModel.amount >= query.min_amount)
+        if query.max_amount is not None:
+            sql_query = sql_query.filter(ExpenseModel.amount <= query.max_amount)
+        if query.has_date_range:
+            sql_query = sql_query.filter(
+                ExpenseModel.date >= query.start_date,
+                ExpenseModel.date <= query.end_date
+            )
+        return sql_query
+
+    @staticmethod
+    def _row(stored: Sequence[str], values) -> Dict[str, Any]:
+        row = dict(zip(stored, values))
+        if row.get("payment_method") is not None:
+            row["payment_method"] = row["payment_method"].value
+        if row.get("date") is not None:
+            row["date"] = row["date"].isoformat()
+        return row
+
+    def find(self, query: ExpenseQuery) -> List[Expense]:
+        """Filtros en el WHERE, orden y límite con ORDER BY ... LIMIT"""
+        sql_query = self._order_and_limit(self._filter(self.db.query(ExpenseModel), query), query)
+        return [self._model_to_entity(model) for model in sql_query.all()]
+
+    def iter_all(self) -> Iterator[Expense]:
+        """Como get_all, trayendo ITER_BATCH_SIZE filas por vez (yield_per)"""
+        return self._iterate(self.db.query(ExpenseModel).order_by(ExpenseModel.date.desc()))
 
-    
\ No newline at end of file
+    def iter_by_date_range(self, start_date: datetime, end_date: datetime) -> Iterator[Expense]:
+        return self._iterate(self.db.query(ExpenseModel).filter(
+            ExpenseModel.date >= start_date,
+            ExpenseModel.date <= end_date
+        ).order_by(ExpenseModel.date.desc()))
+
+    def iter_find(self, query: ExpenseQuery) -> Iterator[Expense]:
+        return self._iterate(self._order_and_limit(self._filter(self.db.query(ExpenseModel), query), query))
+
+    def _iterate(self, sql_query) -> Iterator[Expense]:
+        """
+        Recorre el resultado por bloques: yield_per usa un cursor del lado del
+        servidor en PostgreSQL, así que ni el driver ni la sesión tienen todas
+        las filas a la vez (los modelos ya convertidos se liberan)
+        """
+        for model in sql_query.yield_per(ITER_BATCH_SIZE):
+            yield self._model_to_entity(model)
+
+    def find_rows(self, query: ExpenseQuery, fields: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        SELECT solo de las columnas pedidas, con los filtros en el WHERE
+        (sin modelos ORM ni entidades)
+        """
+        stored = stored_fields(fields)
+        sql_query = self._filter(self.db.query(*[_COLUMNS[name] for name in stored]), query)
+        rows = self._order_and_limit(sql_query, query).all()
+        return [project(self._row(stored, values), fields) for values in rows]
+
+    @staticmethod
+    def _order_and_limit(sql_query, query: ExpenseQuery):
+        """
+        ORDER BY columna, id (desempate estable), OFFSET y LIMIT. Por fecha
+        usa ix_expenses_date_id; por monto o categoría, sus índices
+        """
+        if query.sort is None:
+            # El id desempata para que las páginas (OFFSET) no repitan ni salteen gastos
+            sql_query = sql_query.order_by(ExpenseModel.date.desc(), ExpenseModel.id.desc())
+        else:
+            columns = (_COLUMNS[query.sort], ExpenseModel.id)
+            sql_query = sql_query.order_by(*[c.desc() if query.descending else c.asc() for c in columns])
+        if query.offset:
+            sql_query = sql_query.offset(query.offset)
+        if query.limit is not None:
+            sql_query = sql_query.limit(query.limit)
+        return sql_query
+
+    def count(self, query: ExpenseQuery, estimate: bool = False) -> ExpenseCount:
+        """
+        SELECT COUNT(*) con los filtros en el WHERE. Con estimate (solo
+        PostgreSQL) se usan las estadísticas del planner sin recorrer filas;
+        si estiman menos de ESTIMATE_MIN_ROWS se cuenta exacto igual
+        """
+        if estimate and self.db.get_bind().dialect.name == "postgresql":
+            estimated = self._estimate_count(query)
+            if estimated is not None and estimated >= ESTIMATE_MIN_ROWS:
+                return ExpenseCount(estimated, exact=False)
+        return ExpenseCount(self._filter(self.db.query(func.count(ExpenseModel.id)), query).scalar() or 0)
+
+    def _estimate_count(self, query: ExpenseQuery) -> Optional[int]:
+        """
+        Sin filtros, pg_class.reltuples (lo actualizan ANALYZE y autovacuum);
+        con filtros, las filas que el planner estima para el SELECT (EXPLAIN
+        sin ANALYZE: no ejecuta la consulta)
+        Returns: None si la tabla nunca se analizó
+        """
+        if not query.has_filters:
+            reltuples = self.db.execute(
+                text("SELECT reltuples FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+                {"table": ExpenseModel.__tablename__}
+            ).scalar()
+            return int(reltuples) if reltuples is not None and reltuples >= 0 else None
+        statement = self._filter(self.db.query(ExpenseModel.id), query).statement
+        # Valores literales: los filtros ya son números, fechas, el id de la
+        # categoría y el enum del método (nada de texto libre del usuario)
+        sql = statement.compile(dialect=self.db.get_bind().dialect, compile_kwargs={"literal_binds": True})
+        plan = self.db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def get_data_version(self) -> Optional[Hashable]:
+        """
+        Cantidad, id máximo y última actualización en una sola pasada: altas,
+        bajas y ediciones de cualquier conexión la cambian (los contadores de
+        pg_stat_user_tables serían más baratos, pero se publican con retraso)
+        """
+        row = self.db.query(
+            func.count(ExpenseModel.id), func.max(ExpenseModel.id), func.max(ExpenseModel.update_at)
+        ).first()
+        return tuple(row)
+
+    def get_row_by_id(self, expense_id: int, fields: Sequence[str]) -> Optional[Dict[str, Any]]:
+        """Un gasto con SELECT solo de las columnas pedidas"""
+        stored = stored_fields(fields)
+        values = self.db.query(*[_COLUMNS[name] for name in stored]).filter(
+            ExpenseModel.id == expense_id
+        ).first()
+        return project(self._row(stored, values), fields) if values is not None else None
@@ -0,0 +1,186 @@
+# app/infrastructure/repositories/registry.py
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from importlib import import_module
+from typing import Dict, Iterator, Optional
+
+from ...core.config import settings
+from ...domain.repositories.budget_repository import BudgetRepository
+from ...domain.repositories.expense_repository import ExpenseRepository
+from ...domain.repositories.exchange_rate_repository import ExchangeRateRepository
+from ...domain.repositories.exceptions import RepositoryError
+
+
+@dataclass(frozen=True)
+class RepositoryBackend:
+    """
+    Describe un backend de repositorio sin importarlo
+
+    El módulo se importa recién cuando se crea el primer repositorio,
+    así el backend JSON no carga SQLAlchemy ni psycopg2.
+    """
+    name: str
+    module: str
+    class_name: str
+    uses_database: bool = False
+    budget_module: Optional[str] = None
+    budget_class_name: Optional[str] = None
+    rate_module: Optional[str] = None
+    rate_class_name: Optional[str] = None
+    # Una sola instancia por proceso (backends sin almacenamiento propio, ej: memory)
+    shared: bool = False
+
+    def load_class(self) -> type:
+        """Importa el módulo del backend y devuelve la clase del repositorio"""
+        return getattr(import_module(self.module, __package__), self.class_name)
+
+    def create(self, db=None) -> ExpenseRepository:
+        """
+        Crea una instancia del repositorio
+        Args: db: Sesión de SQLAlchemy (solo para backends con base de datos)
+        """
+        repository_class = self.load_class()
+        if self.uses_database:
+            if db is None:
+                raise RepositoryError(f"El backend '{self.name}' requiere una sesión de BD")
+            return repository_class(db)
+        if self.shared:
+            with _SHARED_LOCK:
+                if self.name not in _SHARED:
+                    _SHARED[self.name] = repository_class()
+                return _SHARED[self.name]
+        settings.ensure_data_directory()
+        return repository_class(settings.data_file_path)
+
+    def create_budget_repository(self, db=None) -> BudgetRepository:
+        """
+        Crea el repositorio de presupuestos del mismo backend
+        Args: db: La misma sesión que el repositorio de gastos, para que los
+                  contadores se escriban en la misma transacción que el gasto
+        """
+        if self.budget_module is None:
+            raise RepositoryError(f"El backend '{self.name}' no soporta presupuestos")
+        repository_class = getattr(import_module(self.budget_module, __package__), self.budget_class_name)
+        if self.uses_database:
+            if db is None:
+                raise RepositoryError(f"El backend '{self.name}' requiere una sesión de BD")
+            return repository_class(db)
+        return repository_class(settings.budgets_file_path)
+
+    def create_rate_repository(self, db=None) -> ExchangeRateRepository:
+        """
+        Crea el repositorio de tipos de cambio del mismo backend
+        Args: db: Sesión de SQLAlchemy (solo para backends con base de datos)
+        """
+        if self.rate_module is None:
+            raise RepositoryError(f"El backend '{self.name}' no soporta tipos de cambio")
+        repository_class = getattr(import_module(self.rate_module, __package__), self.rate_class_name)
+        if self.uses_database:
+            if db is None:
+                raise RepositoryError(f"El backend '{self.name}' requiere una sesión de BD")
+            return repository_class(db)
+        return repository_class(settings.exchange_rates_file_path)
+
+
+_BACKENDS: Dict[str, RepositoryBackend] = {}
+_SHARED: Dict[str, ExpenseRepository] = {}
+_SHARED_LOCK = threading.Lock()
+
+
+def register_backend(backend: RepositoryBackend) -> None:
+    """Registra (o reemplaza) un backend por nombre"""
+    _BACKENDS[backend.name] = backend
+
+
+def get_backend(name: Optional[str] = None) -> RepositoryBackend:
+    """
+    Obtiene el backend por nombre (por defecto settings.repository_backend)
+    Raises: RepositoryError: Si el backend no está registrado
+    """
+    name = (name or settings.repository_backend).lower()
+    try:
+        return _BACKENDS[name]
+    except KeyError:
+        available = ", ".join(sorted(_BACKENDS))
+        raise RepositoryError(f"Backend de repositorio desconocido: '{name}' (disponibles: {available})")
+
+
+def available_backends() -> list:
+    return sorted(_BACKENDS)
+
+
+@contextmanager
+def open_repository(name: Optional[str] = None) -> Iterator[ExpenseRepository]:
+    """
+    Repositorio para tareas fuera de una petición (tareas en segundo plano, CLI)
+    Con base de datos abre una sesión del primario y la cierra al salir
+    """
+    backend = get_backend(name)
+    if not backend.uses_database:
+        yield backend.create()
+        return
+
+    from ..database.connection import get_session_factory
+    db = get_session_factory()()
+    try:
+        yield backend.create(db)
+    finally:
+        db.close()
+
+
+@contextmanager
+def open_rate_repository(name: Optional[str] = None) -> Iterator[ExchangeRateRepository]:
+    """Como open_repository, para los tipos de cambio"""
+    backend = get_backend(name)
+    if not backend.uses_database:
+        yield backend.create_rate_repository()
+        return
+
+    from ..database.connection import get_session_factory
+    db = get_session_factory()()
+    try:
+        yield backend.create_rate_repository(db)
+    finally:
+        db.close()
+
+
+register_backend(RepositoryBackend(
+    name="json",
+    module=".json_expense_repository",
+    class_name="JsonExpenseRepository",
+    budget_module=".json_budget_repository",
+    budget_class_name="JsonBudgetRepository",
+    rate_module=".json_exchange_rate_repository",
+    rate_class_name="JsonExchangeRateRepository",
+))
+register_backend(RepositoryBackend(
+    name="json_sharded",
+    module=".sharded_json_expense_repository",
+    class_name="ShardedJsonExpenseRepository",
+    budget_module=".json_budget_repository",
+    budget_class_name="JsonBudgetRepository",
+    rate_module=".json_exchange_rate_repository",
+    rate_class_name="JsonExchangeRateRepository",
+))
+register_backend(RepositoryBackend(
+    name="memory",
+    module=".in_memory_expense_repository",
+    class_name="InMemoryExpenseRepository",
+    # Los gastos no se persisten; presupuestos y tipos de cambio siguen en archivos JSON
+    budget_module=".json_budget_repository",
+    budget_class_name="JsonBudgetRepository",
+    rate_module=".json_exchange_rate_repository",
+    rate_class_name="JsonExchangeRateRepository",
+    shared=True,
+))
+register_backend(RepositoryBackend(
+    name="postgresql",
+    module=".postgresql_expense_repository",
+    class_name="PostgreSQLExpenseRepository",
+    uses_database=True,
+    budget_module=".postgresql_budget_repository",
+    budget_class_name="PostgreSQLBudgetRepository",
+    rate_module=".postgresql_exchange_rate_repository",
+    rate_class_name="PostgreSQLExchangeRateRepository",
+))
@@ -0,0 +1,114 @@
+# app/infrastructure/repositories/repository_decorator.py
+from typing import Any, Hashable, Iterator, List, Optional, Dict, Sequence
+from datetime import datetime
+
+from ...domain.entities.expense import Expense
+from ...domain.repositories.expense_repository import ExpenseRepository
+from ...domain.repositories.expense_query import ExpenseCount, ExpenseQuery
+from ...domain.services.currency import ExchangeRates
+from ...domain.services.expense_analytics import ExpenseColumns
+
+
+class ExpenseRepositoryDecorator(ExpenseRepository):
+    """
+    Repositorio que envuelve a otro y delega todas las operaciones
+
+    Base para agregar comportamiento (eventos, caché...) sin tocar las
+    implementaciones concretas: las subclases solo redefinen lo que cambian.
+    """
+
+    def __init__(self, inner: ExpenseRepository):
+        self._inner = inner
+
+    @property
+    def inner(self) -> ExpenseRepository:
+        return self._inner
+
+    def __getattr__(self, name: str):
+        # Métodos propios del backend (clear_all, get_file_stats, ...)
+        return getattr(self._inner, name)
+
+    def save(self, expense: Expense) -> Expense:
+        return self._inner.save(expense)
+
+    def get_by_id(self, expense_id: int) -> Optional[Expense]:
+        return self._inner.get_by_id(expense_id)
+
+    def get_by_id_for_update(self, expense_id: int) -> Optional[Expense]:
+        return self._inner.get_by_id_for_update(expense_id)
+
+    def get_all(self) -> List[Expense]:
+        return self._inner.get_all()
+
+    def get_by_date_range(self, start_date: datetime, end_date: datetime) -> List[Expense]:
+        return self._inner.get_by_date_range(start_date, end_date)
+
+    def get_by_category(self, category: str) -> List[Expense]:
+        return self._inner.get_by_category(category)
+
+    def get_by_payment_method(self, payment_method: str) -> List[Expense]:
+        return self._inner.get_by_payment_method(payment_method)
+
+    def update(self, expense: Expense) -> Expense:
+        return self._inner.update(expense)
+
+    def delete(self, expense_id: int) -> bool:
+        return self._inner.delete(expense_id)
+
+    def get_total_by_category(self, rates: Optional[ExchangeRates] = None, base: Optional[str] = None) -> Dict[str, float]:
+        return self._inner.get_total_by_category(rates, base)
+
+    def get_total_by_payment_method(self, rates: Optional[ExchangeRates] = None, base: Optional[str] = None) -> Dict[str, float]:
+        return self._inner.get_total_by_payment_method(rates, base)
+
+    def get_count_by_category(self) -> Dict[str, int]:
+        return self._inner.get_count_by_category()
+
+    def search_by_description(self, search_term: str) -> List[Expense]:
+        return self._inner.search_by_description(search_term)
+
+    def get_recent_expenses(self, days: int = 30) -> List[Expense]:
+        return self._inner.get_recent_expenses(days)
+
+    def get_time_series(
+        self,
+        granularity: str,
+        start_date: datetime,
+        end_date: datetime,
+        category: Optional[str] = None
+    ) -> List[Dict]:
+        return self._inner.get_time_series(granularity, start_date, end_date, category)
+
+    def get_columns(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> ExpenseColumns:
+        return self._inner.get_columns(start_date, end_date)
+
+    def find(self, query: ExpenseQuery) -> List[Expense]:
+        return self._inner.find(query)
+
+    def find_rows(self, query: ExpenseQuery, fields: Sequence[str]) -> List[Dict[str, Any]]:
+        return self._inner.find_rows(query, fields)
+
+    def iter_all(self) -> Iterator[Expense]:
+        return self._inner.iter_all()
+
+    def iter_by_date_range(self, start_date: datetime, end_date: datetime) -> Iterator[Expense]:
+        return self._inner.iter_by_date_range(start_date, end_date)
+
+    def iter_find(self, query: ExpenseQuery) -> Iterator[Expense]:
+        return self._inner.iter_find(query)
+
+    def count(self, query: ExpenseQuery, estimate: bool = False) -> ExpenseCount:
+        return self._inner.count(query, estimate)
+
+    def get_data_version(self) -> Optional[Hashable]:
+        return self._inner.get_data_version()
+
+    def get_categories(self) -> List[Dict[str, Any]]:
+        return self._inner.get_categories()
+
+    def get_row_by_id(self, expense_id: int, fields: Sequence[str]) -> Optional[Dict[str, Any]]:
+        return self._inner.get_row_by_id(expense_id, fields)
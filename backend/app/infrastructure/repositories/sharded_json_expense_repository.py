@@ -0,0 +1,354 @@
+# app/infrastructure/repositories/sharded_json_expense_repository.py
+import json
+import os
+import shutil
+import sys
+from collections import Counter
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterator, List, Optional
+
+from ...domain.entities.expense import Expense
+from ...domain.repositories.expense_query import ExpenseCount, ExpenseQuery
+from ...domain.repositories.exceptions import ExpenseNotFoundError, RepositoryConnectionError, RepositoryError
+from ...domain.services.currency import ExchangeRates
+from .json_budget_repository import _lock_for
+from .json_codecs import codec_for_file
+from .json_expense_repository import JsonExpenseRepository
+
+MANIFEST_NAME = "manifest.json"
+
+
+def month_key(date: str) -> str:
+    """Mes YYYY-MM de una fecha ISO (el prefijo del texto, sin parsear)"""
+    return date[:7]
+
+
+def _months_between(start_date: datetime, end_date: datetime) -> List[str]:
+    months = []
+    year, month = start_date.year, start_date.month
+    while (year, month) <= (end_date.year, end_date.month):
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+def summarize_shard(records: List[dict]) -> Dict[str, Any]:
+    """
+    Entrada del manifiesto de un mes: cantidad, total, rango de ids y
+    cantidad/total por categoría y método (montos nominales, como los
+    totales sin tipos de cambio). Se recalcula entera al reescribir el mes
+    """
+    categories: Dict[str, List] = {}
+    methods: Dict[str, List] = {}
+    for item in records:
+        amount = float(item['amount'])
+        for groups, key in ((categories, item['category']), (methods, item['payment_method'])):
+            entry = groups.setdefault(key, [0, 0.0])
+            entry[0] += 1
+            entry[1] += amount
+    ids = [item['id'] for item in records]
+    return {
+        "count": len(records),
+        "total": round(sum(total for _, total in categories.values()), 2),
+        "min_id": min(ids),
+        "max_id": max(ids),
+        "categories": {name: [count, round(total, 2)] for name, (count, total) in categories.items()},
+        "payment_methods": {name: [count, round(total, 2)] for name, (count, total) in methods.items()},
+    }
+
+
+class ShardedJsonExpenseRepository(JsonExpenseRepository):
+    """
+    Backend JSON con un archivo por mes (data/expenses/2026-10.json) y un
+    manifiesto (manifest.json) con cantidad, total, rango de ids y totales
+    por categoría y método de cada mes
+
+    - Las lecturas por rango de fechas (get_by_date_range, recientes, serie
+      temporal, columnas, find con fechas) abren solo los meses que se solapan.
+    - get_by_id abre solo los meses cuyo rango de ids lo contiene.
+    - Guardar o borrar reescribe un mes y el manifiesto (cambiar la fecha de
+      mes, los dos meses); los totales y conteos sin tipos de cambio salen
+      del manifiesto sin abrir ningún mes.
+
+    Cada mes se guarda con el codec configurado. Si el manifiesto falta se
+    reconstruye recorriendo los meses; si tampoco hay meses y existe el
+    archivo único (data/expenses.json), se reparte por meses la primera vez.
+    Como el backend JSON, sirve para un único proceso.
+    """
+
+    def __init__(self, file_path: str = "expenses.json", codec: Optional[str] = None):
+        """
+        Args: file_path: Archivo único del backend JSON; los meses van en el
+                         directorio del mismo nombre sin extensión
+              codec: Como en JsonExpenseRepository
+        """
+        self.directory = Path(file_path).with_suffix("")
+        self.manifest_path = self.directory / MANIFEST_NAME
+        self._lock = _lock_for(self.directory)
+        super().__init__(file_path, codec)
+
+    # --- Archivos -----------------------------------------------------------
+
+    def _ensure_file_exists(self) -> None:
+        """Crea el directorio y el manifiesto (repartiendo el archivo único si existe)"""
+        with self._lock:
+            if self.manifest_path.exists():
+                return
+            self.directory.mkdir(parents=True, exist_ok=True)
+            if not self._shard_months_on_disk() and self.file_path.exists():
+                self._split_single_file()
+            else:
+                self.rebuild_manifest()
+
+    def _split_single_file(self) -> None:
+        """Reparte el archivo único por meses (una vez, al activar el layout por meses)"""
+        months: Dict[str, List[dict]] = {}
+        for item, _ in codec_for_file(self.file_path, self.codec).iter_records(self.file_path):
+            months.setdefault(month_key(item['date']), []).append(item)
+        for month, records in months.items():
+            self._write_shard(month, records)
+        self.rebuild_manifest()
+
+    def _shard_path(self, month: str) -> Path:
+        return self.directory / f"{month}.json"
+
+    def _shard_months_on_disk(self) -> List[str]:
+        return sorted(path.stem for path in self.directory.glob("????-??.json"))
+
+    def _read_shard(self, month: str) -> List[dict]:
+        path = self._shard_path(month)
+        try:
+            records = codec_for_file(path, self.codec).loads(path.read_bytes())
+        except FileNotFoundError:
+            return []
+        except ValueError as e:
+            raise RepositoryError(f"Error al leer el mes {month}: {e}")
+        except OSError as e:
+            raise RepositoryConnectionError(f"Error al acceder al archivo: {e}")
+        for item in records:
+            item['category'] = sys.intern(item['category'])
+        return records
+
+    def _write_shard(self, month: str, records: List[dict]) -> None:
+        """Temporal + rename, como el archivo único; un mes vacío se borra"""
+        path = self._shard_path(month)
+        try:
+            if not records:
+                path.unlink(missing_ok=True)
+                return
+            temp_path = path.with_suffix(path.suffix + ".tmp")
+            with open(temp_path, 'wb') as f:
+                f.write(self.codec.dumps(records))
+            os.replace(temp_path, path)
+        except OSError as e:
+            raise RepositoryConnectionError(f"Error al guardar en el archivo: {e}")
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            with self._lock:
+                return self.rebuild_manifest()
+        except json.JSONDecodeError as e:
+            raise RepositoryError(f"Manifiesto inválido ({self.manifest_path}): {e}")
+
+    def _write_manifest(self, manifest: Dict[str, Any]) -> None:
+        temp_path = self.manifest_path.with_suffix(".json.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False, sort_keys=True)
+        os.replace(temp_path, self.manifest_path)
+
+    def _commit(self, manifest: Dict[str, Any], shards: Dict[str, List[dict]]) -> None:
+        """Escribe los meses cambiados y después el manifiesto con sus resúmenes"""
+        for month, records in shards.items():
+            self._write_shard(month, records)
+            if records:
+                manifest["shards"][month] = summarize_shard(records)
+            else:
+                manifest["shards"].pop(month, None)
+        self._write_manifest(manifest)
+
+    def rebuild_manifest(self) -> Dict[str, Any]:
+        """
+        Recalcula el manifiesto leyendo todos los meses (tras un corte entre
+        la escritura de un mes y la del manifiesto, o si se editó a mano)
+        """
+        shards = {}
+        for month in self._shard_months_on_disk():
+            records = self._read_shard(month)
+            if records:
+                shards[month] = summarize_shard(records)
+        max_id = max((shard["max_id"] for shard in shards.values()), default=0)
+        manifest = {"next_id": max_id + 1, "shards": shards}
+        self._write_manifest(manifest)
+        return manifest
+
+    def _months_for_range(self, start_date: Optional[datetime], end_date: Optional[datetime]) -> List[str]:
+        months = sorted(self._read_manifest()["shards"])
+        if start_date is None or end_date is None:
+            return months
+        wanted = set(_months_between(start_date, end_date))
+        return [month for month in months if month in wanted]
+
+    def _months_with_id(self, manifest: Dict[str, Any], expense_id: int) -> List[str]:
+        return sorted(
+            month for month, shard in manifest["shards"].items()
+            if shard["min_id"] <= expense_id <= shard["max_id"]
+        )
+
+    # --- Lecturas -----------------------------------------------------------
+
+    def _load_from_file(self) -> List[dict]:
+        """Todos los meses, en orden (las lecturas sin rango)"""
+        return self._load_records()
+
+    def _load_records(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[dict]:
+        records = []
+        for month in self._months_for_range(start_date, end_date):
+            records.extend(self._read_shard(month))
+        return records
+
+    def _iter_raw(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> Iterator[dict]:
+        """Un mes por vez, y dentro del mes de a un registro"""
+        for month in self._months_for_range(start_date, end_date):
+            path = self._shard_path(month)
+            try:
+                for item, _ in codec_for_file(path, self.codec).iter_records(path):
+                    yield item
+            except FileNotFoundError:
+                continue
+            except ValueError as e:
+                raise RepositoryError(f"Error al leer el mes {month}: {e}")
+
+    def get_by_id(self, expense_id: int) -> Optional[Expense]:
+        for month in self._months_with_id(self._read_manifest(), expense_id):
+            for item in self._read_shard(month):
+                if item.get('id') == expense_id:
+                    return self._dict_to_expense(item)
+        return None
+
+    def get_recent_expenses(self, days: int = 30) -> List[Expense]:
+        end_date = datetime.now()
+        return self.get_by_date_range(end_date - timedelta(days=days), end_date)
+
+    def get_total_by_category(self, rates: Optional[ExchangeRates] = None, base: Optional[str] = None) -> Dict[str, float]:
+        """Sin tipos de cambio, desde el manifiesto; con ellos hay que abrir los meses (fecha de cada gasto)"""
+        if rates is not None:
+            return super().get_total_by_category(rates, base)
+        return self._manifest_totals("categories", 1)
+
+    def get_total_by_payment_method(self, rates: Optional[ExchangeRates] = None, base: Optional[str] = None) -> Dict[str, float]:
+        if rates is not None:
+            return super().get_total_by_payment_method(rates, base)
+        return self._manifest_totals("payment_methods", 1)
+
+    def get_count_by_category(self) -> Dict[str, int]:
+        return {name: int(count) for name, count in self._manifest_totals("categories", 0).items()}
+
+    def count(self, query: ExpenseQuery, estimate: bool = False) -> ExpenseCount:
+        """
+        Sin filtros, o solo por categoría o solo por método, sale del
+        manifiesto sin abrir ningún mes; si no, se leen los meses del rango
+        """
+        if (query.has_date_range or query.min_amount is not None or query.max_amount is not None
+                or (query.category and query.payment_method)):
+            return super().count(query, estimate)
+        shards = self._read_manifest()["shards"].values()
+        if query.category:
+            category = query.category.lower()
+            return ExpenseCount(sum(
+                count for shard in shards
+                for name, (count, _) in shard["categories"].items() if name.lower() == category
+            ))
+        if query.payment_method:
+            return ExpenseCount(sum(shard["payment_methods"].get(query.payment_method, (0,))[0] for shard in shards))
+        return ExpenseCount(sum(shard["count"] for shard in shards))
+
+    def get_data_version(self) -> Optional[Hashable]:
+        """Toda escritura termina reemplazando el manifiesto"""
+        return self._stat_version(self.manifest_path)
+
+    def _manifest_totals(self, group: str, position: int) -> Dict[str, float]:
+        totals: Counter = Counter()
+        for shard in self._read_manifest()["shards"].values():
+            for name, values in shard[group].items():
+                totals[name] += values[position]
+        return {name: round(total, 2) if position else total for name, total in totals.items()}
+
+    # --- Escrituras ---------------------------------------------------------
+
+    def save(self, expense: Expense) -> Expense:
+        """Reescribe solo el mes del gasto y el manifiesto"""
+        with self._lock:
+            manifest = self._read_manifest()
+            if expense.id is None:
+                expense.id = manifest["next_id"]
+            manifest["next_id"] = max(manifest["next_id"], expense.id + 1)
+            record = self._expense_to_dict(expense)
+            month = month_key(record['date'])
+            records = self._read_shard(month)
+            records.append(record)
+            self._commit(manifest, {month: records})
+        return expense
+
+    def update(self, expense: Expense) -> Expense:
+        """Reescribe el mes del gasto (y el anterior, si la fecha cambió de mes)"""
+        if expense.id is None:
+            raise RepositoryError("No se puede actualizar un gasto sin ID")
+        with self._lock:
+            manifest = self._read_manifest()
+            old_month, records = self._find_shard(manifest, expense.id)
+            record = self._expense_to_dict(expense)
+            new_month = month_key(record['date'])
+            index = next(i for i, item in enumerate(records) if item.get('id') == expense.id)
+            if new_month == old_month:
+                records[index] = record
+                self._commit(manifest, {old_month: records})
+            else:
+                del records[index]
+                target = self._read_shard(new_month)
+                target.append(record)
+                self._commit(manifest, {new_month: target, old_month: records})
+        return expense
+
+    def delete(self, expense_id: int) -> bool:
+        with self._lock:
+            manifest = self._read_manifest()
+            try:
+                month, records = self._find_shard(manifest, expense_id)
+            except ExpenseNotFoundError:
+                return False
+            self._commit(manifest, {month: [item for item in records if item.get('id') != expense_id]})
+        return True
+
+    def _find_shard(self, manifest: Dict[str, Any], expense_id: int):
+        """Mes y registros del mes que contiene el gasto"""
+        for month in self._months_with_id(manifest, expense_id):
+            records = self._read_shard(month)
+            if any(item.get('id') == expense_id for item in records):
+                return month, records
+        raise ExpenseNotFoundError(expense_id)
+
+    def clear_all(self) -> None:
+        """
+        Elimina todos los gastos (útil para testing)
+        ⚠️ CUIDADO: Esta operación es irreversible
+        """
+        with self._lock:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._write_manifest({"next_id": 1, "shards": {}})
+
+    def get_file_stats(self) -> Dict:
+        manifest = self._read_manifest()
+        shards = manifest["shards"]
+        return {
+            'file_path': str(self.directory),
+            'file_exists': self.manifest_path.exists(),
+            'total_expenses': sum(shard["count"] for shard in shards.values()),
+            'codec': self.codec.name,
+            'shards': len(shards),
+            'file_size_bytes': sum(path.stat().st_size for path in self.directory.glob("????-??.json")),
+        }
@@ -0,0 +1,139 @@
+# app/infrastructure/repositories/test_cached_expense_repository.py
+import pytest
+
+from app.domain.entities.expense import Expense, PaymentMethod
+from app.domain.repositories.expense_query import ExpenseQuery
+from app.infrastructure.repositories.cached_expense_repository import CachedExpenseRepository, ExpenseCache
+from app.infrastructure.repositories.json_expense_repository import JsonExpenseRepository
+
+
+class FakeClock:
+    """Reloj controlable para probar el TTL"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestCachedExpenseRepository:
+    """Tests de la caché LRU/TTL con invalidación precisa"""
+
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def cache(self, clock):
+        return ExpenseCache(max_entries=3, ttl_seconds=30, clock=clock)
+
+    @pytest.fixture
+    def repository(self, tmp_path, cache):
+        inner = JsonExpenseRepository(str(tmp_path / "test_expenses.json"))
+        inner.save(Expense(10, "Comida", PaymentMethod.CASH, description="Almuerzo"))
+        inner.save(Expense(20, "Viajes", PaymentMethod.DEBIT_CARD))
+        return CachedExpenseRepository(inner, cache)
+
+    def test_repeated_reads_hit_the_cache(self, repository, cache):
+        """Test: La segunda lectura igual sale de la caché"""
+        # Act
+        first = repository.get_total_by_category()
+        second = repository.get_total_by_category()
+
+        # Assert
+        assert first == second == {"Comida": 10.0, "Viajes": 20.0}
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_update_invalidates_only_affected_entries(self, repository, cache):
+        """Test: Cambiar la descripción no invalida agregados ni otras categorías"""
+        # Arrange
+        repository.get_total_by_category()
+        repository.get_by_category("viajes")
+        comida = repository.get_by_category("comida")[0]
+
+        # Act
+        comida.description = "Cena"
+        repository.update(comida)
+
+        # Assert
+        assert cache.stats()["invalidations"] == 1
+        assert repository.get_by_category("comida")[0].description == "Cena"
+        repository.get_total_by_category()
+        repository.get_by_category("viajes")
+        assert cache.stats()["hits"] == 2
+
+    def test_save_and_delete_refresh_lists_and_aggregates(self, repository):
+        """Test: Crear y eliminar se reflejan en listas y totales cacheados"""
+        # Arrange
+        repository.get_all()
+        repository.get_count_by_category()
+
+        # Act
+        saved = repository.save(Expense(5, "Comida", PaymentMethod.CASH))
+        after_save = (len(repository.get_all()), repository.get_count_by_category()["Comida"])
+        repository.delete(saved.id)
+
+        # Assert
+        assert after_save == (3, 2)
+        assert len(repository.get_all()) == 2
+        assert repository.get_by_id(saved.id) is None
+
+    def test_lru_eviction_and_ttl(self, repository, cache, clock):
+        """Test: Se descarta lo menos usado al llenarse y lo vencido por TTL"""
+        # Act
+        repository.get_by_id(1)
+        repository.get_by_id(2)
+        repository.get_all()
+        repository.get_by_id(1)  # 1 pasa a ser el más reciente
+        repository.get_count_by_category()  # desaloja a get_by_id(2)
+        clock.now += 31
+        repository.get_by_id(1)
+
+        # Assert
+        stats = cache.stats()
+        assert stats["evictions"] == 1
+        assert stats["expirations"] == 1
+        assert stats["size"] == 3
+
+    def test_returned_entities_are_copies(self, repository):
+        """Test: Modificar lo devuelto no altera la caché"""
+        # Act
+        expense = repository.get_by_id(1)
+        expense.update_amount(999)
+
+        # Assert
+        assert repository.get_by_id(1).amount == 10
+
+    def test_projected_rows_are_invalidated_by_matching_writes(self, repository, cache):
+        """Test: Las filas proyectadas se invalidan solo si la escritura coincide con el filtro"""
+        # Arrange
+        comida = ExpenseQuery(category="comida")
+        repository.find_rows(comida, ("amount",))
+        repository.find_rows(ExpenseQuery(category="viajes"), ("amount",))
+
+        # Act
+        repository.save(Expense(5, "Comida", PaymentMethod.CASH))
+        rows = repository.find_rows(comida, ("amount",))
+        repository.find_rows(ExpenseQuery(category="viajes"), ("amount",))
+
+        # Assert
+        assert rows == [{"amount": 10.0}, {"amount": 5.0}]
+        assert cache.stats()["hits"] == 1
+
+    def test_reads_without_fill_do_not_populate_the_cache(self, repository, cache):
+        """Test: Con fill=False se usa lo cacheado pero lo leído no se guarda"""
+        # Arrange
+        lagging = CachedExpenseRepository(repository._inner, cache, fill=False)
+        repository.get_total_by_category()
+
+        # Act
+        cached_total = lagging.get_total_by_category()
+        lagging.get_by_category("comida")
+        repository.get_by_category("comida")
+
+        # Assert
+        assert cached_total == {"Comida": 10.0, "Viajes": 20.0}
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["size"] == 2
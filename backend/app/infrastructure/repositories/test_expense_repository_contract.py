@@ -0,0 +1,269 @@
+# app/infrastructure/repositories/test_expense_repository_contract.py
+"""
+Contrato de ExpenseRepository: los mismos tests contra cada implementación
+
+PostgreSQLExpenseRepository corre siempre sobre SQLite y, si está definida
+TEST_DATABASE_URL, también contra esa base PostgreSQL (se vacían las tablas
+en cada test: no usar una base con datos).
+"""
+import os
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.domain.entities.expense import Expense, PaymentMethod
+from app.domain.repositories.exceptions import ExpenseNotFoundError
+from app.domain.repositories.expense_query import ExpenseCount, ExpenseQuery
+from app.infrastructure.repositories.in_memory_expense_repository import InMemoryExpenseRepository
+from app.infrastructure.repositories.json_expense_repository import JsonExpenseRepository
+from app.infrastructure.repositories.sharded_json_expense_repository import ShardedJsonExpenseRepository
+
+BACKENDS = [
+    "memory",
+    "json",
+    "json_sharded",
+    "sql_sqlite",
+    pytest.param("sql_postgresql", marks=pytest.mark.skipif(
+        not os.getenv("TEST_DATABASE_URL"), reason="TEST_DATABASE_URL no definida"
+    )),
+]
+
+
+@pytest.fixture(params=BACKENDS)
+def repository(request, tmp_path):
+    if request.param == "memory":
+        yield InMemoryExpenseRepository()
+    elif request.param == "json":
+        yield JsonExpenseRepository(str(tmp_path / "expenses.json"), codec="json")
+    elif request.param == "json_sharded":
+        yield ShardedJsonExpenseRepository(str(tmp_path / "expenses.json"), codec="json")
+    else:
+        yield from _sql_repository(request.param, tmp_path)
+
+
+def _sql_repository(backend, tmp_path):
+    from sqlalchemy import text
+    from sqlalchemy.orm import sessionmaker
+    from app.infrastructure.database.connection import build_engine
+    from app.infrastructure.database.models import Base
+    from app.infrastructure.repositories.category_cache import CategoryCache
+    from app.infrastructure.repositories.postgresql_expense_repository import PostgreSQLExpenseRepository
+
+    if backend == "sql_sqlite":
+        engine = build_engine(f"sqlite:///{tmp_path / 'contract.db'}")
+    else:
+        engine = build_engine(os.environ["TEST_DATABASE_URL"])
+    Base.metadata.create_all(bind=engine)
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as connection:
+            connection.execute(text("TRUNCATE expenses, categories RESTART IDENTITY CASCADE"))
+    db = sessionmaker(bind=engine)()
+    try:
+        # Caché de categorías propia: los ids son de esta base
+        yield PostgreSQLExpenseRepository(db, categories=CategoryCache())
+    finally:
+        db.close()
+        engine.dispose()
+
+
+def _seed(repository):
+    expenses = [
+        Expense(25.5, "Comida", PaymentMethod.CASH, date=datetime(2026, 8, 3, 12, 30), description="Almuerzo"),
+        Expense(10, "Transporte", PaymentMethod.DEBIT_CARD, date=datetime(2026, 9, 15), description="Colectivo"),
+        Expense(40, "Comida", PaymentMethod.CREDIT_CARD, date=datetime(2026, 9, 20), description="Cena con amigos"),
+        Expense(99.99, "Viajes", PaymentMethod.CASH, date=datetime(2026, 10, 1), currency="EUR"),
+    ]
+    return [repository.save(expense) for expense in expenses]
+
+
+def _ids(expenses):
+    return sorted(expense.id for expense in expenses)
+
+
+class TestExpenseRepositoryContract:
+    """Comportamiento que toda implementación de ExpenseRepository debe cumplir"""
+
+    def test_save_assigns_ids_and_round_trips(self, repository):
+        """Test: save asigna ids distintos y get_by_id devuelve el mismo gasto"""
+        saved = _seed(repository)
+
+        assert len(set(_ids(saved))) == 4
+        for expense in saved:
+            found = repository.get_by_id(expense.id)
+            assert found == expense
+            assert (found.id, found.description) == (expense.id, expense.description)
+        assert repository.get_by_id(max(_ids(saved)) + 100) is None
+
+    def test_reads_are_independent_of_stored_state(self, repository):
+        """Test: Modificar un gasto leído no cambia lo guardado hasta update"""
+        saved = _seed(repository)[0]
+        read = repository.get_by_id(saved.id)
+        read.update_amount(1)
+
+        assert repository.get_by_id(saved.id).amount == 25.5
+        repository.update(read)
+        assert repository.get_by_id(saved.id).amount == 1
+
+    def test_update_moves_expense_between_indexes(self, repository):
+        """Test: Cambiar categoría, método y fecha se refleja en todas las consultas"""
+        saved = _seed(repository)[1]
+        saved.update_category("Ocio")
+        saved.payment_method = PaymentMethod.CASH
+        saved.date = datetime(2026, 10, 5)
+        repository.update(saved)
+
+        assert _ids(repository.get_by_category("Transporte")) == []
+        assert saved.id in _ids(repository.get_by_category("ocio"))
+        assert saved.id in _ids(repository.get_by_payment_method("cash"))
+        assert _ids(repository.get_by_date_range(datetime(2026, 10, 1), datetime(2026, 10, 31))) == sorted(
+            [saved.id, _ids(repository.get_by_category("Viajes"))[0]]
+        )
+
+    def test_update_and_delete_missing(self, repository):
+        """Test: update de un id inexistente falla; delete devuelve False"""
+        saved = _seed(repository)
+        ghost = Expense(5, "Comida", PaymentMethod.CASH, id=max(_ids(saved)) + 100)
+
+        with pytest.raises(ExpenseNotFoundError):
+            repository.update(ghost)
+        assert repository.delete(saved[0].id) is True
+        assert repository.delete(saved[0].id) is False
+        assert _ids(repository.get_all()) == _ids(saved[1:])
+
+    def test_date_range_is_inclusive(self, repository):
+        """Test: Los extremos del rango se incluyen"""
+        saved = _seed(repository)
+
+        found = repository.get_by_date_range(datetime(2026, 9, 15), datetime(2026, 10, 1))
+
+        assert _ids(found) == _ids(saved[1:])
+
+    def test_filters_by_category_method_and_description(self, repository):
+        """Test: Categoría y descripción sin distinguir mayúsculas; método exacto"""
+        saved = _seed(repository)
+
+        assert _ids(repository.get_by_category("COMIDA")) == _ids([saved[0], saved[2]])
+        assert _ids(repository.get_by_payment_method("cash")) == _ids([saved[0], saved[3]])
+        assert _ids(repository.search_by_description("AMIGOS")) == [saved[2].id]
+
+    def test_recent_expenses(self, repository):
+        """Test: Solo los gastos de los últimos N días"""
+        recent = repository.save(Expense(5, "Comida", PaymentMethod.CASH, date=datetime.now() - timedelta(days=2)))
+        repository.save(Expense(5, "Comida", PaymentMethod.CASH, date=datetime.now() - timedelta(days=60)))
+
+        assert _ids(repository.get_recent_expenses(30)) == [recent.id]
+
+    def test_aggregates(self, repository):
+        """Test: Totales (montos nominales) y cantidades por categoría y método"""
+        _seed(repository)
+
+        assert repository.get_total_by_category() == pytest.approx({"Comida": 65.5, "Transporte": 10.0, "Viajes": 99.99})
+        assert repository.get_total_by_payment_method() == pytest.approx(
+            {"cash": 125.49, "debit_card": 10.0, "credit_card": 40.0}
+        )
+        assert repository.get_count_by_category() == {"Comida": 2, "Transporte": 1, "Viajes": 1}
+
+    def test_find_filters_sorts_and_limits(self, repository):
+        """Test: find combina filtros y devuelve los mayores con sort y limit"""
+        saved = _seed(repository)
+
+        largest = repository.find(ExpenseQuery(sort="amount", limit=2))
+        assert [e.id for e in largest] == [saved[3].id, saved[2].id]
+
+        query = ExpenseQuery(
+            start_date=datetime(2026, 8, 1), end_date=datetime(2026, 9, 30), category="comida", min_amount=30
+        )
+        assert [e.id for e in repository.find(query)] == [saved[2].id]
+        assert [e.id for e in repository.iter_find(query)] == [saved[2].id]
+
+    def test_offset_pages_without_overlap(self, repository):
+        """Test: offset y limit recorren las páginas sin repetir ni saltear gastos"""
+        saved = _seed(repository)
+
+        by_amount = [repository.find(ExpenseQuery(sort="amount", limit=2, offset=offset)) for offset in (0, 2, 4)]
+        assert [[e.id for e in page] for page in by_amount] == [
+            [saved[3].id, saved[2].id], [saved[0].id, saved[1].id], []
+        ]
+        pages = [repository.find(ExpenseQuery(limit=3, offset=offset)) for offset in (0, 3)]
+        assert _ids(pages[0] + pages[1]) == _ids(saved)
+        assert _ids(repository.iter_find(ExpenseQuery(limit=3, offset=3))) == _ids(pages[1])
+
+    def test_count_ignores_sort_and_pagination(self, repository):
+        """Test: count cuenta todos los que cumplen los filtros, exacto en datos chicos"""
+        _seed(repository)
+
+        assert repository.count(ExpenseQuery()) == ExpenseCount(4)
+        assert repository.count(ExpenseQuery(category="comida", sort="amount", limit=1, offset=1)).value == 2
+        assert repository.count(ExpenseQuery(payment_method="cash")).value == 2
+        assert repository.count(ExpenseQuery(category="Comida", payment_method="cash")).value == 1
+        assert repository.count(ExpenseQuery(
+            start_date=datetime(2026, 9, 1), end_date=datetime(2026, 10, 1), min_amount=20
+        )).value == 2
+        assert repository.count(ExpenseQuery(category="Inexistente")).value == 0
+        # Con estimate, un resultado chico se cuenta igual de forma exacta
+        assert repository.count(ExpenseQuery(), estimate=True) == ExpenseCount(4, exact=True)
+
+    def test_data_version_changes_with_each_write(self, repository):
+        """Test: La marca de los datos cambia al guardar, actualizar y borrar (si el backend la tiene)"""
+        saved = _seed(repository)
+        versions = [repository.get_data_version()]
+        if versions[0] is None:
+            pytest.skip("Backend sin marca de datos compartidos")
+
+        saved[0].update_amount(1)
+        repository.update(saved[0])
+        versions.append(repository.get_data_version())
+        repository.delete(saved[1].id)
+        versions.append(repository.get_data_version())
+
+        assert len(set(versions)) == 3
+        assert repository.get_data_version() == versions[-1]
+
+    def test_iterators_match_lists(self, repository):
+        """Test: Los iteradores devuelven los mismos gastos que las listas"""
+        _seed(repository)
+        start, end = datetime(2026, 9, 1), datetime(2026, 9, 30)
+
+        assert _ids(repository.iter_all()) == _ids(repository.get_all())
+        assert _ids(repository.iter_by_date_range(start, end)) == _ids(repository.get_by_date_range(start, end))
+
+    def test_time_series_and_columns(self, repository):
+        """Test: Serie temporal y columnas cubren los mismos gastos"""
+        _seed(repository)
+        start, end = datetime(2026, 9, 1), datetime(2026, 10, 31, 23, 59)
+
+        series = repository.get_time_series("month", start, end)
+        assert [(p["bucket"], p["count"]) for p in series] == [(datetime(2026, 9, 1), 2), (datetime(2026, 10, 1), 1)]
+        assert series[0]["total"] == pytest.approx(50.0)
+
+        # Semanas desde el lunes: el domingo 20/9 cae en la semana del 14/9
+        weeks = repository.get_time_series("week", datetime(2026, 9, 14), datetime(2026, 9, 27, 23, 59))
+        assert [(p["bucket"], p["count"]) for p in weeks] == [(datetime(2026, 9, 14), 2), (datetime(2026, 9, 21), 0)]
+        days = repository.get_time_series("day", datetime(2026, 9, 15), datetime(2026, 9, 20, 23, 59), category="COMIDA")
+        assert [(p["bucket"].day, p["count"]) for p in days if p["count"]] == [(20, 1)]
+        assert len(days) == 6
+
+        columns = repository.get_columns(start, end)
+        assert len(columns) == 3
+        assert float(columns.amounts.sum()) == pytest.approx(149.99)
+        assert len(repository.get_columns()) == 4
+
+    def test_performance_smoke(self, repository):
+        """Test: Unos cientos de gastos y consultas terminan rápido (detecta regresiones groseras)"""
+        start = datetime(2026, 1, 1)
+        started = time.perf_counter()
+        for i in range(200):
+            repository.save(Expense(
+                1 + i % 50, ["Comida", "Transporte", "Ocio"][i % 3],
+                list(PaymentMethod)[i % 3], date=start + timedelta(hours=13 * i)
+            ))
+        for i in range(50):
+            repository.get_by_id(1 + i)
+            repository.get_by_date_range(start + timedelta(days=i), start + timedelta(days=i + 7))
+            repository.find(ExpenseQuery(category="ocio", sort="amount", limit=5))
+        repository.get_total_by_category()
+        elapsed = time.perf_counter() - started
+
+        assert sum(repository.get_count_by_category().values()) == 200
+        assert elapsed < 10
@@ -0,0 +1,61 @@
+# app/infrastructure/repositories/test_json_codecs.py
+from datetime import datetime
+
+import pytest
+
+from app.domain.entities.expense import Expense, PaymentMethod
+from app.infrastructure.repositories.json_codecs import FORMAT_JSON, FORMAT_MSGPACK, detect_format, get_codec
+from app.infrastructure.repositories.json_expense_repository import JsonExpenseRepository
+
+CODECS = ["json", "orjson", "msgpack"]
+
+
+def _expenses():
+    return [
+        Expense(25.5, "Comida", PaymentMethod.CASH, date=datetime(2024, 3, 1, 12, 30), description="Almuerzo"),
+        Expense(10, "Café y té", PaymentMethod.DEBIT_CARD, date=datetime(2024, 3, 2, 8, 0, 0, 123456), currency="EUR"),
+        Expense(99.99, "Viajes", PaymentMethod.CREDIT_CARD, date=datetime(1969, 7, 20, 20, 17)),
+    ]
+
+
+class TestJsonCodecs:
+    """Tests de los codecs del archivo de gastos"""
+
+    @pytest.mark.parametrize("codec", CODECS)
+    def test_round_trip(self, tmp_path, codec):
+        """Test: Cada codec guarda y lee los mismos gastos (fechas con y sin microsegundos)"""
+        repository = JsonExpenseRepository(str(tmp_path / "expenses.json"), codec=codec)
+        saved = [repository.save(expense) for expense in _expenses()]
+
+        assert repository.get_all() == saved
+        assert list(repository.iter_all()) == saved
+        assert [e.date for e in repository.get_all()] == [e.date for e in saved]
+
+    @pytest.mark.parametrize("source, target", [("json", "msgpack"), ("msgpack", "orjson"), ("orjson", "json")])
+    def test_migrates_on_write(self, tmp_path, source, target):
+        """Test: Un archivo en otro formato se lee igual y el próximo guardado lo pasa al configurado"""
+        path = tmp_path / "expenses.json"
+        old = JsonExpenseRepository(str(path), codec=source)
+        saved = [old.save(expense) for expense in _expenses()]
+
+        repository = JsonExpenseRepository(str(path), codec=target)
+        assert repository.get_all() == saved
+
+        repository.delete(saved[0].id)
+        expected_format = FORMAT_MSGPACK if target == "msgpack" else FORMAT_JSON
+        assert detect_format(path) == expected_format
+        assert repository.get_all() == saved[1:]
+
+    def test_msgpack_records_resume_from_offset(self, tmp_path):
+        """Test: Los offsets de iter_records permiten retomar un archivo msgpack"""
+        path = tmp_path / "expenses.json"
+        repository = JsonExpenseRepository(str(path), codec="msgpack")
+        for expense in _expenses():
+            repository.save(expense)
+        codec = get_codec("msgpack")
+
+        records = list(codec.iter_records(path))
+        rest = [record for record, _ in codec.iter_records(path, records[0][1])]
+
+        assert rest == [record for record, _ in records[1:]]
+        assert rest[0]["date"] == "2024-03-02T08:00:00.123456"
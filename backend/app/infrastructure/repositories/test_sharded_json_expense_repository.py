@@ -0,0 +1,84 @@
+# app/infrastructure/repositories/test_sharded_json_expense_repository.py
+from datetime import datetime
+
+import pytest
+
+from app.domain.entities.expense import Expense, PaymentMethod
+from app.infrastructure.repositories.json_expense_repository import JsonExpenseRepository
+from app.infrastructure.repositories.sharded_json_expense_repository import ShardedJsonExpenseRepository
+
+
+def _expenses():
+    return [
+        Expense(25.5, "Comida", PaymentMethod.CASH, date=datetime(2026, 8, 3, 12, 30)),
+        Expense(10, "Transporte", PaymentMethod.DEBIT_CARD, date=datetime(2026, 9, 15)),
+        Expense(40, "Comida", PaymentMethod.CREDIT_CARD, date=datetime(2026, 9, 20)),
+        Expense(99.99, "Viajes", PaymentMethod.CASH, date=datetime(2026, 10, 1)),
+    ]
+
+
+@pytest.fixture
+def repository(tmp_path):
+    repository = ShardedJsonExpenseRepository(str(tmp_path / "expenses.json"), codec="json")
+    for expense in _expenses():
+        repository.save(expense)
+    return repository
+
+
+class TestShardedJsonExpenseRepository:
+    """Tests del layout de un archivo por mes"""
+
+    def test_one_file_per_month_and_manifest(self, repository):
+        """Test: Cada mes va a su archivo y el manifiesto lleva cantidad, total e ids"""
+        files = sorted(path.name for path in repository.directory.iterdir())
+        assert files == ["2026-08.json", "2026-09.json", "2026-10.json", "manifest.json"]
+
+        september = repository._read_manifest()["shards"]["2026-09"]
+        assert (september["count"], september["total"]) == (2, 50.0)
+        assert (september["min_id"], september["max_id"]) == (2, 3)
+
+    def test_range_reads_open_only_overlapping_shards(self, repository, monkeypatch):
+        """Test: get_by_date_range solo abre los meses del rango"""
+        opened = []
+        read_shard = repository._read_shard
+        monkeypatch.setattr(repository, "_read_shard", lambda month: opened.append(month) or read_shard(month))
+
+        found = repository.get_by_date_range(datetime(2026, 9, 16), datetime(2026, 10, 31))
+
+        assert [e.id for e in found] == [3, 4]
+        assert opened == ["2026-09", "2026-10"]
+
+    def test_totals_come_from_manifest(self, repository, monkeypatch):
+        """Test: Los totales sin tipos de cambio no abren ningún mes"""
+        monkeypatch.setattr(repository, "_read_shard", lambda month: pytest.fail(f"abrió {month}"))
+
+        assert repository.get_total_by_category() == {"Comida": 65.5, "Transporte": 10.0, "Viajes": 99.99}
+        assert repository.get_total_by_payment_method()["cash"] == 125.49
+        assert repository.get_count_by_category() == {"Comida": 2, "Transporte": 1, "Viajes": 1}
+
+    def test_update_moves_between_months_and_delete_drops_empty_shard(self, repository):
+        """Test: Cambiar la fecha de mes reescribe ambos meses; un mes vacío se borra"""
+        expense = repository.get_by_id(1)
+        expense.date = datetime(2026, 9, 1)
+        repository.update(expense)
+
+        assert not (repository.directory / "2026-08.json").exists()
+        assert repository._read_manifest()["shards"]["2026-09"]["count"] == 3
+        assert repository.get_by_id(1).date == datetime(2026, 9, 1)
+
+        assert repository.delete(4) is True
+        assert repository.delete(4) is False
+        assert "2026-10" not in repository._read_manifest()["shards"]
+        assert repository.save(Expense(5, "Comida", PaymentMethod.CASH, date=datetime(2026, 10, 2))).id == 5
+
+    def test_splits_single_file_and_rebuilds_manifest(self, tmp_path):
+        """Test: El archivo único se reparte por meses y el manifiesto se reconstruye si falta"""
+        single = JsonExpenseRepository(str(tmp_path / "expenses.json"), codec="json")
+        saved = [single.save(expense) for expense in _expenses()]
+
+        repository = ShardedJsonExpenseRepository(str(tmp_path / "expenses.json"), codec="msgpack")
+        assert repository.get_all() == saved
+
+        repository.manifest_path.unlink()
+        assert repository.get_file_stats()["total_expenses"] == 4
+        assert repository.save(Expense(1, "Comida", PaymentMethod.CASH, date=datetime(2026, 10, 5))).id == 5
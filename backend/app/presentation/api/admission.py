@@ -0,0 +1,240 @@
+# app/presentation/api/admission.py
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional
+
+from fastapi import HTTPException, Request, status
+
+from ...core.config import settings
+
+# Carriles: las operaciones pesadas (escaneos completos) no compiten con
+# las lecturas puntuales y escrituras por los mismos lugares
+HEAVY = "heavy"
+LIGHT = "light"
+
+
+class AdmissionRejected(Exception):
+    """No hay lugar ni en ejecución ni en la cola (o se venció la espera)"""
+
+    def __init__(self, limiter: str, reason: str, retry_after: int):
+        self.limiter = limiter
+        self.reason = reason
+        self.retry_after = retry_after
+        super().__init__(f"{limiter}: {reason}")
+
+
+class ConcurrencyLimiter:
+    """
+    Límite de peticiones en ejecución con cola de espera acotada
+
+    Si hay lugar se admite; si no, se espera en la cola (FIFO) como mucho
+    queue_timeout segundos; si la cola está llena se rechaza en el acto.
+    Al liberar, el lugar pasa directo al primero de la cola.
+    Se usa desde el event loop (sin locks).
+    """
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._avg_service_seconds = 0.0  # Promedio móvil exponencial
+        self._stats = {"admitted": 0, "queued": 0, "rejected_queue_full": 0, "rejected_timeout": 0}
+
+    async def acquire(self) -> None:
+        """Raises: AdmissionRejected: Cola llena o espera vencida"""
+        if self._active < self.max_concurrent and not self._waiters:
+            self._active += 1
+            self._stats["admitted"] += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            self._stats["rejected_queue_full"] += 1
+            raise AdmissionRejected(self.name, "cola llena", self.retry_after())
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._stats["queued"] += 1
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._discard(waiter)
+            self._stats["rejected_timeout"] += 1
+            raise AdmissionRejected(self.name, "espera vencida", self.retry_after())
+        except BaseException:
+            # Cliente desconectado: si el lugar ya se le había pasado, devolverlo
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                self._discard(waiter)
+            raise
+        self._stats["admitted"] += 1
+
+    def release(self, service_seconds: Optional[float] = None) -> None:
+        if service_seconds is not None:
+            self._avg_service_seconds = (
+                service_seconds if self._avg_service_seconds == 0.0
+                else 0.8 * self._avg_service_seconds + 0.2 * service_seconds
+            )
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(True)  # El lugar pasa al que espera: _active no cambia
+                return
+        self._active -= 1
+
+    def _discard(self, waiter: asyncio.Future) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+
+    def retry_after(self) -> int:
+        """Segundos estimados hasta que se vacíe la cola actual (1 a 60)"""
+        if self._avg_service_seconds == 0.0:
+            return 1
+        estimate = self._avg_service_seconds * (len(self._waiters) + 1) / self.max_concurrent
+        return min(max(math.ceil(estimate), 1), 60)
+
+    def stats(self) -> Dict:
+        return {
+            **self._stats,
+            "active": self._active,
+            "waiting": len(self._waiters),
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "avg_service_ms": round(self._avg_service_seconds * 1000, 3),
+        }
+
+
+class AdmissionController:
+    """
+    Limitadores por carril (heavy / light) y, opcionalmente, por ruta
+
+    Una petición toma primero el lugar de su ruta (si tiene límite propio)
+    y después el de su carril; los libera en orden inverso.
+    """
+
+    def __init__(self, lanes: Dict[str, ConcurrencyLimiter], routes: Optional[Dict[str, ConcurrencyLimiter]] = None,
+                 clock: Callable[[], float] = time.perf_counter):
+        self.lanes = lanes
+        self.routes = routes or {}
+        self._clock = clock
+
+    def limiters_for(self, lane: str, route: Optional[str]) -> List[ConcurrencyLimiter]:
+        limiters = []
+        if route in self.routes:
+            limiters.append(self.routes[route])
+        limiters.append(self.lanes[lane])
+        return limiters
+
+    def admit(self, lane: str, route: Optional[str] = None) -> "_Admission":
+        """
+        Context manager asíncrono: ocupa los lugares mientras dura la petición
+        Raises: AdmissionRejected: Al entrar, si algún limitador rechaza
+        """
+        return _Admission(self, self.limiters_for(lane, route))
+
+    def stats(self) -> Dict:
+        return {
+            "lanes": {name: limiter.stats() for name, limiter in self.lanes.items()},
+            "routes": {name: limiter.stats() for name, limiter in self.routes.items()},
+        }
+
+
+class _Admission:
+    def __init__(self, controller: AdmissionController, limiters: List[ConcurrencyLimiter]):
+        self._controller = controller
+        self._limiters = limiters
+        self._acquired: List[ConcurrencyLimiter] = []
+        self._started = 0.0
+
+    async def __aenter__(self):
+        try:
+            for limiter in self._limiters:
+                await limiter.acquire()
+                self._acquired.append(limiter)
+        except BaseException:
+            self._release()
+            raise
+        self._started = self._controller._clock()
+        return self
+
+    async def __aexit__(self, *exc):
+        self._release(self._controller._clock() - self._started)
+        return False
+
+    def _release(self, service_seconds: Optional[float] = None) -> None:
+        while self._acquired:
+            self._acquired.pop().release(service_seconds)
+
+
+def _parse_route_limits(value: str) -> Dict[str, int]:
+    """'get_dashboard=2,list_expenses=3' -> {'get_dashboard': 2, 'list_expenses': 3}"""
+    limits = {}
+    for item in value.split(","):
+        if item.strip():
+            route, limit = item.split("=")
+            limits[route.strip()] = int(limit)
+    return limits
+
+
+_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> AdmissionController:
+    """Controlador global con los límites de settings"""
+    global _controller
+    if _controller is None:
+        timeout = settings.admission_queue_timeout_seconds
+        lanes = {
+            HEAVY: ConcurrencyLimiter(HEAVY, settings.admission_heavy_max_concurrent,
+                                      settings.admission_heavy_max_queue, timeout),
+            LIGHT: ConcurrencyLimiter(LIGHT, settings.admission_light_max_concurrent,
+                                      settings.admission_light_max_queue, timeout),
+        }
+        routes = {
+            route: ConcurrencyLimiter(route, limit, settings.admission_heavy_max_queue, timeout)
+            for route, limit in _parse_route_limits(settings.admission_route_limits).items()
+        }
+        _controller = AdmissionController(lanes, routes)
+    return _controller
+
+
+def admission(lane: str, light_if: Optional[Callable[[Request], bool]] = None):
+    """
+    Dependency factory: admite la petición en el carril o responde 503 + Retry-After
+
+    Se declara en `dependencies=[...]` de la ruta para que se resuelva antes
+    que la sesión de BD: lo que espera en la cola no ocupa conexiones del pool.
+    Las rutas del carril heavy son `def` (corren en el threadpool): una async
+    con un escaneo síncrono frenaría el event loop, y con él al carril light y /ready.
+    Args: lane: Carril de la ruta (el del peor caso)
+          light_if: Si devuelve True para la petición, va al carril light
+                    (ej: un listado con filtros o límite no recorre todo)
+    """
+    def lane_for(request: Request) -> str:
+        return LIGHT if light_if is not None and light_if(request) else lane
+
+    async def dependency(request: Request):
+        if not settings.admission_control_enabled:
+            yield
+            return
+        endpoint = request.scope.get("endpoint")
+        route = getattr(endpoint, "__name__", None)
+        try:
+            async with get_admission_controller().admit(lane_for(request), route):
+                yield
+        except AdmissionRejected as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Servidor ocupado ({e.limiter}: {e.reason}), reintentar más tarde",
+                headers={"Retry-After": str(e.retry_after)}
+            )
+
+    dependency.lane = lane
+    dependency.lane_for = lane_for
+    return dependency
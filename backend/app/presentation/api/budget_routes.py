@@ -0,0 +1,132 @@
+# app/presentation/api/budget_routes.py
+from typing import Annotated, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+
+from ..schemas.budget_schemas import (
+    BudgetSetSchema,
+    BudgetResponseSchema,
+    BudgetStatusResponseSchema,
+    BudgetRebuildResponseSchema
+)
+from ..schemas.expense_schemas import ErrorResponseSchema
+from .admission import HEAVY, LIGHT, admission
+from .dependencies import (
+    get_set_budget_use_case,
+    get_delete_budget_use_case,
+    get_get_budget_status_use_case,
+    get_rebuild_budget_totals_use_case
+)
+from ...application.use_cases.set_budget import SetBudgetUseCase
+from ...application.use_cases.delete_budget import DeleteBudgetUseCase
+from ...application.use_cases.get_budget_status import GetBudgetStatusUseCase
+from ...application.use_cases.rebuild_budget_totals import RebuildBudgetTotalsUseCase
+
+
+router = APIRouter(prefix="/budgets", tags=["budgets"])
+
+
+@router.get(
+    "/status",
+    dependencies=[Depends(admission(LIGHT))],
+    response_model=BudgetStatusResponseSchema,
+    summary="Estado de los presupuestos del mes",
+    responses={
+        200: {"description": "Gastado, restante y % usado por categoría"},
+        400: {"model": ErrorResponseSchema, "description": "Mes inválido"}
+    }
+)
+async def get_budget_status(
+    month: Optional[str] = Query(None, description="Mes YYYY-MM (por defecto: el actual)"),
+    use_case: Annotated[GetBudgetStatusUseCase, Depends(get_get_budget_status_use_case)] = None
+):
+    """
+    Obtiene el estado de cada presupuesto leyendo los totales del mes,
+    que se mantienen en cada alta, edición y baja de gastos.
+    """
+    try:
+        return use_case.execute(month)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="El mes debe tener formato YYYY-MM"
+        )
+
+
+@router.put(
+    "/{category}",
+    dependencies=[Depends(admission(LIGHT))],
+    response_model=BudgetResponseSchema,
+    summary="Crear o reemplazar el presupuesto de una categoría",
+    responses={
+        200: {"description": "Presupuesto guardado"},
+        400: {"model": ErrorResponseSchema, "description": "Datos inválidos"}
+    }
+)
+async def set_budget(
+    category: str,
+    budget_data: BudgetSetSchema,
+    use_case: Annotated[SetBudgetUseCase, Depends(get_set_budget_use_case)]
+):
+    """Define el límite mensual de gasto de una categoría."""
+    try:
+        budget = use_case.execute(category, budget_data.monthly_limit)
+        return BudgetResponseSchema(category=budget.category, monthly_limit=budget.monthly_limit)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.delete(
+    "/{category}",
+    dependencies=[Depends(admission(LIGHT))],
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Eliminar el presupuesto de una categoría",
+    responses={
+        204: {"description": "Presupuesto eliminado"},
+        404: {"model": ErrorResponseSchema, "description": "La categoría no tiene presupuesto"}
+    }
+)
+async def delete_budget(
+    category: str,
+    use_case: Annotated[DeleteBudgetUseCase, Depends(get_delete_budget_use_case)]
+):
+    """Elimina el presupuesto (los totales del mes se conservan)."""
+    if not use_case.execute(category):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"La categoría {category} no tiene presupuesto"
+        )
+    return None
+
+
+@router.post(
+    "/rebuild",
+    dependencies=[Depends(admission(HEAVY))],
+    response_model=BudgetRebuildResponseSchema,
+    summary="Reconstruir los totales del mes desde los gastos",
+    responses={
+        200: {"description": "Totales recalculados"},
+        400: {"model": ErrorResponseSchema, "description": "Falta el tipo de cambio de alguna moneda"}
+    }
+)
+def rebuild_budget_totals(
+    use_case: Annotated[RebuildBudgetTotalsUseCase, Depends(get_rebuild_budget_totals_use_case)]
+):
+    """
+    Recalcula todos los totales (categoría, mes) desde la tabla de gastos.
+    Las escrituras de gastos esperan mientras corre.
+    """
+    try:
+        return use_case.execute()
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al reconstruir los totales: {str(e)}"
+        )
@@ -0,0 +1,34 @@
+# app/presentation/api/category_routes.py
+from typing import Annotated
+from fastapi import APIRouter, Depends, Query
+
+from ..schemas.category_schemas import CategoryListResponseSchema
+from .admission import LIGHT, admission
+from .dependencies import get_get_categories_use_case
+from ...application.use_cases.get_categories import GetCategoriesUseCase
+
+
+router = APIRouter(prefix="/categories", tags=["categories"])
+
+
+@router.get(
+    "/",
+    dependencies=[Depends(admission(LIGHT))],
+    response_model=CategoryListResponseSchema,
+    summary="Listar categorías con su cantidad de gastos",
+    responses={
+        200: {"description": "Categorías ordenadas por nombre"}
+    }
+)
+def list_categories(
+    refresh: bool = Query(False, description="Recargar los conteos desde el repositorio"),
+    use_case: Annotated[GetCategoriesUseCase, Depends(get_get_categories_use_case)] = None
+):
+    """
+    Obtiene las categorías y cuántos gastos tiene cada una.
+    
+    Se sirve desde la caché de categorías, que se mantiene con cada alta,
+    edición y baja; **refresh** la recarga (ej: tras escrituras de otro proceso).
+    """
+    categories = use_case.execute(refresh=refresh)
+    return CategoryListResponseSchema(categories=categories, total=len(categories))
@@ -3,14 +3,14 @@
 # =============================================================================
 
 # app/presentation/api/dependencies.py
-from typing import Annotated
-from fastapi import Depends
-from sqlalchemy.orm import Session
+from typing import Annotated, Any, Generator, Optional
+from fastapi import Depends, Request
 
-from ...infrastructure.database.connection import get_db
-from ...infrastructure.repositories.postgresql_expense_repository import PostgreSQLExpenseRepository
-from ...application.use_cases.create_expense import CreateExpenseUseCase
-from ...infrastructure.repositories.json_expense_repository import JsonExpenseRepository
+from ...domain.repositories.budget_repository import BudgetRepository
+from ...domain.repositories.expense_repository import ExpenseRepository
+from ...domain.repositories.exchange_rate_repository import ExchangeRateRepository
+from ...infrastructure.repositories.registry import get_backend
+from ...application.single_flight import ScopedSingleFlight, get_single_flight
 from ...application.use_cases.create_expense import CreateExpenseUseCase
 from ...application.use_cases.get_expense_by_id import GetExpenseByIdUseCase
 from ...application.use_cases.get_all_expenses import GetAllExpensesUseCase
@@ -18,77 +18,348 @@ from ...application.use_cases.get_filtered_expenses import GetFilteredExpensesUs
 from ...application.use_cases.update_expense import UpdateExpenseUseCase
 from ...application.use_cases.delete_expense import DeleteExpenseUseCase
 from ...application.use_cases.get_dashboard_data import GetDashboardDataUseCase
+from ...application.use_cases.get_dashboard_snapshot import GetDashboardSnapshotUseCase
+from ...application.use_cases.get_time_series import GetTimeSeriesUseCase
+from ...application.use_cases.get_largest_expenses import GetLargestExpensesUseCase
+from ...application.use_cases.get_categories import GetCategoriesUseCase
+from ...application.use_cases.set_exchange_rates import SetExchangeRatesUseCase
+from ...application.use_cases.get_exchange_rates import GetExchangeRatesUseCase
+from ...application.use_cases.get_amount_distribution import GetAmountDistributionUseCase
+from ...application.use_cases.set_budget import SetBudgetUseCase
+from ...application.use_cases.delete_budget import DeleteBudgetUseCase
+from ...application.use_cases.get_budget_status import GetBudgetStatusUseCase
+from ...application.use_cases.rebuild_budget_totals import RebuildBudgetTotalsUseCase
+from ...application.use_cases.request_report import RequestReportUseCase
+from ...application.use_cases.get_report import GetReportUseCase
 from ...core.config import settings
 
-"""
-def get_expense_repository() -> JsonExpenseRepository:
-    
-    #Dependency: Provee una instancia del repository
-    
-    #Aquí es donde se decide QUÉ implementación usar.
-    #En el futuro puedes cambiar a PostgreSQL sin tocar nada más.
-    
-    settings.ensure_data_directory()
-    return JsonExpenseRepository(settings.data_file_path)
-"""
+
+def get_client_key(request: Request) -> str:
+    """
+    Identifica al cliente para la ventana read-your-writes
+    Usa el header X-Client-Id si viene, si no la IP
+    """
+    client_id = request.headers.get("X-Client-Id")
+    if client_id:
+        return client_id
+    return request.client.host if request.client else "anonymous"
+
+
+def _with_cache(repository: ExpenseRepository, backend_name: str, fill: bool = True) -> ExpenseRepository:
+    """
+    Envuelve el repository en la caché de lecturas si está activada para el backend
+    Args: fill: False = usar lo cacheado pero no guardar lo leído (réplica con posible lag)
+    """
+    if not settings.is_repository_cache_enabled(backend_name):
+        return repository
+    from ...infrastructure.repositories.cached_expense_repository import CachedExpenseRepository, get_expense_cache
+    return CachedExpenseRepository(repository, get_expense_cache(), fill)
+
+
+def _exchange_rates():
+    """Tasas vigentes (caché del proceso), para los casos de uso que convierten montos"""
+    from ...infrastructure.repositories.exchange_rate_cache import get_exchange_rate_cache
+    return get_exchange_rate_cache().get
+
+
+def _single_flight(request: Request) -> Optional[ScopedSingleFlight]:
+    """
+    Coalescencia de lecturas pesadas, si está activada
+    Solo se comparten lecturas del mismo origen (primario o réplica), que
+    get_read_expense_repository deja en request.state
+    """
+    if not settings.single_flight_enabled:
+        return None
+    return get_single_flight().scoped(getattr(request.state, "read_source", "primary"))
+
+
+def get_write_session(request: Request) -> Generator[Any, None, None]:
+    """
+    Dependency: Sesión del primario para los casos de uso de escritura
+
+    FastAPI la resuelve una vez por petición, así el repository de gastos y
+    el de presupuestos comparten la sesión (y la transacción).
+    Con el backend JSON no hay sesión y se provee None.
+    """
+    backend = get_backend(settings.repository_backend)
+    if not backend.uses_database:
+        yield None
+        return
+
+    from ...infrastructure.database.connection import get_session_factory
+    from ...infrastructure.database.replicas import get_replica_router
+    router = get_replica_router()
+    client_key = get_client_key(request)
+    router.record_write(client_key)
+    db = get_session_factory()()
+    try:
+        yield db
+    finally:
+        db.close()
+        # La ventana read-your-writes cuenta desde que terminó la escritura
+        router.record_write(client_key)
+
+
+def get_primary_read_session() -> Generator[Any, None, None]:
+    """
+    Dependency: Sesión del primario para lecturas que no van a réplicas
+
+    A diferencia de get_write_session no abre la ventana read-your-writes:
+    solo las rutas que escriben deben fijar al cliente en el primario.
+    Con el backend JSON no hay sesión y se provee None.
+    """
+    backend = get_backend(settings.repository_backend)
+    if not backend.uses_database:
+        yield None
+        return
+
+    from ...infrastructure.database.connection import get_session_factory
+    db = get_session_factory()()
+    try:
+        yield db
+    finally:
+        db.close()
+
 
 def get_expense_repository(
-        db: Session = Depends(get_db)
-)->PostgreSQLExpenseRepository:
+    db: Annotated[Any, Depends(get_write_session)]  # Session de SQLAlchemy o None (JSON)
+) -> ExpenseRepository:
     """
-    Dependency: Provee una instancia del repository PostgreSQL
-    
-    ANTES: JsonExpenseRepository
-    AHORA: PostgreSQLExpenseRepository
+    Dependency: Provee el repository configurado en settings.repository_backend
+
+    Aquí es donde se decide QUÉ implementación usar (json o postgresql).
+    Solo se importa el backend elegido: con JSON no se carga SQLAlchemy.
+    Siempre usa el primario: es el repository de los casos de uso de escritura.
+    Se envuelve en ObservedExpenseRepository para publicar cada escritura
+    y, si está activada, en la caché (las escrituras la invalidan).
+    """
+    from ...infrastructure.repositories.observed_expense_repository import ObservedExpenseRepository
+    backend = get_backend(settings.repository_backend)
+    return ObservedExpenseRepository(_with_cache(backend.create(db), backend.name))
+
+
+def get_budget_repository(
+    db: Annotated[Any, Depends(get_write_session)]  # Session de SQLAlchemy o None (JSON)
+) -> BudgetRepository:
+    """Dependency: Presupuestos y totales del mes, en la misma sesión que los gastos"""
+    return get_backend(settings.repository_backend).create_budget_repository(db)
+
+
+def get_read_expense_repository(request: Request) -> Generator[ExpenseRepository, None, None]:
+    """
+    Dependency: Repository para casos de uso de solo lectura
+
+    Con réplicas configuradas lee de una réplica sana, salvo que el cliente
+    haya escrito hace poco (read-your-writes) o no haya réplicas disponibles.
+    La caché es de todos los clientes: lo leído de una réplica mientras la
+    ventana de alguna escritura sigue abierta no se guarda, porque puede ser
+    anterior a esa escritura.
     """
-    return PostgreSQLExpenseRepository(db)
+    backend = get_backend(settings.repository_backend)
+    if not backend.uses_database:
+        yield _with_cache(backend.create(), backend.name)
+        return
+
+    from ...infrastructure.database.replicas import get_replica_router, open_read_session, is_connection_error
+    router = get_replica_router()
+    db, replica = open_read_session(get_client_key(request), router)
+    fill = replica is None or not router.has_any_recent_write()
+    request.state.read_source = "primary" if replica is None else ("replica", replica.url)
+    try:
+        yield _with_cache(backend.create(db), backend.name, fill)
+    except Exception as e:
+        if replica is not None and is_connection_error(e):
+            router.mark_failure(replica)
+        raise
+    finally:
+        db.close()
 
 
 def get_create_expense_use_case(
-    repository: Annotated[JsonExpenseRepository, Depends(get_expense_repository)]
+    repository: Annotated[ExpenseRepository, Depends(get_expense_repository)],
+    budget_repository: Annotated[BudgetRepository, Depends(get_budget_repository)]
 ) -> CreateExpenseUseCase:
     """Dependency: Provee el caso de uso para crear gastos"""
-    return CreateExpenseUseCase(repository)
+    return CreateExpenseUseCase(repository, budget_repository, _exchange_rates())
 
 
 def get_get_expense_by_id_use_case(
-    repository: Annotated[JsonExpenseRepository, Depends(get_expense_repository)]
+    repository: Annotated[ExpenseRepository, Depends(get_read_expense_repository)]
 ) -> GetExpenseByIdUseCase:
     """Dependency: Provee el caso de uso para obtener gasto por ID"""
     return GetExpenseByIdUseCase(repository)
 
 
 def get_get_all_expenses_use_case(
-    repository: Annotated[JsonExpenseRepository, Depends(get_expense_repository)]
+    request: Request,
+    repository: Annotated[ExpenseRepository, Depends(get_read_expense_repository)]
 ) -> GetAllExpensesUseCase:
     """Dependency: Provee el caso de uso para obtener todos los gastos"""
-    return GetAllExpensesUseCase(repository)
+    return GetAllExpensesUseCase(repository, _single_flight(request))
 
 
 def get_get_filtered_expenses_use_case(
-    repository: Annotated[JsonExpenseRepository, Depends(get_expense_repository)]
+    request: Request,
+    repository: Annotated[ExpenseRepository, Depends(get_read_expense_repository)]
 ) -> GetFilteredExpensesUseCase:
     """Dependency: Provee el caso de uso para filtrar gastos"""
-    return GetFilteredExpensesUseCase(repository)
+    return GetFilteredExpensesUseCase(repository, _single_flight(request))
 
 
 def get_update_expense_use_case(
-    repository: Annotated[JsonExpenseRepository, Depends(get_expense_repository)]
+    repository: Annotated[ExpenseRepository, Depends(get_expense_repository)],
+    budget_repository: Annotated[BudgetRepository, Depends(get_budget_repository)]
 ) -> UpdateExpenseUseCase:
     """Dependency: Provee el caso de uso para actualizar gastos"""
-    return UpdateExpenseUseCase(repository)
+    return UpdateExpenseUseCase(repository, budget_repository, _exchange_rates())
 
 
 def get_delete_expense_use_case(
-    repository: Annotated[JsonExpenseRepository, Depends(get_expense_repository)]
+    repository: Annotated[ExpenseRepository, Depends(get_expense_repository)],
+    budget_repository: Annotated[BudgetRepository, Depends(get_budget_repository)]
 ) -> DeleteExpenseUseCase:
     """Dependency: Provee el caso de uso para eliminar gastos"""
-    return DeleteExpenseUseCase(repository)
+    return DeleteExpenseUseCase(repository, budget_repository, _exchange_rates())
 
 
 def get_get_dashboard_data_use_case(
-    repository: Annotated[JsonExpenseRepository, Depends(get_expense_repository)]
+    repository: Annotated[ExpenseRepository, Depends(get_read_expense_repository)]
 ) -> GetDashboardDataUseCase:
     """Dependency: Provee el caso de uso para obtener datos del dashboard"""
-    return GetDashboardDataUseCase(repository)
+    return GetDashboardDataUseCase(repository, _exchange_rates())
+
+
+def get_get_dashboard_snapshot_use_case(
+    request: Request,
+    repository: Annotated[ExpenseRepository, Depends(get_read_expense_repository)]
+) -> GetDashboardSnapshotUseCase:
+    """Dependency: Provee el caso de uso del dashboard desde snapshots"""
+    if not settings.dashboard_snapshots_enabled:
+        return GetDashboardSnapshotUseCase(repository, single_flight=_single_flight(request), exchange_rates=_exchange_rates())
+    from ...infrastructure.analytics.dashboard_snapshots import get_dashboard_snapshot_store
+    return GetDashboardSnapshotUseCase(repository, get_dashboard_snapshot_store(), _single_flight(request), _exchange_rates())
+
+
+def get_get_time_series_use_case(
+    repository: Annotated[ExpenseRepository, Depends(get_read_expense_repository)]
+) -> GetTimeSeriesUseCase:
+    """Dependency: Provee el caso de uso para la serie temporal del dashboard"""
+    return GetTimeSeriesUseCase(repository)
+
+
+def get_get_largest_expenses_use_case(
+    repository: Annotated[ExpenseRepository, Depends(get_read_expense_repository)]
+) -> GetLargestExpensesUseCase:
+    """Dependency: Provee el caso de uso para los mayores gastos de un período"""
+    return GetLargestExpensesUseCase(repository)
+
+
+def get_get_amount_distribution_use_case(
+    repository: Annotated[ExpenseRepository, Depends(get_read_expense_repository)]
+) -> GetAmountDistributionUseCase:
+    """Dependency: Provee el caso de uso de distribución de montos"""
+    from ...infrastructure.analytics.distribution_store import get_distribution_store
+    return GetAmountDistributionUseCase(repository, get_distribution_store())
+
+
+def get_get_categories_use_case(
+    repository: Annotated[ExpenseRepository, Depends(get_read_expense_repository)]
+) -> GetCategoriesUseCase:
+    """Dependency: Provee el caso de uso de categorías (servidas desde la caché)"""
+    from ...infrastructure.repositories.category_cache import get_category_cache
+    return GetCategoriesUseCase(repository, get_category_cache())
+
+
+def get_rate_repository(
+    db: Annotated[Any, Depends(get_write_session)]  # Session de SQLAlchemy o None (JSON)
+) -> ExchangeRateRepository:
+    """Dependency: Tipos de cambio del backend configurado, para cargarlos (primario)"""
+    return get_backend(settings.repository_backend).create_rate_repository(db)
+
+
+def get_read_rate_repository(
+    db: Annotated[Any, Depends(get_primary_read_session)]  # Session de SQLAlchemy o None (JSON)
+) -> ExchangeRateRepository:
+    """Dependency: Tipos de cambio para listarlos (primario, sin contar como escritura)"""
+    return get_backend(settings.repository_backend).create_rate_repository(db)
+
+
+def get_rebuild_budget_totals_use_case(
+    repository: Annotated[ExpenseRepository, Depends(get_expense_repository)],
+    budget_repository: Annotated[BudgetRepository, Depends(get_budget_repository)]
+) -> RebuildBudgetTotalsUseCase:
+    """Dependency: Provee el caso de uso para reconstruir los totales del mes"""
+    return RebuildBudgetTotalsUseCase(repository, budget_repository, _exchange_rates())
+
+
+def get_set_exchange_rates_use_case(
+    rate_repository: Annotated[ExchangeRateRepository, Depends(get_rate_repository)],
+    budget_totals: Annotated[RebuildBudgetTotalsUseCase, Depends(get_rebuild_budget_totals_use_case)]
+) -> SetExchangeRatesUseCase:
+    """Dependency: Provee el caso de uso para cargar tipos de cambio (y recalcular los totales del mes)"""
+    from ...infrastructure.repositories.exchange_rate_cache import get_exchange_rate_cache
+    return SetExchangeRatesUseCase(rate_repository, get_exchange_rate_cache(), budget_totals)
+
+
+def get_get_exchange_rates_use_case(
+    rate_repository: Annotated[ExchangeRateRepository, Depends(get_read_rate_repository)]
+) -> GetExchangeRatesUseCase:
+    """Dependency: Provee el caso de uso para listar tipos de cambio"""
+    from ...infrastructure.repositories.exchange_rate_cache import get_exchange_rate_cache
+    return GetExchangeRatesUseCase(rate_repository, get_exchange_rate_cache())
+
+
+def get_read_budget_repository(request: Request) -> Generator[BudgetRepository, None, None]:
+    """
+    Dependency: Presupuestos para lecturas (réplica si corresponde, igual
+    que get_read_expense_repository)
+    """
+    backend = get_backend(settings.repository_backend)
+    if not backend.uses_database:
+        yield backend.create_budget_repository()
+        return
+
+    from ...infrastructure.database.replicas import get_replica_router, open_read_session, is_connection_error
+    router = get_replica_router()
+    db, replica = open_read_session(get_client_key(request), router)
+    try:
+        yield backend.create_budget_repository(db)
+    except Exception as e:
+        if replica is not None and is_connection_error(e):
+            router.mark_failure(replica)
+        raise
+    finally:
+        db.close()
+
+
+def get_set_budget_use_case(
+    budget_repository: Annotated[BudgetRepository, Depends(get_budget_repository)]
+) -> SetBudgetUseCase:
+    """Dependency: Provee el caso de uso para crear/reemplazar presupuestos"""
+    return SetBudgetUseCase(budget_repository)
+
+
+def get_delete_budget_use_case(
+    budget_repository: Annotated[BudgetRepository, Depends(get_budget_repository)]
+) -> DeleteBudgetUseCase:
+    """Dependency: Provee el caso de uso para eliminar presupuestos"""
+    return DeleteBudgetUseCase(budget_repository)
+
+
+def get_get_budget_status_use_case(
+    budget_repository: Annotated[BudgetRepository, Depends(get_read_budget_repository)]
+) -> GetBudgetStatusUseCase:
+    """Dependency: Provee el caso de uso del estado de presupuestos"""
+    return GetBudgetStatusUseCase(budget_repository)
+
+
+def get_request_report_use_case() -> RequestReportUseCase:
+    """Dependency: Provee el caso de uso para pedir reportes"""
+    from ...infrastructure.reports.report_jobs import get_report_job_manager
+    return RequestReportUseCase(get_report_job_manager())
+
 
+def get_get_report_use_case() -> GetReportUseCase:
+    """Dependency: Provee el caso de uso para consultar reportes"""
+    from ...infrastructure.reports.report_jobs import get_report_job_manager
+    return GetReportUseCase(get_report_job_manager())
@@ -0,0 +1,74 @@
+# app/presentation/api/exchange_rate_routes.py
+from typing import Annotated, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from ..schemas.exchange_rate_schemas import (
+    ExchangeRatesUpdateSchema,
+    ExchangeRateListResponseSchema,
+    ExchangeRatesSavedSchema
+)
+from ..schemas.expense_schemas import ErrorResponseSchema
+from .admission import HEAVY, LIGHT, admission
+from .dependencies import get_set_exchange_rates_use_case, get_get_exchange_rates_use_case
+from ...application.use_cases.set_exchange_rates import SetExchangeRatesUseCase
+from ...application.use_cases.get_exchange_rates import GetExchangeRatesUseCase
+
+
+router = APIRouter(prefix="/exchange-rates", tags=["exchange-rates"])
+
+
+@router.put(
+    "/",
+    dependencies=[Depends(admission(HEAVY))],
+    response_model=ExchangeRatesSavedSchema,
+    summary="Cargar tipos de cambio",
+    responses={
+        200: {"description": "Tasas guardadas"},
+        400: {"model": ErrorResponseSchema, "description": "Tasas inválidas"}
+    }
+)
+def set_exchange_rates(
+    data: ExchangeRatesUpdateSchema,
+    use_case: Annotated[SetExchangeRatesUseCase, Depends(get_set_exchange_rates_use_case)]
+):
+    """
+    Crea o reemplaza tipos de cambio por (moneda, fecha).
+    
+    **rate** es cuánto vale 1 unidad de la moneda en la moneda base. Cada
+    gasto se convierte con la última tasa de su moneda con fecha igual o
+    anterior a la del gasto. Después se recalculan los totales del mes de
+    los presupuestos (que están en la moneda base).
+    """
+    try:
+        saved = use_case.execute([(rate.date, rate.currency, rate.rate) for rate in data.rates])
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return ExchangeRatesSavedSchema(saved=saved)
+
+
+@router.get(
+    "/",
+    dependencies=[Depends(admission(LIGHT))],
+    response_model=ExchangeRateListResponseSchema,
+    summary="Listar tipos de cambio",
+    responses={
+        200: {"description": "Tasas ordenadas por moneda y fecha"},
+        400: {"model": ErrorResponseSchema, "description": "Moneda inválida"}
+    }
+)
+def list_exchange_rates(
+    currency: Optional[str] = Query(None, description="Solo las tasas de esta moneda"),
+    use_case: Annotated[GetExchangeRatesUseCase, Depends(get_get_exchange_rates_use_case)] = None
+):
+    """Obtiene los tipos de cambio cargados y la moneda base."""
+    try:
+        result = use_case.execute(currency)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return ExchangeRateListResponseSchema(**result, total=len(result["rates"]))
@@ -3,8 +3,9 @@
 # =============================================================================
 
 # app/presentation/api/expense_routes.py
-from typing import Annotated, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import Annotated, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status, Query
+from fastapi.responses import JSONResponse
 from datetime import datetime
 
 from ..schemas.expense_schemas import (
@@ -12,9 +13,14 @@ from ..schemas.expense_schemas import (
     ExpenseUpdateSchema,
     ExpenseResponseSchema,
     ExpenseListResponseSchema,
+    LargestExpensesResponseSchema,
     DashboardResponseSchema,
+    TimeSeriesResponseSchema,
+    DistributionResponseSchema,
     ErrorResponseSchema
 )
+from ..schemas.budget_schemas import BudgetStatusSchema
+from .admission import HEAVY, LIGHT, admission
 from .dependencies import (
     get_create_expense_use_case,
     get_get_expense_by_id_use_case,
@@ -22,7 +28,10 @@ from .dependencies import (
     get_get_filtered_expenses_use_case,
     get_update_expense_use_case,
     get_delete_expense_use_case,
-    get_get_dashboard_data_use_case
+    get_get_dashboard_snapshot_use_case,
+    get_get_time_series_use_case,
+    get_get_largest_expenses_use_case,
+    get_get_amount_distribution_use_case
 )
 from ...application.use_cases.create_expense import CreateExpenseUseCase
 from ...application.use_cases.get_expense_by_id import GetExpenseByIdUseCase
@@ -30,20 +39,52 @@ from ...application.use_cases.get_all_expenses import GetAllExpensesUseCase
 from ...application.use_cases.get_filtered_expenses import GetFilteredExpensesUseCase
 from ...application.use_cases.update_expense import UpdateExpenseUseCase
 from ...application.use_cases.delete_expense import DeleteExpenseUseCase
-from ...application.use_cases.get_dashboard_data import GetDashboardDataUseCase
+from ...application.use_cases.get_dashboard_snapshot import GetDashboardSnapshotUseCase
+from ...application.use_cases.get_time_series import GetTimeSeriesUseCase
+from ...application.use_cases.get_largest_expenses import GetLargestExpensesUseCase
+from ...application.use_cases.get_amount_distribution import GetAmountDistributionUseCase
 from ...application.dtos.expense_dto import (
     CreateExpenseDTO,
     UpdateExpenseDTO,
     ExpenseFilterDTO
 )
 from ...domain.repositories.exceptions import ExpenseNotFoundError
+from ...domain.entities.expense import Expense
+from ...domain.repositories.expense_query import EXPENSE_FIELDS, ExpenseCount, parse_fields
 
 
 router = APIRouter(prefix="/expenses", tags=["expenses"])
 
+FIELDS_DESCRIPTION = f"Campos a devolver separados por coma ({', '.join(EXPENSE_FIELDS)}); por defecto todos"
+
+
+def _parse_fields(fields: Optional[str]):
+    """?fields= a tupla de campos (None = todos); 400 si hay campos desconocidos"""
+    try:
+        return parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+def _expense_response(expense: Expense) -> ExpenseResponseSchema:
+    return ExpenseResponseSchema(
+        id=expense.id,
+        amount=expense.amount,
+        currency=expense.currency,
+        category=expense.category,
+        payment_method=expense.payment_method.value,
+        date=expense.date,
+        description=expense.description,
+        formatted_amount=expense.get_formatted_amount()
+    )
+
 
 @router.post(
     "/",
+    dependencies=[Depends(admission(LIGHT))],
     response_model=ExpenseResponseSchema,
     status_code=status.HTTP_201_CREATED,
     summary="Crear un nuevo gasto",
@@ -65,6 +106,11 @@ async def create_expense(
     - **payment_method**: cash, debit_card, o credit_card
     - **description**: Descripción opcional
     - **date**: Fecha del gasto (opcional, por defecto: ahora)
+    - **currency**: Moneda ISO 4217 (opcional, por defecto: USD)
+    
+    Si la categoría tiene presupuesto, **budget** indica el % usado en el mes
+    y si se superó. Los totales del mes están en la moneda base: un gasto en
+    otra moneda necesita su tipo de cambio cargado.
     """
     try:
         # Convertir schema a DTO
@@ -73,21 +119,24 @@ async def create_expense(
             category=expense_data.category,
             payment_method=expense_data.payment_method,
             description=expense_data.description,
-            date=expense_data.date
+            date=expense_data.date,
+            currency=expense_data.currency
         )
         
         # Ejecutar caso de uso
-        expense = use_case.execute(dto)
+        expense, budget_status = use_case.execute_with_budget(dto)
         
         # Convertir entidad a schema de respuesta
         return ExpenseResponseSchema(
             id=expense.id,
             amount=expense.amount,
+            currency=expense.currency,
             category=expense.category,
             payment_method=expense.payment_method.value,
             date=expense.date,
             description=expense.description,
-            formatted_amount=expense.get_formatted_amount()
+            formatted_amount=expense.get_formatted_amount(),
+            budget=BudgetStatusSchema.from_status(budget_status)
         )
     
     except ValueError as e:
@@ -102,26 +151,83 @@ async def create_expense(
         )
 
 
+@router.get(
+    "/largest",
+    dependencies=[Depends(admission(HEAVY))],
+    response_model=LargestExpensesResponseSchema,
+    summary="Mayores gastos de un período",
+    responses={
+        200: {"description": "Gastos de mayor a menor monto"},
+        400: {"model": ErrorResponseSchema, "description": "Parámetros inválidos"}
+    }
+)
+def get_largest_expenses(
+    from_date: Optional[datetime] = Query(None, alias="from", description="Fecha inicial (por defecto: 30 días atrás)"),
+    to_date: Optional[datetime] = Query(None, alias="to", description="Fecha final (por defecto: ahora)"),
+    limit: int = Query(10, description="Cantidad de gastos (1 a 100)"),
+    category: Optional[str] = Query(None, description="Filtrar por categoría"),
+    use_case: Annotated[GetLargestExpensesUseCase, Depends(get_get_largest_expenses_use_case)] = None
+):
+    """
+    Obtiene los **limit** gastos de mayor monto del período.
+    
+    Solo se leen esos gastos: en PostgreSQL con ORDER BY amount DESC LIMIT,
+    en JSON con una selección por heap en lugar de ordenar todo.
+    """
+    try:
+        result = use_case.execute(
+            start_date=from_date,
+            end_date=to_date,
+            limit=limit,
+            category=category
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    expenses = [_expense_response(expense) for expense in result["expenses"]]
+    return LargestExpensesResponseSchema(
+        start_date=result["start_date"],
+        end_date=result["end_date"],
+        category=result["category"],
+        expenses=expenses,
+        total=len(expenses)
+    )
+
+
 @router.get(
     "/{expense_id}",
+    dependencies=[Depends(admission(LIGHT))],
     response_model=ExpenseResponseSchema,
     summary="Obtener un gasto por ID",
     responses={
         200: {"description": "Gasto encontrado"},
+        400: {"model": ErrorResponseSchema, "description": "Campos inválidos"},
         404: {"model": ErrorResponseSchema, "description": "Gasto no encontrado"}
     }
 )
 async def get_expense(
     expense_id: int,
-    use_case: Annotated[GetExpenseByIdUseCase, Depends(get_get_expense_by_id_use_case)]
+    use_case: Annotated[GetExpenseByIdUseCase, Depends(get_get_expense_by_id_use_case)],
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION)
 ):
-    """Obtiene un gasto específico por su ID."""
+    """
+    Obtiene un gasto específico por su ID.
+    
+    Con **fields** solo se leen y devuelven esos campos.
+    """
+    projection = _parse_fields(fields)
     try:
+        if projection is not None:
+            return JSONResponse(content=use_case.execute_projected(expense_id, projection))
+
         expense = use_case.execute(expense_id)
         
         return ExpenseResponseSchema(
             id=expense.id,
             amount=expense.amount,
+            currency=expense.currency,
             category=expense.category,
             payment_method=expense.payment_method.value,
             date=expense.date,
@@ -136,19 +242,54 @@ async def get_expense(
         )
 
 
+def _page_total(
+    use_case: GetFilteredExpensesUseCase,
+    filters: Optional[ExpenseFilterDTO],
+    returned: int,
+    estimate: bool
+) -> ExpenseCount:
+    """
+    Total de la consulta para una página de returned gastos. Si la página
+    llegó al final (sin límite o sin llenarse) sale de lo devuelto; si no
+    (página llena u offset más allá del final) se cuenta aparte
+    """
+    offset = filters.offset if filters is not None else 0
+    limit = filters.limit if filters is not None else None
+    if (limit is None or returned < limit) and (returned or not offset):
+        return ExpenseCount(offset + returned)
+    return use_case.count(filters, estimate)
+
+
+def _is_bounded_listing(request: Request) -> bool:
+    """
+    Listado con filtros o límite: el repositorio no devuelve todo el historial
+    (WHERE / LIMIT), así que no ocupa un lugar del carril heavy
+    """
+    params = request.query_params
+    return any(params.get(name) for name in ("category", "payment_method", "min_amount", "max_amount", "limit"))
+
+
 @router.get(
     "/",
+    dependencies=[Depends(admission(HEAVY, light_if=_is_bounded_listing))],
     response_model=ExpenseListResponseSchema,
     summary="Listar todos los gastos o filtrar",
     responses={
-        200: {"description": "Lista de gastos"}
+        200: {"description": "Lista de gastos"},
+        400: {"model": ErrorResponseSchema, "description": "Campos inválidos"}
     }
 )
-async def list_expenses(
+def list_expenses(
     category: Optional[str] = Query(None, description="Filtrar por categoría"),
     payment_method: Optional[str] = Query(None, description="Filtrar por método de pago"),
     min_amount: Optional[float] = Query(None, description="Monto mínimo"),
     max_amount: Optional[float] = Query(None, description="Monto máximo"),
+    sort: Optional[Literal["date", "amount", "category"]] = Query(None, description="Ordenar por date, amount o category"),
+    order: Literal["asc", "desc"] = Query("desc", description="Sentido del orden"),
+    limit: Optional[int] = Query(None, ge=1, description="Cantidad máxima de gastos"),
+    offset: int = Query(0, ge=0, description="Gastos a saltear (paginación)"),
+    count: Literal["exact", "estimated"] = Query("exact", description="Cómo calcular total al paginar"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     use_case_all: Annotated[GetAllExpensesUseCase, Depends(get_get_all_expenses_use_case)] = None,
     use_case_filtered: Annotated[GetFilteredExpensesUseCase, Depends(get_get_filtered_expenses_use_case)] = None
 ):
@@ -160,40 +301,70 @@ async def list_expenses(
     - **payment_method**: cash, debit_card, credit_card
     - **min_amount**: Monto mínimo
     - **max_amount**: Monto máximo
+    
+    **sort** (date, amount, category), **order** (asc, desc), **limit** y
+    **offset** se resuelven en el repositorio: con límite solo se leen esos gastos.
+    
+    **total** es la cantidad de gastos que cumplen los filtros, no solo los
+    de la página: al paginar se cuenta aparte sin traer filas. Con
+    **count=estimated** un resultado grande puede salir de las estadísticas
+    del planner (PostgreSQL); **exact** indica si total es exacto.
+    
+    Con **fields** (ej: `amount,category,date`) solo se leen y devuelven esos
+    campos: la respuesta es más chica y se arma sin crear entidades.
+
+    Es síncrona a propósito: FastAPI la corre en el threadpool y así las
+    peticiones iguales concurrentes pueden compartir la lectura (single flight)
     """
+    projection = _parse_fields(fields)
     try:
-        # Si hay filtros, usar caso de uso de filtrado
-        if any([category, payment_method, min_amount, max_amount]):
+        filters = None
+        if any([category, payment_method, min_amount, max_amount, sort, limit, offset]):
             filters = ExpenseFilterDTO(
                 category=category,
                 payment_method=payment_method,
                 min_amount=min_amount,
-                max_amount=max_amount
+                max_amount=max_amount,
+                sort=sort,
+                descending=order == "desc",
+                limit=limit,
+                offset=offset
             )
+
+        if projection is not None:
+            if filters is not None:
+                rows = use_case_filtered.execute_projected(filters, projection)
+            else:
+                rows = use_case_all.execute_projected(projection)
+            total = _page_total(use_case_filtered, filters, len(rows), count == "estimated")
+            return JSONResponse(content={
+                "expenses": rows, "total": total.value, "exact": total.exact, "limit": limit, "offset": offset
+            })
+
+        # Si hay filtros, usar caso de uso de filtrado
+        if filters is not None:
             expenses = use_case_filtered.execute(filters)
         else:
             # Si no hay filtros, obtener todos
             expenses = use_case_all.execute()
         
         # Convertir entidades a schemas
-        expense_responses = [
-            ExpenseResponseSchema(
-                id=expense.id,
-                amount=expense.amount,
-                category=expense.category,
-                payment_method=expense.payment_method.value,
-                date=expense.date,
-                description=expense.description,
-                formatted_amount=expense.get_formatted_amount()
-            )
-            for expense in expenses
-        ]
+        expense_responses = [_expense_response(expense) for expense in expenses]
+        total = _page_total(use_case_filtered, filters, len(expense_responses), count == "estimated")
         
         return ExpenseListResponseSchema(
             expenses=expense_responses,
-            total=len(expense_responses)
+            total=total.value,
+            exact=total.exact,
+            limit=limit,
+            offset=offset
         )
     
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -203,6 +374,7 @@ async def list_expenses(
 
 @router.put(
     "/{expense_id}",
+    dependencies=[Depends(admission(LIGHT))],
     response_model=ExpenseResponseSchema,
     summary="Actualizar un gasto",
     responses={
@@ -223,19 +395,22 @@ async def update_expense(
             amount=expense_data.amount,
             category=expense_data.category,
             payment_method=expense_data.payment_method,
-            description=expense_data.description
+            description=expense_data.description,
+            currency=expense_data.currency
         )
         
-        expense = use_case.execute(dto)
+        expense, budget_status = use_case.execute_with_budget(dto)
         
         return ExpenseResponseSchema(
             id=expense.id,
             amount=expense.amount,
+            currency=expense.currency,
             category=expense.category,
             payment_method=expense.payment_method.value,
             date=expense.date,
             description=expense.description,
-            formatted_amount=expense.get_formatted_amount()
+            formatted_amount=expense.get_formatted_amount(),
+            budget=BudgetStatusSchema.from_status(budget_status)
         )
     
     except ExpenseNotFoundError as e:
@@ -252,10 +427,12 @@ async def update_expense(
 
 @router.delete(
     "/{expense_id}",
+    dependencies=[Depends(admission(LIGHT))],
     status_code=status.HTTP_204_NO_CONTENT,
     summary="Eliminar un gasto",
     responses={
         204: {"description": "Gasto eliminado exitosamente"},
+        400: {"model": ErrorResponseSchema, "description": "Sin tipo de cambio para la moneda del gasto"},
         404: {"model": ErrorResponseSchema, "description": "Gasto no encontrado"}
     }
 )
@@ -264,7 +441,13 @@ async def delete_expense(
     use_case: Annotated[DeleteExpenseUseCase, Depends(get_delete_expense_use_case)]
 ):
     """Elimina un gasto por ID."""
-    result = use_case.execute(expense_id)
+    try:
+        result = use_case.execute(expense_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
     if not result:
         raise HTTPException(
@@ -281,15 +464,19 @@ dashboard_router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
 @dashboard_router.get(
     "/",
+    dependencies=[Depends(admission(HEAVY))],
     response_model=DashboardResponseSchema,
     summary="Obtener datos del dashboard",
     responses={
-        200: {"description": "Datos del dashboard"}
+        200: {"description": "Datos del dashboard"},
+        400: {"model": ErrorResponseSchema, "description": "Moneda inválida o sin tipo de cambio"}
     }
 )
-async def get_dashboard(
+def get_dashboard(
     days: int = Query(30, description="Número de días a considerar", ge=1, le=365),
-    use_case: Annotated[GetDashboardDataUseCase, Depends(get_get_dashboard_data_use_case)] = None
+    refresh: bool = Query(False, description="Recalcular antes de responder"),
+    currency: Optional[str] = Query(None, description="Moneda de los montos agregados (por defecto: la base)"),
+    use_case: Annotated[GetDashboardSnapshotUseCase, Depends(get_get_dashboard_snapshot_use_case)] = None
 ):
     """
     Obtiene todos los datos para el dashboard.
@@ -300,13 +487,94 @@ async def get_dashboard(
     - Totales por método de pago
     - Tendencias de gasto
     - Gastos recientes
+    
+    Las ventanas de 7, 30, 90 y 365 días se sirven desde snapshots que se
+    recalculan en segundo plano después de las escrituras. **snapshot** indica
+    cuándo se calculó y si hay escrituras posteriores (stale).
+    Los cálculos en vivo iguales y concurrentes se hacen una sola vez.
+    
+    Los gastos en otras monedas se convierten a **currency** con la tasa
+    vigente en su fecha; los snapshots están en la moneda base y las demás
+    monedas se calculan en vivo.
     """
     try:
-        dashboard_data = use_case.execute(days=days)
+        dashboard_data = use_case.execute(days=days, refresh=refresh, currency=currency)
         return dashboard_data
     
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error al obtener datos del dashboard: {str(e)}"
-        )
\ No newline at end of file
+        )
+
+
+@dashboard_router.get(
+    "/timeseries",
+    dependencies=[Depends(admission(HEAVY))],
+    response_model=TimeSeriesResponseSchema,
+    summary="Serie temporal de gastos",
+    responses={
+        200: {"description": "Totales por bucket con promedios móviles"},
+        400: {"model": ErrorResponseSchema, "description": "Parámetros inválidos"}
+    }
+)
+def get_time_series(
+    granularity: str = Query("day", description="day, week o month"),
+    from_date: Optional[datetime] = Query(None, alias="from", description="Fecha inicial"),
+    to_date: Optional[datetime] = Query(None, alias="to", description="Fecha final (por defecto: ahora)"),
+    category: Optional[str] = Query(None, description="Filtrar por categoría"),
+    use_case: Annotated[GetTimeSeriesUseCase, Depends(get_get_time_series_use_case)] = None
+):
+    """
+    Obtiene totales y cantidades agrupados por día, semana o mes.
+    
+    - Los buckets sin gastos aparecen con total 0
+    - **moving_avg_7** / **moving_avg_30**: promedio móvil de los últimos 7 / 30 buckets
+    """
+    try:
+        return use_case.execute(
+            granularity=granularity,
+            start_date=from_date,
+            end_date=to_date,
+            category=category
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@dashboard_router.get(
+    "/distribution",
+    dependencies=[Depends(admission(HEAVY))],
+    response_model=DistributionResponseSchema,
+    summary="Distribución de montos",
+    responses={
+        200: {"description": "Cuantiles e histogramas de montos"}
+    }
+)
+def get_amount_distribution(
+    rebuild: bool = Query(False, description="Recalcular desde la base de datos"),
+    use_case: Annotated[GetAmountDistributionUseCase, Depends(get_get_amount_distribution_use_case)] = None
+):
+    """
+    Obtiene mediana, p90 y p99 de los montos más un histograma por buckets fijos.
+    
+    - **overall**: todos los gastos
+    - **by_category** / **by_payment_method**: por grupo
+    
+    Los cuantiles son estimaciones con error relativo de ~1%.
+    """
+    try:
+        return use_case.execute(rebuild=rebuild)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error al obtener la distribución: {str(e)}"
+        )
@@ -2,12 +2,73 @@
 # PASO 4: MAIN APP
 # =============================================================================
 # app/presentation/api/main.py - ACTUALIZADO
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager, suppress
+
+from fastapi import FastAPI, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 
 from .expense_routes import router as expense_router, dashboard_router
+from .budget_routes import router as budget_router
+from .report_routes import router as report_router
+from .category_routes import router as category_router
+from .exchange_rate_routes import router as exchange_rate_router
+from .profile_routes import router as profile_router
 from ...core.config import settings
-from ...infrastructure.database.connection import init_db  # NUEVO
+from ...infrastructure.repositories.registry import get_backend
+
+def _initialize_backend() -> None:
+    """
+    Verificar la versión del esquema (sin create_all en cada arranque) y
+    precalentar el pool. El backend JSON no importa SQLAlchemy.
+    """
+    backend = get_backend(settings.repository_backend)
+    if not backend.uses_database:
+        print(f"✅ Backend '{backend.name}' listo")
+        return
+
+    from ...infrastructure.database.connection import ensure_schema, warm_up_pool
+    version = ensure_schema()
+    print(f"✅ Base de datos inicializada (esquema v{version})")
+    if settings.db_pool_warmup > 0:
+        opened = warm_up_pool()
+        print(f"✅ Pool precalentado con {opened} conexiones")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Ciclo de vida de la app
+    Al arrancar: suscribir los stores al bus de eventos antes de la primera
+    escritura, inicializar el backend y lanzar la tarea de snapshots del dashboard.
+    Al cerrar: detener la tarea, cerrar los procesos de reportes y guardar
+    los sketches de distribución.
+    """
+    from ...infrastructure.analytics.distribution_store import get_distribution_store
+    get_distribution_store().load()
+    from ...infrastructure.repositories.category_cache import get_category_cache
+    get_category_cache()
+    _initialize_backend()
+
+    snapshot_task = None
+    if settings.dashboard_snapshots_enabled:
+        from ...infrastructure.analytics.dashboard_snapshots import get_dashboard_snapshot_store
+        snapshot_task = asyncio.create_task(get_dashboard_snapshot_store().run())
+
+    yield
+
+    if snapshot_task is not None:
+        snapshot_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await snapshot_task
+
+    from ...infrastructure.reports.report_jobs import shutdown_report_job_manager
+    shutdown_report_job_manager()
+
+    store = get_distribution_store()
+    if store.is_ready:
+        store.save()
+
 
 # Crear aplicación FastAPI
 app = FastAPI(
@@ -15,16 +76,10 @@ app = FastAPI(
     version=settings.app_version,
     description="API REST para control de gastos personales con PostgreSQL",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
-# NUEVO: Inicializar BD al arrancar
-@app.on_event("startup")
-async def startup_event():
-    """Evento de inicio: crear tablas si no existen"""
-    init_db()
-    print("✅ Base de datos PostgreSQL inicializada")
-
 # Configurar CORS
 app.add_middleware(
     CORSMiddleware,
@@ -35,9 +90,19 @@ app.add_middleware(
     
 )
 
+# Profiling por petición: sin token ni muestreo configurados no se instala
+if settings.is_profiling_enabled():
+    from .profiling import ProfilingMiddleware
+    app.add_middleware(ProfilingMiddleware)
+
 # Incluir routers
 app.include_router(expense_router)
 app.include_router(dashboard_router)
+app.include_router(budget_router)
+app.include_router(report_router)
+app.include_router(category_router)
+app.include_router(exchange_rate_router)
+app.include_router(profile_router)
 
 
 @app.get("/", tags=["health"])
@@ -47,11 +112,49 @@ async def root():
         "app": settings.app_name,
         "version": settings.app_version,
         "status": "running",
-        "database": "PostgreSQL",
+        "database": settings.repository_backend,
         "docs": "/docs"
     }
 
 
+
+@app.get("/ready", tags=["health"])
+def readiness(response: Response):
+    """
+    Readiness check: verifica la BD y reporta el estado del pool
+    (y las estadísticas de la caché de lecturas, del single flight y del
+    control de admisión si están activados)
+    Responde 503 si la base de datos no está disponible
+
+    Es síncrona a propósito: con el pool saturado check_database espera una
+    conexión hasta pool_timeout, y eso no debe frenar el event loop
+    """
+    backend = get_backend(settings.repository_backend)
+    if backend.uses_database:
+        from ...infrastructure.database.connection import check_database
+        result = check_database()
+    else:
+        try:
+            backend.create()
+            result = {"ready": True, "error": None}
+        except Exception as e:
+            result = {"ready": False, "error": str(e)}
+    result["backend"] = backend.name
+    if settings.is_repository_cache_enabled(backend.name):
+        from ...infrastructure.repositories.cached_expense_repository import get_expense_cache
+        result["cache"] = get_expense_cache().stats()
+    if settings.single_flight_enabled:
+        from ...application.single_flight import get_single_flight
+        result["single_flight"] = get_single_flight().stats()
+    if settings.admission_control_enabled:
+        from .admission import get_admission_controller
+        result["admission"] = get_admission_controller().stats()
+
+    if not result["ready"]:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return result
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -0,0 +1,54 @@
+# app/presentation/api/profile_routes.py
+from typing import List
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+
+from ..schemas.expense_schemas import ErrorResponseSchema
+from ..schemas.profile_schemas import ProfileCaptureSchema
+from .profiling import require_profiling_token
+from ...infrastructure.profiling.request_profiles import get_request_profiler
+
+
+router = APIRouter(
+    prefix="/profiles",
+    tags=["profiling"],
+    dependencies=[Depends(require_profiling_token)],
+    responses={403: {"model": ErrorResponseSchema, "description": "Falta el token de administración"}}
+)
+
+_MEDIA_TYPES = {".collapsed": "text/plain", ".prof": "application/octet-stream"}
+
+
+@router.get(
+    "/",
+    response_model=List[ProfileCaptureSchema],
+    summary="Capturas de profiling guardadas"
+)
+def list_profiles():
+    """
+    Capturas del directorio anillo, de la más nueva a la más vieja.
+
+    Una petición se perfila si trae el header **X-Profile-Token** o si la
+    elige el muestreo (`PROFILING_SAMPLE_RATE`).
+    """
+    return get_request_profiler().store.list()
+
+
+@router.get(
+    "/{profile_id}/download",
+    summary="Descargar una captura",
+    responses={
+        200: {"description": "Pilas colapsadas (flamegraph.pl / speedscope) o .prof (pstats / snakeviz)"},
+        404: {"model": ErrorResponseSchema, "description": "Captura no encontrada (o ya rotada)"}
+    }
+)
+def download_profile(profile_id: str):
+    """Descarga el artefacto de la captura."""
+    path = get_request_profiler().store.artifact_path(profile_id)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Captura {profile_id} no encontrada"
+        )
+    return FileResponse(path, media_type=_MEDIA_TYPES[path.suffix], filename=path.name)
@@ -0,0 +1,96 @@
+# app/presentation/api/profiling.py
+import asyncio
+import hmac
+import random
+import time
+from typing import Callable, Optional
+from urllib.parse import parse_qsl
+
+from fastapi import Header, HTTPException, status
+
+from ...core.config import settings
+from ...infrastructure.profiling.request_profiles import RequestProfiler, get_request_profiler
+
+PROFILE_HEADER = b"x-profile-token"
+
+
+def _token_matches(token: Optional[str]) -> bool:
+    expected = settings.profiling_admin_token
+    return bool(expected) and token is not None and hmac.compare_digest(token, expected)
+
+
+class ProfilingMiddleware:
+    """
+    Middleware ASGI: perfila las peticiones con el header X-Profile-Token
+    válido o elegidas por muestreo y guarda la captura con ruta y parámetros
+
+    Solo se instala si settings.is_profiling_enabled(): apagado no agrega
+    nada al camino de las peticiones. La captura se guarda en un hilo,
+    después de enviar la respuesta.
+    """
+
+    def __init__(self, app, profiler: Optional[RequestProfiler] = None,
+                 sample_rate: Optional[float] = None, chance: Callable[[], float] = random.random):
+        self.app = app
+        self._profiler = profiler
+        self.sample_rate = settings.profiling_sample_rate if sample_rate is None else sample_rate
+        self._chance = chance
+
+    @property
+    def profiler(self) -> RequestProfiler:
+        if self._profiler is None:
+            self._profiler = get_request_profiler()
+        return self._profiler
+
+    def _trigger(self, scope) -> Optional[str]:
+        for name, value in scope.get("headers", ()):
+            if name == PROFILE_HEADER:
+                return "header" if _token_matches(value.decode("latin-1")) else None
+        if self.sample_rate > 0 and self._chance() < self.sample_rate:
+            return "sample"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        trigger = self._trigger(scope) if scope["type"] == "http" else None
+        profiler = self.profiler.begin() if trigger else None
+        if profiler is None:
+            await self.app(scope, receive, send)
+            return
+
+        response = {"status": None}
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self.profiler.end(profiler)
+            duration = time.perf_counter() - started
+            route = scope.get("route")
+            endpoint = scope.get("endpoint")
+            metadata = {
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": getattr(route, "path", None),
+                "endpoint": getattr(endpoint, "__name__", None),
+                "query": dict(parse_qsl(scope.get("query_string", b"").decode("latin-1"))),
+                "path_params": {k: str(v) for k, v in scope.get("path_params", {}).items()},
+                "status": response["status"],
+                "duration_ms": round(duration * 1000, 3),
+                "trigger": trigger,
+            }
+            await asyncio.to_thread(self.profiler.save, profiler, metadata)
+
+
+def require_profiling_token(x_profile_token: Optional[str] = Header(None)) -> None:
+    """Dependency: las capturas solo se listan y descargan con el token de admin"""
+    if not _token_matches(x_profile_token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Se requiere el header X-Profile-Token de administración"
+        )
@@ -0,0 +1,102 @@
+# app/presentation/api/report_routes.py
+from typing import Annotated
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+
+from ..schemas.report_schemas import ReportRequestSchema, ReportJobSchema
+from ..schemas.expense_schemas import ErrorResponseSchema
+from .admission import LIGHT, admission
+from .dependencies import get_request_report_use_case, get_get_report_use_case
+from ...application.use_cases.request_report import RequestReportUseCase
+from ...application.use_cases.get_report import GetReportUseCase, ReportNotFoundError, ReportNotReadyError
+
+
+router = APIRouter(prefix="/reports", tags=["reports"])
+
+_MEDIA_TYPES = {"json": "application/json", "csv": "text/csv"}
+
+
+@router.post(
+    "/",
+    dependencies=[Depends(admission(LIGHT))],
+    response_model=ReportJobSchema,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Pedir un resumen mensual o anual",
+    responses={
+        202: {"description": "Reporte encolado"},
+        400: {"model": ErrorResponseSchema, "description": "Parámetros inválidos"}
+    }
+)
+async def request_report(
+    report_data: ReportRequestSchema,
+    use_case: Annotated[RequestReportUseCase, Depends(get_request_report_use_case)]
+):
+    """
+    Encola un resumen con totales por categoría y método de pago,
+    principales comercios (por descripción) y, en los anuales, totales por mes.
+
+    El cálculo corre en un proceso aparte; consultar **GET /reports/{id}**
+    hasta que `status` sea `done` y descargar el archivo.
+    """
+    try:
+        return use_case.execute(report_data.kind, report_data.period, report_data.format)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+@router.get(
+    "/{job_id}",
+    dependencies=[Depends(admission(LIGHT))],
+    response_model=ReportJobSchema,
+    summary="Estado de un reporte",
+    responses={
+        200: {"description": "Estado y avance"},
+        404: {"model": ErrorResponseSchema, "description": "Reporte no encontrado"}
+    }
+)
+async def get_report(
+    job_id: str,
+    use_case: Annotated[GetReportUseCase, Depends(get_get_report_use_case)]
+):
+    """Devuelve el estado (queued, running, done, failed), la etapa y el avance."""
+    try:
+        return use_case.execute(job_id)
+    except ReportNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+
+
+@router.get(
+    "/{job_id}/download",
+    dependencies=[Depends(admission(LIGHT))],
+    summary="Descargar el archivo de un reporte",
+    responses={
+        200: {"description": "Archivo JSON o CSV"},
+        404: {"model": ErrorResponseSchema, "description": "Reporte no encontrado"},
+        409: {"model": ErrorResponseSchema, "description": "El reporte no está listo"}
+    }
+)
+async def download_report(
+    job_id: str,
+    use_case: Annotated[GetReportUseCase, Depends(get_get_report_use_case)]
+):
+    """Descarga el archivo generado (o el que ya existía para los mismos datos)."""
+    try:
+        path = use_case.artifact(job_id)
+    except ReportNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except ReportNotReadyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    format = path.suffix.lstrip(".")
+    return FileResponse(path, media_type=_MEDIA_TYPES[format], filename=path.name)
@@ -0,0 +1,126 @@
+# app/presentation/api/test_admission.py
+import asyncio
+import pytest
+
+from app.presentation.api.admission import (
+    AdmissionController,
+    AdmissionRejected,
+    ConcurrencyLimiter,
+    HEAVY,
+    LIGHT
+)
+
+
+class TestConcurrencyLimiter:
+    """Tests del límite de concurrencia con cola acotada"""
+
+    def test_queue_full_is_rejected_immediately(self):
+        """Test: Sin lugar ni cola se rechaza sin esperar"""
+        async def scenario():
+            limiter = ConcurrencyLimiter("heavy", max_concurrent=1, max_queue=1, queue_timeout=5)
+            await limiter.acquire()
+            queued = asyncio.create_task(limiter.acquire())
+            await asyncio.sleep(0)
+            with pytest.raises(AdmissionRejected) as rejected:
+                await limiter.acquire()
+            limiter.release(0.5)
+            await queued
+            return limiter.stats(), rejected.value
+
+        # Act
+        stats, rejected = asyncio.run(scenario())
+
+        # Assert
+        assert rejected.reason == "cola llena" and rejected.retry_after >= 1
+        assert stats["active"] == 1 and stats["waiting"] == 0
+        assert (stats["admitted"], stats["queued"], stats["rejected_queue_full"]) == (2, 1, 1)
+
+    def test_queue_timeout_is_rejected(self):
+        """Test: Si nadie libera, la espera vence y no queda en la cola"""
+        async def scenario():
+            limiter = ConcurrencyLimiter("heavy", max_concurrent=1, max_queue=4, queue_timeout=0.01)
+            await limiter.acquire()
+            with pytest.raises(AdmissionRejected):
+                await limiter.acquire()
+            limiter.release()
+            return limiter.stats()
+
+        # Act
+        stats = asyncio.run(scenario())
+
+        # Assert
+        assert stats["rejected_timeout"] == 1
+        assert stats["active"] == 0 and stats["waiting"] == 0
+
+
+class TestAdmissionController:
+    """Tests de carriles y límites por ruta"""
+
+    def test_heavy_lane_does_not_block_light_lane(self):
+        """Test: Con el carril pesado lleno, las lecturas puntuales entran"""
+        async def scenario():
+            controller = AdmissionController(
+                {
+                    "heavy": ConcurrencyLimiter("heavy", 1, 0, 5),
+                    "light": ConcurrencyLimiter("light", 1, 0, 5),
+                },
+                {"get_dashboard": ConcurrencyLimiter("get_dashboard", 1, 0, 5)}
+            )
+            async with controller.admit("heavy", "list_expenses"):
+                with pytest.raises(AdmissionRejected) as rejected:
+                    async with controller.admit("heavy", "get_dashboard"):
+                        pass
+                async with controller.admit("light", "get_expense"):
+                    pass
+            return controller.stats(), rejected.value
+
+        # Act
+        stats, rejected = asyncio.run(scenario())
+
+        # Assert
+        assert rejected.limiter == "heavy"
+        # El lugar de la ruta se devolvió al rechazar el carril
+        assert stats["routes"]["get_dashboard"]["active"] == 0
+        assert stats["lanes"]["heavy"]["active"] == 0
+        assert stats["lanes"]["light"]["admitted"] == 1
+
+
+class TestHeavyRoutes:
+    """Tests de las rutas del carril heavy"""
+
+    def test_heavy_routes_run_in_threadpool(self):
+        """Test: Ninguna ruta heavy es async (su trabajo síncrono bloquearía el event loop)"""
+        import inspect
+        from fastapi.routing import APIRoute
+        from app.presentation.api.main import app
+
+        heavy = [
+            route for route in app.routes if isinstance(route, APIRoute)
+            and any(getattr(d.dependency, "lane", None) == HEAVY for d in route.dependencies)
+        ]
+
+        assert {route.endpoint.__name__ for route in heavy} >= {
+            "list_expenses", "get_dashboard", "get_time_series", "get_amount_distribution",
+            "get_largest_expenses", "rebuild_budget_totals"
+        }
+        assert [route.endpoint.__name__ for route in heavy if inspect.iscoroutinefunction(route.endpoint)] == []
+
+    def test_bounded_listing_uses_light_lane(self):
+        """Test: Listar con filtros o límite va al carril light; el listado completo, al heavy"""
+        from fastapi.routing import APIRoute
+        from starlette.requests import Request
+        from app.presentation.api.main import app
+
+        route = next(
+            route for route in app.routes
+            if isinstance(route, APIRoute) and route.endpoint.__name__ == "list_expenses"
+        )
+        dependency = next(d.dependency for d in route.dependencies if hasattr(d.dependency, "lane"))
+
+        def lane(query: bytes) -> str:
+            return dependency.lane_for(Request({"type": "http", "query_string": query, "headers": []}))
+
+        assert lane(b"") == HEAVY
+        assert lane(b"sort=amount&order=asc") == HEAVY
+        assert lane(b"category=Comida") == LIGHT
+        assert lane(b"limit=20&offset=40") == LIGHT
@@ -0,0 +1,26 @@
+# app/presentation/api/test_dependencies.py
+from fastapi.routing import APIRoute
+
+from app.presentation.api.dependencies import get_write_session
+from app.presentation.api.main import app
+
+
+def _dependencies(dependant):
+    for sub in dependant.dependencies:
+        yield sub.call
+        yield from _dependencies(sub)
+
+
+class TestWriteSessions:
+    """Tests de qué rutas abren la ventana read-your-writes"""
+
+    def test_only_mutating_routes_record_writes(self):
+        """Test: Ninguna ruta GET depende de la sesión de escritura (fijaría al cliente en el primario)"""
+        routes = [route for route in app.routes if isinstance(route, APIRoute)]
+        writers = {
+            (method, route.path) for route in routes for method in route.methods
+            if get_write_session in set(_dependencies(route.dependant))
+        }
+
+        assert ("PUT", "/exchange-rates/") in writers
+        assert [writer for writer in writers if writer[0] == "GET"] == []
@@ -0,0 +1,89 @@
+# app/presentation/api/test_profiling.py
+import pstats
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.infrastructure.profiling.request_profiles import CPROFILE, SAMPLING, ProfileStore, RequestProfiler
+from app.presentation.api import profile_routes
+from app.presentation.api.profiling import ProfilingMiddleware
+
+TOKEN = "secreto"
+
+
+def _build_app(profiler, sample_rate=0.0):
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    def get_item(item_id: int, q: str = ""):
+        time.sleep(0.03)
+        return {"item_id": item_id}
+
+    app.include_router(profile_routes.router)
+    app.add_middleware(ProfilingMiddleware, profiler=profiler, sample_rate=sample_rate, chance=lambda: 0.5)
+    return app
+
+
+@pytest.fixture
+def profiler(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "profiling_admin_token", TOKEN)
+    profiler = RequestProfiler(ProfileStore(str(tmp_path / "profiles"), max_files=2), SAMPLING, interval=0.001)
+    monkeypatch.setattr(profile_routes, "get_request_profiler", lambda: profiler)
+    return profiler
+
+
+class TestRequestProfiling:
+    """Tests del profiling por petición"""
+
+    def test_header_captures_route_and_params(self, profiler):
+        """Test: Con el token se guarda la captura con ruta, parámetros y pilas de la ruta sync"""
+        client = TestClient(_build_app(profiler))
+
+        assert client.get("/items/7?q=x").status_code == 200
+        assert client.get("/items/8", headers={"X-Profile-Token": "otro"}).status_code == 200
+        assert client.get("/items/9?q=y", headers={"X-Profile-Token": TOKEN}).status_code == 200
+
+        [capture] = profiler.store.list()
+        assert capture["route"] == "/items/{item_id}" and capture["endpoint"] == "get_item"
+        assert (capture["path_params"], capture["query"]) == ({"item_id": "9"}, {"q": "y"})
+        assert (capture["status"], capture["trigger"], capture["mode"]) == (200, "header", SAMPLING)
+        assert capture["duration_ms"] >= 30
+        stacks = profiler.store.artifact_path(capture["id"]).read_text()
+        assert "test_profiling.py:get_item" in stacks
+
+    def test_sampling_and_ring_directory(self, profiler):
+        """Test: El muestreo elige peticiones y el anillo conserva solo las últimas"""
+        client = TestClient(_build_app(profiler, sample_rate=0.6))
+
+        for item_id in range(4):
+            client.get(f"/items/{item_id}")
+
+        captures = profiler.store.list()
+        assert [c["path_params"]["item_id"] for c in captures] == ["3", "2"]
+        assert {c["trigger"] for c in captures} == {"sample"}
+        assert len(list(profiler.store.directory.iterdir())) == 4
+
+    def test_cprofile_mode_writes_pstats(self, profiler, tmp_path):
+        """Test: El modo cprofile guarda un .prof legible por pstats"""
+        profiler = RequestProfiler(ProfileStore(str(tmp_path / "prof")), CPROFILE)
+        client = TestClient(_build_app(profiler))
+
+        client.get("/items/1", headers={"X-Profile-Token": TOKEN})
+
+        [capture] = profiler.store.list()
+        assert capture["artifact"].endswith(".prof")
+        assert pstats.Stats(str(profiler.store.artifact_path(capture["id"]))).total_calls > 0
+
+    def test_endpoints_require_token(self, profiler):
+        """Test: Listar y descargar capturas requiere el token"""
+        client = TestClient(_build_app(profiler))
+        client.get("/items/1", headers={"X-Profile-Token": TOKEN})
+
+        assert client.get("/profiles/").status_code == 403
+        listed = client.get("/profiles/", headers={"X-Profile-Token": TOKEN}).json()
+        download = client.get(f"/profiles/{listed[0]['id']}/download", headers={"X-Profile-Token": TOKEN})
+        assert download.status_code == 200 and "get_item" in download.text
+        assert client.get("/profiles/nada/download", headers={"X-Profile-Token": TOKEN}).status_code == 404
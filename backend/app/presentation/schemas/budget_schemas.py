@@ -0,0 +1,62 @@
+# app/presentation/schemas/budget_schemas.py
+from pydantic import BaseModel, Field
+from typing import Optional
+
+
+class BudgetSetSchema(BaseModel):
+    """Schema para crear o reemplazar el presupuesto de una categoría"""
+    monthly_limit: float = Field(..., gt=0, description="Límite mensual (debe ser mayor a 0)")
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [{"monthly_limit": 300.00}]
+        }
+    }
+
+
+class BudgetResponseSchema(BaseModel):
+    """Schema para responder con un presupuesto"""
+    category: str
+    monthly_limit: float
+
+
+class BudgetStatusSchema(BaseModel):
+    """Cuánto se usó del presupuesto de una categoría en el mes"""
+    category: str
+    month: str
+    monthly_limit: float
+    spent: float
+    remaining: float
+    percent_used: float
+    exceeded: bool
+    message: Optional[str] = None
+
+    @classmethod
+    def from_status(cls, status) -> Optional["BudgetStatusSchema"]:
+        """Convierte un BudgetStatus del dominio (None si no hay presupuesto)"""
+        if status is None:
+            return None
+        return cls(
+            category=status.category,
+            month=status.month,
+            monthly_limit=status.monthly_limit,
+            spent=status.spent,
+            remaining=status.remaining,
+            percent_used=status.percent_used,
+            exceeded=status.exceeded,
+            message=status.message()
+        )
+
+
+class BudgetStatusResponseSchema(BaseModel):
+    """Schema para el estado de los presupuestos de un mes"""
+    month: str
+    budgets: list[BudgetStatusSchema]
+    exceeded: list[str]
+    total_spent: float
+
+
+class BudgetRebuildResponseSchema(BaseModel):
+    """Schema para el resultado de reconstruir los totales"""
+    counters: int
+    expenses: int
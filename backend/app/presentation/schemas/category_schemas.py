@@ -0,0 +1,16 @@
+# app/presentation/schemas/category_schemas.py
+from pydantic import BaseModel
+from typing import Optional
+
+
+class CategorySchema(BaseModel):
+    """Una categoría con su cantidad de gastos"""
+    id: Optional[int]  # None con el backend JSON (no hay tabla de categorías)
+    name: str
+    count: int
+
+
+class CategoryListResponseSchema(BaseModel):
+    """Schema para la lista de categorías"""
+    categories: list[CategorySchema]
+    total: int
@@ -0,0 +1,40 @@
+# app/presentation/schemas/exchange_rate_schemas.py
+from datetime import date
+from pydantic import BaseModel, Field
+
+
+class ExchangeRateSchema(BaseModel):
+    """Valor de 1 unidad de la moneda en la moneda base, vigente desde la fecha"""
+    date: date
+    currency: str = Field(..., min_length=3, max_length=3, description="Moneda ISO 4217")
+    rate: float = Field(..., gt=0, description="Valor en la moneda base")
+
+
+class ExchangeRatesUpdateSchema(BaseModel):
+    """Schema para cargar tipos de cambio (crea o reemplaza por moneda y fecha)"""
+    rates: list[ExchangeRateSchema] = Field(..., min_length=1)
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "rates": [
+                        {"date": "2024-01-01", "currency": "EUR", "rate": 1.09},
+                        {"date": "2024-01-01", "currency": "ARS", "rate": 0.0012}
+                    ]
+                }
+            ]
+        }
+    }
+
+
+class ExchangeRateListResponseSchema(BaseModel):
+    """Schema para la lista de tipos de cambio"""
+    base_currency: str
+    rates: list[ExchangeRateSchema]
+    total: int
+
+
+class ExchangeRatesSavedSchema(BaseModel):
+    """Resultado de la carga"""
+    saved: int
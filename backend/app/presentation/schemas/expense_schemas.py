@@ -7,6 +7,8 @@ from pydantic import BaseModel, Field, field_validator
 from typing import Optional
 from datetime import datetime
 
+from .budget_schemas import BudgetStatusSchema
+
 
 class ExpenseCreateSchema(BaseModel):
     """
@@ -18,6 +20,7 @@ class ExpenseCreateSchema(BaseModel):
     payment_method: str = Field(..., description="Método de pago: cash, debit_card, credit_card")
     description: Optional[str] = Field(None, max_length=500, description="Descripción opcional")
     date: Optional[datetime] = Field(None, description="Fecha del gasto (por defecto: ahora)")
+    currency: Optional[str] = Field(None, min_length=3, max_length=3, description="Moneda ISO 4217 (por defecto: USD)")
     
     @field_validator('payment_method')
     @classmethod
@@ -44,7 +47,8 @@ class ExpenseCreateSchema(BaseModel):
                     "category": "Comida",
                     "payment_method": "cash",
                     "description": "Almuerzo en restaurante",
-                    "date": "2024-01-15T12:30:00"
+                    "date": "2024-01-15T12:30:00",
+                    "currency": "USD"
                 }
             ]
         }
@@ -57,6 +61,7 @@ class ExpenseUpdateSchema(BaseModel):
     category: Optional[str] = Field(None, min_length=1, max_length=100)
     payment_method: Optional[str] = Field(None)
     description: Optional[str] = Field(None, max_length=500)
+    currency: Optional[str] = Field(None, min_length=3, max_length=3)
     
     @field_validator('payment_method')
     @classmethod
@@ -72,11 +77,13 @@ class ExpenseResponseSchema(BaseModel):
     """Schema para responder con un gasto"""
     id: int
     amount: float
+    currency: str = "USD"
     category: str
     payment_method: str
     date: datetime
     description: Optional[str]
     formatted_amount: str
+    budget: Optional[BudgetStatusSchema] = None  # Solo en crear/actualizar, si la categoría tiene presupuesto
     
     model_config = {
         "from_attributes": True,
@@ -85,6 +92,7 @@ class ExpenseResponseSchema(BaseModel):
                 {
                     "id": 1,
                     "amount": 25.50,
+                    "currency": "USD",
                     "category": "Comida",
                     "payment_method": "cash",
                     "date": "2024-01-15T12:30:00",
@@ -99,28 +107,70 @@ class ExpenseResponseSchema(BaseModel):
 class ExpenseListResponseSchema(BaseModel):
     """Schema para lista de gastos"""
     expenses: list[ExpenseResponseSchema]
-    total: int
+    total: int = Field(..., description="Gastos que cumplen los filtros (todas las páginas)")
+    exact: bool = Field(True, description="False si total es una estimación del planner")
+    limit: Optional[int] = None
+    offset: int = 0
     
     model_config = {
         "json_schema_extra": {
             "examples": [
                 {
                     "expenses": [],
-                    "total": 0
+                    "total": 0,
+                    "exact": True,
+                    "limit": None,
+                    "offset": 0
                 }
             ]
         }
     }
 
 
+class LargestExpensesResponseSchema(BaseModel):
+    """Schema para los mayores gastos de un período"""
+    start_date: datetime
+    end_date: datetime
+    category: Optional[str]
+    expenses: list[ExpenseResponseSchema]
+    total: int
+
+
 class DashboardResponseSchema(BaseModel):
     """Schema para respuesta del dashboard"""
+    currency: str = "USD"  # Moneda de todos los montos agregados
     period_info: dict
     summary: dict
     by_category: dict
     by_payment_method: dict
     trend: dict
     recent_expenses: list[dict]
+    snapshot: Optional[dict] = None  # source, computed_at, age_seconds, stale
+
+
+class TimeSeriesPointSchema(BaseModel):
+    """Un bucket de la serie temporal"""
+    bucket: datetime
+    total: float
+    count: int
+    moving_avg_7: float
+    moving_avg_30: float
+
+
+class TimeSeriesResponseSchema(BaseModel):
+    """Schema para la serie temporal de gastos"""
+    granularity: str
+    start_date: datetime
+    end_date: datetime
+    category: Optional[str]
+    points: list[TimeSeriesPointSchema]
+
+
+class DistributionResponseSchema(BaseModel):
+    """Schema para la distribución de montos (cuantiles e histogramas)"""
+    overall: dict
+    by_category: dict
+    by_payment_method: dict
 
 
 class ErrorResponseSchema(BaseModel):
@@ -0,0 +1,22 @@
+# app/presentation/schemas/profile_schemas.py
+from typing import Dict, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ProfileCaptureSchema(BaseModel):
+    """Una captura de profiling (metadatos; el artefacto se descarga aparte)"""
+    id: str
+    created_at: str
+    method: str
+    path: str
+    route: Optional[str] = Field(None, description="Plantilla de la ruta (ej: /expenses/{expense_id})")
+    endpoint: Optional[str] = None
+    query: Dict[str, str] = Field(default_factory=dict)
+    path_params: Dict[str, str] = Field(default_factory=dict)
+    status: Optional[int] = Field(None, description="Código HTTP (None si la petición falló antes de responder)")
+    duration_ms: float
+    trigger: str = Field(..., description="header o sample")
+    mode: str = Field(..., description="sampling (.collapsed) o cprofile (.prof)")
+    samples: Optional[int] = Field(None, description="Muestras tomadas (modo sampling)")
+    artifact: str
@@ -0,0 +1,36 @@
+# app/presentation/schemas/report_schemas.py
+from datetime import datetime
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ReportRequestSchema(BaseModel):
+    """Schema para pedir un resumen mensual o anual"""
+    kind: Literal["monthly", "yearly"] = Field(..., description="monthly o yearly")
+    period: str = Field(..., description="YYYY-MM (mensual) o YYYY (anual)")
+    format: Literal["json", "csv"] = Field("json", description="Formato del archivo")
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [{"kind": "monthly", "period": "2025-03", "format": "csv"}]
+        }
+    }
+
+
+class ReportJobSchema(BaseModel):
+    """Estado de un pedido de reporte"""
+    id: str
+    kind: str
+    period: str
+    format: str
+    status: str = Field(..., description="queued, running, done o failed")
+    stage: str = Field(..., description="queued, reading, computing o done")
+    progress: float = Field(..., description="Avance aproximado de 0 a 1")
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+    data_version: Optional[str] = Field(None, description="Hash de los datos del período")
+    cached: bool = Field(False, description="Se sirvió un archivo ya generado para los mismos datos")
+    size_bytes: Optional[int] = None
+    expense_count: Optional[int] = None
+    error: Optional[str] = None
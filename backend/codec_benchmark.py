@@ -0,0 +1,99 @@
+# backend/codec_benchmark.py
+"""
+Benchmark de los codecs del archivo de gastos (json, orjson, msgpack)
+
+Genera N gastos sintéticos y, para cada codec, mide el guardado y la carga
+completos del archivo (lo que hace el repositorio JSON en cada escritura y
+lectura), el recorrido de a un gasto (iter_all) y el tamaño en disco.
+
+Uso:
+    python codec_benchmark.py
+    python codec_benchmark.py --rows 100000 --repeat 5
+"""
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from app.domain.repositories.exceptions import RepositoryError
+from app.infrastructure.repositories.json_codecs import available_codecs
+from app.infrastructure.repositories.json_expense_repository import JsonExpenseRepository
+
+CATEGORIES = ["Comida", "Transporte", "Ocio", "Salud", "Hogar", "Educación", "Viajes", "Ropa"]
+METHODS = ["cash", "debit_card", "credit_card"]
+
+
+def build_records(rows: int, seed: int = 42) -> List[dict]:
+    """Gastos como los guarda el repositorio (fecha en ISO)"""
+    rng = random.Random(seed)
+    start = datetime(2022, 1, 1)
+    return [
+        {
+            "id": i,
+            "amount": round(rng.uniform(1, 500), 2),
+            "category": rng.choice(CATEGORIES),
+            "payment_method": rng.choice(METHODS),
+            "date": (start + timedelta(seconds=rng.randrange(3 * 365 * 86400))).isoformat(),
+            "description": rng.choice([None, "Supermercado", "Colectivo", "Farmacia", "Cine con amigos"]),
+            "currency": rng.choice(["USD", "USD", "USD", "EUR"]),
+        }
+        for i in range(1, rows + 1)
+    ]
+
+
+def best_of(repeat: int, function: Callable[[], object]) -> float:
+    """Mediana en milisegundos"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def run(rows: int, repeat: int) -> List[Dict]:
+    records = build_records(rows)
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for codec in available_codecs():
+            path = Path(directory) / f"expenses-{codec}.json"
+            try:
+                repository = JsonExpenseRepository(str(path), codec=codec)
+            except RepositoryError as e:
+                print(f"{codec}: omitido ({e})")
+                continue
+            save_ms = best_of(repeat, lambda: repository._save_to_file(records))
+            load_ms = best_of(repeat, repository._load_from_file)
+            iter_ms = best_of(repeat, lambda: sum(1 for _ in repository.iter_all()))
+            results.append({
+                "codec": codec,
+                "save_ms": save_ms,
+                "load_ms": load_ms,
+                "iter_all_ms": iter_ms,
+                "size_mb": path.stat().st_size / 1e6,
+            })
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark de los codecs del archivo de gastos")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = run(args.rows, args.repeat)
+    print(f"\n{args.rows} gastos, mediana de {args.repeat} corridas\n")
+    print(f"{'codec':<10}{'guardar':>12}{'cargar':>12}{'iter_all':>12}{'tamaño':>12}")
+    for row in results:
+        print(
+            f"{row['codec']:<10}{row['save_ms']:>10.1f}ms{row['load_ms']:>10.1f}ms"
+            f"{row['iter_all_ms']:>10.1f}ms{row['size_mb']:>10.1f}MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# backend/import_time_report.py
+"""
+Reporte de tiempo de importación (arranque en frío)
+
+Importa la app en un proceso nuevo con `python -X importtime` y muestra
+los módulos que más tardan, el total y si se cargó el stack de base de datos.
+
+Uso:
+    python import_time_report.py
+    python import_time_report.py --backend json --top 15
+    python import_time_report.py --module app.infrastructure.repositories.registry
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+from typing import List, Tuple
+
+HEAVY_PACKAGES = ("sqlalchemy", "psycopg2", "numpy")
+
+
+def measure_imports(module: str, backend: str) -> Tuple[float, List[Tuple[int, int, str]]]:
+    """
+    Importa `module` en un subproceso con -X importtime
+
+    Returns:
+        Tuple: (tiempo total en segundos, lista de (self_us, cumulative_us, módulo))
+    """
+    env = dict(os.environ)
+    if backend:
+        env["REPOSITORY_BACKEND"] = backend
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=os.path.abspath(os.path.dirname(__file__)),
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise SystemExit(f"No se pudo importar {module}:\n{result.stderr[-2000:]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(self_us), int(cumulative_us), name.rstrip()))
+    return elapsed, rows
+
+
+def print_report(module: str, backend: str, elapsed: float, rows: List[Tuple[int, int, str]], top: int) -> None:
+    top_level = [row for row in rows if not row[2].startswith("  ")]
+    total_us = sum(row[1] for row in top_level)
+
+    print(f"Módulo: {module}  (backend: {backend or 'settings'})")
+    print(f"Proceso completo: {elapsed * 1000:.0f} ms   importaciones: {total_us / 1000:.0f} ms\n")
+
+    print(f"{'acumulado ms':>13}{'propio ms':>11}  módulo")
+    for self_us, cumulative_us, name in sorted(rows, key=lambda r: r[1], reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:>13.1f}{self_us / 1000:>11.1f}  {name}")
+
+    loaded = {name.strip().split(".")[0] for _, _, name in rows}
+    print("\nPaquetes pesados cargados:")
+    for package in HEAVY_PACKAGES:
+        print(f"  {package:<12} {'sí' if package in loaded else 'no'}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Reporte de tiempo de importación de la app")
+    parser.add_argument("--module", default="app.presentation.api.main")
+    parser.add_argument("--backend", help="Valor para REPOSITORY_BACKEND (json, postgresql)")
+    parser.add_argument("--top", type=int, default=25)
+    args = parser.parse_args()
+
+    elapsed, rows = measure_imports(args.module, args.backend)
+    print_report(args.module, args.backend, elapsed, rows, args.top)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+# backend/load_test.py
+"""
+Generador de carga asíncrono para la API REST
+
+Lanza una mezcla configurable de peticiones (crear, listar, filtrar, obtener,
+actualizar, eliminar y dashboard) con niveles crecientes de concurrencia y
+reporta latencias p50/p95/p99 y throughput por endpoint.
+
+Modos de ejecución:
+    # App en el mismo proceso (sin red) con backend JSON o SQLite temporal
+    python load_test.py --backend json --concurrency 1,8,32 --requests 500
+
+    # App lanzada localmente con uvicorn (JSON o SQLite temporal)
+    python load_test.py --launch --backend sqlite --workers 2
+
+    # Servidor ya levantado
+    python load_test.py --base-url http://localhost:8000
+
+Todo lo que la app guarda en archivos (gastos, presupuestos, tipos de
+cambio, sketches, planes de consultas lentas, reportes y perfiles) se
+redirige a un directorio temporal: la prueba no toca data/.
+
+Nota: en modo en-proceso el generador y la app comparten el proceso. Las
+lecturas pesadas (listado, dashboard) son síncronas y corren en el
+threadpool, pero crear, obtener, actualizar y eliminar son async y llaman a
+repositorios síncronos desde el event loop, el mismo que usa el generador.
+Para medir la saturación real de cada worker usar --launch o --base-url.
+"""
+import argparse
+import asyncio
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import httpx
+
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+
+# Peso relativo de cada operación en la mezcla por defecto
+DEFAULT_MIX = {
+    "create": 15,
+    "list": 5,
+    "list_filtered": 20,
+    "get": 30,
+    "update": 10,
+    "delete": 5,
+    "dashboard": 15,
+}
+
+CATEGORIES = ["Comida", "Transporte", "Entretenimiento", "Salud", "Hogar", "Servicios"]
+PAYMENT_METHODS = ["cash", "debit_card", "credit_card"]
+
+
+@dataclass
+class EndpointStats:
+    """Latencias (en segundos) y errores acumulados de un endpoint"""
+    latencies: List[float] = field(default_factory=list)
+    client_errors: int = 0
+    server_errors: int = 0
+
+    def percentile(self, p: float) -> float:
+        """Percentil por rango más cercano (p entre 0 y 100)"""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        index = min(max(math.ceil(p / 100 * len(ordered)) - 1, 0), len(ordered) - 1)
+        return ordered[index]
+
+
+class LoadRunner:
+    """
+    Ejecuta la mezcla de operaciones contra un cliente HTTP
+
+    Mantiene la lista de IDs conocidos para que las operaciones de lectura,
+    actualización y borrado apunten a gastos que existen.
+    """
+
+    def __init__(self, client: httpx.AsyncClient, mix: Dict[str, int], seed: int = 42):
+        self.client = client
+        self.mix = {name: weight for name, weight in mix.items() if weight > 0}
+        self.rng = random.Random(seed)
+        self.ids: List[int] = []
+        self.stats: Dict[str, EndpointStats] = {}
+
+    def _random_payload(self) -> dict:
+        return {
+            "amount": round(self.rng.uniform(1, 500), 2),
+            "category": self.rng.choice(CATEGORIES),
+            "payment_method": self.rng.choice(PAYMENT_METHODS),
+            "description": f"Gasto de carga {self.rng.randint(1, 10_000)}",
+        }
+
+    async def _timed(self, name: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        """Ejecuta una petición y registra su latencia bajo el nombre indicado"""
+        stats = self.stats.setdefault(name, EndpointStats())
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            stats.latencies.append(time.perf_counter() - start)
+            stats.server_errors += 1
+            return None
+        stats.latencies.append(time.perf_counter() - start)
+        if response.status_code >= 500:
+            stats.server_errors += 1
+        elif response.status_code >= 400:
+            stats.client_errors += 1
+        return response
+
+    async def seed_data(self, rows: int) -> None:
+        """Crea gastos iniciales sin medirlos"""
+        for _ in range(rows):
+            response = await self.client.post("/expenses/", json=self._random_payload())
+            response.raise_for_status()
+            self.ids.append(response.json()["id"])
+
+    async def op_create(self) -> None:
+        response = await self._timed("POST /expenses/", "POST", "/expenses/", json=self._random_payload())
+        if response is not None and response.status_code == 201:
+            self.ids.append(response.json()["id"])
+
+    async def op_list(self) -> None:
+        await self._timed("GET /expenses/", "GET", "/expenses/")
+
+    async def op_list_filtered(self) -> None:
+        params = self.rng.choice([
+            {"category": self.rng.choice(CATEGORIES)},
+            {"payment_method": self.rng.choice(PAYMENT_METHODS)},
+            {"min_amount": 50, "max_amount": 250},
+        ])
+        await self._timed("GET /expenses/?filters", "GET", "/expenses/", params=params)
+
+    async def op_get(self) -> None:
+        if not self.ids:
+            return await self.op_create()
+        await self._timed("GET /expenses/{id}", "GET", f"/expenses/{self.rng.choice(self.ids)}")
+
+    async def op_update(self) -> None:
+        if not self.ids:
+            return await self.op_create()
+        body = {"amount": round(self.rng.uniform(1, 500), 2)}
+        await self._timed("PUT /expenses/{id}", "PUT", f"/expenses/{self.rng.choice(self.ids)}", json=body)
+
+    async def op_delete(self) -> None:
+        if not self.ids:
+            return await self.op_create()
+        # Se retira antes de borrar para que otros workers no lo elijan
+        expense_id = self.ids.pop(self.rng.randrange(len(self.ids)))
+        await self._timed("DELETE /expenses/{id}", "DELETE", f"/expenses/{expense_id}")
+
+    async def op_dashboard(self) -> None:
+        days = self.rng.choice([7, 30, 90])
+        await self._timed("GET /dashboard/", "GET", "/dashboard/", params={"days": days})
+
+    async def run_level(self, concurrency: int, total_requests: int) -> float:
+        """
+        Ejecuta total_requests operaciones con `concurrency` workers
+
+        Returns:
+            float: Tiempo total transcurrido en segundos
+        """
+        self.stats = {}
+        names = list(self.mix)
+        weights = [self.mix[name] for name in names]
+        remaining = total_requests
+
+        async def worker() -> None:
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                operation = self.rng.choices(names, weights)[0]
+                await getattr(self, f"op_{operation}")()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return time.perf_counter() - start
+
+
+def print_report(concurrency: int, elapsed: float, stats: Dict[str, EndpointStats]) -> None:
+    """Imprime la tabla de resultados de un nivel de concurrencia"""
+    total = sum(len(s.latencies) for s in stats.values())
+    print(f"\n=== Concurrencia {concurrency}: {total} peticiones en {elapsed:.2f}s "
+          f"({total / elapsed:.1f} req/s) ===")
+    print(f"{'endpoint':<26}{'n':>7}{'4xx':>6}{'5xx':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}")
+    for name in sorted(stats):
+        s = stats[name]
+        print(
+            f"{name:<26}{len(s.latencies):>7}{s.client_errors:>6}{s.server_errors:>6}"
+            f"{s.percentile(50) * 1000:>10.2f}{s.percentile(95) * 1000:>10.2f}"
+            f"{s.percentile(99) * 1000:>10.2f}{len(s.latencies) / elapsed:>10.1f}"
+        )
+
+
+def backend_environment(backend: str, workdir: str) -> Dict[str, str]:
+    """Variables de entorno que apuntan todo el almacenamiento de la app a workdir"""
+    environment = {
+        "BUDGETS_FILE_PATH": os.path.join(workdir, "budgets.json"),
+        "EXCHANGE_RATES_FILE_PATH": os.path.join(workdir, "exchange_rates.json"),
+        "DISTRIBUTION_STATE_PATH": os.path.join(workdir, "distribution_state.json"),
+        "SLOW_QUERY_PLANS_PATH": os.path.join(workdir, "slow_query_plans.jsonl"),
+        "REPORTS_DIR": os.path.join(workdir, "reports"),
+        "PROFILES_DIR": os.path.join(workdir, "profiles"),
+    }
+    if backend == "json":
+        environment.update({
+            "REPOSITORY_BACKEND": "json",
+            "DATA_FILE_PATH": os.path.join(workdir, "expenses.json"),
+        })
+    else:
+        environment.update({
+            "REPOSITORY_BACKEND": "postgresql",
+            "DATABASE_URL": f"sqlite:///{os.path.join(workdir, 'expenses.db')}",
+        })
+    return environment
+
+
+def build_inprocess_app(backend: str, workdir: str):
+    """
+    Construye la app FastAPI en el mismo proceso apuntando a un almacenamiento temporal
+    """
+    from app.core.config import settings
+
+    for name, value in backend_environment(backend, workdir).items():
+        setattr(settings, name.lower(), value)
+    settings.debug = False
+
+    from app.presentation.api.main import app
+    if backend == "sqlite":
+        from app.infrastructure.database.connection import ensure_schema
+        ensure_schema()
+    return app
+
+
+def launch_server(backend: str, workdir: str, port: int, workers: int) -> subprocess.Popen:
+    """Levanta uvicorn en un subproceso con el almacenamiento temporal"""
+    env = dict(os.environ)
+    env.update(backend_environment(backend, workdir))
+    env["DEBUG"] = "False"
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.presentation.api.main:app",
+            "--port", str(port), "--workers", str(workers), "--log-level", "warning",
+        ],
+        cwd=os.path.abspath(os.path.dirname(__file__)),
+        env=env,
+    )
+
+
+async def wait_until_ready(base_url: str, timeout: float = 30.0) -> None:
+    """Espera a que el health check responda"""
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise SystemExit(f"El servidor en {base_url} no respondió a tiempo")
+
+
+def parse_mix(value: Optional[str]) -> Dict[str, int]:
+    """Convierte 'create=10,get=50' en un diccionario de pesos"""
+    if not value:
+        return dict(DEFAULT_MIX)
+    mix = {name: 0 for name in DEFAULT_MIX}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in mix:
+            raise SystemExit(f"Operación desconocida en --mix: {name}")
+        mix[name.strip()] = int(weight)
+    return mix
+
+
+async def run(args: argparse.Namespace) -> None:
+    levels = [int(level) for level in args.concurrency.split(",")]
+    mix = parse_mix(args.mix)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        server = None
+        if args.base_url:
+            client = httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout)
+        elif args.launch:
+            server = launch_server(args.backend, workdir, args.port, args.workers)
+            base_url = f"http://127.0.0.1:{args.port}"
+            await wait_until_ready(base_url)
+            limits = httpx.Limits(max_connections=max(levels))
+            client = httpx.AsyncClient(base_url=base_url, timeout=args.timeout, limits=limits)
+        else:
+            app = build_inprocess_app(args.backend, workdir)
+            transport = httpx.ASGITransport(app=app)
+            client = httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=args.timeout)
+
+        try:
+            async with client:
+                runner = LoadRunner(client, mix, seed=args.seed)
+                await runner.seed_data(args.seed_rows)
+                for concurrency in levels:
+                    elapsed = await runner.run_level(concurrency, args.requests)
+                    print_report(concurrency, elapsed, runner.stats)
+        finally:
+            if server is not None:
+                server.terminate()
+                server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Prueba de carga de la API de gastos")
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="json",
+                        help="Almacenamiento temporal para el modo en-proceso o --launch")
+    parser.add_argument("--base-url", help="Usar un servidor ya levantado en esta URL")
+    parser.add_argument("--launch", action="store_true", help="Levantar uvicorn localmente")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1, help="Workers de uvicorn con --launch")
+    parser.add_argument("--concurrency", default="1,4,16,64",
+                        help="Niveles de concurrencia separados por coma")
+    parser.add_argument("--requests", type=int, default=500, help="Peticiones por nivel")
+    parser.add_argument("--seed-rows", type=int, default=200, help="Gastos iniciales")
+    parser.add_argument("--mix", help="Pesos por operación, ej: create=10,get=50,dashboard=5")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,48 +4,50 @@ import os
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
 from app.infrastructure.database.connection import SessionLocal
-from app.infrastructure.database.models import ExpenseModel, PaymentMethodEnum
+from app.infrastructure.repositories.postgresql_expense_repository import PostgreSQLExpenseRepository
+from app.domain.entities.expense import Expense, PaymentMethod
+from app.domain.repositories.expense_query import ExpenseQuery
 from datetime import datetime
 
 def seed_data():
     db = SessionLocal()
+    repository = PostgreSQLExpenseRepository(db)
     
     try:
-        # Verificar si ya hay datos
-        count = db.query(ExpenseModel).count()
-        if count > 0:
-            print(f"✅ Ya hay {count} gastos en la base de datos")
+        # Verificar si ya hay datos (en tablas grandes, estimado: sin recorrerlas)
+        count = repository.count(ExpenseQuery(), estimate=True)
+        if count.value > 0:
+            print(f"✅ Ya hay {'' if count.exact else '~'}{count.value} gastos en la base de datos")
             return
         
-        # Crear gastos de prueba
+        # Crear gastos de prueba (por el repositorio: resuelve category_id)
         expenses = [
-            ExpenseModel(
+            Expense(
                 amount=25.50,
                 category="Comida",
-                payment_method=PaymentMethodEnum.CASH,
+                payment_method=PaymentMethod.CASH,
                 description="Almuerzo restaurante",
                 date=datetime.now()
             ),
-            ExpenseModel(
+            Expense(
                 amount=15.00,
                 category="Transporte",
-                payment_method=PaymentMethodEnum.DEBIT_CARD,
+                payment_method=PaymentMethod.DEBIT_CARD,
                 description="Uber",
                 date=datetime.now()
             ),
-            ExpenseModel(
+            Expense(
                 amount=50.00,
                 category="Entretenimiento",
-                payment_method=PaymentMethodEnum.CREDIT_CARD,
+                payment_method=PaymentMethod.CREDIT_CARD,
                 description="Cine",
                 date=datetime.now()
             ),
         ]
         
         for expense in expenses:
-            db.add(expense)
+            repository.save(expense)
         
-        db.commit()
         print(f"✅ Se agregaron {len(expenses)} gastos de prueba")
         
     except Exception as e: